@@ -586,6 +586,14 @@ class DAQ_Move(ParameterControlModule):
         if hasattr(mod, 'config'):
             self.plugin_config = mod.config
 
+    @property
+    def epsilon(self) -> float:
+        """Get the epsilon of the controller: the difference at which a target position is considered reached"""
+        try:
+            return self.settings['move_settings', 'epsilon']
+        except KeyError:  # the plugin settings are not loaded yet
+            return config('actuator', 'epsilon_default')
+
     @property
     def units(self):
         """Get/Set the units for the controller"""
@@ -65,6 +65,9 @@ class DAQ_Viewer(ParameterControlModule):
     grab_done_signal: Signal[DataToExport]
         Signal emitted when the data from the plugin (and eventually from the data viewers) has been received. To be
         used by connected objects.
+    integration_done_signal: Signal[str]
+        Signal emitted with the module title when the detector has finished exposing during a single grab, while its
+        data may still be read out and transferred
     custom_sig: Signal[ThreadCommand]
         use this to propagate info/data coming from the hardware plugin to another object
     overshoot_signal: Signal[bool]
@@ -85,6 +88,7 @@ class DAQ_Viewer(ParameterControlModule):
     custom_sig = Signal(ThreadCommand)  # particular case where DAQ_Viewer is used for a custom module
 
     grab_done_signal = Signal(DataToExport)
+    integration_done_signal = Signal(str)
 
     overshoot_signal = Signal(bool)
     data_saved = Signal()
@@ -181,6 +185,7 @@ class DAQ_Viewer(ParameterControlModule):
         """Configure the objects dealing with the continuous saving mode"""
         self.module_and_data_saver = module_saving.DetectorSaver(self)
         self._h5saver_continuous = H5Saver(save_type='detector')
+        self._h5saver_continuous.set_buffered_appends(True)
         self._h5saver_continuous.show_settings(False)
         self._h5saver_continuous.settings.child('do_save').sigValueChanged.connect(self._init_continuous_save)
         if self.ui is not None:
@@ -610,7 +615,9 @@ class DAQ_Viewer(ParameterControlModule):
     def append_data(self, dte: DataToExport = None, where: Union[Node, str] = None):
         """Appends current DataToExport to a DetectorEnlargeableSaver
 
-        Method to be used when performing continuous saving into a h5file (continuous mode or DAQ_Logger)
+        Method to be used when performing continuous saving into a h5file (continuous mode or DAQ_Logger).
+        In continuous mode, the saving continues into a new file when the current one reaches the limit
+        set in the rollover options of the H5Saver (see H5SaverLowLevel.check_rollover)
 
         Parameters
         ----------
@@ -623,12 +630,17 @@ class DAQ_Viewer(ParameterControlModule):
         """
         if dte is None:
             dte = self._data_to_save_export
+        if where is None and self._h5saver_continuous.check_rollover():
+            # the saving continues into a new file where the nodes have to be created again
+            self._h5saver_continuous.settings.child('N_saved').setValue(0)
         self._add_data_to_saver(dte, init_step=self._h5saver_continuous.settings['N_saved'] == 0,
                                 where=where)
+        if self._h5saver_continuous.settings['N_saved'] == 0:
+            self._h5saver_continuous.start_swmr()  # all the nodes are created, the file can be read
         self._h5saver_continuous.settings.child('N_saved').setValue(self._h5saver_continuous.settings['N_saved'] + 1)
 
     def insert_data(self, indexes: Tuple[int], where: Union[Node, str] = None,
-                    distribution=DataDistribution['uniform']):
+                    distribution=DataDistribution['uniform'], data: DataToExport = None):
         """Insert DataToExport to a DetectorExtendedSaver at specified indexes
 
         Method to be used when saving into an already initialized array within a h5file (DAQ_Scan for instance)
@@ -639,14 +651,43 @@ class DAQ_Viewer(ParameterControlModule):
             The indexes within the extended array where to place these data
         where: Node or str
         distribution: DataDistribution enum
+        data: DataToExport
+            The data to insert, if None the last data of this module is inserted
 
         See Also
         --------
         DAQ_Scan, DetectorExtendedSaver
         """
-        self._add_data_to_saver(self._data_to_save_export, init_step=np.all(np.array(indexes) == 0), where=where,
+        if data is None:
+            data = self._data_to_save_export
+        self._add_data_to_saver(data, init_step=np.all(np.array(indexes) == 0), where=where,
                                 indexes=indexes, distribution=distribution)
 
+    def append_spread_data(self, axis_values: List[float], where: Union[Node, str] = None, init_step=False,
+                           data: DataToExport = None):
+        """Append DataToExport to a DetectorEnlargeableSaver together with the values of its navigation axes
+
+        Method to be used when the positions of the data are not known in advance (adaptive scans of DAQ_Scan
+        for instance), the data being then saved as spread data
+
+        Parameters
+        ----------
+        axis_values: list of float
+            The values of the enlargeable navigation axes (the actuators positions) of these data
+        where: Node or str
+        init_step: bool
+            True for the first data to be appended
+        data: DataToExport
+            The data to append, if None the last data of this module is appended
+
+        See Also
+        --------
+        DAQ_Scan, DetectorEnlargeableSaver
+        """
+        if data is None:
+            data = self._data_to_save_export
+        self._add_data_to_saver(data, init_step=init_step, where=where, axis_values=axis_values)
+
     def _add_data_to_saver(self, dte: DataToExport, init_step=False, where=None, **kwargs):
         """Adds DataToExport data to the current node using the declared module_and_data_saver
 
@@ -667,19 +708,27 @@ class DAQ_Viewer(ParameterControlModule):
 
         """
         if dte is not None:
-            detector_node = self.module_and_data_saver.get_set_node(where)
             dte = dte if not self.module_and_data_saver.h5saver.settings['save_raw_only'] else \
                 dte.get_data_from_source('raw')  # filters depending on the source: raw or calculated
 
             dte = DataToExport(name=dte.name, data=  # filters depending on the extra argument 'save'
                                [dwa for dwa in dte if ('do_save' not in dwa.extra_attributes) or
                                 ('do_save' in dwa.extra_attributes and dwa.do_save)])
+            bkg = self._bkg if init_step and self._do_bkg else None
 
-            self.module_and_data_saver.add_data(detector_node, dte, **kwargs)
+            # executed in the h5saver writer thread if asynchronous writing is activated
+            self.module_and_data_saver.h5saver.submit(self._write_data_to_saver,
+                                                      self.module_and_data_saver, dte, bkg, where,
+                                                      **kwargs)
 
-            if init_step:
-                if self._do_bkg and self._bkg is not None:
-                    self.module_and_data_saver.add_bkg(detector_node, self._bkg)
+    @staticmethod
+    def _write_data_to_saver(module_and_data_saver: module_saving.DetectorSaver, dte: DataToExport,
+                             bkg: Optional[DataToExport] = None, where=None, **kwargs):
+        """Write operations on the h5file related to _add_data_to_saver"""
+        detector_node = module_and_data_saver.get_set_node(where)
+        module_and_data_saver.add_data(detector_node, dte, **kwargs)
+        if bkg is not None:
+            module_and_data_saver.add_bkg(detector_node, bkg)
 
     def _save_data(self, path=None, dte: DataToExport = None):
         """Private. Practical implementation to save data into a h5file altogether with metadata, axes, background...
@@ -1034,6 +1083,7 @@ class DAQ_Viewer(ParameterControlModule):
                 * init_lcd: display a LCD panel
                 * lcd: display on the LCD panel, the content of the attribute
                 * stop: stop the grab
+                * integration_done: emit integration_done_signal
         """
         super().thread_status(status, 'detector')
 
@@ -1055,6 +1105,9 @@ class DAQ_Viewer(ParameterControlModule):
         elif status.command == 'grab_stopped':
             self.grab_status.emit(False)
 
+        elif status.command == 'integration_done':
+            self.integration_done_signal.emit(self.title)
+
         elif status.command == 'init_lcd':
             if self._lcd is not None:
                 try:
@@ -1153,6 +1206,7 @@ class DAQ_Detector(QObject):
         self.ind_average = 0
         self.Naverage = 1
         self.average_done = False
+        self._integration_done = False
         self.hardware_averaging = False
         self.show_averaging = False
         self.wait_time = settings_parameter['main_settings', 'wait_time']
@@ -1328,15 +1382,30 @@ class DAQ_Detector(QObject):
 
             if self.ind_average == self.Naverage:
                 self.average_done = True
+                self.integration_done()
                 self.data_detector_sig.emit(self.datas)
                 self.ind_average = 0
         else:
             self.average_done = True  # expected to make sure the single_grab stop by itself
+            self.integration_done()
             self.data_detector_sig.emit(data)
         self.waiting_for_data = False
         if not self.grab_state:
             self.detector.stop()
 
+    def integration_done(self):
+        """ Notify that the detector has finished exposing during a single grab
+
+        Called by the instrument plugin class (see DAQ_Viewer_base.emit_integration_done) as soon as the exposure is
+        over and before the data is read out, or at the latest when the data is ready. Only the last exposure of a
+        software averaging is notified, and only once per grab.
+        """
+        if not self.single_grab or self._integration_done:
+            return
+        if self.hardware_averaging or self.Naverage <= 1 or self.ind_average >= self.Naverage - 1:
+            self._integration_done = True
+            self.status_sig.emit(ThreadCommand('integration_done'))
+
     def single(self, Naverage=1, *args, **kwargs):
         """ Convenience function to grab a single set of data
 
@@ -1365,6 +1434,7 @@ class DAQ_Detector(QObject):
         try:
             self.ind_average = 0
             self.Naverage = Naverage
+            self._integration_done = False
             if Naverage > 1:
                 self.average_done = False
             self.waiting_for_data = False
@@ -317,6 +317,15 @@ class DAQ_Viewer_base(QObject):
         else:
             print(status)
 
+    def emit_integration_done(self):
+        """Notify that the exposure of the current grab is over
+
+        To be called from the grab_data method (or a callback) of plugins able to know when their exposure ends
+        before the data is read out and emitted: it lets a pipelined scan move the actuators during the readout.
+        """
+        if self.parent is not None:
+            self.parent.integration_done()
+
     def update_scanner(self, scan_parameters):
         # todo check this because ScanParameters has been removed
         self.scan_parameters = scan_parameters
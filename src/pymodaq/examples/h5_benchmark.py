@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Write/read throughput of enlargeable arrays for the available hdf5 backends (and zarr directory
+stores) and compressors. Each data (0D, 1D or 2D) is appended one at a time as during a continuous
+acquisition (or buffered in memory and written by blocks if BUFFERED), then the whole array is read
+back. The durations of the first and last saving steps of a DataEnlargeableSaver are also compared
+while new channel groups are added next to its arrays, to check that a saving step does not slow
+down as the number of nodes of the file grows.
+
+usage: python -m pymodaq.examples.h5_benchmark
+"""
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from pymodaq.utils.data import DataWithAxes
+from pymodaq.utils.h5modules.backends import (H5Backend, backends_available, compression_libraries,
+                                              get_file_size)
+from pymodaq.utils.h5modules.data_saving import DataEnlargeableSaver, DataSaverLoader
+from pymodaq.utils.h5modules.saving import H5SaverLowLevel
+
+DATA_SHAPES = {'Data0D': ((1,), 20000),
+               'Data1D': ((1024,), 2000),
+               'Data2D': ((256, 256), 200)}
+
+COMPRESSORS = [None] + [comp for comp in compression_libraries if comp != 'gzip']
+
+BUFFERED = [False, True]
+
+
+def get_data(data_shape, nsteps):
+    """Smooth noisy data, compressible as real signals are"""
+    x = np.linspace(0, 10, int(np.prod(data_shape)))
+    return [(np.sin(x + ind) + 0.01 * np.random.rand(len(x))).reshape(data_shape)
+            for ind in range(min(nsteps, 10))]
+
+
+def benchmark(backend: str, compression: str, data_shape, nsteps, path: Path,
+              buffered=False) -> dict:
+    """Time the writing then the reading of nsteps data of shape data_shape
+
+    Returns
+    -------
+    dict: with keys rate (appended data per second), write and read (throughput in MB/s) and size
+        (file size in MB)
+    """
+    bck = H5Backend(backend)
+    file_path = path.joinpath(f'bench_{backend}{bck.file_extension}')
+    datas = get_data(data_shape, nsteps)
+    bck.open_file(file_path, 'w')
+    bck.set_buffered_appends(buffered)
+    if compression is not None:
+        bck.define_compression(compression, 5)
+    array = bck.create_earray(bck.root(), 'array', dtype=np.float64, data_shape=data_shape)
+    start = perf_counter()
+    for ind in range(nsteps):
+        array.append(datas[ind % len(datas)])
+    bck.flush()
+    write_time = perf_counter() - start
+    bck.close_file()
+
+    bck.open_file(file_path, 'r')
+    start = perf_counter()
+    bck.get_node('/array').read()
+    read_time = perf_counter() - start
+    bck.close_file()
+
+    nbytes = nsteps * int(np.prod(data_shape)) * 8 / 1e6
+    return dict(rate=nsteps / write_time, write=nbytes / write_time, read=nbytes / read_time,
+                size=get_file_size(file_path) / 1e6)
+
+
+def benchmark_saving_steps(path: Path, nsteps=10000, nsteps_median=1000, new_channel_steps=10) -> dict:
+    """Time each step of a DataEnlargeableSaver saving 0D data in a group where a new channel group
+    (holding a data node) is added every new_channel_steps steps (not timed)
+
+    Returns
+    -------
+    dict: with keys first and last, the median durations (in ms) of the nsteps_median first and last
+    steps, and nodes, the number of nodes of the file at the end
+    """
+    h5saver = H5SaverLowLevel()
+    h5saver.init_file(file_name=path.joinpath('bench_steps.h5'))
+    data_saver = DataEnlargeableSaver(h5saver)
+    channel_saver = DataSaverLoader(h5saver)
+    data = DataWithAxes(name='mydata', data=[np.array([0.]), np.array([1.])], source='raw')
+    channel_data = DataWithAxes(name='channel', data=[np.array([0.])], source='raw')
+    durations = []
+    for ind in range(nsteps):
+        if ind % new_channel_steps == 0:
+            channel_saver.add_data(h5saver.add_ch_group(h5saver.raw_group), channel_data)
+        start = perf_counter()
+        data_saver.add_data(h5saver.raw_group, data, axis_values=[ind])
+        durations.append(perf_counter() - start)
+    n_nodes = len(list(h5saver.walk_nodes('/')))
+    h5saver.close_file()
+    return dict(first=1000 * np.median(durations[:nsteps_median]),
+                last=1000 * np.median(durations[-nsteps_median:]), nodes=n_nodes)
+
+
+def main():
+    backends = [backend for backend in backends_available if backend != 'h5pyd']
+    print(f'{"backend":8s} {"compressor":13s} {"buffered":8s} {"data":7s} {"data/s":>8s}'
+          f' {"write MB/s":>11s} {"read MB/s":>10s} {"file MB":>8s}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in backends:
+            for compression in COMPRESSORS:
+                for buffered in BUFFERED:
+                    for dim, (data_shape, nsteps) in DATA_SHAPES.items():
+                        res = benchmark(backend, compression, data_shape, nsteps, Path(tmp),
+                                        buffered)
+                        print(f'{backend:8s} {str(compression):13s} {str(buffered):8s} {dim:7s}'
+                              f' {res["rate"]:8.0f} {res["write"]:11.2f} {res["read"]:10.1f}'
+                              f' {res["size"]:8.2f}')
+        res = benchmark_saving_steps(Path(tmp))
+        print(f'DataEnlargeableSaver step duration: {res["first"]:.3f} ms (first steps), '
+              f'{res["last"]:.3f} ms (last steps, {res["nodes"]} nodes in the file)')
+
+
+if __name__ == '__main__':
+    main()
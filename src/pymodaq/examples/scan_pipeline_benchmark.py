@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Steps per second of a scan loop run on Mock modules (one Mock actuator, one Mock 0D detector)
+either sequentially (move, then grab and wait for the data) or pipelined (the next move starts as
+soon as the detector notifies the end of its integration, during the readout of the data), as done
+by DAQ_Scan when the time_flow/pipelined setting is on. The detector plugin is wrapped to simulate
+an exposure and a readout time.
+
+usage: python -m pymodaq.examples.scan_pipeline_benchmark
+"""
+from time import perf_counter
+
+import numpy as np
+from qtpy import QtWidgets
+from qtpy.QtCore import QThread
+
+from pymodaq.control_modules.daq_move import DAQ_Move
+from pymodaq.control_modules.daq_viewer import DAQ_Viewer
+from pymodaq.utils.data import DataActuator, DataToExport
+from pymodaq.utils.managers.modules_manager import ModulesManager
+
+NSTEPS = 50
+EXPOSURE = 20  # ms
+READOUTS = [0, 50, 100]  # ms
+TAU = 20  # ms, time constant of the Mock actuator
+
+
+def wait_init(module, timeout=10.):
+    start = perf_counter()
+    while not module.initialized_state and perf_counter() - start < timeout:
+        QtWidgets.QApplication.processEvents()
+        QThread.msleep(10)
+
+
+def wrap_grab(plugin, readout: int):
+    """Make the Mock detector plugin expose then read out its data"""
+    grab_data = plugin.grab_data
+
+    def grab_with_readout(*args, **kwargs):
+        QThread.msleep(EXPOSURE)
+        plugin.emit_integration_done()
+        QThread.msleep(readout)
+        grab_data(*args, **kwargs)
+    plugin.grab_data = grab_with_readout
+
+
+def get_positions(title: str):
+    for pos in np.linspace(0, 1, NSTEPS):
+        yield DataToExport('positions', data=[DataActuator(title, data=float(pos))])
+
+
+def sequential(modules_manager: ModulesManager, title: str):
+    for positions in get_positions(title):
+        modules_manager.move_actuators(positions)
+        modules_manager.grab_datas()
+
+
+def pipelined(modules_manager: ModulesManager, title: str):
+    scan_positions = get_positions(title)
+    modules_manager.start_move(next(scan_positions))
+    while True:
+        modules_manager.wait_move_done()
+        modules_manager.start_grab()
+        next_positions = next(scan_positions, None)
+        if next_positions is not None and modules_manager.wait_integration_done():
+            modules_manager.start_move(next_positions)
+        modules_manager.wait_det_done()
+        if next_positions is None:
+            break
+
+
+def main():
+    app = QtWidgets.QApplication([])
+    actuator = DAQ_Move(title='act')
+    actuator.actuator = 'Mock'
+    actuator.settings.child('move_settings', 'tau').setValue(TAU)
+    actuator.init_hardware()
+    detector = DAQ_Viewer(title='det', daq_type='DAQ0D')
+    detector.detector = 'Mock'
+    detector.init_hardware()
+    wait_init(actuator)
+    wait_init(detector)
+    plugin = detector._hardware_thread.hardware.detector
+
+    modules_manager = ModulesManager([detector], [actuator], [detector], [actuator])
+    modules_manager.connect_actuators()
+    modules_manager.connect_detectors()
+
+    print(f'{"readout (ms)":>12s} {"sequential (steps/s)":>21s} {"pipelined (steps/s)":>20s}')
+    grab_data = plugin.grab_data
+    for readout in READOUTS:
+        plugin.grab_data = grab_data
+        wrap_grab(plugin, readout)
+        rates = []
+        for loop in (sequential, pipelined):
+            start = perf_counter()
+            loop(modules_manager, actuator.title)
+            rates.append(NSTEPS / (perf_counter() - start))
+        print(f'{readout:12d} {rates[0]:21.1f} {rates[1]:20.1f}')
+
+    modules_manager.connect_actuators(False)
+    modules_manager.connect_detectors(False)
+    actuator.quit_fun()
+    detector.quit_fun()
+
+
+if __name__ == '__main__':
+    main()
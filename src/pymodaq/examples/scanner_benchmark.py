@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Time needed by each registered scanner to compute its positions, unique axes and indexes
+(set_scan) for scans of 10^4 up to 10^6 points. Scanners with no known way to set their number of
+points (adaptive or plugin scanners) are skipped.
+
+usage: python -m pymodaq.examples.scanner_benchmark
+"""
+from time import perf_counter
+
+import numpy as np
+from qtpy import QtWidgets
+
+from pymodaq.utils.scanner.utils import scanner_factory
+from pymodaq.utils.scanner.scanners.sequential import TableModelSequential
+
+NPOINTS = [10 ** 4, 10 ** 5, 10 ** 6]
+
+
+class MoveMock:
+    def __init__(self, ind: int = 0):
+        self.title = f'act_{ind}'
+        self.units = ''
+
+
+def set_scan1d(scanner, npts: int):
+    scanner.settings['start'] = 0.
+    scanner.settings['stop'] = npts - 1.
+    scanner.settings['step'] = 1.
+
+
+def set_scan1d_sparse(scanner, npts: int):
+    scanner.settings['parsed_string'] = f'0:1:{npts - 1}'
+
+
+def set_scan2d(scanner, npts: int):
+    npts_axis = int(np.sqrt(npts))
+    for ax in scanner.axes:
+        scanner.settings[ax, f'start_{ax}'] = 0.
+        scanner.settings[ax, f'stop_{ax}'] = npts_axis - 1.
+        scanner.settings[ax, f'step_{ax}'] = 1.
+
+
+def set_scan2d_spiral(scanner, npts: int):
+    scanner.settings['npts_by_axis'] = int(np.sqrt(npts)) - 1
+
+
+def set_sequential(scanner, npts: int):
+    npts_axis = int(np.sqrt(npts))
+    scanner.table_model = TableModelSequential([[act.title, 0., npts_axis - 1., 1.]
+                                                for act in scanner.actuators])
+
+
+def set_tabular(scanner, npts: int):
+    scanner.table_model.set_data_all(np.random.rand(npts, 2))
+
+
+def set_tabular_subsegmented(scanner, npts: int):
+    scanner.table_model_points.set_data_all([[0., 0.], [1., 1.]])
+    scanner.settings['tabular_step'] = np.sqrt(2) / npts
+
+
+SETTERS = {('Scan1D', 'Linear'): set_scan1d,
+           ('Scan1D', 'Random'): set_scan1d,
+           ('Scan1D', 'Sparse'): set_scan1d_sparse,
+           ('Scan2D', 'Linear'): set_scan2d,
+           ('Scan2D', 'LinearBackForce'): set_scan2d,
+           ('Scan2D', 'Random'): set_scan2d,
+           ('Scan2D', 'Spiral'): set_scan2d_spiral,
+           ('Sequential', 'Linear'): set_sequential,
+           ('Tabular', 'Linear'): set_tabular,
+           ('Tabular', 'SubSegmented'): set_tabular_subsegmented,
+           }
+
+
+def benchmark(scan_type: str, scan_subtype: str, npts: int) -> tuple:
+    """Time the set_scan method of a given scanner configured for about npts points
+
+    Returns
+    -------
+    tuple: the number of steps actually computed and the duration in seconds
+    """
+    n_axes = 1 if scan_type == 'Scan1D' else 2
+    scanner = scanner_factory.get(scan_type, scan_subtype,
+                                  actuators=[MoveMock(ind) for ind in range(n_axes)])
+    scanner.save_settings = False
+    SETTERS[(scan_type, scan_subtype)](scanner, npts)
+    start = perf_counter()
+    scanner.set_scan()
+    return scanner.n_steps, perf_counter() - start
+
+
+def main():
+    app = QtWidgets.QApplication([])
+    print(f'{"scan type":12s} {"scan subtype":16s} {"steps":>8s} {"time (s)":>9s}')
+    for scan_type in scanner_factory.scan_types():
+        for scan_subtype in scanner_factory.scan_sub_types(scan_type):
+            if (scan_type, scan_subtype) not in SETTERS:
+                print(f'{scan_type:12s} {scan_subtype:16s} skipped')
+                continue
+            for npts in NPOINTS:
+                n_steps, duration = benchmark(scan_type, scan_subtype, npts)
+                print(f'{scan_type:12s} {scan_subtype:16s} {n_steps:8d} {duration:9.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -12,7 +12,8 @@ import os
 from pathlib import Path
 import sys
 import tempfile
-from typing import List, Tuple, TYPE_CHECKING
+import time
+from typing import Dict, Iterator, List, Tuple, TYPE_CHECKING
 
 import numpy as np
 from qtpy import QtWidgets, QtCore, QtGui
@@ -31,6 +32,9 @@ from pymodaq.utils.plotting.data_viewers.viewer1D import Viewer1D
 from pymodaq.utils.plotting.navigator import Navigator
 from pymodaq.utils.plotting.scan_selector import ScanSelector, SelectorItem
 from pymodaq.utils.scanner.scanner import Scanner, scanner_factory  #, adaptive, adaptive_losses
+from pymodaq.utils.scanner.fly_scan import FlyScanRecorder
+from pymodaq.extensions.daq_scan_profiler import ScanProfiler
+from pymodaq.extensions.daq_scan_checkpoint import ScanCheckpoint
 from pymodaq.utils.managers.batchscan_manager import BatchScanner
 from pymodaq.utils.managers.modules_manager import ModulesManager
 from pymodaq.post_treatment.load_and_plot import LoaderPlotter
@@ -41,6 +45,7 @@ from pymodaq.utils import daq_utils as utils
 from pymodaq.utils import gui_utils as gutils
 from pymodaq.utils.h5modules.saving import H5Saver
 from pymodaq.utils.h5modules import module_saving, data_saving
+from pymodaq.utils.h5modules.writer import WriterError
 from pymodaq.utils.data import DataToExport, DataActuator
 
 
@@ -56,10 +61,13 @@ SHOW_POPUPS = config('scan', 'show_popups')
 
 class ScanDataTemp:
     """Convenience class to hold temporary data to be plotted in the live plots"""
-    def __init__(self, scan_index: int, indexes: Tuple[int], data: data_mod.DataToExport):
+    def __init__(self, scan_index: int, indexes: Tuple[int], data: data_mod.DataToExport,
+                 timings: Dict[str, float] = None, positions: np.ndarray = None):
         self.scan_index = scan_index
         self.indexes = indexes
         self.data = data
+        self.timings = timings if timings is not None else dict([])
+        self.positions = positions
 
 
 class DAQScan(QObject, ParameterManager):
@@ -80,9 +88,15 @@ class DAQScan(QObject, ParameterManager):
              'value': 0,
              'tip': 'Wait time in ms between move and grab processes'},
             {'title': 'Timeout (ms)', 'name': 'timeout', 'type': 'int', 'value': 10000},
+            {'title': 'Pipelined', 'name': 'pipelined', 'type': 'bool', 'value': False,
+             'tip': 'Move the actuators to the next positions as soon as the detectors have finished their '
+                    'integration, while the data is read out, saved and plotted'},
         ]},
         {'title': 'Scan options', 'name': 'scan_options', 'type': 'group', 'children': [
             {'title': 'Naverage:', 'name': 'scan_average', 'type': 'int', 'value': 1, 'min': 1},
+            {'title': 'Fly scan:', 'name': 'fly_scan', 'type': 'bool', 'value': False,
+             'tip': 'Move the last actuator continuously along each line of the scan while the detectors grab '
+                    'freely. Frames are binned on the scan steps from their interpolated positions'},
         ]},
 
         {'title': 'Plotting options', 'name': 'plot_options', 'type': 'group', 'children': [
@@ -95,6 +109,8 @@ class DAQScan(QObject, ParameterManager):
              'value': True},
             {'title': 'Refresh Plots (ms)', 'name': 'refresh_live', 'type': 'int',
              'value': 1000, 'visible': False},
+            {'title': 'Show step timings', 'name': 'show_timings', 'type': 'bool', 'value': True,
+             'tip': 'Display at the end of the scan the timings of the last steps on a Gantt chart'},
             ]},
     ]
 
@@ -149,6 +165,17 @@ class DAQScan(QObject, ParameterManager):
         self.module_and_data_saver = module_saving.ScanSaver(self)
 
         self.extended_saver: data_saving.DataToExportExtendedSaver = None
+        self.enlargeable_saver: data_saving.DataToExportEnlargeableSaver = None
+        self.scan_profiler: ScanProfiler = None
+        self._timings_saver: data_saving.DataEnlargeableSaver = None
+        self._saved_time = 0.
+        self._ind_step = 0
+        self._scan_node = None
+        self._checkpoint: ScanCheckpoint = None
+        self._nav_axes_saved = False
+        self._first_step_saved = False
+        self._swmr_ready = False
+        self.timings_dock: gutils.Dock = None
         self.h5temp: H5Saver = None
         self.temp_path: tempfile.TemporaryDirectory = None
 
@@ -206,8 +233,10 @@ class DAQScan(QObject, ParameterManager):
         self.settings.child('time_flow', 'wait_time').setValue(config['scan']['timeflow']['wait_time'])
         self.settings.child('time_flow', 'wait_time_between').setValue(config['scan']['timeflow']['wait_time'])
         self.settings.child('time_flow', 'timeout').setValue(config['scan']['timeflow']['timeout'])
+        self.settings.child('time_flow', 'pipelined').setValue(config['scan']['timeflow']['pipelined'])
 
         self.settings.child('scan_options',  'scan_average').setValue(config['scan']['Naverage'])
+        self.settings.child('scan_options', 'fly_scan').setValue(config['scan']['fly_scan'])
 
     def process_ui_cmds(self, cmd: utils.ThreadCommand):
         """Process commands sent by actions done in the ui
@@ -220,6 +249,7 @@ class DAQScan(QObject, ParameterManager):
                 * ini_positions
                 * start
                 * start_batch
+                * resume
                 * stop
                 * move_at
                 * show_log
@@ -238,6 +268,8 @@ class DAQScan(QObject, ParameterManager):
             self.start_scan()
         elif cmd.command == 'start_batch':
             self.start_scan_batch()
+        elif cmd.command == 'resume':
+            self.resume_scan()
         elif cmd.command == 'stop':
             self.stop_scan()
         elif cmd.command == 'move_at':
@@ -613,6 +645,9 @@ class DAQScan(QObject, ParameterManager):
         self.settings.child('plot_options', 'plot_1d').setValue(dict(all_items=[], selected=[]))
 
     def prepare_viewers(self):
+        if self.scanner.scan_sub_type == 'Adaptive':
+            self.prepare_spread_viewers()
+            return
 
         viewers_enum = [ViewersEnum('Data0D').increase_dim(self.scanner.n_axes)
                         for _ in range(len(self.settings['plot_options', 'plot_0d']['selected']))]
@@ -631,6 +666,15 @@ class DAQScan(QObject, ParameterManager):
             data_names.extend(self.settings['plot_options', 'plot_1d']['selected'][:])
         self.live_plotter.prepare_viewers(viewers_enum, viewers_name=data_names)
 
+    def prepare_spread_viewers(self):
+        """Prepare ViewerND viewers for the live display of the spread data of adaptive scans (only
+        0D data are plotted live)"""
+        data_names = self.settings['plot_options', 'plot_0d']['selected'][:]
+        if self.settings['plot_options', 'group0D'] and len(data_names) > 0:
+            data_names = [self.live_plotter.grouped_data0D_fullname]
+        self.live_plotter.prepare_viewers([ViewersEnum['ViewerND'] for _ in data_names],
+                                          viewers_name=data_names)
+
     def update_status(self, txt: str, wait_time=0):
         """ Show the txt message in the status bar with a delay of wait_time ms.
 
@@ -671,16 +715,21 @@ class DAQScan(QObject, ParameterManager):
             self.modules_manager.reset_signals()
             self.live_timer.stop()
             self.ui.set_scan_done()
+            try:
+                self.module_and_data_saver.flush()  # barrier: wait for all pending write requests
+            except WriterError as e:
+                logger.error(f'Some data of the scan could not be saved: {str(e)}')
             scan_node = self.module_and_data_saver.get_last_node()
             scan_node.attrs['scan_done'] = True
-            self.module_and_data_saver.flush()
             self.close_file()
+            self.show_scan_timings()
 
             if not self.batch_started:
                 if not self.dashboard.overshoot:
                     self.set_ini_positions()
                 self.ui.set_action_enabled('ini_positions', True)
                 self.ui.set_action_enabled('start', True)
+                self.ui.set_action_enabled('resume', True)
 
                 # reactivate module controls using remote_control
                 if hasattr(self.dashboard, 'remote_manager'):
@@ -696,16 +745,50 @@ class DAQScan(QObject, ParameterManager):
             self.ui.set_permanent_status('Timeout occurred')
 
         elif status.command == 'add_data':
-            self.module_and_data_saver.add_data(**status.attribute)
+            try:
+                self.module_and_data_saver.add_data(**status.attribute)
+                if self._checkpoint is not None:
+                    self.h5saver.submit(ScanCheckpoint.save_progress, self._scan_node, self.ind_scan,
+                                        self.ind_average)
+            except WriterError as e:
+                self.stop_scan_on_error(e)
+                return
+            self._saved_time = time.perf_counter()
+            if not self._first_step_saved:
+                # first step of the scan (or of its resumed part): SWMR is started once the
+                # ScanTimings nodes of this step are created too
+                self._first_step_saved = True
+                self._swmr_ready = True
 
         elif status.command == 'add_nav_axes':
-            self.module_and_data_saver.add_nav_axes(status.attribute)
+            try:
+                self.h5saver.submit(self.module_and_data_saver.add_nav_axes, status.attribute)
+            except WriterError as e:
+                self.stop_scan_on_error(e)
+
+    def stop_scan_on_error(self, error: WriterError):
+        """Stop the running scan as some of its data could not be written in the file"""
+        logger.error(f'The scan is stopped as its data could not be saved: {str(error)}')
+        self.update_status(f'The scan is stopped as its data could not be saved: {str(error)}')
+        if not self.ui.is_action_enabled('start'):  # the scan is still running
+            self.stop_scan()
 
     ############
     #  PLOTTING
 
     def save_temp_live_data(self, scan_data: ScanDataTemp):
-        if scan_data.scan_index == 0:
+        if scan_data.positions is not None:  # adaptive scan, positions not known in advance
+            self.enlargeable_saver.add_data(self.h5temp.raw_group, scan_data.data,
+                                            axis_values=list(scan_data.positions))
+        else:
+            self.save_temp_extended_data(scan_data)
+        if self.settings['plot_options', 'plot_at_each_step']:
+            self.update_live_plots()
+        self.add_step_timings(dict(scan_data.timings, saved=self._saved_time,
+                                   plotted=time.perf_counter()))
+
+    def save_temp_extended_data(self, scan_data: ScanDataTemp):
+        if not self._nav_axes_saved:
             nav_axes = self.scanner.get_nav_axes()
             Naverage = self.settings['scan_options', 'scan_average']
             if Naverage > 1:
@@ -716,11 +799,47 @@ class DAQScan(QObject, ParameterManager):
                                               index=0))
 
             self.extended_saver.add_nav_axes(self.h5temp.raw_group, nav_axes)
+            self._nav_axes_saved = True
 
         self.extended_saver.add_data(self.h5temp.raw_group, scan_data.data, scan_data.indexes,
                                      distribution=self.scanner.distribution)
-        if self.settings['plot_options', 'plot_at_each_step']:
-            self.update_live_plots()
+        self.live_plotter.update_live_data(scan_data.indexes, scan_data.data)
+
+    def add_step_timings(self, timings: Dict[str, float]):
+        """Add the timings of a step to the profiler and save them in the ScanTimings group of the
+        current scan"""
+        step = self.scan_profiler.add_step(timings)
+        try:
+            self.h5saver.submit(self._save_step_timings, self._scan_node, self._ind_step, step)
+            if self._swmr_ready:
+                # all the nodes are created, other processes can now read the file
+                self._swmr_ready = False
+                self.h5saver.start_swmr()
+        except WriterError as e:
+            self.stop_scan_on_error(e)
+        self._ind_step += 1
+
+    def _save_step_timings(self, scan_node, ind_step: int, step: np.ndarray):
+        timings_group = self.h5saver.get_set_group(scan_node, 'ScanTimings', title='Timings of the scan steps')
+        self._timings_saver.add_data(timings_group, self.scan_profiler.to_dwa(step), axis_values=[ind_step])
+
+    def show_scan_timings(self):
+        """Log the mean duration of each phase of the scan steps and display the last steps on a Gantt chart"""
+        durations = self.scan_profiler.get_mean_durations()
+        if len(durations) == 0:
+            return
+        logger.info('Mean durations of the scan steps: ' +
+                    ', '.join([f'{phase}: {1000 * duration:.1f} ms' for phase, duration in durations.items()]))
+        if self.settings['plot_options', 'show_timings']:
+            if self.timings_dock is None:
+                self.timings_dock = gutils.Dock('Scan timings')
+                self.dockarea.addDock(self.timings_dock)
+                self.timings_dock.float()
+            self._gantt_chart = self.scan_profiler.plot_gantt()
+            for widget in self.timings_dock.widgets[:]:
+                widget.setParent(None)
+                self.timings_dock.widgets.remove(widget)
+            self.timings_dock.addWidget(self._gantt_chart.widget)
 
     def update_live_plots(self):
 
@@ -728,30 +847,41 @@ class DAQScan(QObject, ParameterManager):
             average_axis = 0
         else:
             average_axis = None
+        isadaptive = self.scanner.scan_sub_type == 'Adaptive'
         try:
             self.live_plotter.load_plot_data(group_0D=self.settings['plot_options', 'group0D'],
                                              average_axis=average_axis,
                                              average_index=self.ind_average,
-                                             target_at=self.scanner.positions[self.ind_scan],
+                                             target_at=None if isadaptive else
+                                             self.scanner.get_position_at(self.ind_scan),
                                              last_step=(self.ind_scan ==
-                                                        self.scanner.positions.size - 1 and
+                                                        self.scanner.n_scan_steps - 1 and
                                                         self.ind_average ==
                                                         self.settings[
-                                                            'scan_options', 'scan_average'] - 1))
+                                                            'scan_options', 'scan_average'] - 1),
+                                             live_data=not isadaptive)
+            self.ui.set_live_refresh_time(self.live_plotter.refresh_time,
+                                          self.live_plotter.mean_refresh_time)
         except Exception as e:
             logger.exception(str(e))
     #################
     #  SCAN FLOW
 
-    def set_scan(self, scan=None) -> bool:
+    def set_scan(self, scan=None, update_scan_info=True) -> bool:
         """
         Sets the current scan given the selected settings. Makes some checks, increments the h5 file scans.
         In case the dialog is cancelled, return False and aborts the scan
+
+        Parameters
+        ----------
+        update_scan_info: bool
+            if False (when resuming a scan), the scan node and its metadata are kept as is
         """
         try:
-            res = self.update_scan_info()
-            if not res:
-                return False
+            if update_scan_info:
+                res = self.update_scan_info()
+                if not res:
+                    return False
 
             is_oversteps = self.scanner.set_scan()
             if is_oversteps:
@@ -766,14 +896,19 @@ class DAQScan(QObject, ParameterManager):
                 return False
 
             if self.scanner.scan_sub_type == 'Adaptive':
-                #todo include this in scanners objects for the adaptive scanners
                 if len(self.modules_manager.get_selected_probed_data('0D')) == 0:
                     messagebox(text="In adaptive mode, you have to pick a 0D signal from which the algorithm will"
                                     " determine the next positions to scan, see 'probe_data' in the modules selector"
                                     " panel")
                     return False
+                if self.settings['scan_options', 'scan_average'] > 1:
+                    logger.info('Adaptive scans are not averaged, Naverage is set to 1')
+                    self.settings.child('scan_options', 'scan_average').setValue(1)
 
             self.ui.n_scan_steps = self.scanner.n_steps
+            if self.scanner.settings['optimize_path']:
+                self.ui.display_status(f"Optimized path: {self.scanner.settings['time_saved']:.1f} s of "
+                                       f"actuators travel saved", wait_time=5000)
 
             # check if the modules are initialized
             for module in self.modules_manager.actuators:
@@ -825,11 +960,17 @@ class DAQScan(QObject, ParameterManager):
         self._metada_dataset_set = True
         return res
 
-    def start_scan(self):
+    def start_scan(self, checkpoint: ScanCheckpoint = None):
         """
             Start an acquisition calling the set_scan function.
             Emit the command_DAQ signal "start_acquisition".
 
+            Parameters
+            ----------
+            checkpoint: ScanCheckpoint
+                if given, the last scan of the current file is resumed after the last step recorded
+                in this checkpoint (see resume_scan)
+
             See Also
             --------
             set_scan
@@ -840,21 +981,47 @@ class DAQScan(QObject, ParameterManager):
         if self.ui.is_action_checked('move_at'):
             self.ui.get_action('move_at').trigger()
 
-        res = self.set_scan()
+        res = self.set_scan(update_scan_info=checkpoint is None)
+        if res and checkpoint is not None:
+            mismatches = checkpoint.get_mismatches(
+                ScanCheckpoint.from_scan(self.scanner, self.settings['scan_options', 'scan_average'],
+                                         self.modules_manager.selected_detectors_name))
+            if len(mismatches) > 0:
+                messagebox(text='The scan cannot be resumed:\n' + '\n'.join(mismatches))
+                res = False
         if res:
             # deactivate module controls using remote_control
             if hasattr(self.dashboard, 'remote_manager'):
                 remote_manager = getattr(self.dashboard, 'remote_manager')
                 remote_manager.activate_all(False)
 
-            new_scan = self.module_and_data_saver.get_last_node().attrs['scan_done'] # get_last_node
-            scan_node = self.module_and_data_saver.get_set_node(new=new_scan)
-            self.save_metadata(scan_node, 'scan_info')
+            if checkpoint is None:
+                new_scan = self.module_and_data_saver.get_last_node().attrs['scan_done'] # get_last_node
+                scan_node = self.module_and_data_saver.get_set_node(new=new_scan)
+                self.save_metadata(scan_node, 'scan_info')
+                self.save_checkpoint(scan_node)
+                start_indexes = (0, 0)
+            else:
+                scan_node = self.module_and_data_saver.get_set_node(new=False)
+                scan_node.attrs['scan_done'] = False
+                self._checkpoint = checkpoint
+                start_indexes = checkpoint.get_next_indexes()
 
             self._init_live()
+            self.scan_profiler = ScanProfiler(self.modules_manager.selected_detectors_name)
+            self._timings_saver = data_saving.DataEnlargeableSaver(self.h5saver, enl_axis_names=('step',))
+            self._ind_step = start_indexes[0] * self.scanner.n_scan_steps + start_indexes[1]
+            self._first_step_saved = False
+            self._swmr_ready = False
+            self._scan_node = scan_node
             for det in self.modules_manager.detectors:
-                det.module_and_data_saver = (
-                    module_saving.DetectorExtendedSaver(det, self.scanner.get_scan_shape()))
+                if self.scanner.scan_sub_type == 'Adaptive':
+                    det.module_and_data_saver = module_saving.DetectorEnlargeableSaver(
+                        det, enl_axis_names=[act.title for act in self.scanner.actuators],
+                        enl_axis_units=[act.units for act in self.scanner.actuators])
+                else:
+                    det.module_and_data_saver = (
+                        module_saving.DetectorExtendedSaver(det, self.scanner.get_scan_shape()))
             self.module_and_data_saver.h5saver = self.h5saver  # force the update as the h5saver ill also be set on each detectors
 
             # mandatory to deal with multithreads
@@ -869,7 +1036,7 @@ class DAQScan(QObject, ParameterManager):
             self.scan_thread = QThread()
 
             scan_acquisition = DAQScanAcquisition(self.settings, self.scanner, self.modules_manager,
-                                                  )
+                                                  start_indexes=start_indexes)
 
             if config['scan']['scan_in_thread']:
                 scan_acquisition.moveToThread(self.scan_thread)
@@ -882,13 +1049,52 @@ class DAQScan(QObject, ParameterManager):
 
             self.ui.set_action_enabled('ini_positions', False)
             self.ui.set_action_enabled('start', False)
+            self.ui.set_action_enabled('resume', False)
             self.ui.set_scan_done(False)
             if not self.settings['plot_options', 'plot_at_each_step']:
                 self.live_timer.start(self.settings['plot_options', 'refresh_live'])
+            self.scan_profiler.start()
             self.command_daq_signal.emit(utils.ThreadCommand('start_acquisition'))
             self.ui.set_permanent_status('Running acquisition')
             logger.info('Running acquisition')
 
+    def save_checkpoint(self, scan_node):
+        """Record the state of the scan in its scan group so that it can be resumed (see resume_scan)"""
+        self._checkpoint = None
+        if self.scanner.scan_sub_type == 'Adaptive':
+            return
+        try:
+            checkpoint = ScanCheckpoint.from_scan(self.scanner, self.settings['scan_options', 'scan_average'],
+                                                  self.modules_manager.selected_detectors_name)
+            checkpoint.save(scan_node)
+            self._checkpoint = checkpoint
+        except Exception as e:
+            logger.warning(f'The state of the scan could not be recorded, it will not be possible to resume it: '
+                           f'{str(e)}')
+
+    def resume_scan(self) -> bool:
+        """Resume the last scan of the current file (see Load File) after its last saved step
+
+        The scanner settings and the number of averages are set back from the checkpoint recorded in the
+        scan group. The scan is resumed only if the selected actuators and detectors are the same and if the
+        scan positions are identical.
+
+        Returns
+        -------
+        bool: True if the scan has been resumed
+        """
+        scan_node = self.module_and_data_saver.get_last_node()
+        checkpoint = None if scan_node is None else ScanCheckpoint.load(scan_node)
+        if checkpoint is None or checkpoint.is_done:
+            messagebox(text='There is no unfinished scan to resume in the current file')
+            return False
+        self.scanner.set_scan_from_settings(*checkpoint.get_scanner_parameters())
+        self.settings.child('scan_options', 'scan_average').setValue(checkpoint.n_average)
+        average_index, scan_index = checkpoint.get_next_indexes()
+        logger.info(f'Resuming the scan {scan_node.name} at step {scan_index + 1} of average {average_index + 1}')
+        self.start_scan(checkpoint)
+        return not self.ui.is_action_enabled('start')
+
     def _init_live(self):
         Naverage = self.settings['scan_options', 'scan_average']
         if Naverage > 1:
@@ -909,7 +1115,12 @@ class DAQScan(QObject, ParameterManager):
         self.h5temp.init_file(custom_naming=True, addhoc_file_path=addhoc_file_path)
         self.extended_saver: data_saving.DataToExportExtendedSaver =\
             data_saving.DataToExportExtendedSaver(self.h5temp, extended_shape=scan_shape)
+        self.enlargeable_saver: data_saving.DataToExportEnlargeableSaver = \
+            data_saving.DataToExportEnlargeableSaver(self.h5temp,
+                                                     enl_axis_names=[act.title for act in self.scanner.actuators],
+                                                     enl_axis_units=[act.units for act in self.scanner.actuators])
         self.live_plotter.h5saver = self.h5temp
+        self._nav_axes_saved = False
 
         self.prepare_viewers()
         QtWidgets.QApplication.processEvents()
@@ -930,6 +1141,10 @@ class DAQScan(QObject, ParameterManager):
         """
         self.ui.set_permanent_status('Stoping acquisition')
         self.command_daq_signal.emit(utils.ThreadCommand("stop_acquisition"))
+        try:
+            self.module_and_data_saver.flush()
+        except WriterError as e:
+            logger.error(f'Some data of the scan could not be saved: {str(e)}')
         scan_node = self.module_and_data_saver.get_last_node()
         scan_node.attrs['scan_done'] = True
 
@@ -944,6 +1159,7 @@ class DAQScan(QObject, ParameterManager):
 
         self.ui.set_action_enabled('ini_positions', True)
         self.ui.set_action_enabled('start', True)
+        self.ui.set_action_enabled('resume', True)
 
     def do_scan(self, start_scan=True):
         """Public method to start the scan programmatically"""
@@ -967,12 +1183,13 @@ class DAQScanAcquisition(QObject):
     status_sig = Signal(utils.ThreadCommand)
 
     def __init__(self, scan_settings: Parameter = None, scanner: Scanner = None,
-                 modules_manager: ModulesManager = None,):
+                 modules_manager: ModulesManager = None, start_indexes: Tuple[int, int] = (0, 0)):
 
         """
         DAQScanAcquisition deal with the acquisition part of daq_scan, that is transferring commands to modules,
         getting back data, saviong and letting know th UI about the scan status
 
+        start_indexes are the average index and the scan index of the first step (when resuming a scan)
         """
 
         super().__init__()
@@ -985,6 +1202,7 @@ class DAQScanAcquisition(QObject):
         self.Naverage = self.scan_settings['scan_options', 'scan_average']
         self.ind_average = 0
         self.ind_scan = 0
+        self.start_indexes = tuple(start_indexes)
 
         self.isadaptive = self.scanner.scan_sub_type == 'Adaptive'
 
@@ -996,6 +1214,7 @@ class DAQScanAcquisition(QObject):
         self.det_done_flag = False
 
         self.det_done_datas = data_mod.DataToExport('ScanData')
+        self._move_timings: Dict[str, float] = dict([])
 
         scan_shape = self.scanner.get_scan_shape()
         if self.Naverage > 1:
@@ -1034,45 +1253,39 @@ class DAQScanAcquisition(QObject):
 
     def start_acquisition(self):
         try:
-            #todo hoaw to apply newlayout to adaptive mode?
-
             self.modules_manager.connect_actuators()
             self.modules_manager.connect_detectors()
+            self.modules_manager.reset_wait_statistics()
 
             self.stop_scan_flag = False
 
-            Naxes = self.scanner.n_axes
-            scan_type = self.scanner.scan_type
-            self.navigation_axes = self.scanner.get_nav_axes()
             self.status_sig.emit(utils.ThreadCommand("Update_Status",
                                                      attribute="Acquisition has started"))
 
             self.timeout_scan_flag = False
-            for ind_average in range(self.Naverage):
+            for ind_average in range(self.start_indexes[0], self.Naverage):
                 self.ind_average = ind_average
-                self.ind_scan = -1
+                start_index = self.start_indexes[1] if ind_average == self.start_indexes[0] else 0
+                self.ind_scan = start_index - 1
+                scan_positions = self.scanner.iter_positions(start=start_index)  # positions generated by chunks
+                if self.scan_settings['scan_options', 'fly_scan'] and not self.isadaptive:
+                    self.fly_scan(start_index)
+                    if self.stop_scan_flag or self.timeout_scan_flag:
+                        break
+                    continue
+                if self.scan_settings['time_flow', 'pipelined'] and not self.isadaptive:
+                    self.pipelined_scan(scan_positions)
+                    if self.stop_scan_flag or self.timeout_scan_flag:
+                        break
+                    continue
+                if self.isadaptive:
+                    self.adaptive_scan()
+                    break
                 while True:
                     self.ind_scan += 1
-                    if not self.isadaptive:
-                        if self.ind_scan >= len(self.scanner.positions):
-                            break
-                        positions = self.scanner.positions_at(self.ind_scan)  # get positions
-                    else:
-                        pass
-                        #todo update for v4
-                        # positions = learner.ask(1)[0][-1]  # next point to probe
-                        # if self.scanner.scan_type == 'Tabular':  # translate normalized curvilinear position to real coordinates
-                        #     self.curvilinear = positions
-                        #     length = 0.
-                        #     for v in self.scanner.vectors:
-                        #         length += v.norm()
-                        #         if length >= self.curvilinear:
-                        #             vec = v
-                        #             frac_curvilinear = (self.curvilinear - (length - v.norm())) / v.norm()
-                        #             break
-                        #
-                        #     position = (vec.vectorize() * frac_curvilinear).translate_to(vec.p1()).p2()
-                        #     positions = [position.x(), position.y()]
+                    positions = next(scan_positions, None)  # get positions
+                    if positions is None:
+                        break
 
                     self.status_sig.emit(
                         utils.ThreadCommand("Update_scan_index",
@@ -1083,31 +1296,19 @@ class DAQScanAcquisition(QObject):
 
                     #move motors of modules and wait for move completion
                     positions = self.modules_manager.order_positions(self.modules_manager.move_actuators(positions))
+                    self._move_timings = self.modules_manager.move_timings
 
                     QThread.msleep(self.scan_settings['time_flow', 'wait_time_between'])
 
                     #grab datas and wait for grab completion
                     self.det_done(self.modules_manager.grab_datas(positions=positions), positions)
 
-                    if self.isadaptive:
-                        #todo update for v4
-                        # det_channel = self.modules_manager.get_selected_probed_data()
-                        # det, channel = det_channel[0].split('/')
-                        # if self.scanner.scan_type == 'Tabular':
-                        #     self.curvilinear_array.append(np.array([self.curvilinear]))
-                        #     new_positions = self.curvilinear
-                        # elif self.scanner.scan_type == 'Scan1D':
-                        #     new_positions = positions[0]
-                        # else:
-                        #     new_positions = positions[:]
-                        # learner.tell(new_positions, self.modules_manager.det_done_datas[det]['data0D'][channel]['data'])
-                        pass
-
                     # daq_scan wait time
                     QThread.msleep(self.scan_settings.child('time_flow', 'wait_time').value())
 
             self.modules_manager.connect_actuators(False)
             self.modules_manager.connect_detectors(False)
+            self.log_wait_statistics()
 
             self.status_sig.emit(utils.ThreadCommand("Update_Status",
                                                      attribute="Acquisition has finished"))
@@ -1116,16 +1317,187 @@ class DAQScanAcquisition(QObject):
         except Exception as e:
             logger.exception(str(e))
 
-    def det_done(self, det_done_datas: data_mod.DataToExport, positions):
+    def log_wait_statistics(self):
+        """Log the time spent waiting for the actuators and detectors during the scan and the number of
+        actuator moves that have been skipped"""
+        stats = self.modules_manager.get_wait_statistics()
+        logger.info('Waits during the scan: ' + ', '.join(
+            [f'{kind}: {stat["n"]} waits, mean {1000 * stat["mean"]:.1f} ms, max {1000 * stat["max"]:.1f} ms, '
+             f'total {stat["total"]:.2f} s' for kind, stat in stats.items() if stat['n'] > 0]))
+        logger.info(f'Actuator moves saved during the scan: {self.modules_manager.n_moves_saved}')
+
+    def adaptive_scan(self):
+        """Loop over positions chosen by the learner of the adaptive scanner
+
+        The learner is asked batches of positions, the value of the first selected probed 0D data
+        at each of them being told back to the learner. The scan stops after the maximum number of
+        steps of the scanner or when the loss of the learner falls below its loss goal.
+        """
+        learner = self.scanner.get_learner()
+        feedback_name = self.modules_manager.get_selected_probed_data('0D')[0]
+        batch_size = self.scanner.scanner.batch_size
+        loss_goal = self.scanner.scanner.loss_goal
+        n_steps = self.scanner.n_steps
+        while self.ind_scan + 1 < n_steps:
+            if loss_goal > 0 and learner.loss() < loss_goal:
+                break
+            for point in learner.ask(min(batch_size, n_steps - self.ind_scan - 1)):
+                self.ind_scan += 1
+                self.status_sig.emit(
+                    utils.ThreadCommand("Update_scan_index",
+                                        attribute=[self.ind_scan, self.ind_average]))
+
+                positions = self.modules_manager.order_positions(
+                    self.modules_manager.move_actuators(self.scanner.positions_to_dte(point)))
+                self._move_timings = self.modules_manager.move_timings
+                if self.stop_scan_flag or self.timeout_scan_flag:
+                    return
+
+                QThread.msleep(self.scan_settings['time_flow', 'wait_time_between'])
+
+                det_done_datas = self.modules_manager.grab_datas(positions=positions)
+                self.det_done(det_done_datas, positions, axis_values=point)
+                feedback = det_done_datas.get_data_from_full_name(feedback_name)
+                if feedback is None:
+                    txt = f'Adaptive scan stopped: no {feedback_name} data has been received'
+                    logger.error(txt)
+                    self.status_sig.emit(utils.ThreadCommand("Update_Status", attribute=txt))
+                    self.stop_scan_flag = True
+                    return
+                learner.tell(point, float(np.mean(feedback.data[0])))
+                if self.stop_scan_flag or self.timeout_scan_flag:
+                    return
+
+                QThread.msleep(self.scan_settings.child('time_flow', 'wait_time').value())
+
+    def pipelined_scan(self, scan_positions: Iterator[data_mod.DataToExport]):
+        """Loop over the scan positions moving the actuators to the next ones as soon as the detectors
+        have finished their integration
+
+        The data of a step is then read out, saved and plotted while the actuators are moving. The data
+        is still saved at the indexes of the step it has been acquired at, as det_done is called for
+        each step, in order, before triggering the grab of the next one.
+
+        Parameters
+        ----------
+        scan_positions: Iterator of DataToExport
+            The positions of the actuators at each step of the scan
+        """
+        positions = next(scan_positions, None)
+        if positions is None or not self.modules_manager.start_move(positions):
+            return
+        while True:
+            self.ind_scan += 1
+            self.status_sig.emit(
+                utils.ThreadCommand("Update_scan_index",
+                                    attribute=[self.ind_scan, self.ind_average]))
+
+            positions = self.modules_manager.order_positions(self.modules_manager.wait_move_done())
+            self._move_timings = self.modules_manager.move_timings
+            if self.stop_scan_flag or self.timeout_scan_flag:
+                break
+
+            QThread.msleep(self.scan_settings['time_flow', 'wait_time_between'])
+
+            self.modules_manager.start_grab(positions=positions)
+            next_positions = next(scan_positions, None)
+            if next_positions is not None and self.modules_manager.wait_integration_done():
+                self.modules_manager.start_move(next_positions)
+
+            # wait for the data of the current step while moving to the next one
+            self.det_done(self.modules_manager.wait_det_done(), positions)
+
+            if next_positions is None or self.stop_scan_flag or self.timeout_scan_flag:
+                break
+
+            QThread.msleep(self.scan_settings.child('time_flow', 'wait_time').value())
+
+    def fly_scan(self, start_index: int = 0):
+        """Loop over the lines of the scan moving continuously the last actuator along each of them
+
+        Before each line, all actuators are moved to its first step. The last actuator is then sent
+        to the last step of the line while the detectors grab back to back. Each frame gets the
+        position of the actuator at its timestamp, interpolated from the timestamped readbacks of
+        the actuator, and the frames are averaged onto the steps of the line before being saved
+        at the indexes of these steps.
+
+        Parameters
+        ----------
+        start_index: int
+            the scan index to start at, the whole line including it being scanned again
         """
+        fast_actuator = self.modules_manager.actuators[-1]
+        for line_start, line in self.scanner.iter_lines():
+            if line_start + len(line) <= start_index:
+                continue
+            if self.stop_scan_flag or self.timeout_scan_flag:
+                break
+            if len(line) > 2 and not (np.all(np.diff(line[:, -1]) > 0) or np.all(np.diff(line[:, -1]) < 0)):
+                logger.error('Fly scans are only possible along lines of monotonic positions')
+                self.stop_scan_flag = True
+                break
+            self.modules_manager.move_actuators(self.scanner.positions_at(line_start))
+            QThread.msleep(self.scan_settings['time_flow', 'wait_time_between'])
+
+            recorder = FlyScanRecorder(fast_actuator.title)
+            start_position = self.modules_manager.move_done_positions.get_data_from_name(fast_actuator.title)
+            if start_position is not None:
+                recorder.add_readback(start_position)
+            fast_actuator.current_value_signal.connect(recorder.add_readback)
+            fast_actuator.move_done_signal.connect(recorder.add_readback)
+            try:
+                if not self.modules_manager.start_move(self.scanner.positions_at(line_start + len(line) - 1)):
+                    break
+                move_start = time.perf_counter()
+                while True:
+                    self.modules_manager.grab_datas()
+                    recorder.add_frame({det.title: det._data_to_save_export
+                                        for det in self.modules_manager.detectors})
+                    if (self.modules_manager.move_done_flag or self.stop_scan_flag or
+                            self.timeout_scan_flag):
+                        break
+                    if time.perf_counter() - move_start > self.modules_manager.actuator_timeout / 1000:
+                        logger.error('Timeout Fired during the fly move of the actuator')
+                        self.modules_manager.timeout_signal.emit(True)
+                        break
+            finally:
+                fast_actuator.current_value_signal.disconnect(recorder.add_readback)
+                fast_actuator.move_done_signal.disconnect(recorder.add_readback)
+            self._move_timings = self.modules_manager.move_timings
+
+            for ind_step, detectors_data in enumerate(recorder.get_binned_frames(line[:, -1])):
+                self.ind_scan = line_start + ind_step
+                self.status_sig.emit(
+                    utils.ThreadCommand("Update_scan_index",
+                                        attribute=[self.ind_scan, self.ind_average]))
+                det_done_datas = data_mod.DataToExport('FlyScan', data=[dwa for dte in detectors_data.values()
+                                                                        for dwa in dte])
+                self.det_done(det_done_datas, self.scanner.positions_at(self.ind_scan),
+                              detectors_data=detectors_data)
+
+            QThread.msleep(self.scan_settings.child('time_flow', 'wait_time').value())
+
+    def det_done(self, det_done_datas: data_mod.DataToExport, positions,
+                 detectors_data: Dict[str, data_mod.DataToExport] = None, axis_values: np.ndarray = None):
+        """Save the data of the current step and send the data to be plotted live
 
+        Parameters
+        ----------
+        det_done_datas: DataToExport
+            all the data of the detectors at this step
+        positions: DataToExport
+            the positions of the actuators at this step
+        detectors_data: dict of DataToExport
+            the data to save for each detector, if None, the last data of each detector is saved
+        axis_values: np.ndarray
+            the actuators positions of this step for adaptive scans, whose data is saved as spread data
         """
         try:
             indexes = self.scanner.get_indexes_from_scan_index(self.ind_scan)
             if self.Naverage > 1:
                 indexes = [self.ind_average] + list(indexes)
             indexes = tuple(indexes)
-            if self.ind_scan == 0:
+            if self.ind_scan == 0 and axis_values is None:
                 nav_axes = self.scanner.get_nav_axes()
                 if self.Naverage > 1:
                     for nav_axis in nav_axes:
@@ -1134,14 +1506,12 @@ class DAQScanAcquisition(QObject):
                                                   index=0))
                 self.status_sig.emit(utils.ThreadCommand("add_nav_axes", nav_axes))
 
-            self.status_sig.emit(
-                utils.ThreadCommand("add_data",
-                                    dict(indexes=indexes, distribution=self.scanner.distribution)))
-
-            #todo related to adaptive (solution lies along the Enlargeable data saver)
-            if self.isadaptive:
-                for ind_ax, nav_axis in enumerate(self.navigation_axes):
-                    nav_axis.append(np.array(positions[ind_ax]))
+            add_data_kwargs = dict(indexes=indexes, distribution=self.scanner.distribution)
+            if detectors_data is not None:
+                add_data_kwargs['detectors_data'] = detectors_data
+            if axis_values is not None:
+                add_data_kwargs['axis_values'] = list(axis_values)
+            self.status_sig.emit(utils.ThreadCommand("add_data", add_data_kwargs))
 
             self.det_done_flag = True
 
@@ -1150,7 +1520,10 @@ class DAQScanAcquisition(QObject):
             data_temp = det_done_datas.get_data_from_full_names(full_names, deepcopy=False)
             data_temp = data_temp.get_data_with_naxes_lower_than(2-len(indexes))  # maximum Data2D included nav indexes
 
-            self.scan_data_tmp.emit(ScanDataTemp(self.ind_scan, indexes, data_temp))
+            self.scan_data_tmp.emit(ScanDataTemp(self.ind_scan, indexes, data_temp,
+                                                 timings=dict(self._move_timings,
+                                                              **self.modules_manager.grab_timings),
+                                                 positions=axis_values))
 
         except Exception as e:
             logger.exception(str(e))
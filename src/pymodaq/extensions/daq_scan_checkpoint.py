@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Checkpoint of the DAQ_Scan scans: the state of a scan (scanner settings, selected modules, number of
+steps and averages) is recorded in the attributes of its scan group when it starts, together with
+the indexes of the last saved step updated at each step, so that an aborted or crashed scan can be
+resumed at its next step.
+"""
+import hashlib
+from typing import List, Tuple, TYPE_CHECKING
+
+from pymodaq.utils.parameter import ioxml, Parameter
+from pymodaq.utils.h5modules.backends import GROUP
+
+if TYPE_CHECKING:
+    from pymodaq.utils.scanner.scanner import Scanner
+
+
+def get_positions_digest(scanner: 'Scanner') -> str:
+    """Digest of the positions of all the steps of the scan (in their scan order)"""
+    digest = hashlib.sha1()
+    for positions in scanner.scanner.iter_positions():
+        digest.update(positions.astype(float).tobytes())
+    return digest.hexdigest()
+
+
+class ScanCheckpoint:
+    """State of a scan recorded in its scan group
+
+    Parameters
+    ----------
+    scanner_settings: str
+        the settings of the Scanner as a XML string
+    scanner_sub_settings: str
+        the settings of the ScannerBase implementation as a XML string
+    n_steps: int
+        the number of steps of the scan
+    n_average: int
+        the number of averaged scans
+    positions_digest: str
+        see get_positions_digest
+    actuators: list of str
+        the titles of the actuators of the scan
+    detectors: list of str
+        the titles of the detectors of the scan
+    scan_index: int
+        the scan index of the last saved step (-1 if none)
+    average_index: int
+        the average index of the last saved step
+    """
+    attr_names = ('scanner_settings', 'scanner_sub_settings', 'n_steps', 'n_average',
+                  'positions_digest', 'actuators', 'detectors')
+
+    def __init__(self, scanner_settings: str, scanner_sub_settings: str, n_steps: int, n_average: int,
+                 positions_digest: str, actuators: List[str], detectors: List[str],
+                 scan_index: int = -1, average_index: int = 0):
+        self.scanner_settings = scanner_settings
+        self.scanner_sub_settings = scanner_sub_settings
+        self.n_steps = n_steps
+        self.n_average = n_average
+        self.positions_digest = positions_digest
+        self.actuators = list(actuators)
+        self.detectors = list(detectors)
+        self.scan_index = scan_index
+        self.average_index = average_index
+
+    @classmethod
+    def from_scan(cls, scanner: 'Scanner', n_average: int, detectors: List[str]) -> 'ScanCheckpoint':
+        """Get the checkpoint of a scan whose positions have been set and not started yet"""
+        return cls(ioxml.parameter_to_xml_string(scanner.settings).decode(),
+                   ioxml.parameter_to_xml_string(scanner.scanner.settings).decode(),
+                   scanner.n_scan_steps, n_average, get_positions_digest(scanner),
+                   [act.title for act in scanner.actuators], detectors)
+
+    @classmethod
+    def load(cls, scan_node: GROUP) -> 'ScanCheckpoint':
+        """Load the checkpoint of a scan from its scan group, None if there is none"""
+        if 'checkpoint_positions_digest' not in scan_node.attrs.attrs_name:
+            return None
+        return cls(*[scan_node.attrs[f'checkpoint_{name}'] for name in cls.attr_names],
+                   scan_index=scan_node.attrs['checkpoint_scan_index'],
+                   average_index=scan_node.attrs['checkpoint_average_index'])
+
+    def save(self, scan_node: GROUP):
+        """Record the checkpoint in the attributes of the scan group"""
+        attrs = {f'checkpoint_{name}': getattr(self, name) for name in self.attr_names}
+        attrs.update(checkpoint_scan_index=self.scan_index, checkpoint_average_index=self.average_index)
+        scan_node.attrs.update(attrs)
+
+    @staticmethod
+    def save_progress(scan_node: GROUP, scan_index: int, average_index: int):
+        """Record the indexes of the last saved step of the scan"""
+        scan_node.attrs.update(dict(checkpoint_scan_index=scan_index, checkpoint_average_index=average_index))
+
+    def get_scanner_parameters(self) -> Tuple[Parameter, Parameter]:
+        """The recorded settings of the Scanner and of its ScannerBase implementation, see
+        Scanner.set_scan_from_settings"""
+        return (ioxml.XML_string_to_pobject(self.scanner_settings),
+                ioxml.XML_string_to_pobject(self.scanner_sub_settings))
+
+    @property
+    def is_done(self) -> bool:
+        return self.scan_index >= self.n_steps - 1 and self.average_index >= self.n_average - 1
+
+    def get_next_indexes(self) -> Tuple[int, int]:
+        """The average index and the scan index of the step to resume the scan at"""
+        if self.scan_index >= self.n_steps - 1:
+            return self.average_index + 1, 0
+        return self.average_index, self.scan_index + 1
+
+    def get_mismatches(self, other: 'ScanCheckpoint') -> List[str]:
+        """Describe the differences between the scan of this checkpoint and the one of another checkpoint
+
+        Returns
+        -------
+        list of str: empty if the scan of the other checkpoint can resume the scan of this one
+        """
+        mismatches = []
+        for name, description in (('n_steps', 'number of steps'), ('n_average', 'number of averages'),
+                                  ('actuators', 'actuators'), ('detectors', 'detectors')):
+            if getattr(self, name) != getattr(other, name):
+                mismatches.append(f'The {description} differ: {getattr(other, name)} instead of '
+                                  f'{getattr(self, name)}')
+        if len(mismatches) == 0 and self.positions_digest != other.positions_digest:
+            mismatches.append('The scan positions differ')
+        return mismatches
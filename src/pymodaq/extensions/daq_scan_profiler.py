@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Per step timing of DAQ_Scan: when the moves and grabs are issued and done, when each detector
+returned its data and when the data has been saved and plotted.
+"""
+from time import perf_counter
+from typing import Dict, List
+
+import numpy as np
+
+from pymodaq.utils.data import DataRaw
+from pymodaq.utils.plotting.gant_chart import GanttChart
+
+
+class ScanProfiler:
+    """Collect the timings of each step of a scan
+
+    Timings are given as time.perf_counter values and stored in seconds relative to the start
+    of the scan (nan if the event did not happen at this step)
+
+    Parameters
+    ----------
+    detector_names: list of str
+        the titles of the detectors of the scan
+    """
+
+    def __init__(self, detector_names: List[str] = ()):
+        self.detector_names = list(detector_names)
+        self.event_names = (['move_issued', 'move_done', 'grab_issued'] +
+                            [f'det_done {name}' for name in self.detector_names] +
+                            ['saved', 'plotted'])
+        self.start_time = perf_counter()
+        self.timings: List[np.ndarray] = []
+
+    def start(self):
+        self.start_time = perf_counter()
+        self.timings = []
+
+    def add_step(self, timings: Dict[str, float]) -> np.ndarray:
+        """Add the timings of a step
+
+        Parameters
+        ----------
+        timings: dict
+            perf_counter values with the event names as keys, missing events being ignored
+
+        Returns
+        -------
+        np.ndarray: the timings of the step in seconds from the start of the scan
+        """
+        step = np.array([timings.get(name, np.nan) for name in self.event_names], dtype=float)
+        step -= self.start_time
+        self.timings.append(step)
+        return step
+
+    def to_dwa(self, step: np.ndarray) -> DataRaw:
+        """Convert the timings of a step into a DataRaw (one channel per event) to be saved"""
+        return DataRaw('ScanTimings', data=[np.array([value]) for value in step],
+                       labels=self.event_names, units='s', dim='Data0D')
+
+    def get_phases(self) -> List[tuple]:
+        """The successive phases of each step: moving, settling, each detector grab, saving and
+        plotting
+
+        Returns
+        -------
+        list of tuple: (phase name, phase index, step index, start time, stop time)
+        """
+        phase_events = [('move', 'move_issued', 'move_done'),
+                        ('wait', 'move_done', 'grab_issued')]
+        phase_events += [(f'grab {name}', 'grab_issued', f'det_done {name}')
+                         for name in self.detector_names]
+        phases = []
+        for ind_step, step in enumerate(self.timings):
+            step_dict = dict(zip(self.event_names, step))
+            det_done_times = np.array([step_dict[f'det_done {name}'] for name in self.detector_names])
+            det_done = np.nan if np.all(np.isnan(det_done_times)) else np.nanmax(det_done_times)
+            step_phases = [(name, step_dict[start], step_dict[stop]) for name, start, stop in phase_events]
+            step_phases += [('save', det_done, step_dict['saved']),
+                            ('plot', step_dict['saved'], step_dict['plotted'])]
+            for ind_phase, (name, start, stop) in enumerate(step_phases):
+                if not (np.isnan(start) or np.isnan(stop)):
+                    phases.append((name, ind_phase, ind_step, start, stop))
+        return phases
+
+    def get_mean_durations(self) -> Dict[str, float]:
+        """The mean duration in seconds of each phase over all the steps"""
+        durations: Dict[str, List[float]] = dict([])
+        for name, _, _, start, stop in self.get_phases():
+            durations.setdefault(name, []).append(stop - start)
+        return {name: float(np.mean(values)) for name, values in durations.items()}
+
+    def plot_gantt(self, n_steps: int = 10) -> GanttChart:
+        """Display the phases of the last steps of the scan on a Gantt chart, one row per phase
+
+        Parameters
+        ----------
+        n_steps: int
+            the number of steps to display
+
+        Returns
+        -------
+        GanttChart
+        """
+        chart = GanttChart(date_axis=False)
+        first_step = max(0, len(self.timings) - n_steps)
+        phase_names = dict([])
+        for name, ind_phase, ind_step, start, stop in self.get_phases():
+            if ind_step >= first_step:
+                phase_names[ind_phase] = name
+                chart.add_task(dict(name=f'{ind_step}', idnumber=ind_phase,
+                                    task_type=ind_phase % 12 + 1, time_start=start, time_end=stop))
+        chart.set_row_labels(phase_names)
+        return chart
@@ -48,6 +48,8 @@ class DAQScanUI(CustomApp, ViewerDispatcher):
         self.add_action('start', 'Start Scan', 'run2', "Start the scan", menu=self.action_menu)
         self.add_action('start_batch', 'Start ScanBatches', 'run_all', "Start the batch of scans", menu=self.action_menu)
         self.add_action('stop', 'Stop Scan', 'stop', "Stop the scan", menu=self.action_menu)
+        self.add_action('resume', 'Resume Scan', 'run2', "Resume the last unfinished scan of the current file",
+                        menu=self.action_menu, auto_toolbar=False)
         self.add_action('move_at', 'Move at doubleClicked', 'move_contour',
                         "Move to positions where you double clicked", checkable=True, menu=self.action_menu)
         self.add_action('log', 'Show Log file', 'information2', menu=self.file_menu)
@@ -64,6 +66,7 @@ class DAQScanUI(CustomApp, ViewerDispatcher):
     def enable_start_stop(self, enable=True):
         """If True enable main buttons to launch/stop scan"""
         self.set_action_enabled('start', enable)
+        self.set_action_enabled('resume', enable)
         self.set_action_enabled('stop', enable)
 
     def connect_things(self):
@@ -72,6 +75,7 @@ class DAQScanUI(CustomApp, ViewerDispatcher):
         self.connect_action('start', lambda: self.command_sig.emit(ThreadCommand('start')))
         self.connect_action('start_batch', lambda: self.command_sig.emit(ThreadCommand('start_batch')))
         self.connect_action('stop', lambda: self.command_sig.emit(ThreadCommand('stop')))
+        self.connect_action('resume', lambda: self.command_sig.emit(ThreadCommand('resume')))
         self.connect_action('move_at', lambda: self.command_sig.emit(ThreadCommand('move_at')))
         self.connect_action('log', lambda: self.command_sig.emit(ThreadCommand('show_log', )))
 
@@ -174,7 +178,10 @@ class DAQScanUI(CustomApp, ViewerDispatcher):
         self._scan_done_LED.set_as_false()
         self._scan_done_LED.clickable = False
         self._scan_done_LED.setToolTip('Scan done state')
+        self._live_refresh_label = QtWidgets.QLabel('')
+        self._live_refresh_label.setToolTip('Time to refresh the live plots: last (mean)')
         self._statusbar.addPermanentWidget(self._status_message_label)
+        self._statusbar.addPermanentWidget(self._live_refresh_label)
 
         self._statusbar.addPermanentWidget(self._n_scan_steps_sb)
         self._statusbar.addPermanentWidget(self._indice_scan_sb)
@@ -208,6 +215,10 @@ class DAQScanUI(CustomApp, ViewerDispatcher):
     def set_scan_done(self, done=True):
         self._scan_done_LED.set_as(done)
 
+    def set_live_refresh_time(self, refresh_time: float, mean_refresh_time: float):
+        """Display the durations (in ms) of the last and mean refresh of the live plots"""
+        self._live_refresh_label.setText(f'Live: {refresh_time:.0f} ms ({mean_refresh_time:.0f} ms)')
+
     def update_viewers(self, viewers_type: List[ViewersEnum], viewers_name: List[str] = None, force=False):
         super().update_viewers(viewers_type, viewers_name, force)
         self.command_sig.emit(ThreadCommand('viewers_changed', attribute=dict(viewer_types=self.viewer_types,
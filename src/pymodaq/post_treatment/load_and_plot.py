@@ -6,11 +6,13 @@ Created the 22/01/2023
 """
 import os
 import sys
-from typing import List, Union, Callable, Iterable, Dict
+from time import perf_counter
+from typing import List, Union, Callable, Iterable, Dict, Tuple
 
+import numpy as np
 from qtpy import QtWidgets, QtCore
 
-from pymodaq.utils.data import DataToExport, DataFromPlugins, DataDim, enum_checker
+from pymodaq.utils.data import DataToExport, DataFromPlugins, DataDim, DataDistribution, enum_checker
 from pymodaq.utils.h5modules.data_saving import DataLoader
 from pymodaq.utils.h5modules.saving import H5Saver
 from pymodaq.utils.plotting.data_viewers.viewer import ViewerBase, ViewerDispatcher
@@ -34,7 +36,11 @@ class LoaderPlotter:
         self._viewer_types: List[ViewersEnum] = None
         self._h5saver: H5Saver = None
         self._data: DataToExport = None
+        self._live_data: DataToExport = None
         self.dataloader: DataLoader = None
+        self.refresh_time = 0.
+        self._total_refresh_time = 0.
+        self._n_refresh = 0
 
     @property
     def viewers(self) -> List[ViewerBase]:
@@ -59,15 +65,65 @@ class LoaderPlotter:
     def h5saver(self, h5saver: H5Saver):
         self._h5saver = h5saver
         self.dataloader = DataLoader(h5saver)
+        self.reset_live_data()
 
     @property
     def data(self) -> DataToExport:
         return self._data
 
+    @property
+    def mean_refresh_time(self) -> float:
+        """Mean duration in ms of the load_plot_data calls since the last reset_live_data"""
+        return self._total_refresh_time / self._n_refresh if self._n_refresh != 0 else 0.
+
+    def reset_live_data(self):
+        """Clear the in-memory mirror of the h5 file data and the refresh time metrics"""
+        self._live_data = None
+        self.refresh_time = 0.
+        self._total_refresh_time = 0.
+        self._n_refresh = 0
+
+    def update_live_data(self, indexes: Tuple[int], dte: DataToExport):
+        """Update the in-memory mirror of the h5 file data with data just written in the file
+
+        The first call loads the whole file content, then only the given data are copied at the
+        given indexes of the mirrored arrays (as done by a DataToExportExtendedSaver), avoiding
+        to reload the whole file at each step
+
+        Parameters
+        ----------
+        indexes: Tuple[int]
+            the indexes in the extended arrays where the data have been written
+        dte: DataToExport
+            the data written in the file
+        """
+        if self._live_data is None:
+            self._live_data = DataToExport('All')
+            self.dataloader.load_all('/', self._live_data)
+            return
+        if isinstance(indexes, int):
+            indexes = (indexes,)
+        for dwa in dte:
+            live_dwa = self._live_data.get_data_from_full_name(dwa.get_full_name())
+            if live_dwa is None or len(live_dwa) != len(dwa):  # the file content has changed
+                self._live_data = None
+                self.update_live_data(indexes, dte)
+                return
+            for ind, array in enumerate(dwa.data):
+                live_array = live_dwa.data[ind]
+                live_array[tuple(indexes)] = np.reshape(array, np.shape(live_array[tuple(indexes)]))
+
+    def _copy_live_data(self) -> DataToExport:
+        """Get new DataWithAxes objects sharing the arrays of the live data, so that the processing
+        done in load_data does not alter the live data"""
+        return DataToExport('All', data=[dwa.deepcopy_with_new_data(list(dwa.data), source=dwa.source,
+                                                                    keep_dim=True)
+                                         for dwa in self._live_data])
+
     def load_data(self, filter_dims: List[Union[DataDim, str]] = None,
                   filter_full_names: List[str] = None, remove_navigation: bool = True,
                   group_0D=False, average_axis: int=None, average_index: int = 0,
-                  last_step=False):
+                  last_step=False, live_data=False):
         """Load Data from the h5 node of the dataloader and apply some filtering/manipulation before
         plotting
 
@@ -89,14 +145,20 @@ class LoaderPlotter:
             which step in the averaging process are we in.
         last_step: bool
             tells if this is the very last step of the (averaged) scan
+        live_data: bool
+            if True and the live data have been initialized (see update_live_data), use them
+            instead of reading the h5 file
 
         Returns
         -------
         DataToExport
         """
 
-        self._data = DataToExport('All')
-        self.dataloader.load_all('/', self._data)
+        if live_data and self._live_data is not None:
+            self._data = self._copy_live_data()
+        else:
+            self._data = DataToExport('All')
+            self.dataloader.load_all('/', self._data)
 
         if average_axis is not None:
             self.average_axis(average_axis, average_index, last_step=last_step)
@@ -149,9 +211,12 @@ class LoaderPlotter:
         """Make the navigation axes as signal axes
 
         transforms DataND into Data1D or Data2D or error... depending the exact shape of the data
-        and the number of navigation axes
+        and the number of navigation axes. Spread data (from adaptive scans for instance) is kept as
+        is to be displayed on a ViewerND
         """
         for data in self._data:
+            if data.distribution == DataDistribution['spread']:
+                continue
             data.nav_indexes = ()
             data.transpose()  # because usual ND data should be plotted here as 2D with the nav axes as the minor
             # (horizontal)
@@ -174,6 +239,7 @@ class LoaderPlotter:
                                      dim='DataND',
                                      origin=self.grouped_data0D_fullname.split('/')[0],
                                      axes=dwa.axes, nav_indexes=dwa.nav_indexes,
+                                     distribution=dwa.distribution,
                                      )
             self._data.append(data0D)
 
@@ -185,6 +251,7 @@ class LoaderPlotter:
         load_data
         """
 
+        start = perf_counter()
         target_at = kwargs.pop('target_at') if 'target_at' in kwargs else None
         last_step = kwargs.pop('last_step') if 'last_step' in kwargs else False
         crosshair_at = kwargs.pop('crosshair_at') if 'crosshair_at' in kwargs else None
@@ -198,6 +265,9 @@ class LoaderPlotter:
             self.load_data(**kwargs)
             self.show_data(target_at=target_at,
                            crosshair_at=crosshair_at)
+        self.refresh_time = (perf_counter() - start) * 1000
+        self._total_refresh_time += self.refresh_time
+        self._n_refresh += 1
 
     def show_data(self, **kwargs):
         """Send data to their dedicated viewers
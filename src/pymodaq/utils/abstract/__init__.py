@@ -35,7 +35,8 @@ class ABCMeta(NativeABCMeta):
         abstract_attributes = {
             name
             for name in dir(instance)
-            if getattr(getattr(instance, name), '__is_abstract_attribute__', False)
+            if not isinstance(getattr(cls, name, None), property)  # no need to evaluate properties
+            and getattr(getattr(instance, name), '__is_abstract_attribute__', False)
         }
         if abstract_attributes:
             raise NotImplementedError(
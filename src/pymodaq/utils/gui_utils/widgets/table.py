@@ -85,9 +85,10 @@ class TableModel(QtCore.QAbstractTableModel):
             self.remove_row(0)
 
     def set_data_all(self, data):
-        self.clear()
-        for row in data:
-            self.insert_data(self.rowCount(self.index(-1, -1)), [float(d) for d in row])
+        self.beginResetModel()
+        self._data = np.asarray(data, dtype=float).tolist()
+        self._checked = [False for _ in range(len(self._data))]
+        self.endResetModel()
 
     def data(self, index, role):
         if index.isValid():
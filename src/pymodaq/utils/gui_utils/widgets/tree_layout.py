@@ -8,36 +8,49 @@ class TreeLayout(QObject):
     qtpy class object based on QtreeWidget
     The function populate_tree has to be used in order to populate the tree with structure as nested lists of dicts
 
+    If a model is given, the tree is a QTreeView displaying it (populate_tree cannot be used), the
+    clicked signals then emit QModelIndex objects and the node path is the UserRole data of the
+    current index
+
     """
     status_sig = Signal(str)
     item_clicked_sig = Signal(object)
     item_double_clicked_sig = Signal(object)
     
-    def __init__(self, parent=None, col_counts=1, labels=None):
+    def __init__(self, parent=None, col_counts=1, labels=None,
+                 model: QtCore.QAbstractItemModel = None):
         
         super().__init__()
 
         if parent is None:
             parent = QtWidgets.QWidget()
         self.parent = parent
+        self._model = model
 
         self.setupUi()
 
-        self.tree.setColumnCount(col_counts)
-        if labels is not None:
-            self.tree.setHeaderLabels(labels)
-
         self.open_tree_pb.clicked.connect(self.expand_all)
         self.close_tree_pb.clicked.connect(self.collapse_all)
         self.open_tree_selected_pb.clicked.connect(self.open_tree_selection)
-        
-        self.tree.itemClicked.connect(self.item_clicked_sig.emit)
-        self.tree.itemDoubleClicked.connect(self.item_double_clicked_sig.emit)
+
+        if model is None:
+            self.tree.setColumnCount(col_counts)
+            if labels is not None:
+                self.tree.setHeaderLabels(labels)
+
+            self.tree.itemClicked.connect(self.item_clicked_sig.emit)
+            self.tree.itemDoubleClicked.connect(self.item_double_clicked_sig.emit)
+        else:
+            self.tree.setModel(model)
+            self.tree.clicked.connect(self.item_clicked_sig.emit)
+            self.tree.doubleClicked.connect(self.item_double_clicked_sig.emit)
 
     def _current_text(self, col_index: int = 2):
         return self.tree.currentItem().text(col_index)
 
     def current_node_path(self):
+        if self._model is not None:
+            return self.tree.currentIndex().data(QtCore.Qt.UserRole)
         return self._current_text(2)
 
     def expand_all(self):
@@ -54,7 +67,7 @@ class TreeLayout(QObject):
         vlayout = QtWidgets.QVBoxLayout()
         hlayout = QtWidgets.QHBoxLayout()
 
-        self.tree = CustomTree()
+        self.tree = CustomTree() if self._model is None else CustomTreeView()
         vlayout.addWidget(self.tree)
 
         iconopen = QtGui.QIcon()
@@ -158,6 +171,13 @@ class CustomTree(QtWidgets.QTreeWidget):
         self.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
 
 
+class CustomTreeView(QtWidgets.QTreeView):
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
+
+
 if __name__ == '__main__':
 
 
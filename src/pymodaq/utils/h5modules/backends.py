@@ -4,10 +4,17 @@ Created the 15/11/2022
 
 @author: Sebastien Weber
 """
+import os
 import numpy as np
+import bisect
 import importlib
 import pickle
-from typing import Dict
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Tuple, Iterable, Union, List
 
 from pymodaq.utils.logger import set_logger, get_module_name
 from pymodaq.utils.config import Config
@@ -35,6 +42,10 @@ is_h5py = True
 try:
     import h5py
     backends_available.append('h5py')
+    # used to write the (json) string attributes with the low level API, see write_attrs
+    _H5PY_STR_DTYPE = h5py.string_dtype()
+    _H5PY_STR_TYPE = h5py.h5t.py_create(_H5PY_STR_DTYPE, logical=True)
+    _H5PY_SCALAR_SPACE = h5py.h5s.create(h5py.h5s.SCALAR)
 except Exception as e:                              # pragma: no cover
     logger.warning(str(e))
     is_h5py = False
@@ -48,9 +59,84 @@ except Exception as e:                              # pragma: no cover
     logger.warning(str(e))
     is_h5pyd = False
 
+is_zarr = True
+# optional, chunked directory store on the local filesystem (no global file lock, completed chunks
+# readable by other processes while the data is being written)
+try:
+    import zarr
+    import numcodecs
+    backends_available.append('zarr')
+except Exception as e:                              # pragma: no cover
+    is_zarr = False
+
 if not (is_tables or is_h5py or is_h5pyd):
     logger.exception('No valid hdf5 backend has been installed, please install either pytables or h5py')
 
+is_hdf5plugin = True
+# optional, gives access to fast compressors (blosc, lz4...) with the h5py backend
+try:
+    import hdf5plugin
+except Exception as e:                              # pragma: no cover
+    is_hdf5plugin = False
+
+# attributes whose values are cached in the node index of H5Backend, see H5Backend.get_nodes
+INDEXED_ATTRIBUTES = ('CLASS', 'subdtype', 'TITLE', 'type', 'data_type')
+
+# number of elements per chunk of the variable length arrays (logger for instance) of zarr stores
+VLARRAY_ZARR_CHUNK = 256
+
+compression_libraries = ['zlib', 'gzip']
+if is_tables or is_hdf5plugin or is_zarr:
+    compression_libraries.extend(['blosc:blosclz', 'blosc:lz4', 'blosc:zstd'])
+
+
+def get_file_extension(backend: str = 'tables') -> str:
+    """Get the extension of the files written with a given backend: .zarr (directory stores) for the
+    zarr backend, .h5 otherwise"""
+    return '.zarr' if backend == 'zarr' else '.h5'
+
+
+# threads writing in parallel the chunks of the zarr arrays, see write_zarr_rows
+_zarr_write_executor: ThreadPoolExecutor = None
+_zarr_write_executor_lock = threading.Lock()
+
+
+def write_zarr_rows(array, start: int, data: np.ndarray):
+    """Write data in the rows of a zarr array from the row start (the array being large enough)
+
+    The rows are split on the chunk boundaries of the enlargeable dimension and the blocks are
+    written (and compressed) in parallel from zarr_write_threads threads (at most one per CPU), the
+    chunks of a zarr store being independent files
+    """
+    global _zarr_write_executor
+    chunk_rows = array.chunks[0]
+    stop = start + data.shape[0]
+    bounds = [start] + list(range((start // chunk_rows + 1) * chunk_rows, stop, chunk_rows)) + [stop]
+    n_threads = min(config('data_saving', 'h5file', 'zarr_write_threads'), os.cpu_count() or 1)
+    if len(bounds) <= 2 or n_threads <= 1:
+        array[start:stop] = data
+        return
+    with _zarr_write_executor_lock:
+        if _zarr_write_executor is None:
+            _zarr_write_executor = ThreadPoolExecutor(max_workers=n_threads,
+                                                      thread_name_prefix='zarr_write')
+
+    def write_block(block_start: int, block_stop: int):
+        array[block_start:block_stop] = data[block_start - start:block_stop - start]
+
+    futures = [_zarr_write_executor.submit(write_block, block_start, block_stop)
+               for block_start, block_stop in zip(bounds[:-1], bounds[1:])]
+    for future in futures:
+        future.result()  # raising the writing errors
+
+
+def get_file_size(file_path: Path) -> int:
+    """Size in bytes of a h5file or of a zarr directory store (0 if it does not exist yet)"""
+    file_path = Path(file_path)
+    if file_path.is_dir():
+        return sum([path.stat().st_size for path in file_path.rglob('*') if path.is_file()])
+    return file_path.stat().st_size if file_path.exists() else 0
+
 
 class NodeError(Exception):
     pass
@@ -79,6 +165,48 @@ class InvalidExport(Exception):
     pass
 
 
+def get_chunk_shape(data_shape: Iterable[int], dtype, ext_shape: Iterable[int] = (None,),
+                    chunk_size: int = None) -> Tuple[int]:
+    """Get a chunk shape adapted to arrays filled one data (frame) at a time
+
+    The array shape is ext_shape + data_shape where ext_shape are the extra dimensions (enlargeable
+    or scan ones) along which the data are written one by one. A chunk always contains full data:
+
+    * Data of dimension 2 or higher: one data per chunk, so that writing or reading one frame
+      touches a single chunk
+    * Data of dimension 0 or 1: the chunk is grown along the extra dimensions (starting from the
+      last one) until its size reaches chunk_size (tiles in the scan space)
+
+    Parameters
+    ----------
+    data_shape: Iterable[int]
+        The shape of the data written at each step
+    dtype: np.dtype or str
+    ext_shape: Iterable[int]
+        The extra dimensions, None (or 0) for an enlargeable (unlimited) one
+    chunk_size: int
+        The target size of a chunk in kB, default from the config
+
+    Returns
+    -------
+    tuple of int
+    """
+    if chunk_size is None:
+        chunk_size = config('data_saving', 'h5file', 'chunk_size')
+    data_shape = [max(1, int(dim)) for dim in data_shape]
+    chunk = [1 for _ in ext_shape] + data_shape
+    if len(data_shape) < 2:
+        chunk_bytes = np.dtype(dtype).itemsize * int(np.prod(data_shape))
+        target = chunk_size * 1024
+        for ind in reversed(range(len(ext_shape))):
+            if chunk_bytes >= target:
+                break
+            nmax = ext_shape[ind] if ext_shape[ind] else np.inf
+            chunk[ind] = int(max(1, min(nmax, target // chunk_bytes)))
+            chunk_bytes *= chunk[ind]
+    return tuple(chunk)
+
+
 def check_mandatory_attrs(attr_name, attr):
     """for cross compatibility between different backends. If these attributes have binary value, then decode them
 
@@ -100,7 +228,58 @@ def check_mandatory_attrs(attr_name, attr):
         return attr
 
 
+# the attributes set on the nodes of a file written in SWMR mode, by node path, see H5Backend.start_swmr.
+# As modifying attributes is not SWMR safe, they are kept by the H5Backend writing the file and
+# written to the file when closing it. Registered here by h5py file identifier while the
+# file is open
+_swmr_pending_attrs_by_file: Dict[int, Dict[str, dict]] = dict([])
+
+
+def get_swmr_pending_attrs(node, backend='tables') -> Union[dict, None]:
+    """Get the attributes of a node whose writing is deferred as its file is written in SWMR mode
+
+    Returns
+    -------
+    dict or None: None if the file of the node is not written in SWMR mode
+    """
+    if backend != 'h5py' or not _swmr_pending_attrs_by_file:
+        return None
+    pending_attrs = _swmr_pending_attrs_by_file.get(node.file.id.id, None)
+    if pending_attrs is None:
+        return None
+    return pending_attrs.setdefault(node.name, dict([]))
+
+
+# the H5Backend objects having built the node index of a file, see H5Backend._build_node_index,
+# registered by file so that the attributes set from the Node objects update the index too
+_indexing_backends_by_file: Dict[int, 'H5Backend'] = weakref.WeakValueDictionary()
+
+
+def get_file_key(node, backend='tables') -> Union[int, None]:
+    """Get a key identifying the open file of a backend node (or of a backend file object)"""
+    if backend == 'tables':
+        return id(node if isinstance(node, tables.File) else node._v_file)
+    elif backend == 'h5py':
+        return node.file.id.id
+    elif backend == 'zarr':
+        return id(node.store)
+    return None
+
+
+def update_node_index(node, attrs: dict, backend='tables'):
+    """Update the values of the INDEXED_ATTRIBUTES cached in the node index of the file of a node"""
+    if not _indexing_backends_by_file or not any([attr_name in INDEXED_ATTRIBUTES for attr_name in attrs]):
+        return
+    file_key = get_file_key(node, backend)
+    h5backend = _indexing_backends_by_file.get(file_key, None)
+    if h5backend is not None:
+        h5backend.update_index_attrs(file_key, node, attrs)
+
+
 def get_attr(node, attr_name, backend='tables'):
+    pending_attrs = get_swmr_pending_attrs(node, backend) or dict([])
+    if attr_name is not None and attr_name in pending_attrs:
+        return JsonConverter.json2object(check_mandatory_attrs(attr_name, pending_attrs[attr_name]))
     if backend == 'tables':
         if attr_name is not None:
             attr = node._v_attrs[attr_name]
@@ -120,20 +299,61 @@ def get_attr(node, attr_name, backend='tables'):
             return JsonConverter.json2object(attr)
         else:
             attrs = dict([])
-            for attr_name in node.attrs.keys():
-                attrval = node.attrs[attr_name]
-                attrval = check_mandatory_attrs(attr_name, attrval)
-                attrs[attr_name] = JsonConverter.json2object(attrval)
+            for attr_name in list(node.attrs.keys()) + list(pending_attrs.keys()):
+                attrs[attr_name] = get_attr(node, attr_name, backend)
             return attrs
 
 
 def set_attr(node, attr_name, attr_value, backend='tables'):
+    update_node_index(node, {attr_name: attr_value}, backend)
     if backend == 'tables':
         node._v_attrs[attr_name] = JsonConverter.object2json(attr_value)
+    elif get_swmr_pending_attrs(node, backend) is not None:
+        get_swmr_pending_attrs(node, backend)[attr_name] = JsonConverter.object2json(attr_value)
     else:
         node.attrs[attr_name] = JsonConverter.object2json(attr_value)
 
 
+def set_attrs(node, attrs: dict, backend='tables'):
+    """Set several attributes of a node at once (values converted to json strings as with
+    set_attr), see write_attrs"""
+    update_node_index(node, attrs, backend)
+    json_attrs = {attr_name: JsonConverter.object2json(attr_value)
+                  for attr_name, attr_value in attrs.items()}
+    pending_attrs = get_swmr_pending_attrs(node, backend)
+    if pending_attrs is not None:
+        pending_attrs.update(json_attrs)
+    else:
+        write_attrs(node, json_attrs, backend)
+
+
+def write_attrs(node, attrs: dict, backend='tables'):
+    """Write several attributes of a node at once, their values being written as is
+
+    With zarr the attributes file of the node is written once instead of once per attribute and
+    with h5py the string attributes are written using the low level API, twice faster than the
+    node.attrs mapping"""
+    if backend == 'tables':
+        node_attrs = node._v_attrs
+        for attr_name, attr_value in attrs.items():
+            node_attrs[attr_name] = attr_value
+    elif backend == 'zarr':
+        node.attrs.update(attrs)
+    elif backend == 'h5py':
+        for attr_name, attr_value in attrs.items():
+            if isinstance(attr_value, str):
+                name = attr_name.encode()
+                if h5py.h5a.exists(node.id, name):
+                    h5py.h5a.delete(node.id, name)
+                h5py.h5a.create(node.id, name, _H5PY_STR_TYPE, _H5PY_SCALAR_SPACE).write(
+                    np.array(attr_value, dtype=_H5PY_STR_DTYPE))
+            else:
+                node.attrs[attr_name] = attr_value
+    else:
+        for attr_name, attr_value in attrs.items():
+            node.attrs[attr_name] = attr_value
+
+
 class InvalidGroupType(Exception):
     pass
 
@@ -190,6 +410,9 @@ class Node(object):
 
         if self.backend == 'tables':
             p = self.node._v_parent
+        elif self.backend == 'zarr':
+            p = zarr.hierarchy.Group(self.node.store, path=self.path.rsplit('/', 1)[0].strip('/'),
+                                     read_only=self.node.read_only, cache_attrs=False)
         else:
             p = self.node.parent
         klass = get_attr(p, 'CLASS', self.backend)
@@ -200,6 +423,9 @@ class Node(object):
     def h5file(self):
         if self.backend == 'tables':
             return self.node._v_file
+        elif self.backend == 'zarr':
+            return zarr.hierarchy.Group(self.node.store, read_only=self.node.read_only,
+                                        cache_attrs=False)
         else:
             return self.node.file
 
@@ -211,6 +437,10 @@ class Node(object):
     def set_attr(self, key, value):
         self.attrs[key] = value
 
+    def set_attrs(self, attrs: dict):
+        """Set several attributes at once, see Attributes.update"""
+        self.attrs.update(attrs)
+
     def get_attr(self, item):
         return self.attrs[item]
 
@@ -343,6 +573,20 @@ class CARRAY(Node):
     def array(self):
         return self._array
 
+    @property
+    def chunk_shape(self) -> Tuple[int]:
+        """The shape of the chunks of the array (None if not chunked)"""
+        if self.backend == 'tables':
+            return self._array.chunkshape
+        else:
+            return self._array.chunks
+
+    @property
+    def shape(self) -> Tuple[int]:
+        """The actual shape of the array in the file (that may differ from the shape attribute when
+        read while being written, see H5Backend.refresh)"""
+        return tuple(self._array.shape)
+
     def __repr__(self):
         """This provides more metainfo in addition to standard __str__"""
 
@@ -369,9 +613,140 @@ class CARRAY(Node):
             return len(self.array)
 
 
+class AppendBuffer:
+    """Accumulates in memory the rows appended to an enlargeable array to write them at once
+
+    The array shape attribute (and size attribute if any) are updated each time rows are written, so
+    that they always match the rows in the file, the buffered rows being excluded. Readers (from
+    another process in SWMR mode for instance, whose attributes are only written when closing the
+    file) should rely on the actual length of the array (see CARRAY.shape and EARRAY.nrows) rather
+    than on these attributes.
+
+    Parameters
+    ----------
+    array: tables.EArray or h5py.Dataset
+        the backend specific enlargeable array
+    backend: str
+    max_rows: int
+        number of buffered rows triggering the writing
+    max_delay: float
+        delay in ms since the first buffered row triggering the writing
+    lock: threading.RLock
+        lock shared by all the buffers of a file
+    """
+    def __init__(self, array, backend: str, max_rows: int, max_delay: float,
+                 lock: threading.RLock = None):
+        self._array = array
+        self.backend = backend
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._lock = lock if lock is not None else threading.RLock()
+        self._rows = []
+        self._nrows = 0
+        self._first_time: float = None
+        self.shape = [int(dim) for dim in array.shape]
+
+    @property
+    def nrows(self) -> int:
+        return self._nrows
+
+    @property
+    def age(self) -> float:
+        """Time in ms since the first buffered row"""
+        if self._first_time is None:
+            return 0.
+        return (perf_counter() - self._first_time) * 1000
+
+    def append(self, data: np.ndarray):
+        """Buffer data whose first dimension is the enlargeable one, write the buffer if full or old
+
+        Parameters
+        ----------
+        data: ndarray
+        """
+        with self._lock:
+            self._rows.append(np.array(data, copy=True))
+            self._nrows += data.shape[0]
+            self.shape[0] += data.shape[0]
+            if self._first_time is None:
+                self._first_time = perf_counter()
+            if self._nrows >= self.max_rows or self.age >= self.max_delay:
+                self.flush()
+
+    def flush(self):
+        """Write the buffered rows to the array and update its shape attribute"""
+        with self._lock:
+            if self._nrows == 0:
+                return
+            data = self._rows[0] if len(self._rows) == 1 else np.concatenate(self._rows, axis=0)
+            if self.backend == 'tables':
+                self._array.append(data)
+            elif self.backend == 'zarr':
+                length = self._array.shape[0]
+                self._array.resize((length + data.shape[0],) + self._array.shape[1:])
+                write_zarr_rows(self._array, length, data)
+            else:
+                length = self._array.shape[0]
+                self._array.resize(length + data.shape[0], axis=0)
+                self._array[length:] = data
+            self._rows = []
+            self._nrows = 0
+            self._first_time = None
+            self.shape = [int(dim) for dim in self._array.shape]
+            set_attr(self._array, 'shape', tuple(self.shape), backend=self.backend)
+            if self.backend == 'tables':
+                attr_names = self._array._v_attrs._v_attrnames
+            else:
+                attr_names = self._array.attrs.keys()
+            if 'size' in attr_names:
+                set_attr(self._array, 'size', self.shape[0], backend=self.backend)
+
+
 class EARRAY(CARRAY):
     def __init__(self, array, backend):
         super().__init__(array, backend)
+        self._append_buffer: AppendBuffer = None
+
+    @property
+    def is_buffered(self) -> bool:
+        """True if the appended data are buffered in memory, see H5Backend.set_buffered_appends"""
+        return self._append_buffer is not None
+
+    def set_append_buffer(self, append_buffer: AppendBuffer = None):
+        self._append_buffer = append_buffer
+
+    def flush_buffer(self):
+        """Write the buffered data, if any, to the array"""
+        if self._append_buffer is not None:
+            self._append_buffer.flush()
+
+    def __getitem__(self, item):
+        self.flush_buffer()
+        return super().__getitem__(item)
+
+    def read(self):
+        self.flush_buffer()
+        return super().read()
+
+    def __len__(self):
+        self.flush_buffer()
+        return super().__len__()
+
+    @property
+    def shape(self) -> Tuple[int]:
+        self.flush_buffer()
+        return super().shape
+
+    @property
+    def nrows(self) -> int:
+        """Length of the enlargeable dimension, including the buffered rows without writing them
+
+        The actual length of the array is used rather than its shape attribute, which may not be
+        written yet (see AppendBuffer)
+        """
+        if self._append_buffer is not None:
+            return self._append_buffer.shape[0]
+        return super().shape[0]
 
     def append(self, data: np.ndarray, expand=True):
         """ appends a ndarray after the current data in the enlargeable array
@@ -395,7 +770,11 @@ class EARRAY(CARRAY):
         """
         if not isinstance(data, np.ndarray):
             raise TypeError('The appended object should be a ndarray')
-        if len(self.attrs['shape']) > 1 and data.shape == self.attrs['shape'][1:]:
+        if self._append_buffer is not None:
+            array_shape = tuple(self._append_buffer.shape)
+        else:
+            array_shape = self.attrs['shape']
+        if len(array_shape) > 1 and data.shape == array_shape[1:]:
             shape = [1]
             shape.extend(data.shape)
             data = data.reshape(shape)
@@ -404,6 +783,10 @@ class EARRAY(CARRAY):
             extended_first_index = data.shape[0]
         if expand and (len(data.shape) == 1 and not data.shape == (1, )):
             data = np.expand_dims(data, 1)
+        if self._append_buffer is not None:
+            self._append_buffer.append(data.reshape((extended_first_index,) +
+                                                    tuple(array_shape[1:])))
+            return
         self.append_backend(data)
 
         sh = list(self.attrs['shape'])
@@ -411,8 +794,12 @@ class EARRAY(CARRAY):
         self.attrs['shape'] = tuple(sh)
 
     def append_backend(self, data):
-        if self.backend == 'tables':
+        if self.backend == 'tables' or (self.backend == 'zarr' and self.array.dtype == object):
             self.array.append(data)
+        elif self.backend == 'zarr':
+            length = self.array.shape[0]
+            self.array.resize((length + data.shape[0],) + self.array.shape[1:])
+            write_zarr_rows(self.array, length, data)
         else:
             self.array.resize(self.array.len() + 1, axis=0)
             self.array[-1] = data
@@ -423,6 +810,11 @@ class VLARRAY(EARRAY):
         super().__init__(array, backend)
 
     def append(self, data):
+        if self.backend == 'zarr':
+            # the elements of the zarr array are objects (ndarrays of variable length)
+            element = np.empty((1,), dtype=object)
+            element[0] = data
+            data = element
         self.append_backend(data)
 
         sh = list(self.attrs['shape'])
@@ -470,6 +862,11 @@ class Attributes(object):
             key = key.upper()
         set_attr(self._node.node, key, value, backend=self.backend)
 
+    def update(self, attrs: dict):
+        """Set several attributes in a single operation, see set_attrs"""
+        set_attrs(self._node.node, {'TITLE' if key == 'title' else key: value
+                                    for key, value in attrs.items()}, backend=self.backend)
+
     def __iter__(self):
         self._iter_index = 0
         return self
@@ -500,7 +897,10 @@ class Attributes(object):
         if self.backend == 'tables':
             return [k for k in self.node.node._v_attrs._v_attrnames]
         else:
-            return [k for k in self.node.node.attrs.keys()]
+            attrs_name = [k for k in self.node.node.attrs.keys()]
+            attrs_name.extend([k for k in get_swmr_pending_attrs(self.node.node, self.backend) or []
+                               if k not in attrs_name])
+            return attrs_name
 
     def __str__(self):
         """The string representation for this object."""
@@ -536,6 +936,15 @@ class H5Backend:
         self.backend = backend
         self.file_path = None
         self.compression = None
+        self._data_type_counts: Dict[str, Dict[str, int]] = None
+        self._swmr_pending_attrs: Dict[str, dict] = None
+        self._node_index: Dict[str, dict] = None
+        self._node_index_lock = threading.RLock()
+        self._buffered_appends = False
+        self._append_buffer_rows: int = config('data_saving', 'h5file', 'append_buffer_rows')
+        self._append_buffer_delay: float = config('data_saving', 'h5file', 'append_buffer_delay')
+        self._append_buffers: Dict[str, AppendBuffer] = dict([])
+        self._append_buffers_lock = threading.RLock()
         if backend == 'tables':
             if is_tables:
                 self.h5_library = tables
@@ -551,6 +960,12 @@ class H5Backend:
                 self.h5_library = h5pyd
             else:
                 raise ImportError('the h5pyd module is not present')
+        elif backend == 'zarr':
+            if is_zarr:
+                self.h5_library = zarr
+            else:
+                raise ImportError('the zarr module is not present')
+        self._zarr_open = False
 
     @property
     def h5file(self):
@@ -558,13 +973,24 @@ class H5Backend:
 
     @h5file.setter
     def h5file(self, file):
-        self.file_path = file.filename
+        self.file_path = file.store.path if self.backend == 'zarr' else file.filename
+        self._zarr_open = self.backend == 'zarr'
         self._h5file = file
+        self._data_type_counts = None
+        self._node_index = None
+        self._append_buffers = dict([])
 
     @property
     def filename(self):
+        if self.backend == 'zarr':
+            return self._h5file.store.path
         return self._h5file.filename
 
+    @property
+    def file_extension(self) -> str:
+        """The extension of the files written with this backend, see get_file_extension"""
+        return get_file_extension(self.backend)
+
     def isopen(self):
         if self._h5file is None:
             return False
@@ -572,28 +998,77 @@ class H5Backend:
             return bool(self._h5file.isopen)
         elif self.backend == 'h5py':
             return bool(self._h5file.id.valid)
+        elif self.backend == 'zarr':
+            return self._zarr_open
         else:
             return self._h5file.id.http_conn is not None
 
     def close_file(self):
         """Flush data and close the h5file
+
+        If the file was written in SWMR mode, the attributes set meanwhile are written to the file
         """
+        swmr_filename = self._h5file.filename if self._swmr_pending_attrs is not None else None
         try:
             if self._h5file is not None:
                 self.flush()
-                if self.isopen():
+                if self.backend == 'zarr':
+                    self._h5file.store.close()
+                    self._zarr_open = False
+                elif self.isopen():
                     self._h5file.close()
         except Exception as e:
             print(e)  # no big deal
+        if swmr_filename is not None:
+            self._write_swmr_pending_attrs(swmr_filename)
+        self._swmr_pending_attrs = None
+        self._data_type_counts = None
+        self._node_index = None
+        self._append_buffers = dict([])
+
+    def open_file(self, fullpathname, mode='r', title='PyMoDAQ file', swmr=False, **kwargs):
+        """Open or create a h5file
 
-    def open_file(self, fullpathname, mode='r', title='PyMoDAQ file', **kwargs):
+        Parameters
+        ----------
+        fullpathname: str or Path
+        mode: str
+            'r', 'r+', 'a' or 'w'
+        title: str
+        swmr: bool
+            Single Writer Multiple Readers (h5py backend only). In reading mode, the file is opened
+            as a SWMR reader (see refresh), otherwise it is created using the latest file format so
+            that start_swmr can be called once all the nodes have been created. Not needed with the
+            zarr backend whose stores can always be read while being written
+        kwargs: dict
+            extra keyword arguments passed to the backend library
+        """
         self.file_path = fullpathname
+        self._data_type_counts = None
+        self._node_index = None
+        self._append_buffers = dict([])
         if self.backend == 'tables':
+            if swmr:
+                logger.warning('The SWMR mode is not available with the pytables backend')
             self._h5file = self.h5_library.open_file(str(fullpathname), mode=mode, title=title, **kwargs)
             if mode == 'w':
                 self.root().attrs['pymodaq_version'] = utils.get_version()
             return self._h5file
+        elif self.backend == 'zarr':
+            # attributes not cached so that all the objects of a node see its latest attributes
+            kwargs.setdefault('cache_attrs', False)
+            self._h5file = self.h5_library.open_group(str(fullpathname), mode=mode, **kwargs)
+            self._zarr_open = True
+            if mode == 'w':
+                self.root().attrs['TITLE'] = title
+                self.root().attrs['CLASS'] = 'GROUP'
+                self.root().attrs['pymodaq_version'] = utils.get_version()
+            return self._h5file
         else:
+            if swmr and self.backend == 'h5py':
+                kwargs['libver'] = 'latest'
+                if mode == 'r':
+                    kwargs['swmr'] = True
             self._h5file = self.h5_library.File(str(fullpathname), mode=mode, **kwargs)
 
             if mode == 'w':
@@ -623,30 +1098,465 @@ class H5Backend:
             node = node.node
         return set_attr(node, attr_name, attr_value, self.backend)
 
+    def set_attrs(self, node, attrs: dict):
+        """Set several attributes of a node in a single operation, see set_attrs"""
+        if isinstance(node, Node):
+            node = node.node
+        set_attrs(node, attrs, self.backend)
+
     def has_attr(self, node, attr_name):
         return attr_name in self.get_node(node).attrs.attrs_name
 
     def flush(self):
         if self._h5file is not None:
-            self._h5file.flush()
+            self.flush_append_buffers()
+            if self.backend != 'zarr':  # the chunks of a zarr store are written when filled
+                self._h5file.flush()
+
+    @property
+    def swmr_mode(self) -> bool:
+        """True if the file is written or read in SWMR mode"""
+        if self.backend != 'h5py' or not self.isopen():
+            return False
+        return bool(self._h5file.swmr_mode)
+
+    def start_swmr(self) -> bool:
+        """Switch the writing of the file to the Single Writer Multiple Readers mode
+
+        From then on, other processes can open the file as SWMR readers (see open_file and refresh)
+        and read the flushed data while it is being written. New nodes cannot be created anymore
+        and the attributes set meanwhile are only written to the file when closing it.
+        Only possible with the h5py backend on a file opened in writing mode with swmr=True
+
+        Returns
+        -------
+        bool: True if the SWMR mode is active
+        """
+        if self.backend != 'h5py' or not self.isopen() or self._h5file.mode != 'r+':
+            logger.warning('The SWMR mode can only be started on a h5file opened in writing mode'
+                           ' with the h5py backend')
+            return False
+        if not self._h5file.swmr_mode:
+            self.flush()
+            try:
+                self._h5file.swmr_mode = True
+            except Exception as e:
+                logger.warning(f'The SWMR mode could not be started: {str(e)}')
+                return False
+            self._swmr_pending_attrs = dict([])
+            _swmr_pending_attrs_by_file[self._h5file.id.id] = self._swmr_pending_attrs
+        return True
+
+    def _write_swmr_pending_attrs(self, filename: str):
+        """Write to the (closed) file the attributes set while it was written in SWMR mode"""
+        for file_key, pending_attrs in list(_swmr_pending_attrs_by_file.items()):
+            if pending_attrs is self._swmr_pending_attrs:
+                del _swmr_pending_attrs_by_file[file_key]
+        pending_attrs = {path: attrs for path, attrs in self._swmr_pending_attrs.items() if len(attrs) > 0}
+        if len(pending_attrs) > 0:
+            with self.h5_library.File(filename, mode='r+') as h5file:
+                for path, attrs in pending_attrs.items():
+                    for attr_name, attr_value in attrs.items():
+                        h5file[path].attrs[attr_name] = attr_value
+
+    def refresh(self, where: Union[Node, str] = '/'):
+        """Update the arrays hanging from where with the data written by another process
+
+        Only effective for a file opened in reading mode with swmr=True (h5py backend), see
+        start_swmr, or for a zarr store (whose arrays are read again from the store at each
+        get_node, so that only the node index has to be updated)
 
-    def define_compression(self, compression, compression_opts):
-        """Define cmpression library and level of compression
         Parameters
         ----------
-        compression: (str) either gzip and zlib are supported here as they are compatible
-                        but zlib is used by pytables while gzip is used by h5py
-        compression_opts (int) : 0 to 9  0: None, 9: maximum compression
+        where: Node or str
+        """
+        if self.backend == 'zarr' and self.isopen():
+            with self._node_index_lock:
+                self._node_index = None
+                self._data_type_counts = None
+            return
+        if not self.swmr_mode or self._h5file.mode != 'r':
+            return
+        for node in self.walk_nodes(where):
+            if isinstance(node, CARRAY):
+                node.array.refresh()
+
+    @property
+    def buffered_appends(self) -> bool:
+        return self._buffered_appends
+
+    def set_buffered_appends(self, buffered: bool, max_rows: int = None, max_delay: float = None):
+        """Activate or not the buffering in memory of the data appended to enlargeable arrays
+
+        When activated, the data are written (and the shape attribute updated) once max_rows rows
+        have been appended or when the first buffered row is older than max_delay, then on flush
+        and close
+
+        Parameters
+        ----------
+        buffered: bool
+        max_rows: int
+            number of buffered rows triggering the writing, default from the config
+        max_delay: float
+            delay in ms since the first buffered row triggering the writing, default from the config
+        """
+        if max_rows is not None:
+            self._append_buffer_rows = max_rows
+        if max_delay is not None:
+            self._append_buffer_delay = max_delay
+        if not buffered:
+            self.flush_append_buffers()
+            self._append_buffers = dict([])
+        self._buffered_appends = buffered
+
+    def _get_append_buffer(self, array: 'EARRAY') -> AppendBuffer:
+        """Get the buffer associated with an enlargeable array, create it if needed"""
+        with self._append_buffers_lock:
+            path = array.path
+            if path not in self._append_buffers:
+                self._append_buffers[path] = AppendBuffer(array.node, self.backend,
+                                                          self._append_buffer_rows,
+                                                          self._append_buffer_delay,
+                                                          self._append_buffers_lock)
+            return self._append_buffers[path]
+
+    def flush_append_buffers(self, older_than: float = 0.):
+        """Write to the file the data buffered for the enlargeable arrays
+
+        Parameters
+        ----------
+        older_than: float
+            only the buffers whose first row is older than this delay (in ms) are written
+        """
+        with self._append_buffers_lock:
+            for append_buffer in self._append_buffers.values():
+                if append_buffer.age >= older_than:
+                    append_buffer.flush()
+
+    @staticmethod
+    def _path_and_parents(path: str):
+        """Yield a node path followed by the paths of all its parent groups up to the root"""
+        yield path
+        while path != '/':
+            path = path.rsplit('/', 1)[0] or '/'
+            yield path
+
+    def _seed_data_type_counts(self):
+        """Walk once the whole file to count, for each group, the nodes of each data_type hanging
+        (at any depth) from it"""
+        self._data_type_counts = dict([])
+        for path in self._walk_index_paths('/'):
+            data_type = self._get_index_attr(path, 'data_type')
+            if data_type is not None:
+                self._increment_data_type_count(path, data_type)
+
+    def _increment_data_type_count(self, path: str, data_type: str):
+        for parent_path in self._path_and_parents(path):
+            counts = self._data_type_counts.setdefault(parent_path, dict([]))
+            counts[data_type] = counts.get(data_type, 0) + 1
+
+    def add_data_type_count(self, node: Node, data_type: str):
+        """Update the data_type counters after a node with a data_type attribute has been created
+
+        Parameters
+        ----------
+        node: Node
+            the newly created node
+        data_type: str
+            the value of the data_type attribute of this node
+        """
+        if self._node_index is not None and node.path in self._node_index:
+            self._node_index[node.path]['attrs']['data_type'] = data_type
+        if self._data_type_counts is not None:
+            self._increment_data_type_count(node.path, data_type)
+
+    def get_data_type_count(self, where, data_type: str) -> int:
+        """Get the number of nodes with a given data_type attribute hanging from where (included)
+
+        The counters are built once from the node index at the first call and then updated at each
+        node creation (see add_data_type_count), so that the cost does not grow with the number of
+        nodes already in the file.
+
+        Parameters
+        ----------
+        where: str or node
+            path or node instance
+        data_type: str
+            the value of the data_type attribute to count
+
+        Returns
+        -------
+        int: the number of nodes
+        """
+        node = self.get_node(where)
+        if not isinstance(node, GROUP):
+            return int('data_type' in node.attrs and node.attrs['data_type'] == data_type)
+        if self._data_type_counts is None:
+            self._seed_data_type_counts()
+        return self._data_type_counts.get(node.path, dict([])).get(data_type, 0)
+
+    @staticmethod
+    def _join_path(path: str, name: str = None) -> str:
+        """Normalize a node path (leading slash, no trailing or double slashes) and add name to it"""
+        names = [name_tmp for name_tmp in path.split('/') if name_tmp != '']
+        if name is not None:
+            names.extend([name_tmp for name_tmp in name.split('/') if name_tmp != ''])
+        return '/' + '/'.join(names)
+
+    def _get_path(self, where) -> str:
+        """Get the normalized path of a node given as a path, a Node or a backend node"""
+        if isinstance(where, str):
+            return self._join_path(where)
+        elif isinstance(where, Node):
+            return where.path
+        elif self.backend == 'tables':
+            return where._v_pathname
+        else:
+            return where.name
+
+    def _get_backend_node(self, path: str):
+        if self.backend == 'tables':
+            return self._h5file.get_node(path)
+        else:
+            return self._h5file[path]
+
+    def _has_attr(self, node, attr_name: str) -> bool:
+        """Check if a backend node has a given attribute without reading the attributes"""
+        if self.backend == 'tables':
+            return attr_name in node._v_attrs._v_attrnames
+        else:
+            return attr_name in node.attrs or attr_name in (get_swmr_pending_attrs(node, self.backend) or [])
+
+    def _add_to_node_index(self, path: str, node) -> bool:
+        """Add to the index a node of the file, return False if its parent is not indexed"""
+        if self._has_attr(node, 'CLASS'):
+            klass = self.get_attr(node, 'CLASS')
+        else:
+            klass = 'GROUP'
+        self._node_index[path] = dict(children=None if 'ARRAY' in klass else [],
+                                      attrs=dict(CLASS=klass))
+        if path != '/':
+            parent_path, name = path.rsplit('/', 1)
+            parent = self._node_index.get(parent_path or '/')
+            if parent is None or parent['children'] is None:
+                return False
+            if name not in parent['children']:
+                bisect.insort(parent['children'], name)
+        return True
+
+    def _build_node_index(self):
+        """Walk once the whole file to index its nodes: for each node path, its class, the sorted
+        names of its children (for groups) and a cache of the INDEXED_ATTRIBUTES values
+
+        The cached values are updated by set_attr and set_attrs, whatever the object used to set
+        the attributes (H5Backend or Node.attrs)
+        """
+        with self._node_index_lock:
+            self._node_index = dict([])
+            file_key = get_file_key(self._h5file, self.backend)
+            if file_key is not None:
+                _indexing_backends_by_file[file_key] = self
+            if self.backend == 'tables':
+                for node in self._h5file.walk_nodes('/'):
+                    self._add_to_node_index(node._v_pathname, node)
+            else:
+                def add_node(name, node):
+                    self._add_to_node_index(f'/{name}', node)  # returning None to visit all nodes
+
+                self._add_to_node_index('/', self._h5file)
+                self._h5file.visititems(add_node)
+
+    def _index_missing_node(self, path: str):
+        """Add to the node index a node created without the H5Backend methods, together with its
+        parents and children not indexed yet
+
+        Raises
+        ------
+        NodeError: if there is no such node in the file
+        """
+        try:
+            node = self._get_backend_node(path)
+        except Exception:
+            node = None
+        if node is None:
+            raise NodeError(f'No node {path} in the file')
+        parent_path = path.rsplit('/', 1)[0] or '/'
+        if parent_path not in self._node_index:
+            self._index_missing_node(parent_path)  # indexing its children too
+            return
+        self._add_to_node_index(path, node)
+        if self._node_index[path]['children'] is not None:
+            if self.backend == 'tables':
+                for child in self._h5file.walk_nodes(path):
+                    self._add_to_node_index(child._v_pathname, child)
+            else:
+                def add_node(name, child):
+                    self._add_to_node_index(self._join_path(path, name), child)  # returning None to visit all nodes
+
+                node.visititems(add_node)
+
+    def _index_new_node(self, node: Node, klass: str):
+        """Update the node index after the creation of a node"""
+        with self._node_index_lock:
+            if self._node_index is not None:
+                if not self._add_to_node_index(node.path, node.node):
+                    self._index_missing_node(node.path)  # its parent was created outside the H5Backend
+                self._node_index[node.path]['attrs']['CLASS'] = klass
+
+    def _index_path(self, where) -> str:
+        """Get the path of a node making sure it is in the node index
+
+        The index is built at the first call. A node not found in it (for instance created without
+        using the H5Backend methods) is looked for in the file and indexed
+
+        Raises
+        ------
+        NodeError: if there is no such node in the file
+        """
+        path = self._get_path(where)
+        with self._node_index_lock:
+            if self._node_index is None:
+                self._build_node_index()
+            if path not in self._node_index:
+                self._index_missing_node(path)
+        return path
+
+    def update_index_attrs(self, file_key: int, node, attrs: dict):
+        """Update the INDEXED_ATTRIBUTES values cached in the node index, see update_node_index
+
+        Parameters
+        ----------
+        file_key: int
+            the key of the file of the node, see get_file_key
+        node: backend node
+            the node whose attributes are set
+        attrs: dict
+            the attributes set on the node
+        """
+        with self._node_index_lock:
+            if self._node_index is None or not self.isopen() or \
+                    get_file_key(self._h5file, self.backend) != file_key:
+                return
+            path = self._get_path(node)
+            if path in self._node_index:
+                self._node_index[path]['attrs'].update(
+                    {attr_name: attr_value for attr_name, attr_value in attrs.items()
+                     if attr_name in INDEXED_ATTRIBUTES})
+
+    def _get_index_attr(self, path: str, attr_name: str):
+        """Get the value of a node attribute (None if not present), cached in the node index for
+        the INDEXED_ATTRIBUTES present on the node"""
+        attrs = self._node_index[path]['attrs']
+        if attr_name in attrs:
+            return attrs[attr_name]
+        node = self._get_backend_node(path)
+        if not self._has_attr(node, attr_name):
+            return None  # not cached as it may be set later on
+        value = self.get_attr(node, attr_name)
+        if attr_name in INDEXED_ATTRIBUTES:
+            attrs[attr_name] = value
+        return value
+
+    def _get_indexed_node(self, path: str) -> Node:
+        return self._wrap_node(self._get_backend_node(path), self._get_index_attr(path, 'CLASS'),
+                               lambda: self._get_index_attr(path, 'subdtype'))
+
+    def _walk_index_group_paths(self, path: str):
+        """Yield the paths of the groups hanging from path (included), parents before children"""
+        if self._node_index[path]['children'] is None:
+            return
+        stack = [path]
+        while stack:
+            group_path = stack.pop()
+            yield group_path
+            children_path = [self._join_path(group_path, name)
+                             for name in self._node_index[group_path]['children']]
+            stack.extend(reversed([child_path for child_path in children_path
+                                   if self._node_index[child_path]['children'] is not None]))
+
+    def _walk_index_paths(self, where):
+        """Yield the path of where then the paths of all the nodes hanging from it, see walk_nodes"""
+        path = self._index_path(where)
+        yield path
+        for group_path in self._walk_index_group_paths(path):
+            for name in list(self._node_index[group_path]['children']):
+                yield self._join_path(group_path, name)
+
+    def get_nodes_from_attributes(self, where='/', **attributes) -> List[Node]:
+        """Get the nodes hanging (at any depth) from where (included) whose attributes have the
+        given values
+
+        The nodes and the values of the INDEXED_ATTRIBUTES (such as data_type or type) are read
+        from an in memory index of the file, so that such queries do not read the file
+
+        Parameters
+        ----------
+        where: str or node
+            path or node instance
+        attributes: dict
+            attribute names and values to match
+
+        Returns
+        -------
+        list of Node
+
+        Examples
+        --------
+        >>> h5saver.get_nodes_from_attributes('/RawData/Scan000', data_type='data')
+        """
+        return [self._get_indexed_node(path) for path in self._walk_index_paths(where)
+                if all([self._get_index_attr(path, attr_name) == attr_value
+                        for attr_name, attr_value in attributes.items()])]
+
+    def get_compression(self, compression: str, compression_opts: int):
+        """Get the backend specific compression filter
+
+        Parameters
+        ----------
+        compression: str
+            one of compression_libraries. zlib and gzip are compatible (zlib is used by pytables
+            while gzip is used by h5py). The blosc compressors are fast ones, available natively with
+            pytables and through the hdf5plugin package with h5py (gzip is used if not installed)
+        compression_opts: int
+            0 to 9  0: None, 9: maximum compression
+
+        Returns
+        -------
+        tables.Filters or dict: to be used as the compression argument of the create_xxx methods
+            (a dict of h5py dataset or zarr array keyword arguments for the other backends)
         """
-        #
         if self.backend == 'tables':
             if compression == 'gzip':
                 compression = 'zlib'
-            self.compression = self.h5_library.Filters(complevel=compression_opts, complib=compression)
+            return self.h5_library.Filters(complevel=compression_opts, complib=compression)
+        elif self.backend == 'zarr':
+            if compression.startswith('blosc'):
+                cname = compression.split(':')[1] if ':' in compression else 'blosclz'
+                return dict(compressor=numcodecs.Blosc(cname=cname, clevel=compression_opts,
+                                                       shuffle=numcodecs.Blosc.SHUFFLE))
+            return dict(compressor=numcodecs.Zlib(level=compression_opts))
         else:
             if compression == 'zlib':
                 compression = 'gzip'
-            self.compression = dict(compression=compression, compression_opts=compression_opts)
+            if compression.startswith('blosc'):
+                if is_hdf5plugin and self.backend == 'h5py':
+                    cname = compression.split(':')[1] if ':' in compression else 'blosclz'
+                    return dict(hdf5plugin.Blosc(cname=cname, clevel=compression_opts,
+                                                 shuffle=hdf5plugin.Blosc.SHUFFLE))
+                logger.warning(f'The {compression} compressor is not available with the '
+                               f'{self.backend} backend, gzip is used instead')
+                compression = 'gzip'
+            return dict(compression=compression, compression_opts=compression_opts)
+
+    def define_compression(self, compression, compression_opts):
+        """Define compression library and level of compression used by default for all arrays
+
+        Parameters
+        ----------
+        compression: (str) one of compression_libraries, see get_compression
+        compression_opts (int) : 0 to 9  0: None, 9: maximum compression
+        """
+        self.compression = self.get_compression(compression, compression_opts)
 
     def get_set_group(self, where, name, title=''):
         """Retrieve or create (if absent) a node group
@@ -668,13 +1578,13 @@ class H5Backend:
         if isinstance(where, Node):
             where = where.node
 
-        if name not in list(self.get_children(where)):
+        if name not in self.get_children_name(where):
             if self.backend == 'tables':
                 group = self._h5file.create_group(where, name, title)
             else:
                 group = self.get_node(where).node.create_group(name)
-                group.attrs['TITLE'] = title
-                group.attrs['CLASS'] = 'GROUP'
+                write_attrs(group, dict(TITLE=title, CLASS='GROUP'), self.backend)
+            self._index_new_node(GROUP(group, self.backend), 'GROUP')
 
         else:
             group = self.get_node(where, name)
@@ -684,12 +1594,12 @@ class H5Backend:
         if isinstance(where, Node):
             where = where.node
 
-        node = self.get_node(where).node
-        for child_name in self.get_children(node):
-            child = node[child_name]
-            if 'TITLE' in self.get_attr(child):
-                if self.get_attr(child, 'TITLE') == title and self.get_attr(child, 'CLASS') == 'GROUP':
-                    return GROUP(child, self.backend)
+        path = self._index_path(where)
+        for child_name in self.get_children_name(path):
+            child_path = self._join_path(path, child_name)
+            if (self._get_index_attr(child_path, 'TITLE') == title and
+                    self._get_index_attr(child_path, 'CLASS') == 'GROUP'):
+                return self.get_node(child_path)
         return None
 
     def is_node_in_group(self, where, name):
@@ -710,9 +1620,18 @@ class H5Backend:
         if isinstance(where, Node):
             where = where.node
 
-        return name.lower() in [name.lower() for name in self.get_children(where)]
+        return name.lower() in [name.lower() for name in self.get_children_name(where)]
 
     def get_node(self, where, name=None) -> Node:
+        """Get a node from its path (or from its parent and its name)
+
+        Once the node index is built (see get_nodes_from_attributes), the node class is read from
+        the index
+        """
+        if self._node_index is not None and isinstance(where, (str, Node)):
+            path = self._join_path(self._get_path(where), name)
+            if path in self._node_index:
+                return self._get_indexed_node(path)
         if isinstance(where, Node):
             where = where.node
         try:
@@ -733,23 +1652,44 @@ class H5Backend:
                         node = where
         except Exception as e:
             raise NodeError(str(e))
+        if node is None:  # h5py returns None for missing nodes
+            raise NodeError(f'No node {name} in {where}')
+        with self._node_index_lock:
+            if self._node_index is not None and self._get_path(node) not in self._node_index:
+                self._index_missing_node(self._get_path(node))  # created without the H5Backend methods
 
-        if 'CLASS' not in self.get_attr(node):
+        if not self._has_attr(node, 'CLASS'):
             self.set_attr(node, 'CLASS', 'GROUP')
             return GROUP(node, self.backend)
         else:
-            attr = self.get_attr(node, 'CLASS')
-            if 'ARRAY' not in attr:
-                return GROUP(node, self.backend)
-            elif attr == 'CARRAY':
-                return CARRAY(node, self.backend)
-            elif attr == 'EARRAY':
-                return EARRAY(node, self.backend)
-            elif attr == 'VLARRAY':
-                if self.get_attr(node, 'subdtype') == 'string':
-                    return StringARRAY(node, self.backend)
-                else:
-                    return VLARRAY(node, self.backend)
+            return self._wrap_node(node, self.get_attr(node, 'CLASS'),
+                                   lambda: self.get_attr(node, 'subdtype'))
+
+    def _wrap_node(self, node, klass: str, get_subdtype) -> Node:
+        """Get the Node object corresponding to a backend node of a given class
+
+        Parameters
+        ----------
+        node: backend node
+        klass: str
+            the value of the CLASS attribute
+        get_subdtype: Callable
+            returns the value of the subdtype attribute, only called for VLARRAY
+        """
+        if 'ARRAY' not in klass:
+            return GROUP(node, self.backend)
+        elif klass == 'CARRAY':
+            return CARRAY(node, self.backend)
+        elif klass == 'EARRAY':
+            array = EARRAY(node, self.backend)
+            if self._buffered_appends:
+                array.set_append_buffer(self._get_append_buffer(array))
+            return array
+        elif klass == 'VLARRAY':
+            if get_subdtype() == 'string':
+                return StringARRAY(node, self.backend)
+            else:
+                return VLARRAY(node, self.backend)
 
     def get_node_name(self, node):
         """return node name
@@ -787,6 +1727,8 @@ class H5Backend:
 
         if self.backend == 'tables':
             return self.get_node(node._v_parent)
+        elif self.backend == 'zarr':
+            return self.get_node(self._get_path(node).rsplit('/', 1)[0] or '/')
         else:
             return self.get_node(node.parent)
 
@@ -805,56 +1747,69 @@ class H5Backend:
 
         See Also
         --------
-        :meth:`.GROUP.children_name`
+        :meth:`.GROUP.children_name`, get_children_name
 
         """
-        where = self.get_node(where)  # return a node object in case where is a string
-        if isinstance(where, Node):
-            where = where.node
+        path = self._index_path(where)
+        return {name: self._get_indexed_node(self._join_path(path, name))
+                for name in self.get_children_name(path)}
 
-        mod = importlib.import_module('.backends', 'pymodaq.utils.h5modules')
-        children = dict([])
-        if self.backend == 'tables':
-            for child_name, child in where._v_children.items():
-                klass = get_attr(child, 'CLASS', self.backend)
-                if 'ARRAY' in klass:
-                    _cls = getattr(mod, klass)
-                else:
-                    _cls = GROUP
-                children[child_name] = _cls(child, self.backend)
-        else:
-            for child_name, child in where.items():
-                klass = get_attr(child, 'CLASS', self.backend)
-                if 'ARRAY' in klass:
-                    _cls = getattr(mod, klass)
-                else:
-                    _cls = GROUP
-                children[child_name] = _cls(child, self.backend)
-        return children
+    def get_children_name(self, where) -> List[str]:
+        """Get the sorted list of the names of the children hanging from where, from the node index
+
+        Parameters
+        ----------
+        where (str or node instance)
+
+        Returns
+        -------
+        list of str
+        """
+        path = self._index_path(where)
+        children = self._node_index[path]['children']
+        return list(children) if children is not None else []
 
     def walk_nodes(self, where):
-        where = self.get_node(where)  # return a node object in case where is a string
-        yield where
-        for gr in self.walk_groups(where):
-            for child in self.get_children(gr).values():
-                yield child
+        for path in self._walk_index_paths(where):
+            yield self._get_indexed_node(path)
 
     def walk_groups(self, where):
-        where = self.get_node(where)  # return a node object in case where is a string
-        if where.attrs['CLASS'] != 'GROUP':
-            return None
+        for path in self._walk_index_group_paths(self._index_path(where)):
+            yield self._get_indexed_node(path)
+
+    def remove_node(self, where, recursive=True):
+        """Remove a node from the file, and the nodes hanging from it if recursive
+
+        Nodes should be removed using this method for the node index to stay up to date
+
+        Parameters
+        ----------
+        where: str or node
+            path or node instance
+        recursive: bool
+            if False, a group with children cannot be removed
+        """
+        path = self._index_path(where)
+        if path == '/':
+            raise NodeError('The root node cannot be removed')
+        if not recursive and len(self.get_children_name(path)) != 0:
+            raise NodeError(f'The group {path} has children, it can only be removed recursively')
         if self.backend == 'tables':
-            for ch in self.h5file.walk_groups(where.node):
-                yield self.get_node(ch)
-        else:
-            stack = [where]
-            yield where
-            while stack:
-                obj = stack.pop()
-                children = [child for child in self.get_children(obj).values() if child.attrs['CLASS'] == 'GROUP']
-                for child in children:
-                    stack.append(child)
-                    yield child
+            self._h5file.remove_node(path, recursive=recursive)
+        else:
+            del self._h5file[path]
+
+        with self._append_buffers_lock:
+            self._append_buffers = {buffer_path: append_buffer for buffer_path, append_buffer
+                                    in self._append_buffers.items()
+                                    if buffer_path != path and not buffer_path.startswith(f'{path}/')}
+        with self._node_index_lock:
+            for node_path in [node_path for node_path in self._node_index
+                              if node_path == path or node_path.startswith(f'{path}/')]:
+                del self._node_index[node_path]
+            parent_path, name = path.rsplit('/', 1)
+            self._node_index[parent_path or '/']['children'].remove(name)
+        self._data_type_counts = None
 
     def read(self, array, *args, **kwargs):
         if isinstance(array, CARRAY):
@@ -864,68 +1819,127 @@ class H5Backend:
         else:
             return array[:]
 
-    def create_carray(self, where, name, obj=None, title=''):
+    def create_carray(self, where, name, obj=None, title='', chunk_shape: Tuple[int] = None,
+                      compression=None, shape: Tuple[int] = None, dtype=None, fill_value=0):
+        """create a fixed size array from a ndarray or from its shape and dtype
+
+        Parameters
+        ----------
+        where: (str or node) group location in the file where to create the array node
+        name: (str) name of the array
+        obj: (ndarray) the data to be saved
+        title: (str) node title attribute (written in capitals)
+        chunk_shape: (tuple of int) the shape of the hdf5 chunks, default from the library
+        compression: compression filter as returned by get_compression, default self.compression
+        shape: (tuple of int) if obj is None, the shape of the array to create. Its content is not
+            allocated in memory, the chunks are only written on the disk when filled
+        dtype: (dtype) numpy dtype style, used together with shape
+        fill_value: the value of the array elements that have not been written, used together
+            with shape
+        """
         if isinstance(where, Node):
             where = where.node
         if obj is None:
-            raise ValueError('Data to be saved as carray cannot be None')
-        dtype = obj.dtype
+            if shape is None or dtype is None:
+                raise ValueError('Data to be saved as carray cannot be None')
+            shape = tuple(shape)
+            dtype = np.dtype(dtype)
+        else:
+            shape = obj.shape
+            dtype = obj.dtype
+        if compression is None:
+            compression = self.compression
+        if compression is None and self.backend == 'zarr':
+            compression = dict(compressor=None)  # zarr compresses by default
         if self.backend == 'tables':
-            array = CARRAY(self._h5file.create_carray(where, name, obj=obj,
-                                                      title=title,
-                                                      filters=self.compression), self.backend)
+            if obj is None:
+                atom = self.h5_library.Atom.from_dtype(dtype, dflt=fill_value)
+                array = CARRAY(self._h5file.create_carray(where, name, atom=atom, shape=shape,
+                                                          title=title, filters=compression,
+                                                          chunkshape=chunk_shape), self.backend)
+            else:
+                array = CARRAY(self._h5file.create_carray(where, name, obj=obj,
+                                                          title=title,
+                                                          filters=compression,
+                                                          chunkshape=chunk_shape), self.backend)
         else:
-            if self.compression is not None:
-                array = CARRAY(self.get_node(where).node.create_dataset(name, data=obj, **self.compression),
+            if obj is None:
+                data_kwargs = dict(shape=shape, dtype=dtype)
+                data_kwargs['fill_value' if self.backend == 'zarr' else 'fillvalue'] = fill_value
+            elif self.backend == 'zarr' and len(shape) > 0:
+                data_kwargs = dict(shape=shape, dtype=dtype)  # obj written below, see write_zarr_rows
+            else:
+                data_kwargs = dict(data=obj)
+            if compression is not None:
+                array = CARRAY(self.get_node(where).node.create_dataset(name, chunks=chunk_shape,
+                                                                        **data_kwargs, **compression),
                                self.backend)
             else:
-                array = CARRAY(self.get_node(where).node.create_dataset(name, data=obj), self.backend)
-            array.array.attrs['TITLE'] = title
-            array.array.attrs[
-                'CLASS'] = 'CARRAY'  # direct writing using h5py to be compatible with pytable automatic class writing as binary
-        array.attrs['shape'] = obj.shape
-        array.attrs['dtype'] = dtype.name
-        array.attrs['subdtype'] = ''
-        array.attrs['backend'] = self.backend
+                array = CARRAY(self.get_node(where).node.create_dataset(name, chunks=chunk_shape,
+                                                                        **data_kwargs),
+                               self.backend)
+            if obj is not None and 'data' not in data_kwargs:
+                write_zarr_rows(array.array, 0, obj)
+            # direct writing using h5py to be compatible with pytable automatic class writing as binary
+            write_attrs(array.array, dict(TITLE=title, CLASS='CARRAY'), self.backend)
+        array.attrs.update(dict(shape=shape, dtype=dtype.name, subdtype='', backend=self.backend))
+        self._index_new_node(array, 'CARRAY')
         return array
 
-    def create_earray(self, where, name, dtype, data_shape=None, title=''):
+    def create_earray(self, where, name, dtype, data_shape=None, title='', chunk_shape: Tuple[int] = None,
+                      compression=None):
         """create enlargeable arrays from data with a given shape and of a given type. The array is enlargeable along
         the first dimension
+
+        Parameters
+        ----------
+        where: (str or node) group location in the file where to create the array node
+        name: (str) name of the array
+        dtype: (dtype) numpy dtype style
+        data_shape: (tuple of int) the shape of the data to be appended
+        title: (str) node title attribute (written in capitals)
+        chunk_shape: (tuple of int) the shape of the hdf5 chunks (including the enlargeable
+            dimension), default from get_chunk_shape
+        compression: compression filter as returned by get_compression, default self.compression
         """
         if isinstance(where, Node):
             where = where.node
+        if compression is None:
+            compression = self.compression
+        if compression is None and self.backend == 'zarr':
+            compression = dict(compressor=None)  # zarr compresses by default
         dtype = np.dtype(dtype)
         shape = [0]
         if data_shape is not None:
             shape.extend(list(data_shape))
         shape = tuple(shape)
+        if chunk_shape is None:
+            chunk_shape = get_chunk_shape(shape[1:], dtype)
 
         if self.backend == 'tables':
             atom = self.h5_library.Atom.from_dtype(dtype)
             array = EARRAY(self._h5file.create_earray(where, name, atom, shape=shape, title=title,
-                                                      filters=self.compression), self.backend)
+                                                      filters=compression, chunkshape=chunk_shape),
+                           self.backend)
         else:
             maxshape = [None]
             if data_shape is not None:
                 maxshape.extend(list(data_shape))
             maxshape = tuple(maxshape)
-            if self.compression is not None:
-                array = EARRAY(
-                    self.get_node(where).node.create_dataset(name, shape=shape, dtype=dtype, maxshape=maxshape,
-                                                             **self.compression), self.backend)
-            else:
-                array = EARRAY(
-                    self.get_node(where).node.create_dataset(name, shape=shape, dtype=dtype, maxshape=maxshape),
-                    self.backend)
-            array.array.attrs['TITLE'] = title
-            array.array.attrs[
-                'CLASS'] = 'EARRAY'  # direct writing using h5py to be compatible with pytable automatic class writing as binary
-            array.array.attrs['EXTDIM'] = 0
-        array.attrs['shape'] = shape
-        array.attrs['dtype'] = dtype.name
-        array.attrs['subdtype'] = ''
-        array.attrs['backend'] = self.backend
+            # zarr arrays can always be resized
+            extra_kwargs = dict([]) if self.backend == 'zarr' else dict(maxshape=maxshape)
+            if compression is not None:
+                extra_kwargs.update(compression)
+            array = EARRAY(
+                self.get_node(where).node.create_dataset(name, shape=shape, dtype=dtype,
+                                                         chunks=chunk_shape, **extra_kwargs),
+                self.backend)
+            # direct writing using h5py to be compatible with pytable automatic class writing as binary
+            write_attrs(array.array, dict(TITLE=title, CLASS='EARRAY', EXTDIM=0), self.backend)
+        array.attrs.update(dict(shape=shape, dtype=dtype.name, subdtype='', backend=self.backend))
+        self._index_new_node(array, 'EARRAY')
+        if self._buffered_appends:
+            array.set_append_buffer(self._get_append_buffer(array))
         return array
 
     def create_vlarray(self, where, name, dtype, title=''):
@@ -959,6 +1973,14 @@ class H5Backend:
             else:
                 array = VLARRAY(self._h5file.create_vlarray(where, name, atom, title=title,
                                                             filters=self.compression), self.backend)
+        elif self.backend == 'zarr':
+            compression = self.compression if self.compression is not None else \
+                dict(compressor=None)
+            array_klass = StringARRAY if subdtype == 'string' else VLARRAY
+            array = array_klass(self.get_node(where).node.create_dataset(
+                name, shape=(0,), dtype=object, object_codec=numcodecs.VLenArray(dtype.name),
+                chunks=(VLARRAY_ZARR_CHUNK,), **compression), self.backend)
+            write_attrs(array.array, dict(TITLE=title, CLASS='VLARRAY', EXTDIM=0), self.backend)
         else:
             maxshape = (None,)
             if self.backend == 'h5py':
@@ -980,14 +2002,11 @@ class H5Backend:
                 else:
                     array = VLARRAY(self.get_node(where).node.create_dataset(name, (0,), dtype=dt,
                                                                              maxshape=maxshape), self.backend)
-            array.array.attrs['TITLE'] = title
-            array.array.attrs[
-                'CLASS'] = 'VLARRAY'  # direct writing using h5py to be compatible with pytable automatic class writing as binary
-            array.array.attrs['EXTDIM'] = 0
-        array.attrs['shape'] = (0,)
-        array.attrs['dtype'] = dtype.name
-        array.attrs['subdtype'] = subdtype
-        array.attrs['backend'] = self.backend
+            # direct writing using h5py to be compatible with pytable automatic class writing as binary
+            write_attrs(array.array, dict(TITLE=title, CLASS='VLARRAY', EXTDIM=0), self.backend)
+        array.attrs.update(dict(shape=(0,), dtype=dtype.name, subdtype=subdtype,
+                                backend=self.backend))
+        self._index_new_node(array, 'VLARRAY')
         return array
 
     def add_group(self, group_name, group_type: GroupType, where, title='', metadata=dict([])) -> GROUP:
@@ -1010,13 +2029,11 @@ class H5Backend:
 
         group_type = enum_checker(GroupType, group_type)
 
-        if group_name in self.get_children(self.get_node(where)):
+        if group_name in self.get_children_name(where):
             node = self.get_node(where, group_name)
 
         else:
             node = self.get_set_group(where, utils.capitalize(group_name), title)
-            node.attrs['type'] = group_type.name.lower()
-            for metadat in metadata:
-                node.attrs[metadat] = metadata[metadat]
+            self.set_attrs(node, {'type': group_type.name.lower(), **metadata})
         node.attrs['backend'] = self.backend
         return node
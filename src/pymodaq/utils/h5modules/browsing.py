@@ -4,8 +4,9 @@ Created the 15/11/2022
 
 @author: Sebastien Weber
 """
-from typing import Tuple
+from typing import Tuple, Iterable
 import os
+import threading
 from collections import OrderedDict
 from typing import List
 import warnings
@@ -18,14 +19,14 @@ from packaging import version as version_mod
 from pymodaq.utils.logger import set_logger, get_module_name
 from pymodaq.utils.config import Config
 from qtpy import QtGui, QtCore
-from qtpy.QtCore import Qt, QObject, Signal, QByteArray
+from qtpy.QtCore import Qt, QObject, Signal, QByteArray, QTimer, QThread, QModelIndex
 
 from pymodaq.utils.parameter import ioxml
 
 from pymodaq.utils.gui_utils.widgets.tree_layout import TreeLayout
 from pymodaq.utils.daq_utils import capitalize
 from pymodaq.utils.data import Axis
-from pymodaq.utils.gui_utils.utils import h5tree_to_QTree, pngbinary2Qlabel
+from pymodaq.utils.gui_utils.utils import pngbinary2Qlabel
 from pymodaq.utils.gui_utils.file_io import select_file, select_file_filter
 from pymodaq.utils.plotting.data_viewers.viewerND import ViewerND
 from qtpy import QtWidgets
@@ -33,10 +34,10 @@ from pymodaq.utils import daq_utils as utils
 from pymodaq.utils.managers.action_manager import ActionManager
 from pymodaq.utils.managers.parameter_manager import ParameterManager
 from pymodaq.utils.messenger import messagebox
-from .backends import H5Backend
+from .backends import H5Backend, get_file_extension
 from .saving import H5Saver
 from . import data_saving
-from .exporter import ExporterFactory
+from .exporter import ExporterFactory, H5Exporter, ExportCancelled
 
 config = Config()
 logger = set_logger(get_module_name(__file__))
@@ -55,19 +56,46 @@ class H5BrowserUtil(H5Backend):
     def __init__(self, backend='tables'):
         super().__init__(backend=backend)
 
-    def export_data(self, node_path='/', filesavename: str = 'datafile.h5', filter=None):
-        """Initialize the correct exporter and export the node"""
+    @staticmethod
+    def get_exporter(filesavename: str, filter: str) -> H5Exporter:
+        """Get the exporter corresponding to the extension of the file and to the filter"""
+        # Separate dot from extension
+        extension = Path(filesavename).suffix[1:]
+        return ExporterFactory.create_exporter(extension,
+                                               ExporterFactory.get_format_from_filter(filter))
+
+    def export_data(self, node_path='/', filesavename: str = 'datafile.h5', filter=None,
+                    exporter: H5Exporter = None):
+        """Initialize the correct exporter and export the node
+
+        Parameters
+        ----------
+        node_path: str
+        filesavename: str
+        filter: str
+            One of the ExporterFactory file filters
+        exporter: H5Exporter
+            the exporter to use (for instance to follow the progress or to cancel the export from
+            another thread), by default the one given by get_exporter
+
+        Raises
+        ------
+        ExportCancelled: if the export has been cancelled, the partially written file being removed
+        """
 
         # Format the node and file type
         filepath = Path(filesavename)
         node = self.get_node(node_path)
-        # Separate dot from extension
-        extension = filepath.suffix[1:]
         # Obtain the suitable exporter object
-        exporter = ExporterFactory.create_exporter(extension,
-                                                   ExporterFactory.get_format_from_filter(filter))
+        if exporter is None:
+            exporter = self.get_exporter(filesavename, filter)
         # Export the data
-        exporter.export_data(node, filepath)
+        try:
+            exporter.export_data(node, filepath)
+        except ExportCancelled:
+            if filepath.is_file():
+                filepath.unlink()
+            raise
 
     def get_h5file_scans(self, where='/'):
         """Get the list of the scan nodes in the file
@@ -93,6 +121,78 @@ class H5BrowserUtil(H5Backend):
 
         return scan_list
 
+    @property
+    def lock(self) -> threading.RLock:
+        """The lock held while the file is accessed from a worker thread (see index_file and
+        H5ExportWorker), to be acquired by the other threads before accessing the file"""
+        return self._node_index_lock
+
+    def index_file(self):
+        """Walk once the whole file to build its node index (see H5Backend.get_nodes_from_attributes)
+
+        To be called from a worker thread for big files, the other methods being then fast. The
+        file is not thread safe: the lock is held meanwhile
+        """
+        with self.lock:
+            self._build_node_index()
+
+    def get_tree_pixmaps(self, node_path: str) -> List[bytes]:
+        """Get the png images (pixmap1D and pixmap2D attributes) of a node, displayed in the tree"""
+        node = self.get_node(node_path)
+        attrs_name = node.attrs.attrs_name
+        return [node.attrs[attr_name] for attr_name in ('pixmap1D', 'pixmap2D') if attr_name in attrs_name]
+
+    def get_children_info(self, where) -> List[Tuple[str, str, bool]]:
+        """Get the name, the path and if it is a group of each child of a node from the node index
+
+        Parameters
+        ----------
+        where: str or node
+            path or node instance
+
+        Returns
+        -------
+        list of tuple
+        """
+        path = self._index_path(where)
+        children_info = []
+        for name in self.get_children_name(path):
+            child_path = self._join_path(path, name)
+            children_info.append((name, child_path,
+                                  self._node_index[child_path]['children'] is not None))
+        return children_info
+
+    def search_nodes(self, text: str) -> List[str]:
+        """Get the paths of the nodes whose name or title contains text (case insensitive)
+
+        If text is of the form attr_name=value, get the paths of the nodes whose attribute attr_name
+        has this value (as a string). The attributes of the INDEXED_ATTRIBUTES (such as type or
+        data_type) are read from the node index, see H5Backend.get_nodes_from_attributes
+
+        Parameters
+        ----------
+        text: str
+
+        Returns
+        -------
+        list of str
+        """
+        paths = []
+        if '=' in text:
+            attr_name, value = [string.strip() for string in text.split('=', 1)]
+            for path in self._walk_index_paths('/'):
+                attr = self._get_index_attr(path, attr_name)
+                if attr is not None and str(attr) == value:
+                    paths.append(path)
+        else:
+            text = text.lower()
+            for path in self._walk_index_paths('/'):
+                title = self._get_index_attr(path, 'TITLE')
+                if text in path.rsplit('/', 1)[-1].lower() or (title is not None and
+                                                               text in str(title).lower()):
+                    paths.append(path)
+        return paths
+
     def get_h5_attributes(self, node_path):
         """
         """
@@ -117,14 +217,233 @@ class H5BrowserUtil(H5Backend):
         return attr_dict, settings, scan_settings, pixmaps
 
 
+class H5TreeItem:
+    """Item of the H5TreeModel corresponding to a node of the h5file
+
+    Its children are only read from the file when first needed (None until then)
+    """
+    def __init__(self, name: str, path: str, is_group: bool, parent: 'H5TreeItem' = None,
+                 row: int = 0):
+        self.name = name
+        self.path = path
+        self.is_group = is_group
+        self.parent = parent
+        self.row = row
+        self.children: List['H5TreeItem'] = None
+        self.pixmap: QtGui.QPixmap = None
+
+
+class H5TreeModel(QtCore.QAbstractItemModel):
+    """Qt model of the node tree of a h5file, populated lazily
+
+    The children of a group are only fetched (from the node index of the H5BrowserUtil) when the
+    group is expanded, so that the opening time does not depend on the number of nodes. The
+    displayed nodes can be restricted to the ones matching a search, see set_filter. The second
+    column displays the png images saved in the attributes of the nodes (see
+    H5BrowserUtil.get_tree_pixmaps), read when the node is first displayed
+
+    Parameters
+    ----------
+    h5utils: H5BrowserUtil
+    """
+    def __init__(self, h5utils: H5BrowserUtil = None):
+        super().__init__()
+        self._h5utils: H5BrowserUtil = None
+        self._root_item = H5TreeItem('', '', True)
+        self._root_item.children = []
+        self._matches: set = None
+        self._visible_paths: set = None
+        self.set_h5utils(h5utils)
+
+    def set_h5utils(self, h5utils: H5BrowserUtil = None):
+        """Display the tree of the file of h5utils (or nothing if None)"""
+        self.beginResetModel()
+        self._h5utils = h5utils
+        self._matches = None
+        self._visible_paths = None
+        self._reset_root()
+        self.endResetModel()
+
+    def _reset_root(self):
+        self._root_item.children = []
+        if self._h5utils is not None and self._h5utils.isopen():
+            self._root_item.children.append(H5TreeItem('/', '/', True, self._root_item))
+
+    def set_filter(self, paths: Iterable[str] = None):
+        """Only display the given node paths (with their parents and children), all if None"""
+        self.beginResetModel()
+        if paths is None:
+            self._matches = None
+            self._visible_paths = None
+        else:
+            self._matches = set(paths)
+            self._visible_paths = set([])
+            for path in self._matches:
+                self._visible_paths.update(self._path_and_parents(path))
+        self._reset_root()
+        self.endResetModel()
+
+    @staticmethod
+    def _path_and_parents(path: str) -> List[str]:
+        names = [name for name in path.split('/') if name != '']
+        return ['/'] + ['/' + '/'.join(names[:ind + 1]) for ind in range(len(names))]
+
+    def is_visible(self, path: str) -> bool:
+        if self._matches is None or path in self._visible_paths:
+            return True
+        return any([parent_path in self._matches
+                    for parent_path in self._path_and_parents(path)])
+
+    def fetch_all(self, parent: QModelIndex = QModelIndex()):
+        """Fetch all the (visible) items hanging from parent"""
+        if self.canFetchMore(parent):
+            self.fetchMore(parent)
+        for row in range(self.rowCount(parent)):
+            self.fetch_all(self.index(row, 0, parent))
+
+    def item_from_index(self, index: QModelIndex) -> H5TreeItem:
+        if index.isValid():
+            return index.internalPointer()
+        return self._root_item
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        parent_item = self.item_from_index(parent)
+        if parent_item.children is None or not (0 <= row < len(parent_item.children)):
+            return QModelIndex()
+        return self.createIndex(row, column, parent_item.children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        parent_item = index.internalPointer().parent
+        if parent_item is None or parent_item is self._root_item:
+            return QModelIndex()
+        return self.createIndex(parent_item.row, 0, parent_item)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        children = self.item_from_index(parent).children
+        return 0 if children is None else len(children)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 2
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        item = self.item_from_index(parent)
+        return item.is_group and (item.children is None or len(item.children) > 0)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        item = self.item_from_index(parent)
+        return item.is_group and item.children is None
+
+    def fetchMore(self, parent: QModelIndex):
+        item = self.item_from_index(parent)
+        children = [H5TreeItem(name, path, is_group, item) for name, path, is_group
+                    in self._h5utils.get_children_info(item.path) if self.is_visible(path)]
+        for row, child in enumerate(children):
+            child.row = row
+        if len(children) > 0:
+            self.beginInsertRows(parent, 0, len(children) - 1)
+        item.children = children
+        if len(children) > 0:
+            self.endInsertRows()
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item: H5TreeItem = index.internalPointer()
+        if role == Qt.DisplayRole and index.column() == 0:
+            return item.name
+        elif role == Qt.DecorationRole and index.column() == 1:
+            return self._get_pixmap(item)
+        elif role in (Qt.UserRole, Qt.ToolTipRole):
+            return item.path
+        return None
+
+    def _get_pixmap(self, item: H5TreeItem) -> QtGui.QPixmap:
+        """Get the png images of a node stacked vertically in a pixmap (None if no image)"""
+        if item.pixmap is None:
+            with self._h5utils.lock:
+                pixmaps = self._h5utils.get_tree_pixmaps(item.path)
+            images = [QtGui.QImage.fromData(QByteArray(pixmap)) for pixmap in pixmaps]
+            images = [image for image in images if not image.isNull()]
+            item.pixmap = QtGui.QPixmap()
+            if len(images) > 0:
+                item.pixmap = QtGui.QPixmap(max([image.width() for image in images]),
+                                            sum([image.height() for image in images]))
+                item.pixmap.fill(Qt.transparent)
+                painter = QtGui.QPainter(item.pixmap)
+                height = 0
+                for image in images:
+                    painter.drawImage(0, height, image)
+                    height += image.height()
+                painter.end()
+        return None if item.pixmap.isNull() else item.pixmap
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return ['Node', 'Pixmap'][section]
+        return None
+
+
+class H5Indexer(QObject):
+    """Worker building the node index of a h5file in a separate thread, see H5BrowserUtil.index_file"""
+    indexed_sig = Signal(bool)
+
+    def __init__(self, h5utils: H5BrowserUtil):
+        super().__init__()
+        self.h5utils = h5utils
+
+    def index_file(self):
+        try:
+            self.h5utils.index_file()
+            self.indexed_sig.emit(True)
+        except Exception as e:
+            logger.exception(str(e))
+            self.indexed_sig.emit(False)
+
+
+class H5ExportWorker(QObject):
+    """Worker exporting a node in a separate thread, see H5BrowserUtil.export_data
+
+    The progress (in percent) is emitted with the progress_sig and the end of the export with the
+    exported_sig (with an empty string or the error message)
+    """
+    progress_sig = Signal(int)
+    exported_sig = Signal(str)
+
+    def __init__(self, h5utils: H5BrowserUtil, node_path: str, filename: str, exporter: H5Exporter):
+        super().__init__()
+        self.h5utils = h5utils
+        self.node_path = node_path
+        self.filename = filename
+        self.exporter = exporter
+        self.exporter.set_progress_callback(self.progress_sig.emit)
+
+    def export_data(self):
+        try:
+            with self.h5utils.lock:
+                self.h5utils.export_data(self.node_path, self.filename, exporter=self.exporter)
+            self.exported_sig.emit('')
+        except ExportCancelled as e:
+            self.exported_sig.emit(str(e))
+        except Exception as e:
+            logger.exception(str(e))
+            self.exported_sig.emit(str(e))
+
+
 class View(QObject):
     item_clicked_sig = Signal(object)
     item_double_clicked_sig = Signal(object)
+    search_sig = Signal(str)
     
     def __init__(self, widget: QtWidgets.QWidget, settings_tree, settings_attributes_tree):
         super().__init__()
         self.parent_widget = widget
         self.h5file_tree: TreeLayout = None
+        self.tree_model = H5TreeModel()
+        self._search_edit: QtWidgets.QLineEdit = None
 
         self._viewer_widget: QtWidgets.QWidget = None
         self._text_list: QtWidgets.QListWidget = None
@@ -140,9 +459,20 @@ class View(QObject):
         h_splitter = QtWidgets.QSplitter(Qt.Horizontal)
 
         widget = QtWidgets.QWidget()
-        # self.ui.h5file_tree = TreeLayout(Form,col_counts=2,labels=["Node",'Pixmap'])
-        self.h5file_tree = TreeLayout(widget, col_counts=1, labels=["Node"])
+        widget.setLayout(QtWidgets.QVBoxLayout())
+        widget.layout().setContentsMargins(0, 0, 0, 0)
+        self._search_edit = QtWidgets.QLineEdit()
+        self._search_edit.setPlaceholderText('Search: node name, title or attribute=value')
+        self._search_edit.setClearButtonEnabled(True)
+        self._search_edit.returnPressed.connect(lambda: self.search_sig.emit(self._search_edit.text()))
+        self._search_edit.textChanged.connect(lambda text: self.search_sig.emit('') if text == ''
+                                              else None)
+        widget.layout().addWidget(self._search_edit)
+
+        tree_widget = QtWidgets.QWidget()
+        self.h5file_tree = TreeLayout(tree_widget, model=self.tree_model)
         self.h5file_tree.tree.setMinimumWidth(300)
+        widget.layout().addWidget(tree_widget)
 
         self.h5file_tree.item_clicked_sig.connect(self.item_clicked_sig.emit)
         self.h5file_tree.item_double_clicked_sig.connect(self.item_double_clicked_sig.emit)
@@ -184,33 +514,16 @@ class View(QObject):
     def pixmap_widget(self):
         return self._pixmap_widget
 
-    def clear(self):
-        self.h5file_tree.tree.clear()
-
-    def add_base_item(self, base_tree_item):
-        self.h5file_tree.tree.addTopLevelItem(base_tree_item)
-
-    def add_widget_to_tree(self, pixmap_items):
-        for item in pixmap_items:
-            widget = QtWidgets.QWidget()
-
-            vLayout = QtWidgets.QVBoxLayout()
-            label1D = QtWidgets.QLabel()
-            bytes = QByteArray(item['node'].attrs['pixmap1D'])
-            im1 = QtGui.QImage.fromData(bytes)
-            a = QtGui.QPixmap.fromImage(im1)
-            label1D.setPixmap(a)
-
-            label2D = QtWidgets.QLabel()
-            bytes = QByteArray(item['node'].attrs['pixmap2D'])
-            im2 = QtGui.QImage.fromData(bytes)
-            b = QtGui.QPixmap.fromImage(im2)
-            label2D.setPixmap(b)
-
-            vLayout.addWidget(label1D)
-            vLayout.addwidget(label2D)
-            widget.setLayout(vLayout)
-            self.h5file_tree.tree.setItemWidget(item['item'], 1, widget)
+    def show_tree(self, expand_all=False):
+        """Expand the root node of the tree (or all the fetched nodes)"""
+        if expand_all:
+            self.tree_model.fetch_all()
+            self.h5file_tree.expand_all()
+        else:
+            root_index = self.tree_model.index(0, 0)
+            if self.tree_model.canFetchMore(root_index):
+                self.tree_model.fetchMore(root_index)
+            self.h5file_tree.tree.expand(root_index)
 
 
 class H5Browser(QObject, ActionManager):
@@ -258,6 +571,7 @@ class H5Browser(QObject, ActionManager):
                          settings_attributes_tree=self.settings_attributes.settings_tree)
         self.view.item_clicked_sig.connect(self.show_h5_attributes)
         self.view.item_double_clicked_sig.connect(self.show_h5_data)
+        self.view.search_sig.connect(self.search_nodes)
         self.hyper_viewer = ViewerND(self.view.viewer_widget)
 
         self.setup_actions()
@@ -267,12 +581,19 @@ class H5Browser(QObject, ActionManager):
         # construct the h5 interface and load the file (or open a select file message)
         self.h5utils = H5BrowserUtil(backend=backend)
         self.data_loader = None
+        self._index_thread: QThread = None
+        self._export_thread: QThread = None
+        self._export_dialog: QtWidgets.QProgressDialog = None
+        self._follow_timer = QTimer()
+        self._follow_timer.setInterval(config('data_saving', 'h5file', 'swmr_flush_interval'))
+        self._follow_timer.timeout.connect(self.refresh_data)
         self.load_file(h5file, h5file_path)
 
     def connect_things(self):
         self.connect_action('export', self.export_data)
         self.connect_action('comment', self.add_comments)
         self.connect_action('load', lambda: self.load_file(None, None))
+        self.connect_action('follow', self.follow_file)
         self.connect_action('save', self.save_file)
         self.connect_action('quit', self.quit_fun)
         self.connect_action('about', self.show_about)
@@ -289,29 +610,50 @@ class H5Browser(QObject, ActionManager):
     def get_node_and_plot(self, with_bkg, plot_all=False):
         self.show_h5_data(item=None, with_bkg=with_bkg, plot_all=plot_all)
 
-    def load_file(self, h5file=None, h5file_path=None):
+    def load_file(self, h5file=None, h5file_path=None, swmr=False):
+        """Load a h5file in the browser
+
+        Parameters
+        ----------
+        h5file: h5file object
+            an already opened file
+        h5file_path: str or Path
+            the path of the file to open, if None a file dialog popup is opened
+        swmr: bool
+            If True, the file is opened in reading mode as a SWMR reader (with the h5py backend) to
+            follow a file being written by another process, see follow_file
+        """
+        self._stop_index_thread()
         if h5file is None:
             if h5file_path is None:
                 h5file_path = select_file(save=False, ext=['h5', 'hdf5'])
-            if Path(h5file_path).is_file():
+            if Path(h5file_path).is_file() or Path(h5file_path).suffix == get_file_extension('zarr'):
                 if self.h5utils.isopen():
                     self.h5utils.close_file()
 
-                self.h5utils.open_file(h5file_path, 'r+')
+                if Path(h5file_path).suffix == get_file_extension('zarr'):
+                    # a zarr store can always be read while being written (no SWMR needed)
+                    self.h5utils = H5BrowserUtil(backend='zarr')
+                    self.h5utils.open_file(h5file_path, 'r' if swmr else 'r+')
+                elif swmr:
+                    self.h5utils = H5BrowserUtil(backend='h5py')
+                    self.h5utils.open_file(h5file_path, 'r', swmr=True)
+                else:
+                    self.h5utils.open_file(h5file_path, 'r+')
             else:
                 return
         else:
             self.h5utils.h5file = h5file
 
-        self.data_loader = data_saving.DataLoader(self.h5utils)
+        self.data_loader = data_saving.DataLoader(self.h5utils, follow=self.h5utils.swmr_mode)
         self.check_version()
         self.populate_tree()
-        self.view.h5file_tree.expand_all()
 
     def setup_menu(self):
         menubar = self.main_window.menuBar()
         file_menu = menubar.addMenu('File')
         self.affect_to('load', file_menu)
+        self.affect_to('follow', file_menu)
         self.affect_to('save', file_menu)
         file_menu.addSeparator()
         self.affect_to('quit', file_menu)
@@ -343,6 +685,9 @@ class H5Browser(QObject, ActionManager):
                                self.get_action('plot_nodes_with_bkg')])
 
         self.add_action('load', 'Load File', 'Open', tip='Open a new file')
+        self.add_action('follow', 'Follow File', 'Refresh2', tip='Periodically refresh the displayed'
+                                                                ' data of a file being written in'
+                                                                ' SWMR mode', checkable=True)
         self.add_action('save', 'Save File as', 'SaveAs', tip='Save as another file')
         self.add_action('quit', 'Quit the application', 'Exit', tip='Quit the application')
         self.add_action('about', 'About', tip='About')
@@ -377,20 +722,21 @@ class H5Browser(QObject, ActionManager):
         """
         try:
             self.current_node_path = self.get_tree_node_path()
-            node = self.h5utils.get_node(self.current_node_path)
-            if 'comments' in node.attrs.attrs_name:
-                tmp = node.attrs['comments']
-            else:
-                tmp = ''
+            with self.h5utils.lock:
+                node = self.h5utils.get_node(self.current_node_path)
+                if 'comments' in node.attrs.attrs_name:
+                    tmp = node.attrs['comments']
+                else:
+                    tmp = ''
             if comment == '':
                 text, res = QtWidgets.QInputDialog.getMultiLineText(None, 'Enter comments', 'Enter comments here:', tmp)
                 if res and text != '':
                     comment = text
-                node.attrs['comments'] = comment
             else:
-                node.attrs['comments'] = tmp + comment
-
-            self.h5utils.flush()
+                comment = tmp + comment
+            with self.h5utils.lock:
+                node.attrs['comments'] = comment
+                self.h5utils.flush()
 
         except Exception as e:
             logger.exception(str(e))
@@ -411,22 +757,57 @@ class H5Browser(QObject, ActionManager):
             file, selected_filter = select_file_filter(save=True, filter=file_filter)
             self.current_node_path = self.get_tree_node_path()
             if file != '':
-                self.h5utils.export_data(self.current_node_path, str(file), selected_filter)
+                self.start_export(self.current_node_path, str(file), selected_filter)
 
         except Exception as e:
             logger.exception(str(e))
 
+    def start_export(self, node_path: str, filename: str, filter: str):
+        """Export a node from a worker thread, the progress being displayed in a dialog from
+        which the export can be cancelled"""
+        exporter = self.h5utils.get_exporter(filename, filter)
+        self._export_dialog = QtWidgets.QProgressDialog(f'Exporting {node_path} to {filename}',
+                                                        'Cancel', 0, 100, self.main_window)
+        self._export_dialog.setWindowModality(Qt.WindowModal)
+        self._export_dialog.setAutoClose(False)
+        self._export_dialog.canceled.connect(exporter.cancel)
+
+        self._export_thread = QThread()
+        worker = H5ExportWorker(self.h5utils, node_path, filename, exporter)
+        worker.moveToThread(self._export_thread)
+        self._export_thread.worker = worker
+        self._export_thread.started.connect(worker.export_data)
+        worker.progress_sig.connect(self._export_dialog.setValue)
+        worker.exported_sig.connect(self._end_export)
+        self._export_dialog.show()
+        self._export_thread.start()
+
+    def _end_export(self, message: str):
+        self._stop_export_thread()
+        self._export_dialog.close()
+        self.status_signal.emit('Node exported' if message == '' else message)
+
+    def _stop_export_thread(self):
+        if self._export_thread is not None:
+            self._export_thread.worker.exporter.cancel()
+            self._export_thread.quit()
+            self._export_thread.wait()
+            self._export_thread = None
+
     def save_file(self, filename=None):
 
         if filename is None:
             filename = select_file(save=True, ext='txt')
         if filename != '':
-            self.h5utils.save_file(filename)
+            with self.h5utils.lock:
+                self.h5utils.save_file(filename)
 
     def quit_fun(self):
         """
         """
         try:
+            self._stop_index_thread()
+            self._stop_export_thread()
             self.h5utils.close_file()
             if self.main_window is None:
                 self.parent_widget.close()
@@ -460,7 +841,8 @@ class H5Browser(QObject, ActionManager):
         try:
             self.current_node_path = self.get_tree_node_path()
 
-            attr_dict, settings, scan_settings, pixmaps = self.h5utils.get_h5_attributes(self.current_node_path)
+            with self.h5utils.lock:
+                attr_dict, settings, scan_settings, pixmaps = self.h5utils.get_h5_attributes(self.current_node_path)
 
             for child in self.settings_attributes.settings.children():
                 child.remove()
@@ -521,36 +903,90 @@ class H5Browser(QObject, ActionManager):
             if item is None:
                 self.current_node_path = self.get_tree_node_path()
             self.show_h5_attributes()
-            node = self.h5utils.get_node(self.current_node_path)
             self.data_node_signal.emit(self.current_node_path)
-
-            if 'data_type' in node.attrs and node.attrs['data_type'] == 'strings':
+            with self.h5utils.lock:
+                node = self.h5utils.get_node(self.current_node_path)
+                data_type = node.attrs['data_type'] if 'data_type' in node.attrs else None
+                if data_type == 'strings':
+                    texts = node.read()
+                elif data_type is not None:
+                    data_with_axes = self.data_loader.load_data(node, with_bkg=with_bkg, load_all=plot_all)
+
+            if data_type == 'strings':
                 self.view.text_list.clear()
-                for txt in node.read():
+                for txt in texts:
                     self.view.text_list.addItem(txt)
-            elif 'data_type' in node.attrs:
-                data_with_axes = self.data_loader.load_data(node, with_bkg=with_bkg, load_all=plot_all)
+            elif data_type is not None:
                 self.hyper_viewer.show_data(data_with_axes, force_update=True)
 
         except Exception as e:
             logger.exception(str(e))
 
-    def populate_tree(self):
+    def follow_file(self, follow: bool):
+        """Periodically refresh the displayed data of a file written by another process in SWMR mode
+
+        The file is reopened as a SWMR reader if needed
         """
-            | Init the ui-tree and store data into calling the h5_tree_to_Qtree convertor method
+        if follow:
+            if not self.h5utils.swmr_mode and self.h5utils.file_path is not None:
+                self.load_file(h5file_path=self.h5utils.file_path, swmr=True)
+            self._follow_timer.start()
+        else:
+            self._follow_timer.stop()
+
+    def refresh_data(self):
+        """Refresh and display again the current node data"""
+        if self.current_node_path is not None:
+            with self.h5utils.lock:
+                self.h5utils.refresh(self.current_node_path)
+            self.show_h5_data(self.current_node_path)
+
+    def populate_tree(self):
+        """Build in a worker thread the node index of the file, then display its tree
 
-            See Also
-            --------
-            h5tree_to_QTree, update_status
+        The tree is populated lazily, the children of a node being read when it is expanded
+
+        See Also
+        --------
+        H5TreeModel, H5BrowserUtil.index_file
         """
+        self.view.tree_model.set_h5utils(None)
+        if self.h5utils.h5file is None:
+            return
+        self._stop_index_thread()
+        self._index_thread = QThread()
+        indexer = H5Indexer(self.h5utils)
+        indexer.moveToThread(self._index_thread)
+        self._index_thread.indexer = indexer
+        self._index_thread.started.connect(indexer.index_file)
+        indexer.indexed_sig.connect(self._show_indexed_file)
+        self.status_signal.emit('Indexing the file...')
+        self._index_thread.start()
+
+    def _show_indexed_file(self, indexed: bool):
+        self._stop_index_thread()
+        if indexed:
+            self.view.tree_model.set_h5utils(self.h5utils)
+            self.view.show_tree()
+            self.status_signal.emit('File indexed')
+
+    def _stop_index_thread(self):
+        if self._index_thread is not None:
+            self._index_thread.quit()
+            self._index_thread.wait()
+            self._index_thread = None
+
+    def search_nodes(self, text: str):
+        """Only display the nodes matching text, see H5BrowserUtil.search_nodes (all if empty)"""
         try:
-            if self.h5utils.h5file is not None:
-                self.view.clear()
-                base_node = self.h5utils.root()
-                base_tree_item, pixmap_items = h5tree_to_QTree(base_node)
-                self.view.add_base_item(base_tree_item)
-                self.view.add_widget_to_tree(pixmap_items)
-
+            if text == '':
+                self.view.tree_model.set_filter(None)
+                self.view.show_tree()
+            else:
+                with self.h5utils.lock:
+                    paths = self.h5utils.search_nodes(text)
+                self.view.tree_model.set_filter(paths)
+                self.view.show_tree(expand_all=True)
         except Exception as e:
             logger.exception(str(e))
 
@@ -4,28 +4,153 @@ Created the 21/11/2022
 
 @author: Sebastien Weber
 """
+import datetime
+import numbers
 from time import time
-from typing import Union, List, Tuple, Iterable
+from typing import Union, List, Tuple, Iterable, Dict
 from pathlib import Path
 
 import numpy as np
 
 from pymodaq.utils.abstract import ABCMeta, abstract_attribute
-from pymodaq.utils.enums import enum_checker
+from pymodaq.utils.enums import enum_checker, BaseEnum
+from pymodaq.utils.config import Config
 from pymodaq.utils.data import (Axis, DataDim, DataWithAxes, DataToExport, DataDistribution,
                                 DataDimError, squeeze)
 from .saving import DataType, H5Saver
-from .backends import GROUP, CARRAY, Node, EARRAY, NodeError
+from .backends import GROUP, CARRAY, Node, EARRAY, NodeError, get_file_extension
 from pymodaq.utils.daq_utils import capitalize
 from pymodaq.utils.scanner.utils import ScanType
 
+config = Config()
+
 SPECIAL_GROUP_NAMES = dict(nav_axes='NavAxes')
 
 
+class Decimation(BaseEnum):
+    """Reduction applied to the data rows gathered in a single row when decimating loaded data"""
+    mean = 0
+    min = 1
+    max = 2
+
+
 class AxisError(Exception):
     pass
 
 
+class Hyperslab:
+    """Translate navigation/signal index selections (as used with DataWithAxes.inav/isig) into
+    hyperslabs of a h5 data array, so that only the selected part is read from the file
+
+    Integer indexes are read as one element slices, the corresponding dimension is then removed
+    from the loaded arrays and axes (see squeeze and reduce_axes).
+
+    Parameters
+    ----------
+    shape: Tuple[int]
+        the shape of the h5 array
+    nav_indexes: Tuple[int]
+        the navigation indexes of the data
+    squeeze_indexes: Tuple[int]
+        the indexes in the array shape of the dimensions squeezed when loading the data
+    inav: int or slice or tuple of them
+        the selection on the navigation dimensions
+    isig: int or slice or tuple of them
+        the selection on the signal dimensions
+    """
+    def __init__(self, shape: Tuple[int], nav_indexes: Tuple[int], squeeze_indexes: Tuple[int],
+                 inav=None, isig=None):
+        self._array_dims = [ind for ind in range(len(shape)) if ind not in squeeze_indexes]
+        self._shape = tuple(shape)
+        self.nav_indexes = tuple(nav_indexes)
+        sig_indexes = [ind for ind in range(len(self._array_dims)) if ind not in self.nav_indexes]
+        self._slices: Dict[int, slice] = dict([])
+        self.removed_indexes: List[int] = []
+        self._parse(inav, self.nav_indexes, 'navigation')
+        self._parse(isig, sig_indexes, 'signal')
+
+    def _parse(self, selection, indexes: List[int], dim_type: str):
+        if selection is None:
+            return
+        if isinstance(selection, numbers.Integral) or isinstance(selection, slice):
+            selection = (selection,)
+        if len(selection) > len(indexes):
+            raise IndexError(f'Too many {dim_type} indexes: {len(selection)} for '
+                             f'{len(indexes)} {dim_type} dimensions')
+        for index, _slice in zip(indexes, selection):
+            size = self._shape[self._array_dims[index]]
+            if isinstance(_slice, numbers.Integral):
+                ind = int(_slice) + size if _slice < 0 else int(_slice)
+                if not 0 <= ind < size:
+                    raise IndexError(f'Index {_slice} is out of bounds for the {dim_type} '
+                                     f'dimension {index} of size {size}')
+                self._slices[index] = slice(ind, ind + 1)
+                self.removed_indexes.append(index)
+            elif isinstance(_slice, slice):
+                self._slices[index] = _slice
+            else:
+                raise TypeError(f'Invalid index {_slice}, only int and slice are supported')
+
+    @property
+    def is_full(self) -> bool:
+        """True if the whole array is selected"""
+        return len(self._slices) == 0
+
+    def array_slices(self) -> tuple:
+        """The tuple of slices to apply to the h5 array"""
+        slices = [slice(None) for _ in self._shape]
+        for index, _slice in self._slices.items():
+            slices[self._array_dims[index]] = _slice
+        return tuple(slices)
+
+    def bkg_slices(self, bkg_shape: Tuple[int]) -> tuple:
+        """The tuple of slices to apply to a background h5 array subtracted from the data array
+
+        As when whole arrays are subtracted, the background dimensions are matched with the last
+        dimensions of the data array, background dimensions of size 1 being broadcast
+        """
+        n_extra = len(self._shape) - len(bkg_shape)
+        if n_extra < 0:
+            raise ValueError(f'The background of shape {tuple(bkg_shape)} cannot be subtracted from '
+                             f'data of shape {self._shape}')
+        slices = []
+        for size, data_size, _slice in zip(bkg_shape, self._shape[n_extra:],
+                                           self.array_slices()[n_extra:]):
+            if size == 1:
+                slices.append(slice(None))
+            elif size == data_size:
+                slices.append(_slice)
+            else:
+                raise ValueError(f'The background of shape {tuple(bkg_shape)} cannot be subtracted '
+                                 f'from data of shape {self._shape}')
+        return tuple(slices)
+
+    def axis_slice(self, index: int) -> slice:
+        """The slice to apply to the axes of a given data dimension"""
+        return self._slices.get(index, slice(None))
+
+    def squeeze(self, array: np.ndarray) -> np.ndarray:
+        """Remove from a loaded array the dimensions selected by an integer index"""
+        if len(self.removed_indexes) == 0:
+            return array
+        return np.atleast_1d(np.squeeze(array, axis=tuple(self.removed_indexes)))
+
+    def reduce_axes(self, axes: List[Axis]) -> List[Axis]:
+        """Remove the axes of the dimensions selected by an integer index and shift the index of
+        the others accordingly"""
+        reduced_axes = []
+        for axis in axes:
+            if axis.index not in self.removed_indexes:
+                axis.index -= len([ind for ind in self.removed_indexes if ind < axis.index])
+                reduced_axes.append(axis)
+        return reduced_axes
+
+    def reduce_nav_indexes(self) -> Tuple[int]:
+        """The navigation indexes of the loaded data"""
+        return tuple([index - len([ind for ind in self.removed_indexes if ind < index])
+                      for index in self.nav_indexes if index not in self.removed_indexes])
+
+
 class DataManagement(metaclass=ABCMeta):
     """Base abstract class to be used for all specialized object saving and loading data to/from a h5file
 
@@ -114,12 +239,7 @@ class DataManagement(metaclass=ABCMeta):
         -------
         int: the next available integer to index the node name
         """
-        ind = 0
-        for node in self._h5saver.walk_nodes(where):
-            if 'data_type' in node.attrs:
-                if node.attrs['data_type'] == self.data_type.name:
-                    ind += 1
-        return ind
+        return self._h5saver.get_data_type_count(where, self.data_type.name)
 
     def _is_node_of_data_type(self, where: Union[str, Node]) -> bool:
         """Check if a given node is of the data_type of the real class implementation
@@ -178,11 +298,7 @@ class DataManagement(metaclass=ABCMeta):
         else:
             parent_node = node.parent_node
 
-        nodes = []
-        for child_node in self._h5saver.walk_nodes(parent_node):
-            if self._is_node_of_data_type(child_node):
-                nodes.append(child_node)
-        return nodes
+        return self._h5saver.get_nodes_from_attributes(parent_node, data_type=self.data_type.name)
 
 
 class AxisSaverLoader(DataManagement):
@@ -224,13 +340,15 @@ class AxisSaverLoader(DataManagement):
                                                       spread_order=axis.spread_order))
         return array
 
-    def load_axis(self, where: Union[Node, str]) -> Axis:
+    def load_axis(self, where: Union[Node, str], hyperslab: Hyperslab = None) -> Axis:
         """create an Axis object from the data and metadata at a given node if of data_type: 'axis
 
         Parameters
         ----------
         where: Union[Node, str]
             the path of a given node or the node itself
+        hyperslab: Hyperslab
+            if specified, load only the part of the axis matching the data selection
 
         Returns
         -------
@@ -239,17 +357,23 @@ class AxisSaverLoader(DataManagement):
         axis_node = self._get_node(where)
         if not self._is_node_of_data_type(axis_node):
             raise AxisError(f'Could not create an Axis object from this node: {axis_node}')
+        if hyperslab is None or hyperslab.is_full:
+            axis_array = axis_node.read()
+        else:
+            axis_array = axis_node[hyperslab.axis_slice(axis_node.attrs['index'])]
         return Axis(label=axis_node.attrs['label'], units=axis_node.attrs['units'],
-                    data=squeeze(axis_node.read()), index=axis_node.attrs['index'],
+                    data=squeeze(axis_array), index=axis_node.attrs['index'],
                     spread_order=axis_node.attrs['spread_order'])
 
-    def get_axes(self, where: Union[Node, str]) -> List[Axis]:
+    def get_axes(self, where: Union[Node, str], hyperslab: Hyperslab = None) -> List[Axis]:
         """Return a list of Axis objects from the Axis Nodes hanging from (or among) a given Node
 
         Parameters
         ----------
         where: Union[Node, str]
             the path of a given node or the node itself
+        hyperslab: Hyperslab
+            if specified, load only the part of the axes matching the data selection
 
         Returns
         -------
@@ -257,7 +381,7 @@ class AxisSaverLoader(DataManagement):
         """
         axes = []
         for node in self._get_nodes_from_data_type(where):
-            axis = self.load_axis(node)
+            axis = self.load_axis(node, hyperslab)
             # if axis.size > 1:
             #     axes.append(axis)
             axes.append(axis)
@@ -270,6 +394,10 @@ class DataSaverLoader(DataManagement):
     Parameters
     ----------
     h5saver: H5Saver or Path or str
+    compression: (str, int)
+        compression library and level overriding the h5saver ones for the data arrays
+    chunk_size: int
+        target size in kB of the chunks of the data arrays overriding the config one
 
     Attributes
     ----------
@@ -278,8 +406,10 @@ class DataSaverLoader(DataManagement):
     """
     data_type = DataType['data']
 
-    def __init__(self, h5saver: Union[H5Saver, Path]):
+    def __init__(self, h5saver: Union[H5Saver, Path], compression: Tuple[str, int] = None,
+                 chunk_size: int = None):
         self.data_type = enum_checker(DataType, self.data_type)
+        self._array_options = dict(compression=compression, chunk_size=chunk_size)
 
         if isinstance(h5saver, Path) or isinstance(h5saver, str):
             h5saver_tmp = H5Saver()
@@ -289,7 +419,7 @@ class DataSaverLoader(DataManagement):
         self._h5saver = h5saver
         self._axis_saver = AxisSaverLoader(h5saver)
         if not isinstance(self, ErrorSaverLoader):
-            self._error_saver = ErrorSaverLoader(h5saver)
+            self._error_saver = ErrorSaverLoader(h5saver, **self._array_options)
 
     def isopen(self) -> bool:
         """ Get the opened status of the underlying hdf5 file"""
@@ -317,7 +447,8 @@ class DataSaverLoader(DataManagement):
                 metadata[name] = getattr(data, name)
             self._h5saver.add_array(where, self._get_next_node_name(where), self.data_type,
                                     title=data.name, array_to_save=data[ind_data],
-                                    data_dimension=data.dim.name, metadata=metadata)
+                                    data_dimension=data.dim.name, metadata=metadata,
+                                    **self._array_options)
 
         if save_axes:
             for axis in data.axes:
@@ -326,29 +457,27 @@ class DataSaverLoader(DataManagement):
         if data.errors is not None:
             self._error_saver.add_data(where, data.errors_as_dwa(), save_axes=False)
 
-    def get_axes(self, where: Union[Node, str]) -> List[Axis]:
+    def get_axes(self, where: Union[Node, str], hyperslab: Hyperslab = None) -> List[Axis]:
         """
 
         Parameters
         ----------
         where: Union[Node, str]
             the path of a given node or the node itself
+        hyperslab: Hyperslab
+            if specified, load only the part of the axes matching the data selection
 
         Returns
         -------
 
         """
-        return self._axis_saver.get_axes(where)
+        return self._axis_saver.get_axes(where, hyperslab)
 
     def get_bkg_nodes(self, where: Union[Node, str]):
-        bkg_nodes = []
-        for node in self._h5saver.walk_nodes(where):
-            if 'data_type' in node.attrs and node.attrs['data_type'] == 'bkg':
-                bkg_nodes.append(node)
-        return bkg_nodes
+        return self._h5saver.get_nodes_from_attributes(where, data_type='bkg')
 
     def get_data_arrays(self, where: Union[Node, str], with_bkg=False,
-                        load_all=False) -> List[np.ndarray]:
+                        load_all=False, hyperslab: Hyperslab = None) -> List[np.ndarray]:
         """
 
         Parameters
@@ -359,11 +488,15 @@ class DataSaverLoader(DataManagement):
             If True try to load background node and return the array with background subtraction
         load_all: bool
             If True load all similar nodes hanging from a parent
+        hyperslab: Hyperslab
+            if specified, read only the selected part of the arrays
 
         Returns
         -------
         list of ndarray
         """
+        if hyperslab is not None and not hyperslab.is_full:
+            return self._get_data_arrays_hyperslab(where, with_bkg, load_all, hyperslab)
         where = self._get_node(where)
         if with_bkg:
             bkg_nodes = []
@@ -386,16 +519,54 @@ class DataSaverLoader(DataManagement):
                             squeeze_indexes=self._get_signal_indexes_to_squeeze(array))
                     for array in getter(where)]
 
+    def _get_data_arrays_hyperslab(self, where: Union[Node, str], with_bkg: bool, load_all: bool,
+                                   hyperslab: Hyperslab) -> List[np.ndarray]:
+        """Same as get_data_arrays but reading only the hyperslab of the arrays"""
+        where = self._get_node(where)
+        bkg_nodes = self.get_bkg_nodes(where.parent_node) if with_bkg else []
+        getter = self._get_nodes_from_data_type if load_all else self._get_nodes
+        arrays = []
+        for ind, array in enumerate(getter(where)):
+            data_array = array[hyperslab.array_slices()]
+            if ind < len(bkg_nodes):
+                data_array = data_array - bkg_nodes[ind][hyperslab.bkg_slices(bkg_nodes[ind].shape)]
+            arrays.append(hyperslab.squeeze(
+                squeeze(data_array, squeeze_indexes=self._get_signal_indexes_to_squeeze(array))))
+        return arrays
+
+    def get_hyperslab(self, where: Union[Node, str], inav=None, isig=None) -> Hyperslab:
+        """Get the Hyperslab object corresponding to navigation/signal selections on a data node
+
+        Parameters
+        ----------
+        where: Union[Node, str]
+            the path of a given data node or the node itself
+        inav: int or slice or tuple of them
+            the selection on the navigation dimensions, as with DataWithAxes.inav
+        isig: int or slice or tuple of them
+            the selection on the signal dimensions, as with DataWithAxes.isig
+
+        Returns
+        -------
+        Hyperslab
+        """
+        array = self._get_node(where)
+        nav_indexes = array.attrs['nav_indexes'] if 'nav_indexes' in array.attrs else ()
+        return Hyperslab(array.shape, nav_indexes if nav_indexes is not None else (),
+                         self._get_signal_indexes_to_squeeze(array), inav=inav, isig=isig)
+
     def _get_signal_indexes_to_squeeze(self, array: Union[CARRAY, EARRAY]):
         """ Get the tuple of indexes in the array shape that are not navigation and should be
         squeezed"""
         sig_indexes = []
-        for ind in range(len(array.attrs['shape'])):
-            if ind not in array.attrs['nav_indexes'] and array.attrs['shape'][ind] == 1:
+        shape = array.shape  # the shape attribute may not be written yet, see AppendBuffer
+        for ind in range(len(shape)):
+            if ind not in array.attrs['nav_indexes'] and shape[ind] == 1:
                 sig_indexes.append(ind)
         return tuple(sig_indexes)
 
-    def load_data(self, where, with_bkg=False, load_all=False) -> DataWithAxes:
+    def load_data(self, where, with_bkg=False, load_all=False, inav=None,
+                  isig=None) -> DataWithAxes:
         """Return a DataWithAxes object from the Data and Axis Nodes hanging from (or among) a
         given Node
 
@@ -410,11 +581,25 @@ class DataSaverLoader(DataManagement):
             If True try to load background node and return the data with background subtraction
         load_all: bool
             If True, will load all data hanging from the same parent node
+        inav: int or slice or tuple of them
+            if specified, load only this selection of the navigation dimensions (as with
+            DataWithAxes.inav), only the selected part of the arrays is read from the file
+        isig: int or slice or tuple of them
+            if specified, load only this selection of the signal dimensions (as with
+            DataWithAxes.isig)
 
         See Also
         --------
         load_data
         """
+        hyperslab = None
+        if (inav is not None or isig is not None) and 'axis' not in self.data_type.name:
+            hyperslab = self.get_hyperslab(where, inav, isig)
+        return self._load_data(where, with_bkg=with_bkg, load_all=load_all, hyperslab=hyperslab)
+
+    def _load_data(self, where, with_bkg=False, load_all=False,
+                   hyperslab: Hyperslab = None) -> DataWithAxes:
+        """See load_data, the hyperslab argument defining the part of the arrays to be read"""
 
         data_node = self._get_node(where)
 
@@ -442,10 +627,12 @@ class DataSaverLoader(DataManagement):
                          data=np.linspace(0, ndarrays[0].size-1, ndarrays[0].size-1))]
             error_arrays = None
         else:
-            ndarrays = self.get_data_arrays(data_node, with_bkg=with_bkg, load_all=load_all)
-            axes = self.get_axes(parent_node)
+            ndarrays = self.get_data_arrays(data_node, with_bkg=with_bkg, load_all=load_all,
+                                            hyperslab=hyperslab)
+            axes = self.get_axes(parent_node, hyperslab)
             if error_node is not None:
-                error_arrays = self._error_saver.get_data_arrays(error_node, load_all=load_all)
+                error_arrays = self._error_saver.get_data_arrays(error_node, load_all=load_all,
+                                                                 hyperslab=hyperslab)
                 if len(error_arrays) == 0:
                     error_arrays = None
             else:
@@ -457,6 +644,11 @@ class DataSaverLoader(DataManagement):
                      'subdtype', 'shape', 'size', 'EXTDIM', 'path', 'timestamp', 'units']:
             extra_attributes.pop(name, None)
 
+        nav_indexes = data_node.attrs['nav_indexes'] if 'nav_indexes' in data_node.attrs else ()
+        if hyperslab is not None:
+            axes = hyperslab.reduce_axes(axes)
+            nav_indexes = hyperslab.reduce_nav_indexes()
+
         data = DataWithAxes(data_node.attrs['TITLE'],
                             source=data_node.attrs['source'] if 'source' in data_node.attrs
                             else 'raw',
@@ -466,8 +658,7 @@ class DataSaverLoader(DataManagement):
                             data=ndarrays,
                             labels=[node.attrs['label'] for node in data_nodes],
                             origin=data_node.attrs['origin'] if 'origin' in data_node.attrs else '',
-                            nav_indexes=data_node.attrs['nav_indexes'] if 'nav_indexes' in
-                                                                          data_node.attrs else (),
+                            nav_indexes=nav_indexes,
                             axes=axes,
                             errors=error_arrays,
                             path=data_node.path,
@@ -491,8 +682,8 @@ class BkgSaver(DataSaverLoader):
     """
     data_type = DataType['bkg']
 
-    def __init__(self, h5saver: H5Saver):
-        super().__init__(h5saver)
+    def __init__(self, h5saver: H5Saver, **kwargs):
+        super().__init__(h5saver, **kwargs)
 
 
 class ErrorSaverLoader(DataSaverLoader):
@@ -509,8 +700,8 @@ class ErrorSaverLoader(DataSaverLoader):
     """
     data_type = DataType['error']
 
-    def __init__(self, h5saver: H5Saver):
-        super().__init__(h5saver)
+    def __init__(self, h5saver: H5Saver, **kwargs):
+        super().__init__(h5saver, **kwargs)
 
 
 class DataEnlargeableSaver(DataSaverLoader):
@@ -538,8 +729,8 @@ class DataEnlargeableSaver(DataSaverLoader):
 
     def __init__(self, h5saver: Union[H5Saver, Path],
                  enl_axis_names: Iterable[str] = ('nav axis',),
-                 enl_axis_units: Iterable[str] = ('',)):
-        super().__init__(h5saver)
+                 enl_axis_units: Iterable[str] = ('',), **kwargs):
+        super().__init__(h5saver, **kwargs)
 
         self._n_enl_axes = len(enl_axis_names)
         self._enl_axis_names = enl_axis_names
@@ -584,7 +775,8 @@ class DataEnlargeableSaver(DataSaverLoader):
                                                       source=data.source.name,
                                                       distribution='spread',
                                                       origin=data.origin,
-                                                      nav_indexes=tuple(nav_indexes)))
+                                                      nav_indexes=tuple(nav_indexes)),
+                                        **self._array_options)
             if add_enl_axes:
                 for ind_enl_axis in range(self._n_enl_axes):
                     self._axis_saver.add_axis(where,
@@ -635,7 +827,8 @@ class DataEnlargeableSaver(DataSaverLoader):
             for ind_axis in range(self._n_enl_axes):
                 axis_array: EARRAY = self._axis_saver.get_node_from_index(where, ind_axis)
                 axis_array.append(np.array([axis_values[ind_axis]]))
-                axis_array.attrs['size'] += 1
+                if not axis_array.is_buffered:  # otherwise updated when writing the buffer
+                    axis_array.attrs['size'] += 1
 
 
 class DataExtendedSaver(DataSaverLoader):
@@ -654,8 +847,8 @@ class DataExtendedSaver(DataSaverLoader):
     """
     data_type = DataType['data']
 
-    def __init__(self, h5saver: H5Saver, extended_shape: Tuple[int]):
-        super().__init__(h5saver)
+    def __init__(self, h5saver: H5Saver, extended_shape: Tuple[int], **kwargs):
+        super().__init__(h5saver, **kwargs)
         self.extended_shape = extended_shape
 
     def _create_data_arrays(self, where: Union[Node, str], data: DataWithAxes, save_axes=True,
@@ -689,7 +882,8 @@ class DataExtendedSaver(DataSaverLoader):
                                         metadata=dict(timestamp=data.timestamp, label=data.labels[ind_data],
                                                       source=data.source.name, distribution=distribution.name,
                                                       origin=data.origin,
-                                                      nav_indexes=tuple(nav_indexes)))
+                                                      nav_indexes=tuple(nav_indexes)),
+                                        **self._array_options)
 
             if save_axes:
                 for axis in data.axes:
@@ -713,8 +907,8 @@ class DataExtendedSaver(DataSaverLoader):
         if len(indexes) != len(self.extended_shape):
             raise IndexError(f'Cannot put data into the h5array with extended indexes {indexes}')
         for ind in range(len(indexes)):
-            if indexes[ind] > self.extended_shape[ind]:
-                raise IndexError(f'Indexes cannot be higher than the array shape')
+            if not 0 <= indexes[ind] < self.extended_shape[ind]:
+                raise IndexError(f'Indexes {indexes} are out of the extended shape {self.extended_shape}')
 
         if self.get_last_node_name(where) is None:
             self._create_data_arrays(where, data, save_axes=True, distribution=distribution)
@@ -732,17 +926,22 @@ class DataToExportSaver:
     Parameters
     ----------
     h5saver: H5Saver
-
+    compression: (str, int)
+        compression library and level overriding the h5saver ones for the data arrays
+    chunk_size: int
+        target size in kB of the chunks of the data arrays overriding the config one
     """
-    def __init__(self, h5saver: Union[H5Saver, Path, str]):
+    def __init__(self, h5saver: Union[H5Saver, Path, str], compression: Tuple[str, int] = None,
+                 chunk_size: int = None):
         if isinstance(h5saver, Path) or isinstance(h5saver, str):
             h5saver_tmp = H5Saver()
             h5saver_tmp.init_file(addhoc_file_path=Path(h5saver))
             h5saver = h5saver_tmp
 
         self._h5saver = h5saver
-        self._data_saver = DataSaverLoader(h5saver)
-        self._bkg_saver = BkgSaver(h5saver)
+        self._array_options = dict(compression=compression, chunk_size=chunk_size)
+        self._data_saver = DataSaverLoader(h5saver, **self._array_options)
+        self._bkg_saver = BkgSaver(h5saver, **self._array_options)
 
     def _get_node(self, where: Union[Node, str]) -> Node:
         return self._h5saver.get_node(where)
@@ -837,13 +1036,14 @@ class DataToExportEnlargeableSaver(DataToExportSaver):
         the name of the enlarged axis array
     axis_units: str, deprecated use enl_axis_units
         the units of the enlarged axis array
+    kwargs: compression and chunk_size overrides, see DataToExportSaver
     """
     def __init__(self, h5saver: H5Saver,
                  enl_axis_names: Iterable[str] = None,
                  enl_axis_units: Iterable[str] = None,
-                 axis_name: str = 'nav axis', axis_units: str = ''):
+                 axis_name: str = 'nav axis', axis_units: str = '', **kwargs):
 
-        super().__init__(h5saver)
+        super().__init__(h5saver, **kwargs)
         if enl_axis_names is None:  # for backcompatibility
             enl_axis_names = (axis_name,)
         if enl_axis_units is None:  # for backcompatibilitu
@@ -856,7 +1056,7 @@ class DataToExportEnlargeableSaver(DataToExportSaver):
         self._enl_axis_units = enl_axis_units
         self._n_enl = len(enl_axis_names)
 
-        self._data_saver = DataEnlargeableSaver(h5saver)
+        self._data_saver = DataEnlargeableSaver(h5saver, **self._array_options)
         self._nav_axis_saver = AxisSaverLoader(h5saver)
 
     def add_data(self, where: Union[Node, str], data: DataToExport,
@@ -902,7 +1102,8 @@ class DataToExportEnlargeableSaver(DataToExportSaver):
             axis_array: EARRAY = self._nav_axis_saver.get_node_from_index(nav_group, ind)
             axis_array.append(squeeze(np.array([axis_values[ind]])),
                               expand=False)
-            axis_array.attrs['size'] += 1
+            if not axis_array.is_buffered:  # otherwise updated when writing the buffer
+                axis_array.attrs['size'] += 1
 
 
 class DataToExportTimedSaver(DataToExportEnlargeableSaver):
@@ -915,13 +1116,47 @@ class DataToExportTimedSaver(DataToExportEnlargeableSaver):
     -----
     This object is made for continuous saving mode of DAQViewer and logging to h5file for DAQLogger
     """
-    def __init__(self, h5saver: H5Saver):
-        super().__init__(h5saver, enl_axis_names=('time',), enl_axis_units=('s',))
+    def __init__(self, h5saver: H5Saver, **kwargs):
+        super().__init__(h5saver, enl_axis_names=('time',), enl_axis_units=('s',), **kwargs)
+        self._time_indexes: Dict[str, list] = dict([])
 
     def add_data(self, where: Union[Node, str], data: DataToExport, settings_as_xml='',
                  metadata=None, **kwargs):
         super().add_data(where, data, axis_values=[data.timestamp], settings_as_xml=settings_as_xml,
                          metadata=metadata)
+        self._update_time_index(where, data.timestamp)
+
+    def _update_time_index(self, where: Union[Node, str], timestamp: float):
+        """Keep the time of the first row of each block of the time axis in a small enlargeable
+        array, so that a time range can be located without reading the whole time axis, see
+        DataLoader.load_time_range
+
+        The index array, its block size and the number of rows of the time axis are cached for
+        each opened file. An index created on a time axis already holding rows (file written
+        without index) is first filled from these rows"""
+        path = where.path if isinstance(where, Node) else where
+        time_index = self._time_indexes.get(path, None)
+        if time_index is None or time_index[0] is not self._h5saver.h5file:
+            nav_group = self._h5saver.get_node(self._get_node(where),
+                                               SPECIAL_GROUP_NAMES['nav_axes'])
+            time_array: EARRAY = self._nav_axis_saver.get_node_from_index(nav_group, 0)
+            nrows = time_array.nrows - 1  # rows saved before this one
+            if not self._h5saver.is_node_in_group(nav_group, DataType['time_index'].value):
+                block_size = config('data_saving', 'h5file', 'time_index_block_size')
+                index_array = self._h5saver.add_array(
+                    nav_group, DataType['time_index'].value, 'time_index', enlargeable=True,
+                    array_type=float, data_dimension=DataDim['Data1D'], title='time index',
+                    metadata=dict(block_size=block_size))
+                if nrows > 0:
+                    index_array.append(squeeze(time_array[:nrows]).reshape((-1,))[::block_size],
+                                       expand=False)
+            index_array: EARRAY = self._h5saver.get_node(nav_group, DataType['time_index'].value)
+            time_index = [self._h5saver.h5file, index_array, index_array.attrs['block_size'],
+                          nrows]
+            self._time_indexes[path] = time_index
+        if time_index[3] % time_index[2] == 0:
+            time_index[1].append(np.array([timestamp]), expand=False)
+        time_index[3] += 1
 
 
 class DataToExportExtendedSaver(DataToExportSaver):
@@ -934,11 +1169,12 @@ class DataToExportExtendedSaver(DataToExportSaver):
     h5saver: H5Saver
     extended_shape: Tuple[int]
         the extra shape compared to the data the h5array will have
+    kwargs: compression and chunk_size overrides, see DataToExportSaver
     """
 
-    def __init__(self, h5saver: H5Saver, extended_shape: Tuple[int]):
-        super().__init__(h5saver)
-        self._data_saver = DataExtendedSaver(h5saver, extended_shape)
+    def __init__(self, h5saver: H5Saver, extended_shape: Tuple[int], **kwargs):
+        super().__init__(h5saver, **kwargs)
+        self._data_saver = DataExtendedSaver(h5saver, extended_shape, **self._array_options)
         self._nav_axis_saver = AxisSaverLoader(h5saver)
 
     def add_nav_axes(self, where: Union[Node, str], axes: List[Axis]):
@@ -993,15 +1229,26 @@ class DataLoader:
     Parameters
     ----------
     h5saver: H5Saver
+    follow: bool
+        If True, the file is being written by another process in SWMR mode (see
+        H5Backend.start_swmr) and the arrays are refreshed before each loading to get the latest
+        written data. If h5saver is a path, the file is opened as a SWMR reader (h5py backend), or
+        as a zarr store if its extension is .zarr
     """
 
-    def __init__(self, h5saver: Union[H5Saver, Path]):
+    def __init__(self, h5saver: Union[H5Saver, Path], follow=False):
         self._axis_loader: AxisSaverLoader = None
         self._data_loader: DataSaverLoader = None
+        self.follow = follow
 
         if isinstance(h5saver, Path) or isinstance(h5saver, str):
-            h5saver_tmp = H5Saver()
-            h5saver_tmp.init_file(addhoc_file_path=Path(h5saver))
+            is_zarr = Path(h5saver).suffix == get_file_extension('zarr')
+            if follow:
+                h5saver_tmp = H5Saver(backend='zarr' if is_zarr else 'h5py')
+                h5saver_tmp.open_file(Path(h5saver), 'r', swmr=not is_zarr)
+            else:
+                h5saver_tmp = H5Saver(backend='zarr') if is_zarr else H5Saver()
+                h5saver_tmp.init_file(addhoc_file_path=Path(h5saver))
             h5saver = h5saver_tmp
 
         self.h5saver = h5saver
@@ -1057,7 +1304,8 @@ class DataLoader:
                     return self._h5saver.get_node(node, SPECIAL_GROUP_NAMES['nav_axes'])
             node = node.parent_node
 
-    def load_data(self, where: Union[Node, str], with_bkg=False, load_all=False) -> DataWithAxes:
+    def load_data(self, where: Union[Node, str], with_bkg=False, load_all=False, inav=None,
+                  isig=None) -> DataWithAxes:
         """Load data from a node (or channel node)
 
         Loaded data contains also nav_axes if any and with optional background subtraction
@@ -1070,18 +1318,33 @@ class DataLoader:
             If True will attempt to substract a background data node before loading
         load_all: bool
             If True, will load all data hanging from the same parent node
+        inav: int or slice or tuple of them
+            if specified, load only this selection of the navigation dimensions (as with
+            DataWithAxes.inav). Only the selected part of the data and axes arrays is read from the
+            file
+        isig: int or slice or tuple of them
+            if specified, load only this selection of the signal dimensions (as with
+            DataWithAxes.isig)
 
         Returns
         -------
 
         """
+        if self.follow:
+            self.refresh(where)
         node_data_type = DataType[self._h5saver.get_node(where).attrs['data_type']]
         self._data_loader.data_type = node_data_type
-        data = self._data_loader.load_data(where, with_bkg=with_bkg, load_all=load_all)
+        hyperslab = None
+        if (inav is not None or isig is not None) and 'axis' not in node_data_type.name:
+            hyperslab = self._data_loader.get_hyperslab(where, inav, isig)
+        data = self._data_loader._load_data(where, with_bkg=with_bkg, load_all=load_all,
+                                            hyperslab=hyperslab)
         if 'axis' not in node_data_type.name:
             nav_group = self.get_nav_group(where)
             if nav_group is not None:
-                nav_axes = self._axis_loader.get_axes(nav_group)
+                nav_axes = self._axis_loader.get_axes(nav_group, hyperslab)
+                if hyperslab is not None:
+                    nav_axes = hyperslab.reduce_axes(nav_axes)
                 axes = data.axes[:]
                 axes.extend(nav_axes)
                 data.axes = axes
@@ -1089,6 +1352,169 @@ class DataLoader:
         data.create_missing_axes()
         return data
 
+    def get_time_rows(self, where: Union[Node, str], start: float = None,
+                      stop: float = None) -> slice:
+        """Get the rows of timed enlargeable data (see DataToExportTimedSaver) acquired between two
+        times
+
+        Only the blocks of the time axis possibly containing start and stop are read, using the
+        time index written with the data (the whole time axis is read for files without index)
+
+        Parameters
+        ----------
+        where: Union[Node, str]
+            the path of a given enlargeable node or the node itself
+        start: float or datetime
+            the time (timestamp in s or datetime) of the first row, from the first one if None
+        stop: float or datetime
+            the time of the last row, up to the last one if None
+
+        Returns
+        -------
+        slice: the selection of rows
+        """
+        if self.follow:
+            self.refresh(where)
+        if isinstance(start, datetime.datetime):
+            start = start.timestamp()
+        if isinstance(stop, datetime.datetime):
+            stop = stop.timestamp()
+        nav_group = self.get_nav_group(where)
+        if nav_group is None:
+            raise NodeError(f'No time axis related to the node {where}')
+        time_array: EARRAY = self._axis_loader.get_node_from_index(nav_group, 0)
+        nrows = time_array.nrows
+        block_start, block_stop = 0, nrows
+        if self._h5saver.is_node_in_group(nav_group, DataType['time_index'].value):
+            index_array = self._h5saver.get_node(nav_group, DataType['time_index'].value)
+            block_times = squeeze(index_array.read())
+            block_size = index_array.attrs['block_size']
+            if start is not None:
+                block_start = max(int(np.searchsorted(block_times, start, side='right')) - 1,
+                                  0) * block_size
+            if stop is not None:
+                block_stop = min(int(np.searchsorted(block_times, stop, side='right')) * block_size,
+                                 nrows)
+        times = squeeze(time_array[block_start:block_stop]) if block_stop > block_start \
+            else np.array([])
+        row_start = block_start if start is None else \
+            block_start + int(np.searchsorted(times, start, side='left'))
+        row_stop = block_stop if stop is None else \
+            block_start + int(np.searchsorted(times, stop, side='right'))
+        return slice(row_start, max(row_start, row_stop))
+
+    def load_time_range(self, where: Union[Node, str], start: float = None, stop: float = None,
+                        max_rows: int = None, decimation: Decimation = 'mean',
+                        with_bkg=False) -> DataWithAxes:
+        """Load the part of timed enlargeable data (see DataToExportTimedSaver) acquired between
+        two times, for instance the last ten minutes with start=time.time() - 600
+
+        Parameters
+        ----------
+        where: Union[Node, str]
+            the path of a given enlargeable node or the node itself
+        start: float or datetime
+            the time (timestamp in s or datetime) of the first row, from the first one if None
+        stop: float or datetime
+            the time of the last row, up to the last one if None
+        max_rows: int
+            if specified and if more rows are selected, consecutive rows are gathered into
+            max_rows rows (for instance the number of pixels of a plot)
+        decimation: Decimation or str
+            how the gathered rows are reduced: 'mean', 'min' or 'max' (the time is averaged)
+        with_bkg: bool
+            If True will attempt to substract a background data node before loading
+
+        Returns
+        -------
+        DataWithAxes: or None if no data has been acquired between start and stop
+
+        See Also
+        --------
+        get_time_rows
+        """
+        rows = self.get_time_rows(where, start, stop)
+        if rows.stop == rows.start:
+            return None
+        data = self.load_data(where, with_bkg=with_bkg, inav=rows)
+        if max_rows is None or len(data.get_nav_axes()) == 0 or \
+                data.get_nav_axes()[0].size <= max_rows:
+            return data
+
+        decimation = enum_checker(Decimation, decimation)
+        nrows = data.get_nav_axes()[0].size
+        bin_starts = np.unique(np.linspace(0, nrows, max_rows, endpoint=False).astype(int))
+        bin_sizes = np.diff(np.append(bin_starts, nrows))
+        reducer = dict(mean=np.add, min=np.minimum, max=np.maximum)[decimation.name]
+        arrays = []
+        for array in data:
+            array = reducer.reduceat(array, bin_starts, axis=0)
+            if decimation == Decimation['mean']:
+                array = array / bin_sizes.reshape((-1,) + (1,) * (array.ndim - 1))
+            arrays.append(array)
+        axes_data = dict([])
+        for ind_axis, axis in enumerate(data.axes):
+            if axis.index == 0:
+                axes_data[ind_axis] = np.add.reduceat(axis.get_data(), bin_starts) / bin_sizes
+        return self._new_enlargeable_data(data, arrays, axes_data)
+
+    @staticmethod
+    def _new_enlargeable_data(dwa: DataWithAxes, data: List[np.ndarray],
+                              axes_data: Dict[int, np.ndarray]) -> DataWithAxes:
+        """Copy of enlargeable data with new data arrays and new values of its enlargeable axes
+        (given by their position in the axes list)"""
+        new_dwa = dwa.deepcopy_with_new_data(data, source=dwa.source, keep_dim=True)
+        axes = []
+        for ind_axis, axis in enumerate(dwa.axes):
+            axis = axis.copy()
+            if ind_axis in axes_data:
+                axis.data = axes_data[ind_axis]
+            axes.append(axis)
+        new_dwa.axes = axes
+        return new_dwa
+
+    def load_rolled_data(self, where: Union[Node, str], with_bkg=False) -> DataWithAxes:
+        """Load enlargeable data saved into a series of rolled files as a single continuous dataset
+
+        The node with the same path is loaded from each file of the series the current file belongs
+        to (see H5SaverLowLevel.rollover) and the data and enlargeable axes are concatenated along
+        the enlargeable dimension
+
+        Parameters
+        ----------
+        where: Union[Node, str]
+            the path of a given enlargeable node or the node itself
+        with_bkg: bool
+            If True will attempt to substract a background data node before loading
+
+        Returns
+        -------
+        DataWithAxes
+        """
+        path = self._h5saver.get_node(where).path
+        dwas = []
+        for file_path in self._h5saver.get_rollover_files():
+            if file_path == Path(self._h5saver.file_path):
+                dwas.append(self.load_data(path, with_bkg=with_bkg))
+            else:
+                with DataLoader(file_path) as loader:
+                    dwas.append(loader.load_data(path, with_bkg=with_bkg))
+        if len(dwas) == 1:
+            return dwas[0]
+
+        return self._new_enlargeable_data(
+            dwas[0], [np.concatenate([dwa[ind] for dwa in dwas]) for ind in range(len(dwas[0]))],
+            {ind_axis: np.concatenate([dwa.axes[ind_axis].get_data() for dwa in dwas])
+             for ind_axis, axis in enumerate(dwas[0].axes) if axis.index == 0})
+
+    def refresh(self, where: Union[Node, str]):
+        """Update the arrays related to a data node with the data written meanwhile by another
+        process, see H5Backend.refresh"""
+        self._h5saver.refresh(self._h5saver.get_node(where).parent_node)
+        nav_group = self.get_nav_group(where)
+        if nav_group is not None:
+            self._h5saver.refresh(nav_group)
+
     def load_all(self, where: GROUP, data: DataToExport, with_bkg=False) -> DataToExport:
 
         where = self._h5saver.get_node(where)
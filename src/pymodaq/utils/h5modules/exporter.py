@@ -6,16 +6,23 @@ Created the 02/03/2023
 """
 # Standard imports
 from abc import ABCMeta, abstractmethod
-from typing import Callable
+from typing import Callable, Iterable, Tuple, List
 
 # 3rd party imports
 import numpy as np
 
 # project imports
-from pymodaq.utils.h5modules.backends import H5Backend, Node
+from pymodaq.utils.h5modules.backends import H5Backend, Node, CARRAY, GROUP
 from pymodaq.utils.logger import set_logger, get_module_name
+from pymodaq.utils.config import Config
 
 logger = set_logger(get_module_name(__file__))
+config = Config()
+
+
+class ExportCancelled(Exception):
+    """Raised by an exporter whose export has been cancelled, see H5Exporter.cancel"""
+    pass
 
 
 class H5Exporter(metaclass=ABCMeta):
@@ -38,13 +45,145 @@ class H5Exporter(metaclass=ABCMeta):
 
     def __init__(self):
         """Abstract Exporter Constructor"""
-        pass
+        self._progress_callback: Callable[[int], None] = None
+        self._cancelled = False
+        self.chunk_size: int = config('data_saving', 'h5file', 'export_chunk_size')
 
     @abstractmethod
     def export_data(self, node: Node, filename: str) -> None:
-        """Abstract method to save a .h5 node to a file"""
+        """Abstract method to save a .h5 node to a file
+
+        The data should be read and written chunk by chunk, see iter_chunks, calling progress so that
+        the export can be followed and cancelled
+        """
         pass
 
+    def set_progress_callback(self, callback: Callable[[int], None] = None):
+        """Set a function called with the export progress (in percent) while exporting"""
+        self._progress_callback = callback
+
+    def cancel(self):
+        """Cancel the running export, the export_data method then raises an ExportCancelled"""
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def progress(self, done: int, total: int):
+        """Report the export progress and stop the export if it has been cancelled
+
+        Parameters
+        ----------
+        done: int
+            the number of exported elements (rows, nodes...)
+        total: int
+            the total number of elements to export
+
+        Raises
+        ------
+        ExportCancelled
+        """
+        if self._cancelled:
+            raise ExportCancelled('The export has been cancelled')
+        if self._progress_callback is not None:
+            self._progress_callback(int(100 * done / total) if total > 0 else 100)
+
+    def get_chunk_rows(self, array: CARRAY, axis: int = 0) -> int:
+        """Get the number of rows (along axis) of an array fitting in the export chunk size
+
+        The number is a multiple of the rows of the hdf5 chunks (if any) so that each chunk of the
+        file is read once
+        """
+        shape = array.shape
+        row_bytes = array.array.dtype.itemsize * int(np.prod(shape)) // max(1, shape[axis])
+        rows = max(1, int(self.chunk_size * 1e6) // max(1, row_bytes))
+        chunk_shape = array.chunk_shape
+        if chunk_shape is not None and chunk_shape[axis] < rows:
+            rows = rows // chunk_shape[axis] * chunk_shape[axis]
+        return rows
+
+    def iter_chunks(self, array: CARRAY, axis: int = 0) -> Iterable[Tuple[slice, np.ndarray]]:
+        """Read an array chunk by chunk along axis, reporting the progress
+
+        Parameters
+        ----------
+        array: CARRAY
+            the array node to read (read at once if its data are not a ndarray, as for strings)
+        axis: int
+            the axis along which the array is sliced
+
+        Yields
+        ------
+        tuple of the slice along axis and the corresponding ndarray data
+        """
+        if array.attrs['CLASS'] in ('VLARRAY', 'StringARRAY'):
+            self.progress(0, 1)
+            data = array.read()
+            yield slice(0, len(data)), data if isinstance(data, np.ndarray) else np.array(data)
+            self.progress(1, 1)
+            return
+        shape = array.shape
+        length = shape[axis] if len(shape) > 0 else 1
+        rows = self.get_chunk_rows(array, axis) if len(shape) > 0 else 1
+        self.progress(0, length)
+        for start in range(0, length, rows):
+            rows_slice = slice(start, min(start + rows, length))
+            if len(shape) == 0:
+                data = array.read()
+            else:
+                data = array[(slice(None),) * axis + (rows_slice,)]
+            yield rows_slice, data
+            self.progress(rows_slice.stop, length)
+
+    def export_group_columns(self, group: GROUP, filename: str):
+        """Export the 1D arrays of a group as the tab separated columns of a text file
+
+        The rows are written by chunks, see iter_chunks
+        """
+        arrays: List[CARRAY] = []
+        header = []
+        fmts = []
+        for subnode_name, subnode in group.children().items():
+            if 'ARRAY' in subnode.attrs['CLASS'] and len(subnode.attrs['shape']) == 1:
+                arrays.append(subnode)
+                header.append(subnode_name)
+        if len(arrays) == 0:
+            return
+        length = min([len(array) for array in arrays])
+        rows = min([self.get_chunk_rows(array) for array in arrays])
+        with open(filename, 'w', buffering=EXPORT_BUFFERING) as f:
+            f.write('# #' + '\t'.join(header) + '\n')
+            self.progress(0, length)
+            for start in range(0, length, rows):
+                datas = []
+                for array in arrays:
+                    data = array[start:min(start + rows, length)]
+                    if not isinstance(data, np.ndarray):
+                        # in case one has a list of same objects (array of strings for instance, logger or other)
+                        data = np.array(data)
+                    datas.append(data)
+                if len(fmts) == 0:
+                    fmts = [get_text_format(data, decimal='%.6f', integer='%d') for data in datas]
+                data_trans = np.array(list(zip(*datas)), dtype=[(name, data.dtype) for name, data
+                                                                  in zip(header, datas)])
+                np.savetxt(f, data_trans, fmts, '\t')
+                self.progress(min(start + rows, length), length)
+
+
+EXPORT_BUFFERING = 2 ** 20  # bytes, buffering of the text files written by the exporters
+
+
+def get_text_format(data: np.ndarray, decimal='%.6e', integer: str = None) -> str:
+    """Get the text format of the data of an array: string, decimal or integer (if an integer
+    format is given)"""
+    if data.dtype.kind in 'USO':
+        return '%s'  # for strings (or objects)
+    elif integer is not None and data.dtype.char == 'l':
+        return integer  # for integers
+    else:
+        return decimal  # for decimal numbers
+
 
 class ExporterFactory:
     """The factory class for creating executors"""
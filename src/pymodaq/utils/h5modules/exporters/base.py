@@ -9,8 +9,9 @@ import numpy as np
 
 
 # project imports
-from pymodaq.utils.h5modules.backends import Node
-from pymodaq.utils.h5modules.exporter import ExporterFactory, H5Exporter
+from pymodaq.utils.h5modules.backends import Node, GROUP
+from pymodaq.utils.h5modules.exporter import (ExporterFactory, H5Exporter, EXPORT_BUFFERING,
+                                              get_text_format)
 from pymodaq.utils.h5modules.backends import H5Backend
 
 
@@ -21,32 +22,66 @@ class H5h5Exporter(H5Exporter):
     FORMAT_DESCRIPTION = "Single node h5 file"
     FORMAT_EXTENSION = "h5"
 
+    def __init__(self):
+        super().__init__()
+        self._copied_arrays = 0
+        self._arrays_number = 0
+
     def export_data(self, node: Node, filename: str) -> None:
-        """Export an h5 node"""
-        # This should allow to get the base file object
-        if node.backend == 'tables':
-            basefile = node.node._v_file
-            basefile.copy_file(dstfilename=str(filename), overwrite=False)
+        """Export an h5 node in the RawData group of a new file (the whole file for the root node)
+
+        The arrays are copied one by one at the dataset level (their chunks being copied without
+        being decompressed), together with the attributes of the root and of the copied groups
+        """
+        new_file = H5Backend(backend=node.backend)
+        new_file.open_file(str(filename), 'w')
+        try:
+            self._copy_attrs(node.to_h5_backend().root().node, new_file.root().node, node.backend)
+            if node.path == '/':
+                dest_parent = new_file.root()
+            else:
+                dest_parent = new_file.get_set_group('/', 'RawData')
+
+            self._copied_arrays = 0
+            self._arrays_number = 1 if 'ARRAY' in node.attrs['CLASS'] else \
+                len([child for child in node.to_h5_backend().walk_nodes(node)
+                     if 'ARRAY' in child.attrs['CLASS']])
+            self.progress(0, self._arrays_number)
+            if node.path == '/':
+                for child in node.children().values():
+                    self._copy_node(child, dest_parent.node)
+            else:
+                self._copy_node(node, dest_parent.node)
+            new_file.flush()
+        finally:
+            new_file.close_file()
+
+    @staticmethod
+    def _copy_attrs(backend_node, dest_backend_node, backend: str):
+        """Copy the user attributes of a backend node (without decoding them)"""
+        if backend == 'tables':
+            backend_node._v_attrs._f_copy(dest_backend_node)
         else:
-            import h5py
-            with h5py.File(filename, 'w') as f_dest:
-                node.node.h5file.copy(self.h5file, f_dest)
-
-        # basefile = node.get_file()
-        # basefile.copy_file(dstfilename=str(filename), overwrite=False)
-
-        new_file = H5Backend(backend="tables")
-        new_file.open_file(str(filename), 'a')
-
-        new_file.h5file.move_node(new_file.get_node_path(node), newparent='/')
-        new_file.h5file.remove_node('/RawData', recursive=True)
-        new_file.flush()
-
-        new_file.get_set_group('/', 'RawData')
-        new_file.h5file.move_node(f'/{node.name}',
-                                  newparent='/RawData')
-
-        new_file.close_file()
+            for attr_name, value in backend_node.attrs.items():
+                dest_backend_node.attrs[attr_name] = value
+
+    def _copy_node(self, node: Node, dest_parent):
+        """Copy recursively node in the dest_parent backend group"""
+        if isinstance(node, GROUP):
+            if node.backend == 'tables':
+                dest_group = node.node._f_copy(dest_parent, recursive=False)
+            else:
+                dest_group = dest_parent.create_group(node.name)
+                self._copy_attrs(node.node, dest_group, node.backend)
+            for child in node.children().values():
+                self._copy_node(child, dest_group)
+        else:
+            if node.backend == 'tables':
+                node.node._f_copy(dest_parent)
+            else:
+                node.node.file.copy(node.node, dest_parent)
+            self._copied_arrays += 1
+            self.progress(self._copied_arrays, self._arrays_number)
 
 
 @ExporterFactory.register_exporter()
@@ -57,40 +92,13 @@ class H5txtExporter(H5Exporter):
     FORMAT_EXTENSION = "txt"
 
     def export_data(self, node: Node, filename: str) -> None:
-        """Export the node as a .txt file format"""
+        """Export the node as a .txt file format, written chunk by chunk"""
         if 'ARRAY' in node.attrs['CLASS']:
-            data = node.read()
-            if not isinstance(data, np.ndarray):
-                # in case one has a list of same objects (array of strings for instance, logger or other)
-                data = np.array(data)
-                np.savetxt(filename, data, '%s', '\t')
-            else:
-                np.savetxt(filename, data, '%.6e', '\t')
+            with open(filename, 'w', buffering=EXPORT_BUFFERING) as f:
+                for rows_slice, data in self.iter_chunks(node):
+                    np.savetxt(f, data, get_text_format(data), '\t')
         elif 'GROUP' in node.attrs['CLASS']:
-            data_tot = []
-            header = []
-            dtypes = []
-            fmts = []
-            for subnode_name, subnode in node.children().items():
-                if 'ARRAY' in subnode.attrs['CLASS']:
-                    if len(subnode.attrs['shape']) == 1:
-                        data = subnode.read()
-                        if not isinstance(data, np.ndarray):
-                            # in case one has a list of same objects (array of strings for instance, logger or other)
-                            data = np.array(data)
-                        data_tot.append(data)
-                        dtypes.append((subnode_name, data.dtype))
-                        header.append(subnode_name)
-                        if data.dtype.char == 'U':
-                            fmt = '%s'  # for strings
-                        elif data.dtype.char == 'l':
-                            fmt = '%d'  # for integers
-                        else:
-                            fmt = '%.6f'  # for decimal numbers
-                        fmts.append(fmt)
-
-            data_trans = np.array(list(zip(*data_tot)), dtype=dtypes)
-            np.savetxt(filename, data_trans, fmts, '\t', header='#' + '\t'.join(header))
+            self.export_group_columns(node, filename)
 
 
 @ExporterFactory.register_exporter()
@@ -101,11 +109,25 @@ class H5npyExporter(H5Exporter):
     FORMAT_EXTENSION = "npy"
 
     def export_data(self, node: Node, filename: str) -> None:
-        """Export the node as a numpy binary file format"""
+        """Export the node as a numpy binary file format
+
+        The file is memory mapped and filled chunk by chunk, except for arrays of objects (strings
+        for instance) that are saved at once
+        """
         # String __contain__ method will evaluate to True for CARRAY,EARRAY,VLARRAY,stringARRAY
         if 'ARRAY' in node.attrs['CLASS']:
-            data = node.read()
-            if not isinstance(data, np.ndarray):
-                data = np.array(data)
-
-            np.save(filename, data)
\ No newline at end of file
+            if node.attrs['CLASS'] in ('VLARRAY', 'StringARRAY'):
+                for rows_slice, data in self.iter_chunks(node):
+                    np.save(filename, data)
+                return
+            mmap = np.lib.format.open_memmap(filename, mode='w+', dtype=node.array.dtype,
+                                             shape=node.shape)
+            try:
+                for rows_slice, data in self.iter_chunks(node):
+                    if len(node.shape) == 0:
+                        mmap[...] = data
+                    else:
+                        mmap[rows_slice] = data
+                mmap.flush()
+            finally:
+                del mmap
@@ -9,7 +9,8 @@ import numpy as np
 
 # project imports
 from pymodaq.utils.h5modules.backends import Node
-from pymodaq.utils.h5modules.exporter import ExporterFactory, H5Exporter
+from pymodaq.utils.h5modules.exporter import (ExporterFactory, H5Exporter, EXPORT_BUFFERING,
+                                              get_text_format)
 
 
 @ExporterFactory.register_exporter()
@@ -20,44 +21,20 @@ class H5asciiExporter(H5Exporter):
     FORMAT_EXTENSION = "ascii"
 
     def export_data(self, node: Node, filename: str) -> None:
+        """Export the node transposed in a text file, written chunk by chunk"""
         if 'ARRAY' in node.attrs['CLASS']:
-            data = node.read()
-            if not isinstance(data, np.ndarray):
-                # in case one has a list of same objects (array of strings for instance, logger or other)
-                data = np.array(data)
-                np.savetxt(filename,
-                           data.T if len(data.shape) > 1 else [data],
-                           '%s', '\t')
-            else:
-                np.savetxt(filename,
-                           data.T if len(data.shape) > 1 else [data],
-                           '%.6e', '\t')
+            with open(filename, 'w', buffering=EXPORT_BUFFERING) as f:
+                if len(node.shape) > 1:
+                    # the columns of the array are written as rows
+                    for rows_slice, data in self.iter_chunks(node, axis=1):
+                        np.savetxt(f, data.T, get_text_format(data), '\t')
+                else:
+                    # a single row
+                    for rows_slice, data in self.iter_chunks(node):
+                        if rows_slice.start > 0:
+                            f.write('\t')
+                        np.savetxt(f, [data], get_text_format(data), '\t', newline='')
+                    f.write('\n')
 
         elif 'GROUP' in node.attrs['CLASS']:
-            data_tot = []
-            header = []
-            dtypes = []
-            fmts = []
-            for subnode_name, subnode in node.children().items():
-                if 'ARRAY' in subnode.attrs['CLASS']:
-                    if len(subnode.attrs['shape']) == 1:
-                        data = subnode.read()
-                        if not isinstance(data, np.ndarray):
-                            # in case one has a list of same objects (array of strings for instance, logger or other)
-                            data = np.array(data)
-                        data_tot.append(data)
-                        dtypes.append((subnode_name, data.dtype))
-                        header.append(subnode_name)
-                        if data.dtype.char == 'U':
-                            fmt = '%s'  # for strings
-                        elif data.dtype.char == 'l':
-                            fmt = '%d'  # for integers
-                        else:
-                            fmt = '%.6f'  # for decimal numbers
-                        fmts.append(fmt)
-
-            data_trans = np.array(list(zip(*data_tot)), dtype=dtypes)
-
-            np.savetxt(filename, data_trans, fmts, '\t', header='#' + '\t'.join(header))
-
-
+            self.export_group_columns(node, filename)
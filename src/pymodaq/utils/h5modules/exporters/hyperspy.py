@@ -30,7 +30,12 @@ try:
         FORMAT_EXTENSION = "hspy"
 
         def export_data(self, node: Node, filename) -> None:
-            """Exporting a .h5 node as a hyperspy object"""
+            """Exporting a .h5 node as a hyperspy object
+
+            The whole data are loaded in memory to build the hyperspy signal, the progress is only
+            reported at the beginning and at the end of the export
+            """
+            self.progress(0, 1)
 
             # first verify if the node type is compatible with export. Only data nodes are.
             ############## compatible with v4 done by Seb
@@ -109,7 +114,9 @@ try:
                 sig = hs.signals.BaseSignal(data=data, original_metadata={}, axes=ordered_axes)
 
             # Finally save
+            self.progress(0, 1)
             sig.save(filename)
+            self.progress(1, 1)
 
         def build_hyperspy_axis(self, ax_data: np.ndarray, data_idx: int,
                                 label: str, unit: str, navigate: bool) -> dict:
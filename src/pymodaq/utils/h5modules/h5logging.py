@@ -43,11 +43,13 @@ class H5Logger(AbstractLogger):
 
         self.modules_manager: ModulesManager = modules_manager
         self.h5saver = H5Saver(*args, save_type='logger', **kwargs)
+        self.h5saver.set_buffered_appends(True)  # data are logged one at a time, possibly at high rate
 
         self.module_and_data_saver = module_saving.LoggerSaver(self)
         for det in self.modules_manager.detectors_all:
             det.module_and_data_saver = module_saving.DetectorEnlargeableSaver(det)
         self.module_and_data_saver.h5saver = self.h5saver  # will update its h5saver and all submodules's h5saver
+        self._logged_detectors = set([])
 
     def close(self):
         self.h5saver.close_file()
@@ -65,6 +67,7 @@ class H5Logger(AbstractLogger):
         self.h5saver.flush()
         self.module_and_data_saver.h5saver = self.h5saver
         logger_node = self.module_and_data_saver.get_set_node(new=True)
+        self._logged_detectors = set([])
         return True
 
     def get_handler(self):
@@ -77,7 +80,16 @@ class H5Logger(AbstractLogger):
         pass
 
     def add_data(self, dte: DataToExport):
+        if self.h5saver.check_rollover(dte.name):  # the frames of each module are counted
+            self.module_and_data_saver.get_set_node(new=True)
+            self._logged_detectors = set([])
         self.module_and_data_saver.add_data(dte)
+        if not self.h5saver.swmr_mode:
+            self._logged_detectors.add(dte.name)
+            if self._logged_detectors.issuperset(self.modules_manager.selected_detectors_name +
+                                                 self.modules_manager.selected_actuators_name):
+                # the nodes of all the logged modules are created, other processes can now read the file
+                self.h5saver.start_swmr()
 
         self.settings.child('N_saved').setValue(self.settings.child('N_saved').value() + 1)
 
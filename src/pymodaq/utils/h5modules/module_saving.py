@@ -6,7 +6,7 @@ Created the 23/11/2022
 """
 from __future__ import annotations
 
-from typing import Union, List, Dict, Tuple, TYPE_CHECKING
+from typing import Union, List, Dict, Iterable, Tuple, TYPE_CHECKING
 import xml.etree.ElementTree as ET
 
 
@@ -17,7 +17,8 @@ from pymodaq.utils.daq_utils import capitalize
 from pymodaq.utils.data import Axis, DataDim, DataWithAxes, DataToExport, DataDistribution
 from .saving import H5SaverLowLevel
 from .backends import GROUP, CARRAY, Node, GroupType
-from .data_saving import DataToExportSaver, AxisSaverLoader, DataToExportTimedSaver, DataToExportExtendedSaver
+from .data_saving import (DataToExportSaver, AxisSaverLoader, DataToExportTimedSaver, DataToExportExtendedSaver,
+                          DataToExportEnlargeableSaver)
 from pymodaq.utils.parameter import ioxml
 
 if TYPE_CHECKING:
@@ -215,15 +216,29 @@ class DetectorEnlargeableSaver(DetectorSaver):
     Parameters
     ----------
     module
+    enl_axis_names: Iterable[str]
+        The names of the enlargeable navigation axes, if None the data is enlarged along time
+    enl_axis_units: Iterable[str]
+        The units of the enlargeable navigation axes
     """
     group_type = GroupType['detector']
 
-    def __init__(self, module: DAQ_Viewer):
+    def __init__(self, module: DAQ_Viewer, enl_axis_names: Iterable[str] = None,
+                 enl_axis_units: Iterable[str] = None):
         super().__init__(module)
-        self._datatoexport_saver: DataToExportTimedSaver = None
+        self._enl_axis_names = enl_axis_names
+        self._enl_axis_units = enl_axis_units
+        self._datatoexport_saver: DataToExportEnlargeableSaver = None
 
     def update_after_h5changed(self, ):
-        self._datatoexport_saver = DataToExportTimedSaver(self.h5saver)
+        if self._enl_axis_names is None:
+            self._datatoexport_saver = DataToExportTimedSaver(self.h5saver)
+        else:
+            self._datatoexport_saver = DataToExportEnlargeableSaver(self.h5saver, self._enl_axis_names,
+                                                                    self._enl_axis_units)
+
+    def add_data(self, where: Union[Node, str], data: DataToExport, **kwargs):
+        self._datatoexport_saver.add_data(where, data, **kwargs)
 
 
 class DetectorExtendedSaver(DetectorSaver):
@@ -368,10 +383,22 @@ class ScanSaver(ModuleSaver):
             detector.module_and_data_saver.add_nav_axes(self._module_group, axes)
 
     def add_data(self, dte: DataToExport = None, indexes: Tuple[int] = None,
-                 distribution=DataDistribution['uniform']):
+                 distribution=DataDistribution['uniform'], detectors_data: Dict[str, DataToExport] = None,
+                 axis_values: List[float] = None):
+        """Add the data of the detectors at the given indexes of the scan
+
+        If axis_values is given (adaptive scans), the data is appended to enlargeable arrays together
+        with these values of the navigation axes (see DAQ_Viewer.append_spread_data)
+        """
         for detector in self._module.modules_manager.detectors:
             try:
-                detector.insert_data(indexes, where=self._module_group, distribution=distribution)
+                data = None if detectors_data is None else detectors_data.get(detector.title)
+                if axis_values is not None:
+                    detector.append_spread_data(axis_values, where=self._module_group,
+                                                init_step=not any(indexes), data=data)
+                else:
+                    detector.insert_data(indexes, where=self._module_group, distribution=distribution,
+                                         data=data)
             except Exception as e:
                 pass
 
@@ -10,11 +10,12 @@ from dateutil import parser
 from numbers import Number
 import os
 from pathlib import Path
-from typing import Union, Iterable
+from time import perf_counter
+from typing import Union, Iterable, Callable, Tuple, List, Dict
 
 
 import numpy as np
-from qtpy.QtCore import QObject, Signal
+from qtpy.QtCore import QObject, Signal, QTimer
 from qtpy import QtWidgets
 
 from pymodaq.utils.logger import set_logger, get_module_name
@@ -34,13 +35,46 @@ from pymodaq.utils.messenger import deprecation_msg
 
 from .backends import (H5Backend, backends_available, SaveType, InvalidSave, InvalidExport, InvalidDataType,
                        InvalidGroupType, InvalidGroupDataType, Node, GroupType, InvalidDataDimension, InvalidScanType,
-                       GROUP, VLARRAY)
+                       GROUP, VLARRAY, get_chunk_shape, compression_libraries, get_file_size,
+                       get_file_extension)
 from . import browsing
+from .writer import H5WriterThread, BackpressurePolicy, WriterMetrics
 
 
 config = Config()
 logger = set_logger(get_module_name(__file__))
 
+ROLLOVER_SIZE_CHECK_INTERVAL = 0.5  # s, the size of a zarr store is the sum of its chunk files
+
+
+def get_rollover_files(file_path: Union[Path, str], backend: str = None) -> List[Path]:
+    """Get the series of files written with rollover (see H5SaverLowLevel.rollover) a file
+    belongs to
+
+    Parameters
+    ----------
+    file_path: Path or str
+        any file of the series
+    backend: str
+        the backend used to open the files, by default zarr for .zarr stores and the hdf5_backend
+        of the configuration otherwise
+
+    Returns
+    -------
+    list of Path: the files of the series in the order they have been written (only file_path if
+        it has not been rolled over)
+    """
+    file_path = Path(file_path)
+    if backend is None:
+        backend = 'zarr' if file_path.suffix == get_file_extension('zarr') else \
+            config('general', 'hdf5_backend')
+    h5file = H5SaverLowLevel(backend=backend)
+    h5file.open_file(file_path, 'r')
+    try:
+        return h5file.get_rollover_files()
+    finally:
+        h5file.close_file()
+
 
 class FileType(BaseEnum):
     detector = 0
@@ -58,6 +92,15 @@ class DataType(BaseEnum):
     bkg = 'Bkg'
     data_enlargeable = 'EnlData'
     error = 'ErrorBar'
+    time_index = 'TimeIndex'
+
+
+class RolloverMode(BaseEnum):
+    """Criterion used to close the current file and to continue the saving into a new one"""
+    none = 0
+    size = 1
+    duration = 2
+    frames = 3
 
 
 class H5SaverLowLevel(H5Backend):
@@ -88,6 +131,24 @@ class H5SaverLowLevel(H5Backend):
         self._raw_group: Union[GROUP, str] = '/RawData'
         self._logger_array = None
 
+        self._async_writing = False
+        self._async_queue_size = config('data_saving', 'h5file', 'async_queue_size')
+        self._async_policy = BackpressurePolicy[config('data_saving', 'h5file', 'async_policy')]
+        self._writer: H5WriterThread = None
+
+        self._swmr = False
+
+        self._rollover_mode = RolloverMode[config('data_saving', 'h5file', 'rollover')]
+        self._rollover_size = config('data_saving', 'h5file', 'rollover_size')
+        self._rollover_duration = config('data_saving', 'h5file', 'rollover_duration')
+        self._rollover_frames = config('data_saving', 'h5file', 'rollover_frames')
+        self._rollover_base: Path = None
+        self._rollover_index = 0
+        self._rollover_start = 0.
+        self._rollover_counts: Dict[str, int] = dict([])
+        self._rollover_size_check = 0.
+        self._file_metadata: dict = None
+
     @property
     def raw_group(self):
         return self._raw_group
@@ -102,7 +163,8 @@ class H5SaverLowLevel(H5Backend):
         Parameters
         ----------
         file_name: Path
-            a complete Path pointing to a h5 file
+            a complete Path pointing to a h5 file (its extension is replaced by the one of the
+            backend, see H5Backend.file_extension)
         raw_group_name: str
             Base node name
         new_file: bool
@@ -113,12 +175,10 @@ class H5SaverLowLevel(H5Backend):
         bool
             True if new file has been created, False otherwise
         """
-        datetime_now = datetime.datetime.now()
-
         if file_name is not None and isinstance(file_name, Path):
-            self.h5_file_name = file_name.stem + ".h5"
+            self.h5_file_name = file_name.stem + self.file_extension
             self.h5_file_path = file_name.parent
-            if not self.h5_file_path.joinpath(self.h5_file_name).is_file():
+            if not self.h5_file_path.joinpath(self.h5_file_name).exists():  # zarr stores are directories
                 new_file = True
 
         else:
@@ -127,21 +187,299 @@ class H5SaverLowLevel(H5Backend):
             new_file = True
 
         self.close_file()
-        self.open_file(self.h5_file_path.joinpath(self.h5_file_name), 'w' if new_file else 'a', title='PyMoDAQ file')
+        self._init_file_content(self.h5_file_path.joinpath(self.h5_file_name), raw_group_name,
+                                new_file, metadata)
+
+        self._file_metadata = metadata
+        self._rollover_base = self.h5_file_path.joinpath(self.h5_file_name)
+        self._rollover_index = 0
+        self._reset_rollover_counters()
+
+        if self._async_writing:
+            self._start_writer()
+
+    def _init_file_content(self, file_path: Path, raw_group_name='RawData', new_file=False,
+                           metadata: dict = None):
+        """Open the file and create (or get) its raw group, logger and file attributes"""
+        datetime_now = datetime.datetime.now()
+
+        self.open_file(file_path, 'w' if new_file else 'a', title='PyMoDAQ file', swmr=self._swmr)
 
         self._raw_group = self.get_set_group(self.root(), raw_group_name, title='Data from PyMoDAQ modules')
         self.get_set_logger(self._raw_group)
 
         if new_file:
-            self._raw_group.attrs['type'] = self.save_type.name  # first possibility to set a node attribute
-            self.root().set_attr('file', self.h5_file_name)  # second possibility
+            self._raw_group.attrs.update({'type': self.save_type.name,
+                                          **(metadata if metadata is not None else {})})
+            self.set_attrs(self.root(), dict(file=file_path.name,
+                                             date=datetime_now.date().isoformat(),
+                                             time=datetime_now.time().isoformat()))
+
+    def set_rollover(self, mode: RolloverMode, max_size: float = None, max_duration: float = None,
+                     max_frames: int = None):
+        """Set the criterion used to close the current file and to continue the saving into a new
+        one, see check_rollover
+
+        Parameters
+        ----------
+        mode: RolloverMode or str
+            'none', 'size', 'duration' or 'frames'
+        max_size: float
+            maximum size (in MB) of a file in 'size' mode
+        max_duration: float
+            maximum time (in s) during which a file is written in 'duration' mode
+        max_frames: int
+            maximum number of frames saved in a file in 'frames' mode
+        """
+        self._rollover_mode = enum_checker(RolloverMode, mode)
+        if max_size is not None:
+            self._rollover_size = max_size
+        if max_duration is not None:
+            self._rollover_duration = max_duration
+        if max_frames is not None:
+            self._rollover_frames = max_frames
+
+    @property
+    def rollover_index(self) -> int:
+        """Index of the current file within the series of rolled files, 0 for the first one"""
+        return self._rollover_index
+
+    def _reset_rollover_counters(self):
+        self._rollover_start = perf_counter()
+        self._rollover_size_check = self._rollover_start
+        self._rollover_counts = dict([])
+
+    def rollover_needed(self, source: str = '') -> bool:
+        """Check if the current file reached the limit set by the rollover mode (in 'frames' mode,
+        for the frames of source, see check_rollover)"""
+        if self._rollover_mode == RolloverMode['none'] or len(self._rollover_counts) == 0:
+            return False
+        if self._rollover_mode == RolloverMode['frames']:
+            return self._rollover_counts.get(source, 0) >= self._rollover_frames
+        elif self._rollover_mode == RolloverMode['duration']:
+            return perf_counter() - self._rollover_start >= self._rollover_duration
+        else:
+            if perf_counter() - self._rollover_size_check < ROLLOVER_SIZE_CHECK_INTERVAL:
+                return False
+            self._rollover_size_check = perf_counter()
+            return (get_file_size(self.h5_file_path.joinpath(self.h5_file_name)) >=
+                    self._rollover_size * 2**20)
+
+    def check_rollover(self, source: str = '') -> bool:
+        """To be called before saving a new frame: continue the saving into a new file if the
+        current one reached the limit set by the rollover mode (see set_rollover and rollover) then
+        count the frame
+
+        Parameters
+        ----------
+        source: str
+            the name of the module saving the frame: when several modules save their frames in the
+            same file (DAQ_Logger), the frames are counted for each of them, the 'frames' mode
+            limiting the number of frames of each module
+
+        Returns
+        -------
+        bool: True if a new file has been started, the nodes of the saved data have then to be
+            created again
+        """
+        rolled = self.rollover_needed(source)
+        if rolled:
+            self.rollover()
+        self._rollover_counts[source] = self._rollover_counts.get(source, 0) + 1
+        return rolled
+
+    def rollover(self) -> Path:
+        """Close the current file and continue the saving into a new one
+
+        The new file is named after the first file of the series with an incremented suffix, for
+        instance Data_20231019_10_00_00_001.h5, and gets the same raw group and metadata, the other
+        nodes being created again by the saving of the next data. The first file of the series
+        holds the names of the other ones in its 'rollover_files' root attribute and the other files
+        reference it with their 'rollover_base' root attribute, see get_rollover_files.
+
+        In asynchronous mode the current file is closed once the pending write requests have been
+        executed (see close_file), so that no data is lost, and the writer thread is then started
+        again for the new file
+
+        Returns
+        -------
+        Path: the path of the new file
+
+        Raises
+        ------
+        WriterError: in asynchronous mode, if one of the write requests failed (the saving being
+            continued into the new file anyway)
+        """
+        self._rollover_index += 1
+        base_path = self._rollover_base
+        file_path = base_path.with_name(f'{base_path.stem}_{self._rollover_index:03d}'
+                                        f'{base_path.suffix}')
+        raw_group_name = self._raw_group.name
+        async_writing = self._writer is not None
+        try:
+            self.close_file()
+        finally:
+            self._update_rollover_base(file_path)
+            self.h5_file_name = file_path.name
+            self._init_file_content(file_path, raw_group_name, new_file=True,
+                                    metadata=self._file_metadata)
+            self.root().attrs['rollover_base'] = self._rollover_base.name
+            self.root().attrs['rollover_index'] = self._rollover_index
+            self._reset_rollover_counters()
+            if async_writing:
+                self._start_writer()
+            logger.info(f'Saving continued into {file_path}')
+        return file_path
+
+    def get_rollover_files(self) -> List[Path]:
+        """Get the series of rolled files the opened file belongs to, see get_rollover_files"""
+        file_path = Path(self.file_path)
+        attrs_name = self.root().attrs.attrs_name
+        if 'rollover_base' in attrs_name:
+            return get_rollover_files(file_path.with_name(self.root().attrs['rollover_base']),
+                                      backend=self.backend)
+        rollover_files = self.root().attrs['rollover_files'] if 'rollover_files' in attrs_name \
+            else []
+        return [file_path] + [file_path.with_name(name) for name in rollover_files]
+
+    def _update_rollover_base(self, file_path: Path):
+        """Add a new file of the series to the 'rollover_files' attribute of the first one"""
+        base_file = H5Backend(self.backend)
+        base_file.open_file(self._rollover_base, 'a')
+        rollover_files = []
+        if 'rollover_files' in base_file.root().attrs.attrs_name:
+            rollover_files = base_file.root().attrs['rollover_files']
+        base_file.root().attrs['rollover_files'] = list(rollover_files) + [file_path.name]
+        base_file.close_file()
+
+    def set_async_writing(self, async_writing: bool, queue_size: int = None,
+                          policy: BackpressurePolicy = None):
+        """Activate or not the asynchronous writing mode
+
+        In this mode, a dedicated thread owns the opened file and executes, in order, the write
+        requests passed to the submit method. The writer thread is started when a file is
+        initialized (or immediately if a file is already opened) and stopped when it is closed.
+
+        Parameters
+        ----------
+        async_writing: bool
+        queue_size: int
+            The maximum number of pending write requests
+        policy: BackpressurePolicy or str
+            What to do when a request is submitted while the queue is full: 'block' the submitter
+            until there is a free slot, 'drop' the request or raise an 'error'
+        """
+        if queue_size is not None:
+            self._async_queue_size = queue_size
+        if policy is not None:
+            self._async_policy = enum_checker(BackpressurePolicy, policy)
+        self._async_writing = async_writing
+        self._stop_writer()
+        if async_writing and self.isopen():
+            self._start_writer()
+
+    @property
+    def is_async(self) -> bool:
+        """True if write requests are currently executed by the writer thread"""
+        return self._writer is not None
 
-            self.set_attr(self.root(), 'date', datetime_now.date().isoformat())
-            self.set_attr(self.root(), 'time', datetime_now.time().isoformat())
+    @property
+    def write_failed(self) -> bool:
+        """True if a write request failed on the writer thread and its error has not been raised yet"""
+        return self._writer is not None and self._writer.failed
+
+    @property
+    def writer_metrics(self) -> Union[WriterMetrics, None]:
+        """Queue depth and write latency statistics of the writer thread if any"""
+        return self._writer.metrics if self._writer is not None else None
+
+    def _start_writer(self):
+        self._stop_writer()
+        self._writer = H5WriterThread(self._async_queue_size, self._async_policy,
+                                      name=f'H5Writer_{self.h5_file_name}')
+        self._writer.start()
+
+    def _stop_writer(self):
+        """Stop the writer thread, raising a WriterError if one of its requests failed"""
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            try:
+                writer.stop()
+            finally:
+                logger.info(f'{self.h5_file_name} {writer.metrics}')
+
+    def submit(self, func: Callable, *args, **kwargs) -> bool:
+        """Execute a write operation on the file
+
+        In asynchronous mode the call is queued and executed by the writer thread, otherwise it is
+        executed immediately
+
+        Parameters
+        ----------
+        func: Callable
+            the function or method doing the write operations
+        args: positional arguments passed to func
+        kwargs: named arguments passed to func
+
+        Returns
+        -------
+        bool: False if the request has been dropped because the writer queue was full
+
+        Raises
+        ------
+        WriterError: in asynchronous mode, if a previously submitted request failed
+        """
+        if self._writer is not None:
+            return self._writer.submit(func, *args, **kwargs)
+        func(*args, **kwargs)
+        return True
+
+    @property
+    def swmr(self) -> bool:
+        return self._swmr
+
+    def set_swmr(self, swmr: bool):
+        """Enable or not the Single Writer Multiple Readers mode (h5py backend only)
+
+        Applies to the files initialized afterwards, the mode itself being started (see start_swmr)
+        once all the nodes have been created, for instance after the first acquisition
+        """
+        self._swmr = swmr and self.backend == 'h5py'
+
+    def start_swmr(self) -> bool:
+        """Switch the file to the SWMR mode if enabled, see set_swmr and H5Backend.start_swmr"""
+        if not self._swmr:
+            return False
+        return super().start_swmr()
+
+    def flush(self):
+        """Wait for all pending write requests to be executed (if in asynchronous mode) then flush
+        the file
+
+        Raises
+        ------
+        WriterError: in asynchronous mode, if one of the write requests failed
+        """
+        if self._writer is not None:
+            try:
+                self._writer.barrier()
+            finally:
+                super().flush()
+        else:
+            super().flush()
 
-            if metadata is not None:
-                for metadata_key in metadata:
-                    self._raw_group.attrs[metadata_key] = metadata[metadata_key]
+    def close_file(self):
+        """Close the file after all pending write requests have been executed
+
+        Raises
+        ------
+        WriterError: in asynchronous mode, if one of the write requests failed (the file being closed
+            anyway)
+        """
+        try:
+            self._stop_writer()
+        finally:
+            super().close_file()
 
     def save_file(self, filename=None):
         if filename is None:
@@ -167,7 +505,7 @@ class H5SaverLowLevel(H5Backend):
         if isinstance(where, Node):
             where = where.node
         logger = 'Logger'
-        if logger not in list(self.get_children(where)):
+        if logger not in self.get_children_name(where):
             # check if logger node exist
             self._logger_array = self.add_string_array(where, logger)
             self._logger_array.attrs['type'] = 'log'
@@ -176,21 +514,19 @@ class H5SaverLowLevel(H5Backend):
         return self._logger_array
 
     def add_log(self, msg):
-        self._logger_array.append(msg)
+        self.submit(self._logger_array.append, msg)
 
     def add_string_array(self, where, name, title='', metadata=dict([])):
         array = self.create_vlarray(where, name, dtype='string', title=title)
-        array.attrs['shape'] = (0,)
-        array.attrs['data_type'] = 'strings'
-
-        for metadat in metadata:
-            array.attrs[metadat] = metadata[metadat]
+        self.set_attrs(array, {'shape': (0,), 'data_type': 'strings', **metadata})
+        self.add_data_type_count(array, 'strings')
         return array
     
     def add_array(self, where: Union[GROUP, str], name: str, data_type: DataType, array_to_save: np.ndarray = None,
                   data_shape: tuple = None, array_type: np.dtype = None, data_dimension: DataDim = None,
                   scan_shape: tuple = tuple([]), add_scan_dim=False, enlargeable: bool = False,
-                  title: str = '', metadata=dict([]), ):
+                  title: str = '', metadata=dict([]), chunk_shape: tuple = None,
+                  chunk_size: int = None, compression: Tuple[str, int] = None):
 
         """save data arrays on the hdf5 file together with metadata
         Parameters
@@ -220,6 +556,13 @@ class H5SaverLowLevel(H5Backend):
             dictionnary whose keys will be saved as the array attributes
         add_scan_dim: if True, the scan axes dimension (scan_shape iterable) is prepended to the array shape on the hdf5
                       In that case, the array is usually initialized as zero and further populated
+        chunk_shape: tuple of int
+            the shape of the hdf5 chunks. If None, for enlargeable arrays or arrays with scan dimensions,
+            it is computed from the data shape, see backends.get_chunk_shape
+        chunk_size: int
+            the target size (in kB) of the chunks, if None use the config value
+        compression: (str, int)
+            compression library and level overriding the default ones, see H5Backend.get_compression
 
         Returns
         -------
@@ -237,26 +580,38 @@ class H5SaverLowLevel(H5Backend):
 
         data_type = enum_checker(DataType, data_type)
         data_dimension = enum_checker(DataDim, data_dimension)
+        if compression is not None:
+            compression = self.get_compression(*compression)
 
         if enlargeable:
             # if data_shape == (1,):
             #     data_shape = None
+            if chunk_shape is None:
+                chunk_shape = get_chunk_shape(data_shape if data_shape is not None else (),
+                                              array_type, chunk_size=chunk_size)
             array = self.create_earray(where, utils.capitalize(name), dtype=np.dtype(array_type),
-                                       data_shape=data_shape, title=title)
+                                       data_shape=data_shape, title=title, chunk_shape=chunk_shape,
+                                       compression=compression)
         else:
+            shape = None
             if add_scan_dim:  # means it is an array initialization to zero
                 shape = list(scan_shape[:])
+                step_shape = []
                 if not(len(data_shape) == 1 and data_shape[0] == 1):  # means data are not ndarrays of scalars
-                    shape.extend(data_shape)
-                if array_to_save is None:
-                    array_to_save = np.zeros(shape, dtype=np.dtype(array_type))
-
-            array = self.create_carray(where, utils.capitalize(name), obj=array_to_save, title=title)
-        self.set_attr(array, 'data_type', data_type.name)
-        self.set_attr(array, 'data_dimension', data_dimension.name)
-
-        for metadat in metadata:
-            self.set_attr(array, metadat, metadata[metadat])
+                    step_shape = list(data_shape)
+                shape.extend(step_shape)
+                if chunk_shape is None:
+                    chunk_shape = get_chunk_shape(step_shape, array_type, ext_shape=scan_shape,
+                                                  chunk_size=chunk_size)
+            # with add_scan_dim and no array_to_save, the array is not allocated in memory, its
+            # chunks will be written on the disk as the scan goes
+            array = self.create_carray(where, utils.capitalize(name), obj=array_to_save, title=title,
+                                       chunk_shape=chunk_shape, compression=compression,
+                                       shape=shape, dtype=array_type, fill_value=0)
+        # all the attributes written at once
+        self.set_attrs(array, {'data_type': data_type.name, 'data_dimension': data_dimension.name,
+                               **metadata})
+        self.add_data_type_count(array, data_type.name)
         return array
 
     def get_set_group(self, where, name, title=''):
@@ -269,12 +624,9 @@ class H5SaverLowLevel(H5Backend):
 
     def get_groups(self, where: Union[str, GROUP], group_type: GroupType):
         """Get all groups hanging from a Group and of a certain type"""
-        groups = []
-        for node_name in list(self.get_children(where)):
-            group = self.get_node(where, node_name)
-            if 'type' in group.attrs and group.attrs['type'] == group_type.name:
-                groups.append(group)
-        return groups
+        path = self._index_path(where)
+        return [self.get_node(path, node_name) for node_name in self.get_children_name(path)
+                if self._get_index_attr(self._join_path(path, node_name), 'type') == group_type.name]
 
     def get_last_group(self, where: GROUP, group_type: GroupType):
         groups = self.get_groups(where, group_type)
@@ -285,9 +637,9 @@ class H5SaverLowLevel(H5Backend):
 
     def get_node_from_attribute_match(self, where, attr_name, attr_value):
         """Get a Node starting from a given node (Group) matching a pair of node attribute name and value"""
-        for node in self.walk_nodes(where):
-            if attr_name in node.attrs and node.attrs[attr_name] == attr_value:
-                return node
+        for path in self._walk_index_paths(where):
+            if self._get_index_attr(path, attr_name) == attr_value:
+                return self.get_node(path)
 
     def get_node_from_title(self, where, title: str):
         """Get a Node starting from a given node (Group) matching the given title"""
@@ -343,7 +695,7 @@ class H5SaverLowLevel(H5Backend):
         """
         group_type = enum_checker(GroupType, group_type)
 
-        nodes = [name for name in self.get_children(self.get_node(where))]
+        nodes = self.get_children_name(where)
         nodes_tmp = []
         for node in nodes:
             if utils.capitalize(group_type.name) in node:
@@ -354,13 +706,10 @@ class H5SaverLowLevel(H5Backend):
         else:
             ind_group = int(nodes_tmp[-1][-3:])
         group = self.get_set_group(where, f'{utils.capitalize(group_type.name)}{ind_group + 1:03d}', title)
-        self.set_attr(group, 'settings', settings_as_xml)
-        if group_type.name.lower() != 'ch':
-            self.set_attr(group, 'type', group_type.name.lower())
-        else:
-            self.set_attr(group, 'type', '')
-        for metadat in metadata:
-            self.set_attr(group, metadat, metadata[metadat])
+        self.set_attrs(group, {'settings': settings_as_xml,
+                               'type': group_type.name.lower() if group_type.name.lower() != 'ch'
+                               else '',
+                               **metadata})
         return group
 
     def add_act_group(self, where, title='', settings_as_xml='', metadata=dict([])):
@@ -484,6 +833,10 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
         [{'title': 'Backend:', 'name': 'backend', 'type': 'group', 'children': [
             {'title': 'Backend type:', 'name': 'backend_type', 'type': 'list', 'limits': backends_available,
                 'readonly': True},
+            {'title': 'SWMR mode?:', 'name': 'swmr', 'type': 'bool',
+             'value': config('data_saving', 'h5file', 'swmr'),
+             'tip': 'Single Writer Multiple Readers (h5py backend only): other processes can read the'
+                    ' file while it is being written'},
             {'title': 'HSDS Server:', 'name': 'hsds_options', 'type': 'group', 'visible': False, 'children': [
                 {'title': 'Endpoint:', 'name': 'endpoint', 'type': 'str',
                     'value': config('data_saving', 'hsds', 'root_url'), 'readonly': False},
@@ -510,10 +863,31 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
          'value': config('data_saving', 'data_type', 'dynamic')},
         {'title': 'Compression options:', 'name': 'compression_options', 'type': 'group', 'children': [
             {'title': 'Compression library:', 'name': 'h5comp_library', 'type': 'list', 'value': 'zlib',
-                'limits': ['zlib', 'gzip']},
+                'limits': compression_libraries},
             {'title': 'Compression level:', 'name': 'h5comp_level', 'type': 'int',
                 'value': config('data_saving', 'h5file', 'compression_level'), 'min': 0, 'max': 9},
         ]},
+        {'title': 'Asynchronous writing:', 'name': 'async_options', 'type': 'group', 'children': [
+            {'title': 'Write in thread?:', 'name': 'async_writing', 'type': 'bool',
+             'value': config('data_saving', 'h5file', 'async_writing')},
+            {'title': 'Queue size:', 'name': 'async_queue_size', 'type': 'int',
+             'value': config('data_saving', 'h5file', 'async_queue_size'), 'min': 1},
+            {'title': 'When queue is full:', 'name': 'async_policy', 'type': 'list',
+             'value': config('data_saving', 'h5file', 'async_policy'),
+             'limits': BackpressurePolicy.names()},
+        ]},
+        {'title': 'File rollover:', 'name': 'rollover_options', 'type': 'group', 'children': [
+            {'title': 'Rollover on:', 'name': 'rollover', 'type': 'list',
+             'value': config('data_saving', 'h5file', 'rollover'), 'limits': RolloverMode.names(),
+             'tip': 'Close the current file and continue the saving into a new one when it reaches'
+                    ' the given size, duration or number of frames'},
+            {'title': 'Max size (MB):', 'name': 'rollover_size', 'type': 'float',
+             'value': config('data_saving', 'h5file', 'rollover_size'), 'min': 0.},
+            {'title': 'Max duration (s):', 'name': 'rollover_duration', 'type': 'float',
+             'value': config('data_saving', 'h5file', 'rollover_duration'), 'min': 0.},
+            {'title': 'Max frames:', 'name': 'rollover_frames', 'type': 'int',
+             'value': config('data_saving', 'h5file', 'rollover_frames'), 'min': 1},
+        ]},
     ]
 
     def __init__(self, save_type='scan', backend='tables'):
@@ -535,6 +909,20 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
         self.current_scan_name = None
 
         self.settings.child('save_type').setValue(self.save_type.name)
+        self._update_async_writing()
+        self._update_rollover()
+        self.set_swmr(self.settings['backend', 'swmr'])
+
+    def _update_async_writing(self):
+        self.set_async_writing(self.settings['async_options', 'async_writing'],
+                               queue_size=self.settings['async_options', 'async_queue_size'],
+                               policy=self.settings['async_options', 'async_policy'])
+
+    def _update_rollover(self):
+        self.set_rollover(self.settings['rollover_options', 'rollover'],
+                          max_size=self.settings['rollover_options', 'rollover_size'],
+                          max_duration=self.settings['rollover_options', 'rollover_duration'],
+                          max_frames=self.settings['rollover_options', 'rollover_frames'])
 
     def show_settings(self, show=True):
         self.settings_tree.setVisible(show)
@@ -583,9 +971,10 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
 
                 if not scan_type:
                     self.h5_file_path = save_path.parent  # will remove the dataset part used for DAQ_scan datas
-                    self.h5_file_name = base_name + datetime_now.strftime('_%Y%m%d_%H_%M_%S.h5')
+                    self.h5_file_name = (base_name + datetime_now.strftime('_%Y%m%d_%H_%M_%S') +
+                                         self.file_extension)
                 else:
-                    self.h5_file_name = save_path.name + ".h5"
+                    self.h5_file_name = save_path.name + self.file_extension
                     self.h5_file_path = save_path.parent
 
             else:
@@ -599,9 +988,10 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
             self.h5_file_name = addhoc_file_path.name
 
         fullpathname = self.h5_file_path.joinpath(self.h5_file_name)
-        self.settings.child('current_h5_file').setValue(str(fullpathname))
 
         super().init_file(fullpathname, new_file=update_h5, metadata=metadata)
+        self.settings.child('current_h5_file').setValue(
+            str(self.h5_file_path.joinpath(self.h5_file_name)))
 
         self.get_set_logger(self.raw_group)
 
@@ -728,7 +1118,8 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
         day_path = cls.find_part_in_path_and_subpath(year_path, part=curr_date.strftime('%Y%m%d'),
                                                      create=True)  # create directory of the day if it doen't exist and return it
         dataset_base_name = curr_date.strftime('Dataset_%Y%m%d')
-        dataset_paths = sorted([path for path in day_path.glob(dataset_base_name + "*"+".h5") if path.is_file()])
+        dataset_paths = sorted([path for path in day_path.glob(dataset_base_name + "*")
+                                if path.suffix in ('.h5', '.zarr')])
 
         if ind_dataset is None:
             if dataset_paths == []:
@@ -747,6 +1138,12 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
         ind_scan = next_scan_index
         return dataset_path, base_name + '{:03d}'.format(ind_scan), dataset_path
 
+    def rollover(self) -> Path:
+        """Continue the saving into a new file, see H5SaverLowLevel.rollover"""
+        file_path = super().rollover()
+        self.settings.child('current_h5_file').setValue(str(file_path))
+        return file_path
+
     def get_last_scan(self):
         """Gets the last scan node within the h5_file and under the **raw_group**
 
@@ -793,8 +1190,8 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
             if not isinstance(file_path, Path):
                 file_path = Path(file_path)
 
-            if 'h5' not in file_path.suffix:
-                raise IOError('Invalid file type, should be a h5 file')
+            if 'h5' not in file_path.suffix and file_path.suffix != '.zarr':
+                raise IOError('Invalid file type, should be a h5 file (or a zarr store)')
 
             self.init_file(addhoc_file_path=file_path)
             self.file_loaded = True
@@ -823,6 +1220,15 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
             compression_opts = self.settings.child('compression_options', 'h5comp_level').value()
             self.define_compression(compression, compression_opts)
 
+        elif param.name() in putils.iter_children(self.settings.child('async_options'), []):
+            self._update_async_writing()
+
+        elif param.name() in putils.iter_children(self.settings.child('rollover_options'), []):
+            self._update_rollover()
+
+        elif param.name() == 'swmr':
+            self.set_swmr(param.value())
+
     def update_status(self, status):
         logger.warning(status)
 
@@ -851,6 +1257,47 @@ class H5Saver(H5SaverBase, QObject):
 
         self.settings.child('new_file').sigActivated.connect(lambda: self.emit_new_file(True))
 
+        self._append_buffer_timer = QTimer()
+        self._append_buffer_timer.timeout.connect(self._flush_old_append_buffers)
+
+        self._swmr_flush_timer = QTimer()
+        self._swmr_flush_timer.timeout.connect(self._flush_swmr)
+
+    def set_buffered_appends(self, buffered: bool, max_rows: int = None, max_delay: float = None):
+        """Activate or not the buffering of appended data, see H5Backend.set_buffered_appends
+
+        When activated, a timer periodically writes the buffered data that have not been written
+        since max_delay, for instance if no more data is appended, so that they are not lost in
+        case of a crash
+        """
+        super().set_buffered_appends(buffered, max_rows, max_delay)
+        if buffered:
+            self._append_buffer_timer.start(int(self._append_buffer_delay))
+        else:
+            self._append_buffer_timer.stop()
+
+    def _flush_old_append_buffers(self):
+        if self.h5file is not None and self.isopen() and not self.write_failed:
+            self.submit(self.flush_append_buffers, older_than=self._append_buffer_delay)
+
+    def start_swmr(self) -> bool:
+        """Switch the file to the SWMR mode if enabled, see H5SaverLowLevel.start_swmr
+
+        A timer then periodically flushes the file so that readers get the data written meanwhile
+        """
+        swmr_mode = super().start_swmr()
+        if swmr_mode:
+            self._swmr_flush_timer.start(config('data_saving', 'h5file', 'swmr_flush_interval'))
+        return swmr_mode
+
+    def _flush_swmr(self):
+        if self.h5file is not None and self.isopen() and not self.write_failed:
+            self.submit(H5Backend.flush, self)
+
+    def close_file(self):
+        self._swmr_flush_timer.stop()
+        super().close_file()
+
     def close(self):
         self.close_file()
 
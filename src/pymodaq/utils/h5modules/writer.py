@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Thread executing the write requests on a h5 file so that acquisitions are not blocked by the disk
+"""
+import queue
+import threading
+from time import perf_counter
+from typing import Callable
+
+from pymodaq.utils.enums import BaseEnum, enum_checker
+from pymodaq.utils.logger import set_logger, get_module_name
+
+logger = set_logger(get_module_name(__file__))
+
+
+class WriterQueueFull(Exception):
+    pass
+
+
+class WriterError(Exception):
+    """Raised to the submitter of write requests when one of them failed on the writer thread"""
+    pass
+
+
+class BackpressurePolicy(BaseEnum):
+    """What to do with a new write request when the writer queue is full"""
+    block = 0  # wait for a free slot in the queue
+    drop = 1  # discard the new request
+    error = 2  # raise a WriterQueueFull exception
+
+
+class WriteRequest:
+    """Holds a callable and its arguments to be executed by the writer thread"""
+    def __init__(self, func: Callable, args: tuple, kwargs: dict):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.submitted = perf_counter()
+
+
+class WriterMetrics:
+    """Statistics about the write requests processed by a H5WriterThread
+
+    Attributes
+    ----------
+    submitted: int
+        number of requests accepted in the queue
+    written: int
+        number of requests executed without error
+    dropped: int
+        number of requests discarded because the queue was full
+    errors: int
+        number of requests that raised an exception
+    queue_depth: int
+        number of pending requests at the last submission/execution
+    max_queue_depth: int
+        highest number of pending requests
+    last_latency, max_latency, mean_latency: float
+        time in s between the submission of a request and the end of its execution
+    last_write_duration, max_write_duration: float
+        time in s spent executing a request
+    """
+    def __init__(self):
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.last_latency = 0.
+        self.max_latency = 0.
+        self.last_write_duration = 0.
+        self.max_write_duration = 0.
+        self._total_latency = 0.
+
+    @property
+    def mean_latency(self) -> float:
+        return self._total_latency / self.written if self.written != 0 else 0.
+
+    def update_queue_depth(self, depth: int):
+        self.queue_depth = depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def update_latency(self, latency: float, duration: float):
+        self.written += 1
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self._total_latency += latency
+        self.last_write_duration = duration
+        self.max_write_duration = max(self.max_write_duration, duration)
+
+    def to_dict(self) -> dict:
+        return dict(submitted=self.submitted, written=self.written, dropped=self.dropped,
+                    errors=self.errors, queue_depth=self.queue_depth,
+                    max_queue_depth=self.max_queue_depth, last_latency=self.last_latency,
+                    max_latency=self.max_latency, mean_latency=self.mean_latency,
+                    last_write_duration=self.last_write_duration,
+                    max_write_duration=self.max_write_duration)
+
+    def __repr__(self):
+        return (f'WriterMetrics: {self.written}/{self.submitted} written, {self.dropped} dropped, '
+                f'{self.errors} errors, max queue depth: {self.max_queue_depth}, '
+                f'mean latency: {self.mean_latency * 1000:.1f} ms, '
+                f'max latency: {self.max_latency * 1000:.1f} ms')
+
+
+class H5WriterThread(threading.Thread):
+    """Thread executing, in their submission order, the write requests on a h5 file
+
+    While running, this thread should be the only one accessing the file: all write operations
+    have to be submitted and any other access has to be preceded by a call to the barrier method.
+
+    An exception raised by a request is stored and raised back as a WriterError to the caller of
+    the next submit, barrier or stop so that failed writes do not go unnoticed.
+
+    Parameters
+    ----------
+    queue_size: int
+        maximum number of pending requests
+    policy: BackpressurePolicy or str
+        what to do when submitting a request while the queue is full
+    name: str
+        the name of the thread
+    """
+
+    def __init__(self, queue_size: int = 100, policy: BackpressurePolicy = 'block',
+                 name: str = 'H5Writer'):
+        super().__init__(name=name, daemon=True)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self.policy = enum_checker(BackpressurePolicy, policy)
+        self.metrics = WriterMetrics()
+        self._metrics_lock = threading.Lock()
+        self._error: Exception = None
+
+    @property
+    def queue_size(self) -> int:
+        return self._queue.maxsize
+
+    def _is_writer_thread(self) -> bool:
+        return threading.current_thread() is self
+
+    @property
+    def failed(self) -> bool:
+        """True if a request failed and its error has not been raised yet (see raise_error)"""
+        return self._error is not None
+
+    def raise_error(self):
+        """Raise a WriterError if a request failed since the last call, the error being then cleared"""
+        with self._metrics_lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise WriterError(f'A write request failed: {error}') from error
+
+    def submit(self, func: Callable, *args, **kwargs) -> bool:
+        """Queue a call to func with the given arguments
+
+        If called from the writer thread itself (a request submitting another one), the call is
+        executed immediately to preserve the ordering.
+
+        Returns
+        -------
+        bool: True if the request has been queued (or executed), False if it has been dropped
+
+        Raises
+        ------
+        WriterError: if a previously submitted request failed
+        """
+        if self._is_writer_thread():
+            func(*args, **kwargs)
+            return True
+        self.raise_error()
+        request = WriteRequest(func, args, kwargs)
+        if self.policy == BackpressurePolicy['block']:
+            self._queue.put(request)
+        else:
+            try:
+                self._queue.put_nowait(request)
+            except queue.Full:
+                if self.policy == BackpressurePolicy['drop']:
+                    with self._metrics_lock:
+                        self.metrics.dropped += 1
+                    logger.warning(f'The h5 writer queue is full ({self.queue_size} requests),'
+                                   f' a write request has been dropped')
+                    return False
+                else:
+                    raise WriterQueueFull(f'The h5 writer queue is full ({self.queue_size} '
+                                          f'requests)')
+        with self._metrics_lock:
+            self.metrics.submitted += 1
+            self.metrics.update_queue_depth(self._queue.qsize())
+        return True
+
+    def run(self):
+        while True:
+            request: WriteRequest = self._queue.get()
+            try:
+                if request is None:
+                    break
+                start = perf_counter()
+                try:
+                    request.func(*request.args, **request.kwargs)
+                except Exception as e:
+                    with self._metrics_lock:
+                        self.metrics.errors += 1
+                        if self._error is None:
+                            self._error = e
+                    logger.exception(str(e))
+                else:
+                    end = perf_counter()
+                    with self._metrics_lock:
+                        self.metrics.update_latency(end - request.submitted, end - start)
+                with self._metrics_lock:
+                    self.metrics.update_queue_depth(self._queue.qsize())
+            finally:
+                self._queue.task_done()
+
+    def barrier(self):
+        """Block until all the requests submitted so far have been executed
+
+        Raises
+        ------
+        WriterError: if one of the requests failed
+        """
+        if not self._is_writer_thread():
+            if self.is_alive():
+                self._queue.join()
+            self.raise_error()
+
+    def stop(self):
+        """Execute all pending requests then terminate the thread
+
+        Raises
+        ------
+        WriterError: if one of the requests failed
+        """
+        if self.is_alive():
+            self._queue.put(None)
+            if not self._is_writer_thread():
+                self.join()
+        if not self._is_writer_thread():
+            self.raise_error()
@@ -1,8 +1,9 @@
-from typing import List, Union, TYPE_CHECKING
+from typing import Dict, List, Union, TYPE_CHECKING
 
 from collections import OrderedDict
-from qtpy.QtCore import QObject, Signal, Slot, QThread
+from qtpy.QtCore import QObject, Signal, Slot, QThread, QEventLoop, QTimer, QMetaObject, Qt
 from qtpy import QtWidgets
+import numpy as np
 import time
 
 from pymodaq.utils.logger import set_logger, get_module_name, get_module_name
@@ -73,12 +74,24 @@ class ModulesManager(QObject, ParameterManager):
             assert mod in detectors
 
         self.actuator_timeout = config('actuator', 'timeout')
+        self.skip_redundant_moves = config('actuator', 'skip_redundant_moves')
         self.detector_timeout = config('viewer', 'timeout')
 
         self.det_done_datas: DataToExport = None
         self.det_done_flag = False
+        self.integration_done_flag = False
+        self._integrated_detectors: List[str] = []
+        self._grab_start_time = 0.
         self.move_done_positions: DataToExport = None
         self.move_done_flag = False
+        self._move_start_time = 0.
+        self._last_targets: Dict[str, DataActuator] = dict([])
+        self._last_positions: Dict[str, DataActuator] = dict([])
+        self.n_moves_saved = 0
+        self._wait_loop: QEventLoop = None
+        self._move_timings: Dict[str, float] = dict([])
+        self._grab_timings: Dict[str, float] = dict([])
+        self._wait_durations: Dict[str, List[float]] = dict(move=[], integration=[], det=[])
 
         self.settings.child('data_dimensions', 'probe_data').sigActivated.connect(self.get_det_data_list)
         self.settings.child('actuators_positions', 'test_actuator').sigActivated.connect(self.test_move_actuators)
@@ -274,24 +287,53 @@ class ModulesManager(QObject, ParameterManager):
 
     def grab_datas(self, **kwargs):
         """Do a single grab of connected and selected detectors"""
+        self.start_grab(**kwargs)
+        return self.wait_det_done()
+
+    def start_grab(self, **kwargs):
+        """Trigger a single grab of connected and selected detectors without waiting for their data
+
+        See Also
+        --------
+        wait_integration_done, wait_det_done
+        """
         self.det_done_datas = DataToExport(name=__class__.__name__, control_module='DAQ_Viewer')
         self._received_data = 0
+        self._integrated_detectors = []
         self.det_done_flag = False
+        self.integration_done_flag = False
         self.settings.child('det_done').setValue(self.det_done_flag)
-        tzero = time.perf_counter()
+        self._grab_start_time = time.perf_counter()
+        self._grab_timings = dict(grab_issued=self._grab_start_time)
 
         for mod in self.detectors:
             kwargs.update(dict(Naverage=mod.Naverage))
             mod.command_hardware.emit(utils.ThreadCommand("single", kwargs))
 
-        while not self.det_done_flag:
-            # wait for grab done signals to end
+    def wait_integration_done(self) -> bool:
+        """Wait for all the detectors triggered by start_grab to have done their integration
+
+        The detectors may still be reading out, transferring or processing their data, but the
+        actuators can already be moved. Detectors whose plugin does not notify the end of its
+        integration are considered done when their plugin has emitted its data.
 
-            QtWidgets.QApplication.processEvents()
-            if time.perf_counter() - tzero > self.detector_timeout:
-                self.timeout_signal.emit(True)
-                logger.error('Timeout Fired during waiting for data to be acquired')
-                break
+        Returns
+        -------
+        bool: False if the detector timeout fired
+        """
+        if not self._wait_for(lambda: self.integration_done_flag or self.det_done_flag,
+                              self._grab_start_time, self.detector_timeout, 'integration'):
+            self.timeout_signal.emit(True)
+            logger.error('Timeout Fired during waiting for data to be integrated')
+            return False
+        return True
+
+    def wait_det_done(self) -> DataToExport:
+        """Wait for the data of all the detectors triggered by start_grab"""
+        if not self._wait_for(lambda: self.det_done_flag, self._grab_start_time,
+                              self.detector_timeout, 'det'):
+            self.timeout_signal.emit(True)
+            logger.error('Timeout Fired during waiting for data to be acquired')
 
         self.det_done_signal.emit(self.det_done_datas)
         return self.det_done_datas
@@ -317,6 +359,7 @@ class ModulesManager(QObject, ParameterManager):
         """
         if slot is None:
             slot = self.move_done
+        self.forget_positions()
         if connect:
             for sig in [mod.move_done_signal if signal == 'move_done' else mod.current_value_signal
                         for mod in self.actuators]:
@@ -349,10 +392,16 @@ class ModulesManager(QObject, ParameterManager):
 
         if slot is None:
             slot = self.det_done
+            integration_slot = self.integration_done
+        else:
+            integration_slot = None
 
         if connect:
             for sig in [mod.grab_done_signal for mod in self.detectors]:
                 sig.connect(slot)
+            if integration_slot is not None:
+                for sig in [mod.integration_done_signal for mod in self.detectors]:
+                    sig.connect(integration_slot)
         else:
 
             for sig in [mod.grab_done_signal for mod in self.detectors_all]:
@@ -361,6 +410,12 @@ class ModulesManager(QObject, ParameterManager):
                 except TypeError as e:
                     # means the slot was not previously connected
                     logger.info(str(e))
+            if integration_slot is not None:
+                for sig in [mod.integration_done_signal for mod in self.detectors_all]:
+                    try:
+                        sig.disconnect(integration_slot)
+                    except TypeError as e:
+                        logger.info(str(e))
 
         self.detectors_connected = connect
 
@@ -402,6 +457,31 @@ class ModulesManager(QObject, ParameterManager):
         Returns
         -------
         DataToExport with the selected actuators's name as key and current actuators's value as value
+
+        Notes
+        -----
+        If the moves cannot be started (invalid mode or number of positions), the error is logged,
+        move_done_signal is not emitted and an empty DataToExport is returned
+        """
+        if not self.start_move(dte_act, mode, polling):
+            return self.move_done_positions
+        if polling:
+            return self.wait_move_done()
+        self.move_done_signal.emit(self.move_done_positions)
+        return self.move_done_positions
+
+    def start_move(self, dte_act: DataToExport, mode='abs', polling=True) -> bool:
+        """Send the positions to the selected actuators without waiting for the end of the moves
+
+        Parameters are the same as for move_actuators
+
+        Returns
+        -------
+        bool: True if the move commands have been sent
+
+        See Also
+        --------
+        move_actuators, wait_move_done
         """
         self.move_done_positions = DataToExport(name=__class__.__name__, control_module='DAQ_Move')
         self.move_done_flag = False
@@ -413,14 +493,23 @@ class ModulesManager(QObject, ParameterManager):
             command = 'move_rel'
         else:
             logger.error(f'Invalid positioning mode: {mode}')
-            return self.move_done_positions
+            return False
 
         if len(dte_act) == self.Nactuators:
             for dact in dte_act:
                 act = self.get_mod_from_name(dact.name, 'act')
                 if act is not None:
+                    if mode == 'abs' and self.is_move_redundant(act, dact):
+                        self.n_moves_saved += 1
+                        self.move_done_positions.append(self._last_positions[act.title])
+                        continue
+                    self._last_positions.pop(act.title, None)  # set back when the move is done
                     act.command_hardware.emit(
                         utils.ThreadCommand(command=command, attribute=[dact, polling]))
+                    if mode == 'abs':
+                        self._last_targets[act.title] = dact
+                    else:
+                        self._last_targets.pop(act.title, None)
             # else:
             #     for ind, act in enumerate(self.actuators):
             #         #getattr(act, command)(positions[ind])
@@ -428,25 +517,135 @@ class ModulesManager(QObject, ParameterManager):
 
         else:
             logger.error('Invalid number of positions compared to selected actuators')
-            return self.move_done_positions
+            return False
+        self._move_start_time = time.perf_counter()
+        self._move_timings = dict(move_issued=self._move_start_time)
+        if len(self.move_done_positions) == len(self.actuators):  # no actuator had to move
+            self._move_timings['move_done'] = self._move_start_time
+            self.move_done_flag = True
+            self.settings.child('move_done').setValue(self.move_done_flag)
+        return True
+
+    def is_move_redundant(self, act: 'DAQ_Move', target: DataActuator) -> bool:
+        """Check if an actuator is already at a target position
+
+        This is the case if the actuator has been sent to the same target position (within its epsilon)
+        by the previous move and if its readback position at the end of this move is within its epsilon
+        of the target. Always False if the skip_redundant_moves attribute is False (see the
+        skip_redundant_moves key of the actuator section of the configuration file).
+        """
+        if not self.skip_redundant_moves or act.title not in self._last_targets or \
+                act.title not in self._last_positions:
+            return False
+        epsilon = act.epsilon
+        try:
+            return (abs(target.value() - self._last_targets[act.title].value()) < epsilon and
+                    abs(target.value() - self._last_positions[act.title].value()) < epsilon)
+        except Exception:
+            return False
 
-        tzero = time.perf_counter()
-        if polling:
-            while not self.move_done_flag:  # polling move done
+    def forget_positions(self):
+        """Forget the last target and readback positions of the actuators so that their next moves are
+        not skipped (see is_move_redundant)"""
+        self._last_targets = dict([])
+        self._last_positions = dict([])
 
-                QtWidgets.QApplication.processEvents()
-                if time.perf_counter() - tzero > self.actuator_timeout / 1000:  # timeout in seconds
-                    self.timeout_signal.emit(True)
-                    logger.error('Timeout Fired during waiting for actuators to be moved')
-                    break
-                QThread.msleep(20)
+    def wait_move_done(self) -> DataToExport:
+        """Wait for the actuators moved by start_move to reach their positions
+
+        Returns
+        -------
+        DataToExport with the selected actuators's name as key and current actuators's value as value
+        """
+        if not self._wait_for(lambda: self.move_done_flag, self._move_start_time,
+                              self.actuator_timeout, 'move'):
+            self.timeout_signal.emit(True)
+            logger.error('Timeout Fired during waiting for actuators to be moved')
 
         self.move_done_signal.emit(self.move_done_positions)
         return self.move_done_positions
 
+    def _wait_for(self, is_done, start_time: float, timeout: int, kind: str) -> bool:
+        """Run a local event loop until is_done returns True or the timeout expires
+
+        The loop is quit by the slots setting the flags (see _wake_up), so that there is no dead time
+        between the last module being done and the return of this method.
+
+        Parameters
+        ----------
+        is_done: Callable[[], bool]
+        start_time: float
+            the time (from time.perf_counter) at which the commands have been sent to the modules
+        timeout: int
+            the timeout in ms, counted from start_time
+        kind: str
+            either 'move', 'integration' or 'det', the key of the wait durations statistics
+
+        Returns
+        -------
+        bool: False if the timeout expired
+        """
+        wait_start = time.perf_counter()
+        remaining = int(timeout - 1000 * (wait_start - start_time))
+        if not is_done() and remaining > 0:
+            loop = QEventLoop()
+            timer = QTimer()
+            timer.setSingleShot(True)
+            timer.timeout.connect(loop.quit)
+            self._wait_loop = loop
+            timer.start(remaining)
+            while not is_done() and timer.isActive():
+                loop.exec_()
+            timer.stop()
+            self._wait_loop = None
+        self._wait_durations[kind].append(time.perf_counter() - wait_start)
+        return is_done()
+
+    def _wake_up(self):
+        """Quit the event loop of the current wait, from the thread it is running in"""
+        loop = self._wait_loop
+        if loop is not None:
+            QMetaObject.invokeMethod(loop, 'quit', Qt.QueuedConnection)
+
+    @property
+    def move_timings(self) -> Dict[str, float]:
+        """time.perf_counter values at which the last move has been issued ('move_issued') and
+        done ('move_done')"""
+        return dict(self._move_timings)
+
+    @property
+    def grab_timings(self) -> Dict[str, float]:
+        """time.perf_counter values at which the last grab has been issued ('grab_issued') and at
+        which each detector returned its data ('det_done <detector title>')"""
+        return dict(self._grab_timings)
+
+    def get_wait_statistics(self) -> Dict[str, Dict[str, float]]:
+        """Statistics of the time spent waiting for the modules since the last reset
+
+        Returns
+        -------
+        dict: for each kind of wait ('move', 'integration' and 'det'), a dict with the number of waits
+            and the mean, max and total wait durations in seconds
+        """
+        stats = dict([])
+        for kind, durations in self._wait_durations.items():
+            durations = np.array(durations)
+            stats[kind] = dict(n=len(durations),
+                               mean=float(durations.mean()) if len(durations) > 0 else 0.,
+                               max=float(durations.max()) if len(durations) > 0 else 0.,
+                               total=float(durations.sum()))
+        return stats
+
+    def reset_wait_statistics(self):
+        """Reset the wait durations statistics and the number of moves saved"""
+        for durations in self._wait_durations.values():
+            durations.clear()
+        self.n_moves_saved = 0
+
     def reset_signals(self):
         self.move_done_flag = True
         self.det_done_flag = True
+        self._wake_up()
 
     def order_positions(self, positions: DataToExport):
         """ Reorder the content of the DataToExport given the order of the selected actuators"""
@@ -459,17 +658,29 @@ class ModulesManager(QObject, ParameterManager):
     @Slot(DataActuator)
     def move_done(self, data_act: DataActuator):
         try:
+            self._last_positions[data_act.name] = data_act
             if data_act.name not in self.move_done_positions.get_names():
                 self.move_done_positions.append(data_act)
 
             if len(self.move_done_positions) == len(self.actuators):
+                self._move_timings['move_done'] = time.perf_counter()
                 self.move_done_flag = True
                 self.settings.child('move_done').setValue(self.move_done_flag)
+                self._wake_up()
         except Exception as e:
             logger.exception(str(e))
 
+    @Slot(str)
+    def integration_done(self, detector_name: str):
+        if detector_name not in self._integrated_detectors:
+            self._integrated_detectors.append(detector_name)
+        if len(self._integrated_detectors) == len(self.detectors):
+            self.integration_done_flag = True
+            self._wake_up()
+
     def det_done(self, data: DataToExport):
         if self.det_done_datas is not None:  # means that somehow data are not initialized so no further processing
+            self._grab_timings[f'det_done {data.name}'] = time.perf_counter()
             self._received_data += 1
             if len(data) != 0:
                 self.det_done_datas.append(data)
@@ -477,6 +688,7 @@ class ModulesManager(QObject, ParameterManager):
             if self._received_data == len(self.detectors):
                 self.det_done_flag = True
                 self.settings.child('det_done').setValue(self.det_done_flag)
+                self._wake_up()
 
         # if data.name not in list(self.det_done_datas.keys()):
         #     self.det_done_datas[data['name']] = data
@@ -3,7 +3,7 @@ from qtpy import QtWidgets
 from qtpy.QtCore import QDateTime, Signal, QPointF, QObject
 import numpy as np
 import pyqtgraph as pg
-from pymodaq.utils.plotting.widgets.image import ImageWidget
+from pymodaq.utils.plotting.widgets import ImageWidget
 from pymodaq.utils.managers.roi_manager import ROIBrushable
 
 from pyqtgraph.graphicsItems.GradientEditorItem import Gradients
@@ -13,14 +13,14 @@ colors = []
 for ticks in Gradients['thermal']['ticks']:
     pos.append(ticks[0])
     colors.append(ticks[1])
-cmap = pg.ColorMap(pos, colors, Gradients['thermal']['mode'])
+cmap = pg.ColorMap(pos, colors)
 
 
 def setTicksLabels(values):
     strings = []
     for v in values:
         d = QDateTime()
-        d = d.fromSecsSinceEpoch(v * 30 * 60)
+        d = d.fromSecsSinceEpoch(int(v * 30 * 60))
         vstr = d.toString('HH:mm dd/MM/yy')
         strings.append(vstr)
     return strings
@@ -43,7 +43,8 @@ class AxisItemDate(pg.AxisItem):
 class GanttROI(ROIBrushable):
     index_signal = Signal(int)
 
-    def __init__(self, task='No task', index=0, start=0, stop=1, brush=None, *args, **kwargs):
+    def __init__(self, task='No task', index=0, start=0, stop=1, brush=None, *args, date_axis=True, **kwargs):
+        self.date_axis = date_axis
         super().__init__(pos=[start, index], size=[stop - start, 1], brush=brush, pen=brush, snapSize=1, scaleSnap=True,
                          translateSnap=True, *args, **kwargs)  # )
         self.h1 = self.addScaleHandle([1, 0.5], [0, 0.5])
@@ -57,8 +58,12 @@ class GanttROI(ROIBrushable):
         self.update_tooltip()
 
     def update_tooltip(self):
-        self.h2.setToolTip(setTicksLabels([self.pos()[0]])[0])
-        self.h1.setToolTip(setTicksLabels([self.pos()[0] + self.size()[0]])[0])
+        if self.date_axis:
+            self.h2.setToolTip(setTicksLabels([self.pos()[0]])[0])
+            self.h1.setToolTip(setTicksLabels([self.pos()[0] + self.size()[0]])[0])
+        else:
+            self.h2.setToolTip(f'{self.pos()[0]:.4g}')
+            self.h1.setToolTip(f'{self.pos()[0] + self.size()[0]:.4g}')
 
     def center(self):
         return QPointF(self.pos().x() + self.size().x() / 2, self.pos().y() + self.size().y() / 2)
@@ -70,15 +75,15 @@ class GanttROI(ROIBrushable):
 class GanttTask(QObject):
     alpha = 255
 
-    def __init__(self, task_dict):
+    def __init__(self, task_dict, date_axis=True):
         super().__init__()
 
         self.task_dict = task_dict  # taskdict=dict(name=  ,idnumber=  ,task_type=int(0 to 12), time_start=, time_end=)
         qc = cmap.mapToQColor(task_dict['task_type'] / 12)
         qc.setAlpha(self.alpha)
         self.roi_item = GanttROI(task_dict['name'], task_dict['idnumber'], start=task_dict['time_start'],
-                                 stop=task_dict['time_end'], brush=qc)
-        self.roi_item.sigRegionChangeFinished.connect(self.show_hide_move_text())
+                                 stop=task_dict['time_end'], brush=qc, date_axis=date_axis)
+        self.roi_item.sigRegionChangeFinished.connect(self.show_hide_move_text)
         self.roi_item.setZValue(-1000)
         self.text_item = pg.TextItem(task_dict['name'])
         self.text_item.setPos(task_dict['time_start'], task_dict['idnumber'])
@@ -89,14 +94,23 @@ class GanttTask(QObject):
 
 
 class GanttChart(QObject):
-    def __init__(self):
+    """Display tasks as bars along a time axis, one row per idnumber
+
+    Parameters
+    ----------
+    date_axis: bool
+        if True the time axis displays dates (in units of 30 minutes), otherwise the raw values
+    """
+    def __init__(self, date_axis=True):
         super().__init__()
+        self.date_axis = date_axis
         self.setupUI()
         self.tasks = []
 
     def setupUI(self):
-        axis = AxisItemDate(orientation='bottom')
-        axis_top = AxisItemDate(orientation='top')
+        axis_class = AxisItemDate if self.date_axis else pg.AxisItem
+        axis = axis_class(orientation='bottom')
+        axis_top = axis_class(orientation='top')
 
         self.widget = ImageWidget(axisItems=dict(bottom=axis, top=axis_top))
         self.widget.plotitem.showAxis('top')
@@ -105,10 +119,16 @@ class GanttChart(QObject):
         self.widget.view.setLimits(yMin=0)
 
     def add_task(self, task_dict):
-        self.tasks.append(GanttTask(task_dict))
+        self.tasks.append(GanttTask(task_dict, date_axis=self.date_axis))
         self.widget.plotItem.addItem(self.tasks[-1].roi_item)
         self.widget.plotItem.addItem(self.tasks[-1].text_item)
 
+    def set_row_labels(self, labels: dict):
+        """Display labels on the left axis at the center of the rows given by their idnumber"""
+        self.widget.plotitem.showAxis('left')
+        self.widget.plotitem.getAxis('left').setTicks(
+            [[(idnumber + 0.5, label) for idnumber, label in labels.items()]])
+
 
 # # create GUI
 if __name__ == '__main__':
@@ -157,11 +157,10 @@ def get_sub_segmented_positions(spacing: float, points: List[Point]) -> List[np.
     positions = []
     for ind in range(len(points) - 1):
         vect = Vector(points[ind+1]-points[ind], origin=points[ind])
-        npts = 0
-        while npts * spacing < vect.norm():
-            positions.append(
-                (vect.origin + vect.unit_vector() * npts * spacing).coordinates)
-            npts += 1
+        npts = np.arange(int(np.ceil(vect.norm() / spacing)) + 1)
+        npts = npts[npts * spacing < vect.norm()]
+        positions.extend(vect.origin.coordinates +
+                         vect.unit_vector().coordinates * npts[:, None] * spacing)
 
     # # add_last point not taken into account
     positions.append(points[-1].coordinates)
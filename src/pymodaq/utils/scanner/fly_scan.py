@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Utilities for fly scans: the fast actuator moves continuously along each line of the scan while
+the detectors grab freely. Each frame is given the position of the actuator at its timestamp,
+interpolated from the timestamped actuator readbacks, then assigned to the steps of the line.
+"""
+from typing import List
+
+import numpy as np
+
+from pymodaq.utils.data import DataActuator, DataToExport, DataSource
+
+
+def interpolate_positions(times: np.ndarray, readback_times: np.ndarray,
+                          readback_positions: np.ndarray) -> np.ndarray:
+    """Interpolate the actuator positions at given times from its timestamped readbacks
+
+    Times before the first (resp. after the last) readback get the first (resp. last) readback
+    position as the actuator is supposed to stand still before and after its move.
+
+    Parameters
+    ----------
+    times: np.ndarray
+        the times at which positions are needed
+    readback_times: np.ndarray
+        the timestamps of the readbacks
+    readback_positions: np.ndarray
+        the actuator positions read back at readback_times
+
+    Returns
+    -------
+    np.ndarray: the interpolated positions at times
+    """
+    readback_times = np.asarray(readback_times, dtype=float)
+    readback_positions = np.asarray(readback_positions, dtype=float)
+    order = np.argsort(readback_times, kind='stable')
+    return np.interp(np.asarray(times, dtype=float), readback_times[order], readback_positions[order])
+
+
+def bin_positions(positions: np.ndarray, line_positions: np.ndarray) -> List[np.ndarray]:
+    """Assign positions to the steps of a line
+
+    Each position is assigned to the step it is the closest to, positions further than half a
+    step outside the line being ignored. Steps with no assigned position get the closest position.
+
+    Parameters
+    ----------
+    positions: np.ndarray
+        the positions (of the frames) to be assigned
+    line_positions: np.ndarray
+        the monotonic positions of the steps of the line
+
+    Returns
+    -------
+    list of np.ndarray: for each step of the line, the indexes of the assigned positions
+    """
+    positions = np.asarray(positions, dtype=float)
+    line_positions = np.asarray(line_positions, dtype=float)
+    if len(positions) == 0:
+        return [np.array([], dtype=int) for _ in line_positions]
+    order = np.argsort(line_positions, kind='stable')
+    sorted_line = line_positions[order]
+    if len(sorted_line) > 1:
+        half_steps = np.diff(sorted_line) / 2
+        edges = np.concatenate(([sorted_line[0] - half_steps[0]], sorted_line[:-1] + half_steps,
+                                [sorted_line[-1] + half_steps[-1]]))
+    else:
+        edges = np.array([-np.inf, np.inf])
+    sorted_bins = np.searchsorted(edges, positions, side='right') - 1
+    inside = (sorted_bins >= 0) & (sorted_bins < len(sorted_line))
+    bins = np.full(positions.shape, -1)
+    bins[inside] = order[sorted_bins[inside]]
+
+    assigned = []
+    for ind_step, line_position in enumerate(line_positions):
+        frames = np.flatnonzero(bins == ind_step)
+        if len(frames) == 0:
+            frames = np.array([np.argmin(np.abs(positions - line_position))])
+        assigned.append(frames)
+    return assigned
+
+
+class FlyScanRecorder:
+    """Collect the timestamped readbacks of the fast actuator and the frames of the detectors
+    during the move along one line of a fly scan
+
+    Parameters
+    ----------
+    actuator_name: str
+        the title of the fast actuator, readbacks from other actuators are ignored
+    """
+
+    def __init__(self, actuator_name: str):
+        self.actuator_name = actuator_name
+        self.readback_times: List[float] = []
+        self.readback_positions: List[float] = []
+        self.frame_times: List[float] = []
+        self.frames: List[dict] = []
+
+    def add_readback(self, data_act: DataActuator):
+        """Slot to be connected to the current_value_signal and move_done_signal of the actuators"""
+        if data_act.name == self.actuator_name:
+            self.readback_times.append(data_act.timestamp)
+            self.readback_positions.append(data_act.value())
+
+    def add_frame(self, detectors_data: dict):
+        """Store the data of one grab of all the detectors
+
+        The time of the frame is the mean of the timestamps of the raw data emitted by the
+        detector plugins
+
+        Parameters
+        ----------
+        detectors_data: dict
+            the DataToExport of each detector with the detector title as key
+        """
+        timestamps = [dwa.timestamp for dte in detectors_data.values()
+                      for dwa in dte.get_data_from_source(DataSource['raw'])]
+        if len(timestamps) == 0:
+            timestamps = [dwa.timestamp for dte in detectors_data.values() for dwa in dte]
+        self.frame_times.append(float(np.mean(timestamps)))
+        self.frames.append(detectors_data)
+
+    def get_frame_positions(self) -> np.ndarray:
+        """The positions of the fast actuator at the time of each frame"""
+        if len(self.readback_times) == 0:
+            return np.full((len(self.frames),), np.nan)
+        return interpolate_positions(self.frame_times, self.readback_times, self.readback_positions)
+
+    def get_binned_frames(self, line_positions: np.ndarray) -> List[dict]:
+        """Average the frames assigned to each step of the line
+
+        Parameters
+        ----------
+        line_positions: np.ndarray
+            the positions of the fast actuator at each step of the line
+
+        Returns
+        -------
+        list of dict: for each step, the (averaged) DataToExport of each detector
+        """
+        binned = []
+        for frame_indexes in bin_positions(self.get_frame_positions(), line_positions):
+            frames = [self.frames[ind] for ind in frame_indexes]
+            averaged = dict(frames[0])
+            for ind_frame, frame in enumerate(frames[1:]):
+                for title, dte in frame.items():
+                    averaged[title] = dte.average(averaged[title], ind_frame + 1)
+            binned.append(averaged)
+        return binned
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+Adaptive sampling engine used by the adaptive scanners, following the learner/loss model of the
+python-adaptive package: a learner is told the values measured at some points and asked for the
+next points to probe. Those are taken within the intervals (1D) or triangles (2D) of the sampled
+domain having the largest loss, the loss being a function of the (scaled) points and values.
+Points asked but not yet measured are pending: their values are interpolated from the measured
+ones, so that batches of points can be asked at once.
+
+Loss functions are pluggable: any callable with the same signature as the ones of the losses
+dictionary of a learner can be given as its loss.
+"""
+from abc import ABCMeta, abstractmethod
+from typing import Callable, Dict, Iterable, List, Tuple, Type, Union
+
+import numpy as np
+from scipy.interpolate import LinearNDInterpolator, NearestNDInterpolator
+from scipy.spatial import Delaunay
+
+from pymodaq.utils.data import Axis, DataDistribution
+
+
+def uniform_loss_1d(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Loss of each interval given by its length, giving a uniform sampling
+
+    Parameters
+    ----------
+    xs: np.ndarray
+        the sorted and scaled positions of the points
+    ys: np.ndarray
+        the scaled values at these points
+
+    Returns
+    -------
+    np.ndarray: the loss of the len(xs) - 1 intervals
+    """
+    return np.diff(xs)
+
+
+def default_loss_1d(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Loss of each interval given by the length of the segment joining its points in the (x, y)
+    plane, sampling more where the values vary (see uniform_loss_1d for the signature)"""
+    return np.hypot(np.diff(xs), np.diff(ys))
+
+
+def curvature_loss_1d(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Default loss plus the square root of the mean area of the triangles formed by the points of
+    each interval with their neighbours, sampling more where the curvature is high (see
+    uniform_loss_1d for the signature)"""
+    areas = np.zeros(xs.shape)
+    areas[1:-1] = 0.5 * np.abs((xs[1:-1] - xs[:-2]) * (ys[2:] - ys[:-2]) -
+                               (xs[2:] - xs[:-2]) * (ys[1:-1] - ys[:-2]))
+    return default_loss_1d(xs, ys) + np.sqrt((areas[:-1] + areas[1:]) / 2)
+
+
+def uniform_loss_2d(vertices: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Loss of each triangle given by the square root of its area, giving a uniform sampling
+
+    Parameters
+    ----------
+    vertices: np.ndarray
+        the scaled positions of the vertices of the triangles, of shape (n_triangles, 3, 2)
+    values: np.ndarray
+        the scaled values at these vertices, of shape (n_triangles, 3)
+
+    Returns
+    -------
+    np.ndarray: the loss of the n_triangles triangles
+    """
+    sides_a = vertices[:, 1] - vertices[:, 0]
+    sides_b = vertices[:, 2] - vertices[:, 0]
+    return np.sqrt(0.5 * np.abs(sides_a[:, 0] * sides_b[:, 1] - sides_a[:, 1] * sides_b[:, 0]))
+
+
+def default_loss_2d(vertices: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Loss of each triangle given by the square root of the area of the triangle joining its
+    vertices in the (x, y, value) space, sampling more where the values vary (see uniform_loss_2d
+    for the signature)"""
+    points = np.concatenate((vertices, values[..., np.newaxis]), axis=-1)
+    cross = np.cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0])
+    return np.sqrt(0.5 * np.linalg.norm(cross, axis=-1))
+
+
+class LearnerBase(metaclass=ABCMeta):
+    """Base class of the learners choosing the next points to probe from the measured ones
+
+    Parameters
+    ----------
+    bounds: iterable of (float, float)
+        the start and stop of the domain along each axis
+    loss: str or Callable
+        one of the keys of the losses dictionary or a loss function with the same signature
+
+    Attributes
+    ----------
+    losses: dict
+        the available loss functions
+    """
+    losses: Dict[str, Callable] = dict([])
+
+    def __init__(self, bounds: Iterable[Tuple[float, float]], loss: Union[str, Callable] = 'default'):
+        self.bounds = np.atleast_2d(np.asarray(bounds, dtype=float))
+        if np.any(self.bounds[:, 0] == self.bounds[:, 1]):
+            raise ValueError(f'The bounds {bounds} should have different start and stop values')
+        if callable(loss):
+            self.loss_function = loss
+        elif loss in self.losses:
+            self.loss_function = self.losses[loss]
+        else:
+            raise ValueError(f'{loss} is not a valid loss, should be one of {list(self.losses.keys())}')
+        self._points = np.zeros((0, self.n_axes))
+        self._values = np.zeros((0,))
+        self._pending = np.zeros((0, self.n_axes))
+
+    @property
+    def n_axes(self) -> int:
+        return self.bounds.shape[0]
+
+    @property
+    def points(self) -> np.ndarray:
+        """The measured points, of shape (n_points, n_axes)"""
+        return self._points
+
+    @property
+    def values(self) -> np.ndarray:
+        """The values measured at each point"""
+        return self._values
+
+    @property
+    def pending(self) -> np.ndarray:
+        """The points asked but not measured yet, of shape (n_pending, n_axes)"""
+        return self._pending
+
+    @property
+    def n_points(self) -> int:
+        return len(self._points)
+
+    def tell(self, point: Union[float, Iterable[float]], value: float):
+        """Give the value measured at a point, removing it from the pending points"""
+        point = np.asarray(point, dtype=float).reshape((1, self.n_axes))
+        self._points = np.concatenate((self._points, point))
+        self._values = np.append(self._values, float(value))
+        is_point = np.all(np.isclose(self._pending, point), axis=1)
+        if np.any(is_point):
+            self._pending = np.delete(self._pending, np.flatnonzero(is_point)[0], axis=0)
+
+    def tell_many(self, points: Iterable, values: Iterable[float]):
+        for point, value in zip(points, values):
+            self.tell(point, value)
+
+    def ask(self, n: int = 1) -> np.ndarray:
+        """Get the next n points to probe, those being pending until their values are told
+
+        Returns
+        -------
+        np.ndarray: the points of shape (n, n_axes)
+        """
+        points = []
+        for _ in range(n):
+            point = self._get_initial_point()
+            if point is None:
+                point = self._unscale(self._get_next_scaled_point())
+            self._pending = np.concatenate((self._pending, point.reshape((1, self.n_axes))))
+            points.append(point)
+        return np.array(points).reshape((n, self.n_axes))
+
+    def _get_initial_point(self) -> Union[np.ndarray, None]:
+        """Get the first initial point neither measured nor pending, if any"""
+        known = np.concatenate((self._points, self._pending))
+        for point in self.get_initial_points():
+            if not np.any(np.all(np.isclose(known, point), axis=1)):
+                return point
+        return None
+
+    def initial_points_measured(self) -> bool:
+        """True if the values at all the initial points have been told"""
+        return all([np.any(np.all(np.isclose(self._points, point), axis=1))
+                    for point in self.get_initial_points()])
+
+    def _scale(self, points: np.ndarray) -> np.ndarray:
+        """Scale the points to the unit hypercube of the bounds"""
+        return (points - self.bounds[:, 0]) / (self.bounds[:, 1] - self.bounds[:, 0])
+
+    def _unscale(self, points: np.ndarray) -> np.ndarray:
+        return points * (self.bounds[:, 1] - self.bounds[:, 0]) + self.bounds[:, 0]
+
+    def _scale_values(self, values: np.ndarray) -> np.ndarray:
+        """Scale the values between 0 and 1 using the range of the measured values"""
+        if len(self._values) == 0:
+            return np.zeros(values.shape)
+        value_range = np.ptp(self._values)
+        return (values - np.min(self._values)) / (value_range if value_range > 0 else 1.)
+
+    @abstractmethod
+    def get_initial_points(self) -> np.ndarray:
+        """The points to be measured before any loss can be computed, of shape (n, n_axes)"""
+        ...
+
+    @abstractmethod
+    def _get_next_scaled_point(self) -> np.ndarray:
+        """The scaled point where the loss is the largest, the measured and pending points being
+        taken into account"""
+        ...
+
+    @abstractmethod
+    def loss(self) -> float:
+        """The largest loss of the measured points (inf if not all the initial points are known)"""
+        ...
+
+
+class Learner1D(LearnerBase):
+    """Learner sampling a 1D domain, splitting in two halves the interval with the largest loss
+
+    Parameters
+    ----------
+    bounds: (float, float)
+        the start and stop of the domain
+    loss: str or Callable
+        'default', 'curvature', 'uniform' or a function with the signature of uniform_loss_1d
+    """
+    losses = dict(default=default_loss_1d, curvature=curvature_loss_1d, uniform=uniform_loss_1d)
+
+    def get_initial_points(self) -> np.ndarray:
+        return self.bounds.T.copy()
+
+    def _get_losses(self, with_pending=True) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the sorted scaled positions of the points and the loss of each interval"""
+        xs = self._scale(self._points)[:, 0]
+        ys = self._scale_values(self._values)
+        if with_pending and len(self._pending) > 0:
+            pending_xs = self._scale(self._pending)[:, 0]
+            order = np.argsort(xs)
+            pending_ys = np.interp(pending_xs, xs[order], ys[order]) if len(xs) > 0 else \
+                np.zeros(pending_xs.shape)
+            xs = np.concatenate((xs, pending_xs))
+            ys = np.concatenate((ys, pending_ys))
+        order = np.argsort(xs)
+        return xs[order], self.loss_function(xs[order], ys[order])
+
+    def _get_next_scaled_point(self) -> np.ndarray:
+        xs, losses = self._get_losses()
+        ind = int(np.argmax(losses))
+        return np.array([(xs[ind] + xs[ind + 1]) / 2])
+
+    def loss(self) -> float:
+        if not self.initial_points_measured():
+            return np.inf
+        return float(np.max(self._get_losses(with_pending=False)[1]))
+
+
+class Learner2D(LearnerBase):
+    """Learner sampling a 2D domain, adding a point at the centroid of the triangle (of the Delaunay
+    triangulation of the known points) with the largest loss
+
+    Parameters
+    ----------
+    bounds: ((float, float), (float, float))
+        the start and stop of the domain along each axis
+    loss: str or Callable
+        'default', 'uniform' or a function with the signature of uniform_loss_2d
+    """
+    losses = dict(default=default_loss_2d, uniform=uniform_loss_2d)
+
+    def get_initial_points(self) -> np.ndarray:
+        return np.array([[self.bounds[0, ind_0], self.bounds[1, ind_1]]
+                         for ind_0 in range(2) for ind_1 in range(2)])
+
+    def _get_losses(self, with_pending=True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the scaled known points, the triangles of their triangulation and their loss"""
+        points = self._scale(self._points)
+        values = self._scale_values(self._values)
+        if with_pending and len(self._pending) > 0:
+            pending_points = self._scale(self._pending)
+            pending_values = np.zeros((len(pending_points),))
+            if len(points) >= 3:
+                pending_values = LinearNDInterpolator(points, values)(pending_points)
+                outside = np.isnan(pending_values)
+                pending_values[outside] = NearestNDInterpolator(points, values)(pending_points[outside])
+            points = np.concatenate((points, pending_points))
+            values = np.concatenate((values, pending_values))
+        triangles = Delaunay(points).simplices
+        return points, triangles, self.loss_function(points[triangles], values[triangles])
+
+    def _get_next_scaled_point(self) -> np.ndarray:
+        points, triangles, losses = self._get_losses()
+        return np.mean(points[triangles[int(np.argmax(losses))]], axis=0)
+
+    def loss(self) -> float:
+        if not self.initial_points_measured():
+            return np.inf
+        return float(np.max(self._get_losses(with_pending=False)[2]))
+
+
+def get_adaptive_params(learner_type: Type[LearnerBase]) -> List[dict]:
+    """The settings common to all adaptive scanners using a given type of learner"""
+    return [
+        {'title': 'Loss type', 'name': 'scan_loss', 'type': 'list',
+         'limits': list(learner_type.losses.keys()),
+         'tip': 'Type of loss used by the algo. to determine next points'},
+        {'title': 'Max steps:', 'name': 'max_steps', 'type': 'int', 'value': 100, 'min': 1,
+         'tip': 'The scan stops after this number of steps'},
+        {'title': 'Batch size:', 'name': 'batch_size', 'type': 'int', 'value': 1, 'min': 1,
+         'tip': 'Number of points chosen by the algo. at once, before telling it the values'},
+        {'title': 'Loss goal:', 'name': 'loss_goal', 'type': 'float', 'value': 0., 'min': 0.,
+         'tip': 'The scan stops when the largest loss is below this value (0 to disable)'},
+    ]
+
+
+class AdaptiveScanner(metaclass=ABCMeta):
+    """Mixin of the ScannerBase subclasses whose positions are chosen during the scan by a learner
+
+    The scan steps are not known in advance, the scan stops when its maximum number of steps is
+    reached or when the loss of the learner falls below the loss goal. Subclasses should define the
+    learner_type attribute, the get_bounds method and include the get_adaptive_params settings.
+    """
+    learner_type: Type[LearnerBase] = None
+    distribution = DataDistribution['spread']
+
+    @abstractmethod
+    def get_bounds(self) -> List[Tuple[float, float]]:
+        """The start and stop of the scan along each axis"""
+        ...
+
+    def get_learner(self) -> LearnerBase:
+        """Get a new learner configured from the settings"""
+        return self.learner_type(self.get_bounds(), loss=self.settings['scan_loss'])
+
+    @property
+    def batch_size(self) -> int:
+        return self.settings['batch_size']
+
+    @property
+    def loss_goal(self) -> float:
+        return self.settings['loss_goal']
+
+    def evaluate_steps(self) -> int:
+        return self.settings['max_steps']
+
+    def set_scan(self):
+        self.axes_unique = [np.array([]) for _ in range(self.n_axes)]
+        self.axes_indexes = np.zeros((0, self.n_axes), dtype=int)
+        self.positions = np.zeros((0, self.n_axes))
+        self.n_steps = self.evaluate_steps()
+
+    def get_nav_axes(self) -> List[Axis]:
+        if len(self.positions) == 0:
+            return []
+        return [Axis(label=f'{act.title}', units=f'{act.units}', data=self.positions[:, ind],
+                     index=0, spread_order=ind) for ind, act in enumerate(self.actuators)]
+
+    def get_scan_shape(self) -> Tuple[int]:
+        return ()  # unknown shape
+
+    def get_indexes_from_scan_index(self, scan_index: int) -> Tuple[int]:
+        return scan_index,
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Ordering of the scan steps minimizing the travel time of the actuators: a nearest neighbour path
+starting from the first step of the scan, then improved by 2-opt moves (reversing a section of the
+path whenever it shortens it). The actuators moving simultaneously, the travel time between two
+steps is the longest of the actuators travel times, each actuator moving at its own speed.
+"""
+from typing import List
+
+import numpy as np
+
+
+def get_travel_times(positions_from: np.ndarray, positions_to: np.ndarray,
+                     speeds: List[float] = None) -> np.ndarray:
+    """Travel times of the actuators between positions
+
+    Parameters
+    ----------
+    positions_from: np.ndarray
+        positions of shape (n_axes,) or (n_steps, n_axes)
+    positions_to: np.ndarray
+        positions broadcastable with positions_from
+    speeds: list of float
+        the speed of each actuator (in units per second, strictly positive), 1 if None
+
+    Returns
+    -------
+    np.ndarray: the travel times in seconds, the last dimension being reduced
+    """
+    if speeds is None:
+        speeds = 1.
+    speeds = np.asarray(speeds, dtype=float)
+    if np.any(speeds <= 0.):
+        raise ValueError(f'The actuators speeds should be strictly positive, got {speeds}')
+    return np.max(np.abs(np.asarray(positions_to) - np.asarray(positions_from)) / speeds, axis=-1)
+
+
+def get_path_duration(positions: np.ndarray, speeds: List[float] = None) -> float:
+    """Total travel time to go through positions (of shape (n_steps, n_axes)) in order"""
+    if len(positions) < 2:
+        return 0.
+    return float(np.sum(get_travel_times(positions[:-1], positions[1:], speeds)))
+
+
+def nearest_neighbour_order(positions: np.ndarray, speeds: List[float] = None) -> np.ndarray:
+    """Order positions going each time to the closest (in travel time) position not visited yet
+
+    The path starts from the first position
+
+    Returns
+    -------
+    np.ndarray: the indexes of the positions in the path order
+    """
+    n_steps = len(positions)
+    order = np.zeros((n_steps,), dtype=int)
+    visited = np.zeros((n_steps,), dtype=bool)
+    visited[0] = True
+    for ind in range(1, n_steps):
+        travel_times = get_travel_times(positions[order[ind - 1]], positions, speeds)
+        travel_times[visited] = np.inf
+        order[ind] = np.argmin(travel_times)
+        visited[order[ind]] = True
+    return order
+
+
+def two_opt(positions: np.ndarray, order: np.ndarray, speeds: List[float] = None,
+            max_passes: int = 10) -> np.ndarray:
+    """Improve a path by reversing sections of it as long as this reduces its travel time
+
+    The path is open (no return to the start) and its first position is kept.
+
+    Parameters
+    ----------
+    positions: np.ndarray
+        positions of shape (n_steps, n_axes)
+    order: np.ndarray
+        the indexes of the positions in the initial path order
+    speeds: list of float
+        the speed of each actuator
+    max_passes: int
+        the maximum number of passes over the whole path
+
+    Returns
+    -------
+    np.ndarray: the indexes of the positions in the improved path order
+    """
+    order = np.array(order)
+    n_steps = len(order)
+    for _ in range(max_passes):
+        improved = False
+        for ind in range(n_steps - 2):
+            path = positions[order]
+            # reversing order[ind + 1: ind_end + 1] replaces the edges (ind, ind + 1) and
+            # (ind_end, ind_end + 1) by (ind, ind_end) and (ind + 1, ind_end + 1)
+            ends = path[ind + 2:]
+            after_ends = path[ind + 3:]
+            removed = (get_travel_times(path[ind], path[ind + 1], speeds) +
+                       np.append(get_travel_times(ends[:-1], after_ends, speeds), 0.))
+            added = (get_travel_times(path[ind], ends, speeds) +
+                     np.append(get_travel_times(path[ind + 1], after_ends, speeds), 0.))
+            gains = removed - added
+            best = int(np.argmax(gains))
+            if gains[best] > 1e-12 * max(removed[best], 1.):
+                ind_end = ind + 2 + best
+                order[ind + 1: ind_end + 1] = order[ind + 1: ind_end + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return order
+
+
+def optimize_order(positions: np.ndarray, speeds: List[float] = None) -> np.ndarray:
+    """Order of the positions minimizing the travel time of the actuators, starting from the
+    first position
+
+    The nearest neighbour path is improved using 2-opt. Both scale quadratically (at least) with the
+    number of positions, see the path_optimization_max_steps value of the scan section of the
+    configuration file, checked by ScannerBase.optimize_path.
+
+    Parameters
+    ----------
+    positions: np.ndarray
+        positions of shape (n_steps, n_axes)
+    speeds: list of float
+        the speed of each actuator (in units per second), 1 if None
+
+    Returns
+    -------
+    np.ndarray: the indexes of the positions in the optimized order
+    """
+    positions = np.asarray(positions, dtype=float)
+    if len(positions) < 3:
+        return np.arange(len(positions))
+    order = nearest_neighbour_order(positions, speeds)
+    return two_opt(positions, order, speeds)
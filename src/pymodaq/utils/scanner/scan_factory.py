@@ -7,7 +7,7 @@ Created the 05/12/2022
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
-from typing import Callable, Union, List, Tuple, TYPE_CHECKING
+from typing import Callable, Iterator, Union, List, Tuple, TYPE_CHECKING
 
 
 import numpy as np
@@ -22,6 +22,7 @@ from pymodaq.utils.abstract import abstract_attribute
 from pymodaq.utils import math_utils as mutils
 from pymodaq.utils import config as configmod
 from pymodaq.utils.scanner.scan_config import ScanConfig
+from pymodaq.utils.scanner import path_optimization
 
 if TYPE_CHECKING:
     from pymodaq.control_modules.daq_move import DAQ_Move
@@ -65,21 +66,31 @@ class ScannerBase(ScanParameterManager, metaclass=ABCMeta):
         Number of scan steps. Equal to the second dimension of positions
     n_axes: int
         Number of actuators/scan axes. Equal to the first dimension of positions
+
+    Notes
+    -----
+    Scanners may not hold all their positions in memory: either they are defined on a grid (see
+    set_grid) or they reimplement is_lazy and get_positions_chunk. Positions should then be
+    obtained by chunks using iter_positions or get_positions_chunk, the positions and axes_indexes
+    attributes computing (once) the whole arrays when accessed.
     """
     scan_type: str = abstract_attribute()
     scan_subtype: str = abstract_attribute()
 
     params: List[dict] = abstract_attribute()
     axes_unique: List[np.ndarray] = abstract_attribute()
-    axes_indexes: np.ndarray = abstract_attribute()
     n_steps: int = abstract_attribute()
     n_axes: int = abstract_attribute()
     distribution: DataDistribution = abstract_attribute()
     save_settings = True
 
     def __init__(self, actuators: List[DAQ_Move] = None):
+        self._positions: np.ndarray = None
+        self._axes_indexes: np.ndarray = None
+        self._grid_positions: List[np.ndarray] = None
+        self._grid_indexes: List[np.ndarray] = None
+        self._grid_back_and_forth = False
         super().__init__()
-        self.positions: np.ndarray = None
         self.n_steps = 1
         self.config = ScanConfig()
         base_path = [act.title for act in actuators] + [self.scan_type, self.scan_subtype]
@@ -145,25 +156,216 @@ class ScannerBase(ScanParameterManager, metaclass=ABCMeta):
         """To be reimplemented. Calculations of indexes within the scan"""
         ...
 
+    @property
+    def positions(self) -> np.ndarray:
+        """All the positions of the scan, computed on first access for lazy scanners"""
+        if self._positions is None and self.is_lazy:
+            self._positions = self.get_positions_chunk(0, self.n_steps)
+        return self._positions
+
+    @positions.setter
+    def positions(self, positions: np.ndarray):
+        self._positions = positions
+
+    @property
+    def axes_indexes(self) -> np.ndarray:
+        """Indexes within axes_unique of all the positions, computed on first access for lazy
+        scanners"""
+        if self._axes_indexes is None and self.is_lazy:
+            self._axes_indexes = self.get_axes_indexes_chunk(0, self.n_steps)
+        return self._axes_indexes
+
+    @axes_indexes.setter
+    def axes_indexes(self, axes_indexes: np.ndarray):
+        self._axes_indexes = axes_indexes
+
+    @property
+    def is_lazy(self) -> bool:
+        """True if the positions are not all held in memory but computed when requested"""
+        return self._grid_positions is not None
+
     def get_info_from_positions(self, positions: np.ndarray):
         """Set mandatory attributes from a ndarray of positions"""
         if positions is not None:
             if len(positions.shape) == 1:
                 positions = np.expand_dims(positions, 1)
             axes_unique = []
-            for ax in positions.T:
-                axes_unique.append(np.unique(ax))
             axes_indexes = np.zeros_like(positions, dtype=int)
-            for ind in range(positions.shape[0]):
-                for ind_pos, pos in enumerate(positions[ind]):
-                    axes_indexes[ind, ind_pos] = mutils.find_index(axes_unique[ind_pos], pos)[0][0]
+            for ind_ax, ax in enumerate(positions.T):
+                ax_unique, ax_indexes = np.unique(ax, return_inverse=True)
+                axes_unique.append(ax_unique)
+                axes_indexes[:, ind_ax] = ax_indexes.reshape(-1)
 
+            self._grid_positions = None
             self.n_axes = len(axes_unique)
             self.axes_unique = axes_unique
             self.axes_indexes = axes_indexes
             self.positions = positions
             self.n_steps = positions.shape[0]
 
+    def set_grid(self, axes_positions: List[np.ndarray], back_and_forth=False):
+        """Set mandatory attributes for a scan on a grid without computing all its positions
+
+        The scan steps are all the combinations of the axes positions, the last axis being the
+        fastest one. Positions and axes indexes are then computed by chunks when requested.
+
+        Parameters
+        ----------
+        axes_positions: List[np.ndarray]
+            The successive positions of each actuator
+        back_and_forth: bool
+            If True, the last axis is scanned backward one line out of two
+        """
+        self._grid_positions = [np.asarray(positions) for positions in axes_positions]
+        self._grid_indexes = []
+        self.axes_unique = []
+        for positions in self._grid_positions:
+            ax_unique, ax_indexes = np.unique(positions, return_inverse=True)
+            self.axes_unique.append(ax_unique)
+            self._grid_indexes.append(ax_indexes.reshape(-1))
+        self._grid_back_and_forth = back_and_forth
+        self._positions = None
+        self._axes_indexes = None
+        self.n_axes = len(self._grid_positions)
+        self.n_steps = int(np.prod([len(positions) for positions in self._grid_positions]))
+
+    def _get_grid_indexes(self, start: int, stop: int) -> Tuple[np.ndarray]:
+        """Get the indexes within each axis positions of the grid for the steps start to stop"""
+        shape = tuple([len(positions) for positions in self._grid_positions])
+        indexes = list(np.unravel_index(np.arange(start, stop), shape))
+        if self._grid_back_and_forth and len(shape) > 1:
+            backward = mutils.odd_even(indexes[-2])
+            indexes[-1][backward] = shape[-1] - 1 - indexes[-1][backward]
+        return tuple(indexes)
+
+    def get_positions_chunk(self, start: int, stop: int) -> np.ndarray:
+        """Get the positions of the scan steps from start to stop (excluded)
+
+        Returns
+        -------
+        np.ndarray: of shape (stop - start, n_axes)
+        """
+        if self._grid_positions is not None:
+            return np.stack([positions[indexes] for positions, indexes in
+                             zip(self._grid_positions, self._get_grid_indexes(start, stop))],
+                            axis=-1)
+        return self.positions[start:stop]
+
+    def get_axes_indexes_chunk(self, start: int, stop: int) -> np.ndarray:
+        """Get the indexes within axes_unique of the scan steps from start to stop (excluded)
+
+        Returns
+        -------
+        np.ndarray: of shape (stop - start, n_axes)
+        """
+        if self._grid_positions is not None:
+            return np.stack([ax_indexes[indexes] for ax_indexes, indexes in
+                             zip(self._grid_indexes, self._get_grid_indexes(start, stop))],
+                            axis=-1)
+        return self.axes_indexes[start:stop]
+
+    def get_position_at(self, scan_index: int) -> np.ndarray:
+        """Get the positions of all actuators at a given scan step"""
+        return self.get_positions_chunk(scan_index, scan_index + 1)[0]
+
+    def iter_positions(self, chunk_size: int = None, start: int = 0) -> Iterator[np.ndarray]:
+        """Iterate over the positions of all the scan steps by chunks
+
+        Parameters
+        ----------
+        chunk_size: int
+            The number of steps in each chunk (except the last one). If None, use the chunk_size
+            value of the scan section of the configuration file
+        start: int
+            The scan index of the first step (to resume a scan for instance)
+
+        Yields
+        ------
+        np.ndarray: the positions of chunk_size steps, of shape (chunk_size, n_axes)
+        """
+        if chunk_size is None:
+            chunk_size = config('scan', 'positions_chunk_size')
+        for chunk_start in range(start, self.n_steps, chunk_size):
+            yield self.get_positions_chunk(chunk_start, min(chunk_start + chunk_size, self.n_steps))
+
+    def iter_lines(self, chunk_size: int = None) -> Iterator[Tuple[int, np.ndarray]]:
+        """Iterate over the lines of the scan, a line being consecutive steps along which only the
+        last actuator moves
+
+        Parameters
+        ----------
+        chunk_size: int
+            see iter_positions
+
+        Yields
+        ------
+        int: the scan index of the first step of the line
+        np.ndarray: the positions of the steps of the line, of shape (n_steps_in_line, n_axes)
+        """
+        line_start = 0
+        line = []
+        for positions in self.iter_positions(chunk_size):
+            for position in positions:
+                if len(line) > 0 and np.any(position[:-1] != line[0][:-1]):
+                    yield line_start, np.array(line)
+                    line_start += len(line)
+                    line = []
+                line.append(position)
+        if len(line) > 0:
+            yield line_start, np.array(line)
+
+    def reorder(self, order: np.ndarray):
+        """Change the order of the scan steps, the positions keeping their axes indexes
+
+        Parameters
+        ----------
+        order: np.ndarray
+            the indexes of the current steps in the new order
+        """
+        positions = self.positions[order]
+        axes_indexes = self.axes_indexes[order]
+        self._grid_positions = None
+        self.positions = positions
+        self.axes_indexes = axes_indexes
+
+    def optimize_path(self, speeds: List[float] = None) -> Tuple[float, float]:
+        """Reorder the scan steps to minimize the travel time of the actuators
+
+        The first step is kept, see path_optimization.optimize_order. The optimization is skipped,
+        with a warning, for scans with more steps than the path_optimization_max_steps value of the
+        scan section of the configuration file and for lazy scans whose positions are not in memory
+        (they are never computed for this purpose)
+
+        Parameters
+        ----------
+        speeds: list of float
+            the speed of each actuator (in units per second), 1 if None
+
+        Returns
+        -------
+        float: the estimated travel time in seconds before optimization
+        float: the estimated travel time in seconds after optimization
+        """
+        if self.n_steps < 3:
+            return 0., 0.
+        if self.n_steps > config('scan', 'path_optimization_max_steps'):
+            logger.warning(f'Path optimization skipped: the scan has {self.n_steps} steps, more than '
+                           f'the configured path_optimization_max_steps')
+            return 0., 0.
+        if self._positions is None and self.is_lazy:
+            logger.warning('Path optimization skipped: the scan positions are computed on the fly')
+            return 0., 0.
+        if self.positions is None or len(self.positions) < 3:
+            return 0., 0.
+        positions = self.positions.reshape((len(self.positions), -1))
+        order = path_optimization.optimize_order(positions, speeds)
+        duration = path_optimization.get_path_duration(positions, speeds)
+        optimized_duration = path_optimization.get_path_duration(positions[order], speeds)
+        if optimized_duration < duration:
+            self.reorder(order)
+            return duration, optimized_duration
+        return duration, duration
+
     @abstractmethod
     def evaluate_steps(self):
         """To be reimplemented. Quick evaluation of the number of steps to stop the calculation if the evaluation os above the
@@ -1,7 +1,8 @@
 from __future__ import annotations
-from typing import Tuple, List, TYPE_CHECKING
+from typing import Iterator, Tuple, List, TYPE_CHECKING
 from collections import OrderedDict
 
+import numpy as np
 
 from qtpy import QtWidgets, QtCore
 from qtpy.QtCore import QObject, Signal, Slot
@@ -48,6 +49,13 @@ class Scanner(QObject, ParameterManager):
         {'title': 'Scan type:', 'name': 'scan_type', 'type': 'list', 'limits': scanner_factory.scan_types()},
         {'title': 'Scan subtype:', 'name': 'scan_sub_type', 'type': 'list',
          'limits': scanner_factory.scan_sub_types(scanner_factory.scan_types()[0])},
+        {'title': 'Optimize path:', 'name': 'optimize_path', 'type': 'bool',
+         'value': config('scan', 'optimize_path'),
+         'tip': 'Reorder the scan steps to minimize the travel time of the actuators'},
+        {'title': 'Speeds (units/s):', 'name': 'speeds', 'type': 'group', 'children': [],
+         'visible': config('scan', 'optimize_path')},
+        {'title': 'Time saved (s):', 'name': 'time_saved', 'type': 'float', 'value': 0.,
+         'readonly': True, 'visible': config('scan', 'optimize_path')},
     ]
 
     def __init__(self, parent_widget: QtWidgets.QWidget = None, scanner_items=OrderedDict([]),
@@ -113,6 +121,9 @@ class Scanner(QObject, ParameterManager):
             self.set_scanner()
             self.settings.child('scan_type').setOpts(tip=self._scanner.__doc__)
             self.settings.child('scan_sub_type').setOpts(tip=self._scanner.__doc__)
+        elif param.name() == 'optimize_path':
+            self.settings.child('speeds').show(param.value())
+            self.settings.child('time_saved').show(param.value())
 
         self.settings.child('n_steps').setValue(self._scanner.evaluate_steps())
 
@@ -124,8 +135,18 @@ class Scanner(QObject, ParameterManager):
     @actuators.setter
     def actuators(self, act_list):
         self._actuators = act_list
+        self.set_speeds()
         self.set_scanner()
 
+    def set_speeds(self):
+        """Create one speed setting per actuator, used by the path optimization"""
+        speeds = self.settings.child('speeds')
+        previous_speeds = {child.name(): child.value() for child in speeds.children()}
+        speeds.clearChildren()
+        speeds.addChildren([{'title': f'{act.title}:', 'name': act.title, 'type': 'float',
+                             'value': previous_speeds.get(act.title, 1.), 'min': 1e-9,
+                             'suffix': f'{act.units}/s'} for act in self.actuators])
+
     def set_scan_type_and_subtypes(self, scan_type: str, scan_subtype: str):
         """Convenience function to set the main scan type
 
@@ -170,9 +191,17 @@ class Scanner(QObject, ParameterManager):
         self._scanner.save_scan_parameters()
 
     def get_scan_info(self) -> ScanInfo:
-        """Get a summary of the configured scan as a ScanInfo object"""
-        return ScanInfo(self._scanner.n_steps, positions=self._scanner.positions,
-                        axes_indexes=self._scanner.axes_indexes, axes_unique=self._scanner.axes_unique,
+        """Get a summary of the configured scan as a ScanInfo object
+
+        The positions and axes indexes of the lazy scanners (see ScannerBase.is_lazy) are not
+        computed, see iter_positions
+        """
+        if self._scanner.is_lazy:
+            positions, axes_indexes = None, None
+        else:
+            positions, axes_indexes = self._scanner.positions, self._scanner.axes_indexes
+        return ScanInfo(self._scanner.n_steps, positions=positions, axes_indexes=axes_indexes,
+                        axes_unique=self._scanner.axes_unique,
                         selected_actuators=[act.title for act in self.actuators])
 
     def get_nav_axes(self):
@@ -196,17 +225,52 @@ class Scanner(QObject, ParameterManager):
     def n_axes(self):
         return self._scanner.n_axes
 
+    @property
+    def n_scan_steps(self) -> int:
+        """Number of steps of the computed scan (while n_steps is evaluated from the settings)"""
+        return self._scanner.n_steps
+
     @property
     def positions(self):
         return self._scanner.positions
 
+    def get_position_at(self, index: int) -> np.ndarray:
+        """Get the actuators positions at a given index in the scan"""
+        return self._scanner.get_position_at(index)
+
     def positions_at(self, index: int) -> DataToExport:
         """ Extract the actuators positions at a given index in the scan as a DataToExport of DataActuators"""
+        return self.positions_to_dte(self.get_position_at(index))
+
+    def iter_positions(self, chunk_size: int = None, start: int = 0) -> Iterator[DataToExport]:
+        """Iterate over the actuators positions of all the scan steps, starting at the start index
+
+        The positions are computed (or read) by the scanner by chunks of chunk_size steps (see
+        ScannerBase.iter_positions), so that they are never all held in memory.
+
+        Yields
+        ------
+        DataToExport: the positions at each step as DataActuators
+        """
+        for positions in self._scanner.iter_positions(chunk_size, start):
+            for position in positions:
+                yield self.positions_to_dte(position)
+
+    def iter_lines(self, chunk_size: int = None) -> Iterator[Tuple[int, np.ndarray]]:
+        """Iterate over the lines of the scan (see ScannerBase.iter_lines)"""
+        return self._scanner.iter_lines(chunk_size)
+
+    def positions_to_dte(self, position: np.ndarray) -> DataToExport:
+        """Convert the actuators positions of a scan step into a DataToExport of DataActuators"""
         dte = DataToExport('scanner')
-        for ind, pos in enumerate(self.positions[index]):
+        for ind, pos in enumerate(position):
             dte.append(DataActuator(self.actuators[ind].title, data=float(pos)))
         return dte
 
+    def get_learner(self):
+        """Get a new learner choosing the positions of an adaptive scan (see AdaptiveScanner)"""
+        return self._scanner.get_learner()
+
     @property
     def axes_indexes(self):
         return self._scanner.axes_indexes
@@ -230,10 +294,27 @@ class Scanner(QObject, ParameterManager):
         if self._scanner.evaluate_steps() > oversteps:
             return True
         self._scanner.set_scan()
+        if self.settings['optimize_path']:
+            self.optimize_path()
         self.settings.child('n_steps').setValue(self.n_steps)
         self.scanner_updated_signal.emit()
         return False
 
+    def optimize_path(self) -> float:
+        """Reorder the scan steps to minimize the travel time of the actuators given their speed
+        settings (see ScannerBase.optimize_path)
+
+        Returns
+        -------
+        float: the estimated travel time saved in seconds
+        """
+        speeds = [self.settings['speeds', act.title] for act in self.actuators]
+        duration, optimized_duration = self._scanner.optimize_path(speeds)
+        self.settings.child('time_saved').setValue(duration - optimized_duration)
+        logger.info(f'Estimated travel time of the actuators: {optimized_duration:.1f} s '
+                    f'instead of {duration:.1f} s')
+        return duration - optimized_duration
+
     def update_from_scan_selector(self, scan_selector: Selector):
         self._scanner.update_from_scan_selector(scan_selector)
 
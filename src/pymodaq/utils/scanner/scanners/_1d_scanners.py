@@ -14,6 +14,7 @@ from pymodaq.utils import config as configmod
 from pymodaq.utils.plotting.scan_selector import Selector
 
 from ..scan_factory import ScannerFactory, ScannerBase, ScanParameterManager
+from ..learners import AdaptiveScanner, Learner1D, get_adaptive_params
 
 if TYPE_CHECKING:
     from pymodaq.control_modules.daq_move import DAQ_Move
@@ -162,41 +163,32 @@ class Scan1DSparse(Scan1DBase):
         if len(self.actuators) == 1:
             self.settings.child('parsed_string').setOpts(title=f'{self.actuators[0].title} Parsed string:')
 
-try:
-    import adaptive
-
-
-    @ScannerFactory.register()
-    class Scan1DAdaptive(Scan1DBase):
-
-        scan_subtype = 'Adaptive'
-        params = [
-            {'title': 'Loss type', 'name': 'scan_loss', 'type': 'list',
-             'limits': ['default', 'curvature', 'uniform'], 'tip': 'Type of loss used by the algo. to determine next points'},
-            {'title': 'Start:', 'name': 'start', 'type': 'float', 'value': 0.},
-            {'title': 'Stop:', 'name': 'stop', 'type': 'float', 'value': 1.},
-            ]
-        distribution = DataDistribution['spread']
-
-        def __init__(self, actuators: List['DAQ_Move'] = None, **_ignored):
-            super().__init__(actuators=actuators)
-
-        def set_scan(self):
-            self.axes_unique = [np.array([])]
-            self.axes_indexes = np.array([], dtype=int)
-            self.positions = np.array([self.settings['start'], self.settings['stop']])
+@ScannerFactory.register()
+class Scan1DAdaptive(AdaptiveScanner, Scan1DBase):
+    """ Defines a scan between start and stop values whose positions are chosen during the scan
+    from the values of the selected 0D data at the previous positions"""
 
-        def evaluate_steps(self) -> int:
-            return 1
+    scan_subtype = 'Adaptive'
+    learner_type = Learner1D
+    params = [
+        {'title': 'Start:', 'name': 'start', 'type': 'float', 'value': 0.},
+        {'title': 'Stop:', 'name': 'stop', 'type': 'float', 'value': 1.},
+        ] + get_adaptive_params(Learner1D)
+    distribution = DataDistribution['spread']
 
-        def get_nav_axes(self) -> List[Axis]:
-            return [Axis(label=f'{self.actuators[0].mod_name} axis',
-                         units=f'{self.actuators[0].units}',
-                         data=self.positions[0])]
+    def __init__(self, actuators: List['DAQ_Move'] = None, **_ignored):
+        super().__init__(actuators=actuators)
 
-        def get_scan_shape(self) -> Tuple[int]:
-            return len(self.positions),
+    def get_bounds(self) -> List[Tuple[float, float]]:
+        return [(self.settings['start'], self.settings['stop'])]
 
-except ModuleNotFoundError:
-    logger.info('adaptive module is not present, no adaptive scan possible')
+    def set_settings_titles(self):
+        if len(self.actuators) == 1:
+            self.settings.child('start').setOpts(title=f'{self.actuators[0].title} start:')
+            self.settings.child('stop').setOpts(title=f'{self.actuators[0].title} stop:')
 
+    def update_from_scan_selector(self, scan_selector: Selector):
+        coordinates = scan_selector.get_coordinates()
+        if coordinates.shape == (2, 2) or coordinates.shape == (2, 1):
+            self.settings.child('start').setValue(coordinates[0, 0])
+            self.settings.child('stop').setValue(coordinates[1, 0])
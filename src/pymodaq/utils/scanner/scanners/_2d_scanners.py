@@ -14,6 +14,7 @@ from pymodaq.utils import config as configmod
 from pymodaq.utils.plotting.scan_selector import Selector
 
 from ..scan_factory import ScannerFactory, ScannerBase, ScanParameterManager
+from ..learners import AdaptiveScanner, Learner2D, get_adaptive_params
 
 logger = set_logger(get_module_name(__file__))
 config = configmod.Config()
@@ -92,12 +93,7 @@ class Scan2DLinear(Scan2DBase):
             axis_1_unique = mutils.linspace_step(starts[0], stops[0], steps[0])
             axis_2_unique = mutils.linspace_step(starts[1], stops[1], steps[1])
 
-            positions = []
-            for ind_x, pos1 in enumerate(axis_1_unique):
-                for ind_y, pos2 in enumerate(axis_2_unique):
-                    positions.append([pos1, pos2])
-
-        self.get_info_from_positions(np.array(positions))
+        self.set_grid([axis_1_unique, axis_2_unique])
 
     def set_settings_titles(self):
         if len(self.actuators) == 2:
@@ -119,7 +115,7 @@ class Scan2DLinear(Scan2DBase):
 
     def get_indexes_from_scan_index(self, scan_index: int) -> Tuple[int]:
         """To be reimplemented. Calculations of indexes within the scan"""
-        return tuple(self.axes_indexes[scan_index])
+        return tuple(self.get_axes_indexes_chunk(scan_index, scan_index + 1)[0])
 
     def update_from_scan_selector(self, scan_selector: Selector):
         coordinates = scan_selector.get_coordinates()
@@ -148,15 +144,7 @@ class Scan2DLinearBF(Scan2DLinear):
             axis_1_unique = mutils.linspace_step(starts[0], stops[0], steps[0])
             axis_2_unique = mutils.linspace_step(starts[1], stops[1], steps[1])
 
-            positions = []
-            for ind_x, pos1 in enumerate(axis_1_unique):
-                for ind_y, pos2 in enumerate(axis_2_unique):
-                    if not mutils.odd_even(ind_x):
-                        positions.append([pos1, pos2])
-                    else:
-                        positions.append([pos1, axis_2_unique[len(axis_2_unique) - ind_y - 1]])
-
-        self.get_info_from_positions(np.array(positions))
+        self.set_grid([axis_1_unique, axis_2_unique], back_and_forth=True)
 
 
 @ScannerFactory.register()
@@ -168,8 +156,7 @@ class Scan2DRandom(Scan2DLinear):
 
     def set_scan(self):
         super().set_scan()
-        np.random.shuffle(self.positions)
-        self.get_info_from_positions(self.positions)
+        self.get_info_from_positions(self.positions[np.random.permutation(self.n_steps)])
 
 
 @ScannerFactory.register()
@@ -242,40 +229,35 @@ class Scan2DSpiral(Scan2DLinear):
             positions = np.array([starts])
 
         else:
-            Nlin = self.settings['npts_by_axis'] / 2
-            axis_1_indexes = [0]
-            axis_2_indexes = [0]
-            ind = 0
-            flag = True
-
-            while flag:
-                if mutils.odd_even(ind):
-                    step = 1
-                else:
-                    step = -1
-                if flag:
-
-                    for ind_step in range(ind):
-                        axis_1_indexes.append(axis_1_indexes[-1] + step)
-                        axis_2_indexes.append(axis_2_indexes[-1])
-                        if len(axis_1_indexes) >= (2 * Nlin + 1) ** 2:
-                            flag = False
-                            break
-                if flag:
-                    for ind_step in range(ind):
-                        axis_1_indexes.append(axis_1_indexes[-1])
-                        axis_2_indexes.append(axis_2_indexes[-1] + step)
-                        if len(axis_1_indexes) >= (2 * Nlin + 1) ** 2:
-                            flag = False
-                            break
-                ind += 1
-
-            positions = []
-            for ind in range(len(axis_1_indexes)):
-                positions.append(np.array([axis_1_indexes[ind] * rsteps[0] + starts[0],
-                                           axis_2_indexes[ind] * rsteps[1] + starts[1]]))
-
-        self.get_info_from_positions(np.array(positions))
+            indexes = self.get_spiral_indexes(self.settings['npts_by_axis'])
+            positions = indexes * rsteps + starts
+
+        self.get_info_from_positions(positions)
+
+    @staticmethod
+    def get_spiral_indexes(npts_by_axis: int) -> np.ndarray:
+        """Get the integer coordinates of the points of a square spiral starting at (0, 0)
+
+        The spiral turns by segments of increasing length: n moves along the first axis then n
+        moves along the second one, in the negative direction for n even and positive for n odd.
+
+        Parameters
+        ----------
+        npts_by_axis: int
+            The spiral holds (npts_by_axis + 1)**2 points
+
+        Returns
+        -------
+        np.ndarray: the (npts_by_axis + 1)**2 x 2 array of integer coordinates
+        """
+        npts = int(npts_by_axis + 1) ** 2
+        n_segments = int(np.ceil(np.sqrt(npts))) + 1
+        lengths = np.arange(n_segments)
+        moves = np.zeros((2 * n_segments, 2), dtype=int)
+        moves[0::2, 0] = np.where(mutils.odd_even(lengths), 1, -1)
+        moves[1::2, 1] = moves[0::2, 0]
+        moves = np.repeat(moves, np.repeat(lengths, 2), axis=0)[:npts - 1]
+        return np.concatenate((np.zeros((1, 2), dtype=int), np.cumsum(moves, axis=0)))
 
     def update_from_scan_selector(self, scan_selector: Selector):
         coordinates = scan_selector.get_coordinates()
@@ -287,60 +269,45 @@ class Scan2DSpiral(Scan2DLinear):
                     (coordinates[0, i] - coordinates[1, i]) / 2)
 
 
-try:
-    import adaptive
-
-    @ScannerFactory.register()
-    class Scan2DAdaptive(Scan2DLinear):
-        scan_subtype = 'Adaptive'
-
-        params = [
-            {'title': 'Loss type', 'name': 'scan_loss', 'type': 'list',
-             'limits': ['default', 'curvature', 'uniform'],
-             'tip': 'Type of loss used by the algo. to determine next points'},
+@ScannerFactory.register()
+class Scan2DAdaptive(AdaptiveScanner, Scan2DBase):
+    """ Defines a scan within the start and stop values of each axis whose positions are chosen
+    during the scan from the values of the selected 0D data at the previous positions"""
+    scan_type = 'Scan2D'
+    scan_subtype = 'Adaptive'
+    learner_type = Learner2D
 
-            {'title': 'Ax1:', 'name': 'axis1', 'type': 'group',
-               'children':[
-              {'title': 'Start Ax1:', 'name': 'start_axis1', 'type': 'float',
-               'value': config('scan', 'scan2D', 'linear', 'start1')},
-              {'title': 'Stop Ax1:', 'name': 'stop_axis1', 'type': 'float',
-               'value': config('scan', 'scan2D', 'linear', 'stop1')},              
-              {'title': 'Step Ax1:', 'name': 'step_axis1', 'type': 'float',
-               'value': config('scan', 'scan2D', 'linear', 'step1')},
-              ]}, 
+    params = [{'title': 'Ax1:', 'name': 'axis1', 'type': 'group',
+               'children': [
+                   {'title': 'Start Ax1:', 'name': 'start_axis1', 'type': 'float', 'value': 0.},
+                   {'title': 'Stop Ax1:', 'name': 'stop_axis1', 'type': 'float', 'value': 1.},
+               ]},
               {'title': 'Ax2:', 'name': 'axis2', 'type': 'group',
-               'children':[
-              {'title': 'Start Ax2:', 'name': 'start_axis2', 'type': 'float',
-               'value': config('scan', 'scan2D', 'linear', 'start2')},
-              {'title': 'Stop Ax2:', 'name': 'stop_axis2', 'type': 'float',
-               'value': config('scan', 'scan2D', 'linear', 'stop2')},              
-              {'title': 'Step Ax2:', 'name': 'step_axis2', 'type': 'float',
-               'value': config('scan', 'scan2D', 'linear', 'step2')},              
+               'children': [
+                   {'title': 'Start Ax2:', 'name': 'start_axis2', 'type': 'float', 'value': 0.},
+                   {'title': 'Stop Ax2:', 'name': 'stop_axis2', 'type': 'float', 'value': 1.},
                ]},
-            ]
-        distribution = DataDistribution['spread']
-
-        def __init__(self, actuators: List['DAQ_Move'] = None, **_ignored):
-            super().__init__(actuators=actuators)
-
-        def set_scan(self):
-
-            self.axes_unique = [np.array([]), np.array([])]
-            self.axes_indexes = np.array([], dtype=int)
-            self.positions = np.zeros((0, 2))
-
-        def evaluate_steps(self) -> int:
-            return 1
+              ] + get_adaptive_params(Learner2D)
+    distribution = DataDistribution['spread']
 
-        def get_nav_axes(self) -> List[Axis]:
-            return [Axis(label=f'{act.mod_name} axis',
-                         units=f'{act.units}',
-                         data=self.positions[:, ind],
-                         index=ind) for ind, act in enumerate(self.actuators)]
+    def __init__(self, actuators: List['DAQ_Move'] = None, **_ignored):
+        super().__init__(actuators=actuators)
 
-        def get_scan_shape(self) -> Tuple[int]:
-            return ()  # unknown shape
+    def get_bounds(self) -> List[Tuple[float, float]]:
+        return [(self.settings[ax, f'start_{ax}'], self.settings[ax, f'stop_{ax}'])
+                for ax in self.axes]
 
-except ModuleNotFoundError:
-    logger.info('adaptive module is not present, no adaptive scan possible')
+    def set_settings_titles(self):
+        if len(self.actuators) == 2:
+            for i, ax in enumerate(self.axes):
+                title = self.actuators[i].title
+                self.settings.child(ax).setOpts(title=title)
+                self.settings.child(ax, f'start_{ax}').setOpts(title=f'{title} start:')
+                self.settings.child(ax, f'stop_{ax}').setOpts(title=f'{title} stop:')
 
+    def update_from_scan_selector(self, scan_selector: Selector):
+        coordinates = scan_selector.get_coordinates()
+        if coordinates.shape == (2, 2):
+            for i, ax in enumerate(self.axes):
+                self.settings.child(ax, f'start_{ax}').setValue(coordinates[0, i])
+                self.settings.child(ax, f'stop_{ax}').setValue(coordinates[1, i])
@@ -168,26 +168,29 @@ class SequentialScanner(ScannerBase):
         self.table_view.setDragDropMode(QtWidgets.QTableView.InternalMove)
         self.table_view.setDragDropOverwriteMode(False)
 
-    def set_scan(self):
-        starts, stops, steps = self.get_pos()
-        all_positions = [starts.copy()]
-        positions = starts.copy()
-        state = self.pos_above_stops(positions, steps, stops)
-        if len(state) != 0:
-            while not state[0]:
-                if not np.any(np.array(state)):
-                    positions[-1] += steps[-1]
-
-                else:
-                    indexes_true = np.where(np.array(state))
-                    positions[indexes_true[-1][0]] = starts[indexes_true[-1][0]]
-                    positions[indexes_true[-1][0] - 1] += steps[indexes_true[-1][0] - 1]
+    @staticmethod
+    def get_axis_positions(start: float, stop: float, step: float) -> np.ndarray:
+        """Get the positions of one actuator, incremented by step from start until above stop
 
-                state = self.pos_above_stops(positions, steps, stops)
-                if not np.any(np.array(state)):
-                    all_positions.append(positions.copy())
+        The positions are accumulated by successive additions of step (and not computed as
+        start + n * step) to be exactly the ones reached by incrementing the actuator.
+        """
+        if step == 0:
+            return np.array([start])
+        n_steps = int(np.abs((stop - start) / step)) + 2
+        positions = np.add.accumulate(np.concatenate(([start], np.full(n_steps, step))))
+        above = positions > stop if step >= 0 else positions < stop
+        return positions[:np.argmax(above)]
 
-        self.get_info_from_positions(np.array(all_positions))
+    def set_scan(self):
+        starts, stops, steps = self.get_pos()
+        axes_positions = [self.get_axis_positions(start, stop, step)
+                          for start, stop, step in zip(starts, stops, steps)]
+        if len(axes_positions) == 0 or np.any([len(positions) == 0
+                                               for positions in axes_positions]):
+            self.get_info_from_positions(np.array([starts]))
+        else:
+            self.set_grid(axes_positions)  # the last actuator is the fastest one
 
     def get_nav_axes(self) -> List[Axis]:
         return [Axis(label=f'{act.title}', units=act.units, data=self.axes_unique[ind], index=ind)
@@ -195,7 +198,7 @@ class SequentialScanner(ScannerBase):
 
     def get_indexes_from_scan_index(self, scan_index: int) -> Tuple[int]:
         """To be reimplemented. Calculations of indexes within the scan"""
-        return tuple(self.axes_indexes[scan_index])
+        return tuple(self.get_axes_indexes_chunk(scan_index, scan_index + 1)[0])
 
     def get_scan_shape(self) -> Tuple[int]:
         return tuple([len(axis) for axis in self.axes_unique])
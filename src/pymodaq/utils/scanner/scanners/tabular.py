@@ -4,7 +4,9 @@ Created the 05/12/2022
 
 @author: Sebastien Weber
 """
-from typing import List, Tuple, TYPE_CHECKING
+import itertools
+from pathlib import Path
+from typing import Iterator, List, Tuple, TYPE_CHECKING
 
 import numpy as np
 
@@ -290,13 +292,168 @@ class TabularScannerSubSegmented(TabularScanner):
 
     def set_scan(self):
         points = [Point(coordinates) for coordinates in self.table_model_points.get_data_all()]
-        positions = get_sub_segmented_positions(self.settings['tabular_step'], points)
+        positions = np.array(get_sub_segmented_positions(self.settings['tabular_step'], points))
 
         self.table_model.set_data_all(positions)
-        positions = np.array(self.table_model.get_data_all())
         self.get_info_from_positions(positions)
 
     def update_from_scan_selector(self, scan_selector: Selector):
         coordinates = scan_selector.get_coordinates()
         self.update_model_points(init_data=coordinates)
         self.set_scan()
+
+
+@ScannerFactory.register()
+class TabularScannerFile(ScannerBase):
+    """Tabular scan whose positions are read by chunks from a text file
+
+    The file holds one line per scan step and one column per actuator (values separated by spaces
+    or tabulations, empty lines and lines starting with # being ignored). The positions are never
+    displayed in a table nor entirely loaded in memory while scanning. The file offset of every
+    offsets_step-th line of data is indexed when the steps are evaluated, so that the positions of
+    any step are read without going through the file from its beginning.
+    """
+    scan_type = 'Tabular'
+    scan_subtype = 'File'
+    save_settings = False
+    params = [
+        {'title': 'Positions file:', 'name': 'positions_file', 'type': 'browsepath', 'value': '',
+         'filetype': True},
+    ]
+    distribution = DataDistribution['spread']
+    offsets_step = 1024
+
+    def __init__(self, actuators: List['DAQ_Move']):
+        self._axes_unique: List[np.ndarray] = None
+        self._steps_cache: Tuple[tuple, int, np.ndarray] = ((), 0, np.array([], dtype=np.int64))
+        super().__init__(actuators=actuators)
+        self.n_axes = len(self.actuators)
+
+    @property
+    def axes_unique(self) -> List[np.ndarray]:
+        """Unique positions of each actuator, reading the file by chunks on first access"""
+        if self._axes_unique is None and self.n_steps > 0:
+            axes_unique = [np.zeros((0,)) for _ in range(self.n_axes)]
+            for positions in self.iter_positions():
+                axes_unique = [np.union1d(ax_unique, positions[:, ind])
+                               for ind, ax_unique in enumerate(axes_unique)]
+            self._axes_unique = axes_unique
+        return self._axes_unique
+
+    @axes_unique.setter
+    def axes_unique(self, axes_unique: List[np.ndarray]):
+        self._axes_unique = axes_unique
+
+    @property
+    def is_lazy(self) -> bool:
+        return self._positions is None and self.n_steps > 0
+
+    @property
+    def file_path(self) -> Path:
+        return Path(self.settings['positions_file'])
+
+    @staticmethod
+    def is_data_line(line: bytes) -> bool:
+        """Check if a line of a positions file holds positions"""
+        line = line.strip()
+        return line != b'' and not line.startswith(b'#')
+
+    def iter_data_lines(self, file) -> Iterator[str]:
+        """Iterate over the lines of data of a file holding positions, opened in binary mode"""
+        for line in file:
+            if self.is_data_line(line):
+                yield line.decode().strip()
+
+    def index_file(self) -> Tuple[int, np.ndarray]:
+        """Count the lines of data of the file and get the offset of every offsets_step-th one"""
+        n_steps = 0
+        offset = 0
+        offsets = []
+        with open(self.file_path, 'rb') as file:
+            for line in file:
+                if self.is_data_line(line):
+                    if n_steps % self.offsets_step == 0:
+                        offsets.append(offset)
+                    n_steps += 1
+                offset += len(line)
+        return n_steps, np.array(offsets, dtype=np.int64)
+
+    def iter_data_lines_from(self, file, start: int) -> Iterator[str]:
+        """Iterate over the lines of data of a file opened in binary mode from the start-th one"""
+        offsets = self._steps_cache[2]
+        if start // self.offsets_step < len(offsets):
+            file.seek(int(offsets[start // self.offsets_step]))
+            start = start % self.offsets_step
+        data_lines = self.iter_data_lines(file)
+        for _ in itertools.islice(data_lines, start):
+            pass
+        return data_lines
+
+    def read_positions(self, data_lines: Iterator[str], n_steps: int) -> np.ndarray:
+        """Read the positions of the next n_steps lines of data"""
+        lines = list(itertools.islice(data_lines, n_steps))
+        if len(lines) == 0:
+            return np.zeros((0, self.n_axes))
+        return np.loadtxt(lines, ndmin=2)
+
+    def evaluate_steps(self) -> int:
+        if not self.file_path.is_file():
+            return 0
+        stat = self.file_path.stat()
+        file_id = (str(self.file_path), stat.st_mtime, stat.st_size)
+        if self._steps_cache[0] != file_id:
+            self._steps_cache = (file_id, *self.index_file())
+        return self._steps_cache[1]
+
+    def set_scan(self):
+        self._positions = None
+        self._axes_indexes = None
+        self._axes_unique = None
+        self.n_steps = self.evaluate_steps()
+
+    def get_positions_chunk(self, start: int, stop: int) -> np.ndarray:
+        if self._positions is not None:
+            return self._positions[start:stop]
+        self.evaluate_steps()  # the offsets are updated if the file changed
+        with open(self.file_path, 'rb') as file:
+            return self.read_positions(self.iter_data_lines_from(file, start), stop - start)
+
+    def get_axes_indexes_chunk(self, start: int, stop: int) -> np.ndarray:
+        if self._axes_indexes is not None:
+            return self._axes_indexes[start:stop]
+        positions = self.get_positions_chunk(start, stop)
+        return np.stack([np.searchsorted(ax_unique, positions[:, ind])
+                         for ind, ax_unique in enumerate(self.axes_unique)], axis=-1)
+
+    def iter_positions(self, chunk_size: int = None, start: int = 0) -> Iterator[np.ndarray]:
+        if not self.is_lazy:
+            yield from super().iter_positions(chunk_size, start)
+            return
+        if chunk_size is None:
+            chunk_size = config('scan', 'positions_chunk_size')
+        self.evaluate_steps()
+        with open(self.file_path, 'rb') as file:
+            data_lines = self.iter_data_lines_from(file, start)
+            for chunk_start in range(start, self.n_steps, chunk_size):
+                yield self.read_positions(data_lines, min(chunk_size, self.n_steps - chunk_start))
+
+    def get_nav_axes(self) -> List[Axis]:
+        """The spread navigation axes, filled by reading the file by chunks"""
+        axes_data = np.zeros((self.n_axes, self.n_steps))
+        start = 0
+        for positions in self.iter_positions():
+            axes_data[:, start:start + positions.shape[0]] = positions.T
+            start += positions.shape[0]
+        return [Axis(label=f'{act.title}', units=act.units, data=axes_data[ind], index=0,
+                     spread_order=ind)
+                for ind, act in enumerate(self.actuators)]
+
+    def get_indexes_from_scan_index(self, scan_index: int) -> Tuple[int]:
+        """To be reimplemented. Calculations of indexes within the scan"""
+        return scan_index,
+
+    def get_scan_shape(self) -> Tuple[int]:
+        return self.n_steps,
+
+    def update_from_scan_selector(self, scan_selector: Selector):
+        pass
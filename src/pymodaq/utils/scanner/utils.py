@@ -83,9 +83,10 @@ class ScanInfo:
         Number of steps of the scan
     positions: ndarray
         multidimensional array. the first dimension has a length of Nsteps and each element is an actuator position
+        (None for the scans whose positions are computed by chunks)
     positions_indexes: ndarray
         multidimensional array of Nsteps 0th dimension length where each element is the index
-        of the corresponding positions within the axis_unique
+        of the corresponding positions within the axis_unique (None as positions)
     axes_unique: list of ndarray
         list of sorted (and with unique values) 1D arrays of unique positions of each defined axes
     kwargs: dict of other named attributes
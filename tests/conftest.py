@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+
+class MoveMock:
+    """Stand-in of a DAQ_Move exposing the attributes used by the scanners"""
+    def __init__(self, ind: int = 0):
+        self.title = f'act_{ind}'
+        self.units = f'units_{ind}'
+
+
+@pytest.fixture()
+def get_actuators():
+    """Get a function returning a list of n MoveMock actuators named act_0, act_1..."""
+    def _get_actuators(n_actuators: int = 2):
+        return [MoveMock(ind) for ind in range(n_actuators)]
+    return _get_actuators
@@ -16,6 +16,7 @@ from pymodaq.utils.config import Config
 from pymodaq.utils.parameter import utils as putils
 from pymodaq.utils.parameter import Parameter
 from pymodaq.utils.h5modules.browsing import H5BrowserUtil
+from pymodaq.utils.daq_utils import ThreadCommand
 
 config = Config()
 config_viewer = daqvm.config
@@ -85,6 +86,30 @@ class TestWithoutUI:
         assert putils.iter_children(prog.settings.child('detector_settings'), []) == \
             putils.iter_children(det_params, [])
 
+    def test_integration_done(self, ini_daq_viewer_without_ui):
+        prog, qtbot = ini_daq_viewer_without_ui
+        detector = daqvm.DAQ_Detector(prog.title, prog.settings, prog.detector)
+        commands = []
+        detector.status_sig.connect(lambda status: commands.append(status.command))
+
+        detector.integration_done()
+        assert commands == []  # only notified during single grabs
+
+        detector.single_grab = True
+        detector.Naverage = 3
+        detector.ind_average = 0
+        detector.integration_done()
+        assert commands == []  # not the last exposure of the software averaging
+        detector.ind_average = 2
+        detector.integration_done()
+        detector.integration_done()
+        assert commands == ['integration_done']
+
+        with qtbot.waitSignal(prog.integration_done_signal) as blocker:
+            prog.thread_status(ThreadCommand('integration_done'))
+        assert blocker.args[0] == prog.title
+
+
 @pytest.mark.skip
 class TestWithUI:
 
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+from qtpy.QtCore import QObject
+
+from pymodaq.extensions.daq_scan import DAQScan
+from pymodaq.extensions.daq_scan_checkpoint import ScanCheckpoint
+from pymodaq.extensions.daq_scan_profiler import ScanProfiler
+from pymodaq.utils.daq_utils import ThreadCommand
+from pymodaq.utils.h5modules import saving
+from pymodaq.utils.scanner.scanner import Scanner
+
+
+def get_scanner(actuators, scan_type='Scan2D', scan_sub_type='Linear') -> Scanner:
+    scanner = Scanner(actuators=actuators)
+    scanner.set_scan_type_and_subtypes(scan_type, scan_sub_type)
+    scanner.scanner.save_settings = False
+    scanner.set_scan()
+    return scanner
+
+
+def test_indexes():
+    checkpoint = ScanCheckpoint('', '', 10, 2, '', [], [])
+    assert checkpoint.get_next_indexes() == (0, 0)
+    assert not checkpoint.is_done
+    checkpoint.scan_index = 4
+    assert checkpoint.get_next_indexes() == (0, 5)
+    checkpoint.scan_index = 9
+    assert checkpoint.get_next_indexes() == (1, 0)
+    assert not checkpoint.is_done
+    checkpoint.average_index = 1
+    assert checkpoint.is_done
+
+
+def test_save_load(qtbot, tmp_path, get_actuators):
+    scanner = get_scanner(get_actuators(2))
+    checkpoint = ScanCheckpoint.from_scan(scanner, 3, ['det0'])
+    assert checkpoint.n_steps == scanner.n_steps
+    assert checkpoint.actuators == ['act_0', 'act_1']
+
+    h5saver = saving.H5SaverLowLevel()
+    h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'))
+    scan_node = h5saver.get_set_group(h5saver.raw_group, 'Scan000')
+    assert ScanCheckpoint.load(scan_node) is None
+    checkpoint.save(scan_node)
+    ScanCheckpoint.save_progress(scan_node, 7, 1)
+
+    loaded = ScanCheckpoint.load(scan_node)
+    assert (loaded.scan_index, loaded.average_index) == (7, 1)
+    assert loaded.get_mismatches(checkpoint) == []
+    h5saver.close_file()
+
+    settings, sub_settings = loaded.get_scanner_parameters()
+    resumed = Scanner(actuators=get_actuators(2))
+    resumed.set_scan_from_settings(settings, sub_settings)
+    resumed.scanner.save_settings = False
+    assert resumed.scan_type == 'Scan2D'
+    assert np.allclose(resumed.positions, scanner.positions)
+    assert loaded.get_mismatches(ScanCheckpoint.from_scan(resumed, 3, ['det0'])) == []
+
+
+def test_mismatches(qtbot, get_actuators):
+    scanner = get_scanner(get_actuators(2))
+    checkpoint = ScanCheckpoint.from_scan(scanner, 1, ['det0'])
+    assert len(checkpoint.get_mismatches(ScanCheckpoint.from_scan(scanner, 2, ['det1']))) == 2
+
+    scanner.scanner.settings.child('axis1', 'start_axis1').setValue(0.5)
+    scanner.scanner.settings.child('axis1', 'stop_axis1').setValue(1.5)
+    scanner.set_scan()
+    assert checkpoint.get_mismatches(ScanCheckpoint.from_scan(scanner, 1, ['det0'])) == \
+        ['The scan positions differ']
+
+
+@pytest.mark.parametrize('scan_type, scan_sub_type', [('Scan1D', 'Linear'), ('Scan2D', 'Spiral')])
+def test_iter_positions_start(qtbot, get_actuators, scan_type, scan_sub_type):
+    scanner = get_scanner(get_actuators(1 if scan_type == 'Scan1D' else 2), scan_type, scan_sub_type)
+    positions = np.concatenate([chunk for chunk in scanner.scanner.iter_positions(3, start=5)])
+    assert np.allclose(positions, scanner.positions[5:])
+    assert len(list(scanner.iter_positions(start=scanner.n_steps))) == 0
+
+
+
+class SaverMock:
+    def __init__(self):
+        self.h5_file = self
+        self.h5saver = self
+        self.swmr_started = False
+        self.n_data = 0
+
+    def isopen(self):
+        return True
+
+    def add_data(self, **kwargs):
+        self.n_data += 1
+
+    def submit(self, func, *args):
+        pass
+
+    def start_swmr(self):
+        self.swmr_started = True
+        return True
+
+
+@pytest.mark.parametrize('start_indexes', [(0, 0), (0, 5), (1, 0)])
+def test_swmr_started_on_resume(qtbot, start_indexes):
+    """SWMR is started after the first step saved, even when a scan is resumed"""
+    daq_scan = DAQScan.__new__(DAQScan)  # only the saving of the scan steps is used
+    QObject.__init__(daq_scan)
+    daq_scan._h5saver = SaverMock()
+    daq_scan._module_and_data_saver = SaverMock()
+    daq_scan._checkpoint = ScanCheckpoint('', '', 10, 2, '', [], [])
+    daq_scan._scan_node = None
+    daq_scan.scan_profiler = ScanProfiler()
+    daq_scan.scan_profiler.start()
+    daq_scan._first_step_saved = False
+    daq_scan._swmr_ready = False
+    daq_scan.ind_average, daq_scan.ind_scan = start_indexes
+    daq_scan._ind_step = start_indexes[0] * 10 + start_indexes[1]
+
+    for ind in range(3):
+        daq_scan.thread_status(ThreadCommand('add_data', dict(indexes=(daq_scan.ind_scan,))))
+        daq_scan.add_step_timings(dict([]))
+        assert daq_scan.h5saver.swmr_started == (ind == 0)
+        daq_scan.h5saver.swmr_started = False
+        daq_scan.ind_scan += 1
+    assert daq_scan.module_and_data_saver.n_data == 3
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from pymodaq.extensions.daq_scan_profiler import ScanProfiler
+from pymodaq.utils.h5modules import saving
+from pymodaq.utils.h5modules.data_saving import DataEnlargeableSaver, DataLoader
+
+DETECTORS = ['det0', 'det1']
+
+
+def get_profiler(nsteps=5) -> ScanProfiler:
+    profiler = ScanProfiler(DETECTORS)
+    t0 = profiler.start_time
+    for ind in range(nsteps):
+        profiler.add_step({'move_issued': t0 + ind, 'move_done': t0 + ind + 0.3,
+                           'grab_issued': t0 + ind + 0.4, 'det_done det0': t0 + ind + 0.6,
+                           'det_done det1': t0 + ind + 0.8, 'saved': t0 + ind + 0.85,
+                           'plotted': t0 + ind + 0.9})
+    return profiler
+
+
+def test_add_step():
+    profiler = ScanProfiler(DETECTORS)
+    step = profiler.add_step({'move_issued': profiler.start_time + 1.})
+    assert len(step) == len(profiler.event_names) == 7
+    assert step[0] == pytest.approx(1.)
+    assert np.all(np.isnan(step[1:]))
+
+
+def test_phases():
+    profiler = get_profiler()
+    durations = profiler.get_mean_durations()
+    assert durations == pytest.approx({'move': 0.3, 'wait': 0.1, 'grab det0': 0.2, 'grab det1': 0.4,
+                                       'save': 0.05, 'plot': 0.05})
+    phases = profiler.get_phases()
+    assert len(phases) == 5 * 6
+    assert phases[0][:3] == ('move', 0, 0)
+
+
+def test_gantt(qtbot):
+    chart = get_profiler(20).plot_gantt(n_steps=10)
+    assert len(chart.tasks) == 10 * 6
+
+
+def test_save(tmp_path):
+    h5saver = saving.H5SaverLowLevel()
+    h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'))
+    profiler = get_profiler()
+    saver = DataEnlargeableSaver(h5saver, enl_axis_names=('step',))
+    group = h5saver.get_set_group(h5saver.raw_group, 'ScanTimings')
+    for ind, step in enumerate(profiler.timings):
+        saver.add_data(group, profiler.to_dwa(step), axis_values=[ind])
+
+    loader = DataLoader(h5saver)
+    for ind_event, event_name in enumerate(profiler.event_names):
+        dwa = loader.load_data(f'/RawData/ScanTimings/EnlData{ind_event:02d}')
+        assert dwa.labels == [event_name]
+        assert dwa.shape == (5,)
+        assert np.allclose(dwa[0], [timings[ind_event] for timings in profiler.timings],
+                           equal_nan=True)
+    h5saver.close_file()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from pymodaq.utils.data import Axis, DataWithAxes, DataToExport, DataDistribution
+from pymodaq.utils.gui_utils import DockArea
+from pymodaq.utils.h5modules.saving import H5Saver
+from pymodaq.utils.h5modules.data_saving import DataToExportExtendedSaver, DataToExportEnlargeableSaver
+from pymodaq.post_treatment.load_and_plot import LoaderPlotter
+from pymodaq.utils.plotting.data_viewers import ViewersEnum, ViewerND
+
+SCAN_SHAPE = (4, 5)
+
+
+@pytest.fixture()
+def init_h5saver(tmp_path):
+    h5saver = H5Saver()
+    h5saver.init_file(custom_naming=True, addhoc_file_path=tmp_path.joinpath('temp_data.h5'))
+    yield h5saver
+    h5saver.close_file()
+
+
+def get_step_data(ind: int) -> DataToExport:
+    return DataToExport('step', data=[
+        DataWithAxes('data0D', source='raw', data=[np.array([ind]), np.array([-ind])],
+                     origin='det'),
+        DataWithAxes('data1D', source='raw', data=[ind + np.arange(10.)], origin='det',
+                     axes=[Axis('sig', data=np.linspace(0, 1, 10), index=0)])])
+
+
+def test_update_live_data(qtbot, init_h5saver):
+    h5saver = init_h5saver
+    area = DockArea()
+    qtbot.addWidget(area)
+    loader_plotter = LoaderPlotter(area)
+    loader_plotter.h5saver = h5saver
+
+    saver = DataToExportExtendedSaver(h5saver, extended_shape=SCAN_SHAPE)
+    saver.add_nav_axes(h5saver.raw_group,
+                       [Axis('nav0', data=np.linspace(0, 1, SCAN_SHAPE[0]), index=0),
+                        Axis('nav1', data=np.linspace(0, 1, SCAN_SHAPE[1]), index=1)])
+    for ind in range(SCAN_SHAPE[0] * SCAN_SHAPE[1]):
+        indexes = np.unravel_index(ind, SCAN_SHAPE)
+        dte = get_step_data(ind)
+        saver.add_data(h5saver.raw_group, dte, indexes)
+        loader_plotter.update_live_data(indexes, dte)
+        live_data = loader_plotter.load_data(live_data=True, remove_navigation=False)
+
+    data_file = loader_plotter.load_data(remove_navigation=False)
+    assert len(live_data) == len(data_file) == 2
+    for dwa in data_file:
+        live_dwa = live_data.get_data_from_full_name(dwa.get_full_name())
+        assert live_dwa.shape == dwa.shape
+        assert live_dwa.nav_indexes == dwa.nav_indexes
+        for ind in range(len(dwa)):
+            assert np.allclose(live_dwa[ind], dwa[ind])
+    # the processing of the loaded data does not alter the live data
+    loader_plotter.load_data(live_data=True, remove_navigation=True)
+    assert loader_plotter.load_data(live_data=True, remove_navigation=False).get_data_from_full_name(
+        'det/data1D').nav_indexes == (0, 1)
+
+
+def test_spread_data(qtbot, init_h5saver):
+    h5saver = init_h5saver
+    area = DockArea()
+    qtbot.addWidget(area)
+    loader_plotter = LoaderPlotter(area)
+    loader_plotter.h5saver = h5saver
+    loader_plotter.prepare_viewers([ViewersEnum['ViewerND']],
+                                   viewers_name=[loader_plotter.grouped_data0D_fullname])
+
+    saver = DataToExportEnlargeableSaver(h5saver, enl_axis_names=('x', 'y'), enl_axis_units=('mm', 'mm'))
+    positions = np.random.default_rng(0).random((6, 2))
+    for ind, position in enumerate(positions):
+        saver.add_data(h5saver.raw_group, get_step_data(ind).get_data_from_dim('Data0D'),
+                       axis_values=list(position))
+    loader_plotter.load_plot_data(group_0D=True)
+    data = loader_plotter.load_data(group_0D=True)
+    assert len(data) == 1
+    assert data[0].distribution == DataDistribution['spread']
+    assert data[0].nav_indexes == (0,)
+    assert data[0].size == len(positions)
+    for axis in data[0].axes:
+        assert np.allclose(axis.get_data(), positions[:, axis.spread_order])
+    assert isinstance(loader_plotter.viewers[0], ViewerND)
+
+
+def test_refresh_time(qtbot, init_h5saver):
+    area = DockArea()
+    qtbot.addWidget(area)
+    loader_plotter = LoaderPlotter(area)
+    loader_plotter.h5saver = init_h5saver
+    assert loader_plotter.mean_refresh_time == 0.
+    loader_plotter.load_plot_data()
+    loader_plotter.load_plot_data()
+    assert loader_plotter.refresh_time > 0.
+    assert loader_plotter.mean_refresh_time > 0.
+    loader_plotter.reset_live_data()
+    assert loader_plotter.mean_refresh_time == 0.
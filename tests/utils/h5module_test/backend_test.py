@@ -24,6 +24,11 @@ try:
     tested_backend.append('h5pyd')
 except ImportError:
     pass
+try:
+    import zarr
+    tested_backend.append('zarr')
+except ImportError:
+    pass
 
 
 @pytest.fixture(scope="module")
@@ -52,6 +57,19 @@ def get_temp_path(tmp_path, backend='h5pyd'):
         return tmp_path
 
 
+@pytest.mark.parametrize('data_shape, ext_shape, chunk_size, expected',
+                         [((1,), (None,), 8, (1024, 1)),
+                          ((256,), (None,), 8, (4, 256)),
+                          ((256,), (3, 10), 8, (1, 4, 256)),
+                          ((256,), (3, 2), 8, (2, 2, 256)),
+                          ((2048,), (None,), 8, (1, 2048)),
+                          ((20, 30), (None,), 8, (1, 20, 30)),
+                          ((20, 30), (5, 10), 8, (1, 1, 20, 30)),
+                          ])
+def test_get_chunk_shape(data_shape, ext_shape, chunk_size, expected):
+    assert backends.get_chunk_shape(data_shape, np.float64, ext_shape, chunk_size) == expected
+
+
 def test_check_mandatory_attrs():
     attr_name = 'TITLE'
     attr = b'test'
@@ -103,7 +121,9 @@ class TestH5Backend:
         title = 'this is a test file'
         start_path = get_temp_path(tmp_path, backend)
         h5_file = bck.open_file(start_path.joinpath('h5file.h5'), 'w', title)
-        if backend != 'h5pyd':
+        if backend == 'zarr':
+            assert start_path.joinpath('h5file.h5').is_dir()
+        elif backend != 'h5pyd':
             assert start_path.joinpath('h5file.h5').exists()
             assert start_path.joinpath('h5file.h5').is_file()
 
@@ -138,6 +158,21 @@ class TestH5Backend:
 
         bck.close_file()
 
+    def test_set_attrs(self, get_backend):
+        bck = get_backend
+        attrs = dict(attr1='one attr', attr2=(10, 15), attr3=12.4, title='a title')
+        group = bck.add_group('g1', 'data', bck.root())
+        group.attrs.update(attrs)
+        assert group.attrs['TITLE'] == 'a title'
+        assert group.attrs['attr1'] == 'one attr'
+        utils.check_vals_in_iterable(group.attrs['attr2'], attrs['attr2'])
+        assert group.attrs['attr3'] == attrs['attr3']
+
+        bck.set_attrs(group, dict(attr1='other attr', attr4=[1, 2]))
+        assert group.attrs['attr1'] == 'other attr'
+        utils.check_vals_in_iterable(group.attrs['attr4'], [1, 2])
+        bck.close_file()
+
     @pytest.mark.parametrize('group_type', backends.GroupType.names())
     def test_add_group(self, get_backend, group_type):
         bck = get_backend
@@ -235,6 +270,74 @@ class TestH5Backend:
         for gr in gps:
             assert gr in nodes
 
+    def test_node_index(self, get_backend):
+        bck = get_backend
+        g1 = bck.add_group('g1', 'scan', bck.root())
+        bck.create_carray(g1, 'array0', np.array([1, 2, 3]))
+        array1 = bck.create_carray(g1, 'array1', np.array([1, 2, 3]))
+        bck.set_attr(array1, 'data_type', 'data')
+        g2 = bck.add_group('g2', 'data_dim', g1)
+        array2 = bck.create_earray(g2, 'array2', dtype=np.float64, data_shape=(3,))
+        bck.set_attr(array2, 'data_type', 'data')
+        bck.create_vlarray(g2, 'log', dtype='string')
+
+        assert bck.get_children_name('/G1') == ['G2', 'array0', 'array1']
+        assert isinstance(bck.get_node('/G1/G2/log'), backends.StringARRAY)
+        assert isinstance(bck.get_node('/G1/G2', 'array2'), backends.EARRAY)
+        assert [node.path for node in bck.get_nodes_from_attributes(data_type='data')] == \
+               ['/G1/array1', '/G1/G2/array2']
+        assert [node.path for node in bck.get_nodes_from_attributes('/G1/G2', data_type='data')] == \
+               ['/G1/G2/array2']
+        assert [node.path for node in bck.get_nodes_from_attributes(type='data_dim')] == ['/G1/G2']
+        assert bck.get_data_type_count('/G1', 'data') == 2
+
+        bck.remove_node('/G1/G2')
+        assert bck.get_children_name('/G1') == ['array0', 'array1']
+        assert [node.path for node in bck.get_nodes_from_attributes(data_type='data')] == \
+               ['/G1/array1']
+        assert bck.get_data_type_count('/G1', 'data') == 1
+        with pytest.raises(backends.NodeError):
+            bck.get_node('/G1/G2')
+        with pytest.raises(backends.NodeError):
+            bck.remove_node('/G1', recursive=False)
+
+    def test_node_index_external_change(self, get_backend):
+        bck = get_backend
+        g1 = bck.get_set_group(bck.root(), 'g1')
+        assert bck.get_children_name(g1) == []
+        if bck.backend == 'tables':
+            bck.h5file.create_group('/g1', 'g2')
+        else:
+            bck.h5file['/g1'].create_group('g2')
+        assert bck.get_children_name(g1) == []  # the index is not aware of it
+        assert bck.get_node('/g1/g2').name == 'g2'  # but a missing node is looked for in the file
+        assert bck.get_children_name(g1) == ['g2']
+        with pytest.raises(backends.NodeError):
+            bck.get_children_name('/g1/g3')
+
+    def test_node_index_attributes(self, get_backend, monkeypatch):
+        bck = get_backend
+        g1 = bck.get_set_group(bck.root(), 'g1')
+        array = bck.create_carray(g1, 'array', np.array([1, 2, 3]))
+        assert bck.get_nodes_from_attributes(data_type='data') == []
+
+        array.attrs['data_type'] = 'data'  # missing attributes are not cached
+        assert [node.path for node in bck.get_nodes_from_attributes(data_type='data')] == ['/g1/array']
+        array.attrs.update(dict(data_type='axis'))  # the index is updated from the Node attributes
+        assert bck.get_nodes_from_attributes(data_type='data') == []
+        assert [node.path for node in bck.get_nodes_from_attributes(data_type='axis')] == ['/g1/array']
+
+        def build_node_index():
+            raise AssertionError('the node index should not be built again')
+
+        monkeypatch.setattr(bck, '_build_node_index', build_node_index)
+        if bck.backend == 'tables':
+            bck.h5file.create_group('/g1', 'g2')
+        else:
+            bck.h5file['/g1'].create_group('g2')
+        assert bck.get_children_name('/g1/g2') == []
+        assert bck.get_children_name(g1) == ['array', 'g2']
+
     def test_carray(self, get_backend):
         bck = get_backend
         g1 = bck.get_set_group(bck.root(), 'g1')
@@ -256,6 +359,20 @@ class TestH5Backend:
 
         bck.close_file()
 
+    def test_carray_from_shape(self, get_backend):
+        bck = get_backend
+        g1 = bck.get_set_group(bck.root(), 'g1')
+        with pytest.raises(ValueError):
+            bck.create_carray(g1, 'carray0', shape=(5, 10))
+        carray = bck.create_carray(g1, 'carray', shape=(5, 10), dtype=np.uint16, fill_value=3,
+                                   chunk_shape=(1, 10))
+        assert carray.attrs['dtype'] == 'uint16'
+        utils.check_vals_in_iterable(carray.attrs['shape'], (5, 10))
+        assert np.all(carray.read() == 3)
+        carray[2, :] = np.arange(10)
+        assert np.all(carray[2, :] == np.arange(10))
+        assert np.all(carray[3, :] == 3)
+
     @pytest.mark.parametrize('compression', ['gzip', 'zlib'])
     @pytest.mark.parametrize('comp_level', list(range(0, 10, 3)))
     def test_carray_comp(self, get_backend, compression, comp_level):
@@ -308,6 +425,65 @@ class TestH5Backend:
         array.append(data)
         assert np.all(array[-1, :, :] == pytest.approx(data))
 
+    def test_earray_buffered(self, get_backend):
+        bck = get_backend
+        bck.set_buffered_appends(True, max_rows=3, max_delay=1e6)
+        g1 = bck.get_set_group(bck.root(), 'g1')
+        array_shape = (10, 3)
+        array = bck.create_earray(g1, 'array', dtype=np.float64, data_shape=array_shape)
+        assert array.is_buffered
+        datas = [generate_random_data(array_shape) for _ in range(5)]
+        for data in datas[:2]:
+            array.append(data)
+        assert array.attrs['shape'] == (0, 10, 3)
+        assert array.nrows == 2
+        array.append(datas[2])
+        assert array.attrs['shape'] == (3, 10, 3)
+        assert array.attrs['shape'][0] == array.array.shape[0]  # the attribute matches the written rows
+        for data in datas[3:]:
+            bck.get_node('/g1/array').append(data)
+        assert array.attrs['shape'] == (3, 10, 3)
+        bck.flush()
+        assert array.attrs['shape'] == (5, 10, 3)
+        assert np.all(array.read() == pytest.approx(np.stack(datas)))
+
+        array0D = bck.create_earray(g1, 'array0D', dtype=np.float64, data_shape=(1,))
+        for ind in range(4):
+            array0D.append(np.array([ind]))
+        assert len(array0D) == 4
+        assert array0D.attrs['shape'] == (4, 1)
+
+        bck.set_buffered_appends(False)
+        array = bck.get_node('/g1/array')
+        assert not array.is_buffered
+        array.append(datas[0])
+        assert array.attrs['shape'] == (6, 10, 3)
+
+    @pytest.mark.parametrize('compression', backends.compression_libraries)
+    def test_earray_fast_comp(self, get_backend, compression):
+        bck = get_backend
+        g1 = bck.get_set_group(bck.root(), 'g1')
+        array_shape = (20, 30)
+        bck.define_compression(compression, 5)
+        array = bck.create_earray(g1, 'array', dtype=np.float64, data_shape=array_shape)
+        data = generate_random_data(array_shape)
+        for _ in range(3):
+            array.append(data)
+        assert np.all(array[-1, :, :] == pytest.approx(data))
+        assert array.chunk_shape == (1, 20, 30)
+
+    def test_array_chunk_shape(self, get_backend):
+        bck = get_backend
+        g1 = bck.get_set_group(bck.root(), 'g1')
+        array = bck.create_earray(g1, 'array0D', dtype=np.float64, data_shape=(1,))
+        assert array.chunk_shape == backends.get_chunk_shape((1,), np.float64)
+        array = bck.create_earray(g1, 'array1D', dtype=np.float64, data_shape=(256,),
+                                  chunk_shape=(4, 256))
+        assert array.chunk_shape == (4, 256)
+        carray = bck.create_carray(g1, 'carray', obj=np.zeros((10, 20, 30)),
+                                   chunk_shape=(1, 20, 30))
+        assert carray.chunk_shape == (1, 20, 30)
+
     def test_vlarray(self, get_backend):
         bck = get_backend
         g1 = bck.get_set_group(bck.root(), 'g1')
@@ -376,3 +552,68 @@ class TestGroup:
 
         group.remove_children()
         assert group.children_name() == []  # notice the capital for the groups...
+
+
+@pytest.mark.skipif('h5py' not in tested_backend, reason='the SWMR mode requires h5py')
+def test_swmr(tmp_path):
+    file_path = tmp_path.joinpath('swmr.h5')
+    writer = backends.H5Backend('h5py')
+    writer.open_file(file_path, 'w', swmr=True)
+    array = writer.create_earray(writer.root(), 'array', dtype=np.float64, data_shape=(3,))
+    array.append(np.zeros((3,)))
+    assert not writer.swmr_mode
+    assert writer.start_swmr()
+    assert writer.swmr_mode
+
+    reader = backends.H5Backend('h5py')
+    reader.open_file(file_path, 'r', swmr=True)
+    assert reader.swmr_mode
+    read_array = reader.get_node('/array')
+    assert read_array.shape == (1, 3)
+
+    array.append(np.ones((3,)))
+    writer.root().attrs['scan_done'] = True  # deferred to the file closing
+    assert writer.root().attrs['scan_done']
+    assert 'scan_done' not in reader.root().attrs.attrs_name  # pending attrs are kept per written file
+    assert array.attrs['shape'] == (2, 3)
+    writer.flush()
+    reader.refresh()
+    assert read_array.shape == (2, 3)
+    assert np.all(read_array[-1] == pytest.approx(np.ones((3,))))
+
+    reader.close_file()
+    writer.close_file()
+    reader.open_file(file_path, 'r')
+    assert reader.root().attrs['scan_done']
+    assert reader.get_node('/array').attrs['shape'] == (2, 3)
+    reader.close_file()
+
+
+@pytest.mark.skipif('tables' not in tested_backend, reason='pytables is not installed')
+def test_swmr_not_available(tmp_path):
+    bck = backends.H5Backend('tables')
+    bck.open_file(tmp_path.joinpath('file.h5'), 'w', swmr=True)
+    assert not bck.start_swmr()
+    assert not bck.swmr_mode
+    bck.close_file()
+
+
+@pytest.mark.skipif('zarr' not in tested_backend, reason='zarr is not installed')
+def test_zarr_parallel_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(backends.os, 'cpu_count', lambda: 4)
+    bck = backends.H5Backend('zarr')
+    bck.open_file(tmp_path.joinpath('store.zarr'), 'w')
+    data = np.random.rand(10, 2)
+    carray = bck.create_carray(bck.root(), 'carray', obj=data, chunk_shape=(3, 2))
+    assert np.all(carray.read() == pytest.approx(data))
+    assert backends._zarr_write_executor is not None
+
+    bck.set_buffered_appends(True)
+    earray = bck.create_earray(bck.root(), 'earray', dtype=np.float64, data_shape=(2,),
+                               chunk_shape=(3, 2))
+    earray.append(data[:2])
+    earray.flush_buffer()
+    earray.append(data[2:])  # written from the third row, across the chunk boundaries
+    assert np.all(earray.read() == pytest.approx(data))
+    assert earray.attrs['shape'] == (10, 2)
+    bck.close_file()
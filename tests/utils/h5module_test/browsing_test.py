@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from qtpy import QtCore, QtGui
+from qtpy.QtCore import Qt
+
+from pymodaq.utils.h5modules.saving import H5SaverLowLevel
+from pymodaq.utils.h5modules.browsing import H5BrowserUtil, H5TreeModel
+from pymodaq.utils.h5modules.data_saving import DataSaverLoader
+from pymodaq.utils import data as data_mod
+
+
+def get_png(width: int, height: int) -> bytes:
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_RGB32)
+    image.fill(Qt.red)
+    buffer = QtCore.QBuffer()
+    buffer.open(QtCore.QIODevice.WriteOnly)
+    image.save(buffer, 'PNG')
+    return bytes(buffer.data())
+
+
+@pytest.fixture()
+def h5utils(tmp_path):
+    file_path = tmp_path.joinpath('browsing.h5')
+    h5saver = H5SaverLowLevel()
+    h5saver.init_file(file_name=file_path)
+    datasaver = DataSaverLoader(h5saver)
+    for ind in range(3):
+        dwa = data_mod.DataWithAxes(f'data{ind}', data_mod.DataSource['raw'],
+                                    data=[np.arange(10.)])
+        datasaver.add_data(h5saver.raw_group, dwa)
+    h5saver.get_node('/RawData/Data00').attrs['pixmap2D'] = get_png(4, 3)
+    h5saver.close_file()
+
+    h5utils = H5BrowserUtil()
+    h5utils.open_file(file_path, 'r')
+    h5utils.index_file()
+    yield h5utils
+    h5utils.close_file()
+
+
+def test_get_children_info(h5utils):
+    children = h5utils.get_children_info('/')
+    assert ('RawData', '/RawData', True) in children
+    assert ('Data00', '/RawData/Data00', False) in h5utils.get_children_info('/RawData')
+    assert h5utils.get_children_info('/RawData/Data00') == []
+
+
+def test_search_nodes(h5utils):
+    assert h5utils.search_nodes('rawdata') == ['/RawData']
+    assert len(h5utils.search_nodes('data0')) == 3
+    assert len(h5utils.search_nodes('data_type=data')) == 3
+    assert h5utils.search_nodes('not a node') == []
+
+
+def test_tree_model(qtbot, h5utils):
+    model = H5TreeModel(h5utils)
+    assert model.rowCount() == 1
+    root_index = model.index(0, 0)
+    assert root_index.data() == '/'
+    assert model.hasChildren(root_index)
+    assert model.canFetchMore(root_index)
+    assert model.rowCount(root_index) == 0
+    model.fetchMore(root_index)
+    assert not model.canFetchMore(root_index)
+    assert model.rowCount(root_index) == len(h5utils.get_children_name('/'))
+
+    raw_index = [model.index(row, 0, root_index) for row in range(model.rowCount(root_index))
+                 if model.index(row, 0, root_index).data() == 'RawData'][0]
+    model.fetchMore(raw_index)
+    assert model.rowCount(raw_index) == len(h5utils.get_children_name('/RawData'))
+    data_index = model.index(0, 0, raw_index)
+    assert model.parent(data_index) == raw_index
+    assert not model.hasChildren(data_index)
+    assert data_index.data(Qt.UserRole) == '/RawData/Data00'
+    pixmap = model.index(0, 1, raw_index).data(Qt.DecorationRole)
+    assert (pixmap.width(), pixmap.height()) == (4, 3)
+    assert model.index(1, 1, raw_index).data(Qt.DecorationRole) is None
+
+    model.set_filter(h5utils.search_nodes('data_type=data'))
+    model.fetch_all()
+    root_index = model.index(0, 0)
+    assert [model.index(row, 0, root_index).data()
+            for row in range(model.rowCount(root_index))] == ['RawData']
+    raw_index = model.index(0, 0, root_index)
+    assert model.rowCount(raw_index) == 3
+    model.set_filter(None)
+    assert model.canFetchMore(model.index(0, 0))
@@ -7,6 +7,7 @@ Created the 21/11/2022
 import numpy as np
 import pytest
 from pathlib import Path
+from datetime import datetime
 
 from pymodaq.utils.h5modules import saving
 from pymodaq.utils.h5modules.data_saving import (DataLoader, AxisSaverLoader,
@@ -388,6 +389,32 @@ class TestDataEnlargeableSaver:
         if Nenl > 0:
             assert len(dwa_back.get_nav_axes()[0]) == 2
 
+    def test_add_data_does_not_walk_the_file(self, get_h5saver, monkeypatch):
+        """The next node index should not be obtained by walking the file at each step"""
+        h5saver = get_h5saver
+        NSTEPS = 500
+        data_saver = DataEnlargeableSaver(h5saver)
+        data = DataWithAxes(name='mydata', data=[DATA0D, DATA0D], source='raw')
+        for ind in range(10):  # populate the group with other nodes
+            BkgSaver(h5saver).add_data(h5saver.raw_group, init_data(DATA1D), save_axes=False)
+
+        walked_nodes = []
+        walk_nodes = h5saver.walk_nodes
+
+        def counting_walk_nodes(where):
+            for node in walk_nodes(where):
+                walked_nodes.append(node)
+                yield node
+        monkeypatch.setattr(h5saver, 'walk_nodes', counting_walk_nodes)
+
+        data_saver.add_data(h5saver.raw_group, data, axis_values=[0])
+        n_walked = len(walked_nodes)
+        for ind in range(1, NSTEPS):
+            data_saver.add_data(h5saver.raw_group, data, axis_values=[ind])
+
+        assert h5saver.get_node('/RawData/EnlData00').attrs['shape'] == (NSTEPS, 1)
+        assert len(walked_nodes) == n_walked
+
 
 class TestDataExtendedSaver:
     def test_init(self, get_h5saver):
@@ -428,6 +455,10 @@ class TestDataExtendedSaver:
             assert data_node.attrs['shape'] == tuple(data_ext_shape)
             assert np.all(data_node[tuple(INDEXES)] == pytest.approx(data[ind]))
 
+        for indexes in ([5, 3], [4, 10], [-1, 0]):
+            with pytest.raises(IndexError):
+                data_saver.add_data(h5saver.raw_group, data, indexes=indexes)
+
 
 class TestDataToExportSaver:
     def test_save(self, get_h5saver, init_data_to_export):
@@ -508,6 +539,32 @@ class TestDataToExportTimedSaver:
                 assert node.attrs['shape'][0] == Nadd_data + 1
 
 
+    def test_buffered_save(self, get_h5saver, init_data_to_export):
+        h5saver = get_h5saver
+        h5saver.set_buffered_appends(True, max_rows=4, max_delay=1e6)
+        data_to_export = init_data_to_export
+        det_group = h5saver.get_set_group(h5saver.raw_group, 'MyDet')
+
+        data_saver = DataToExportTimedSaver(h5saver)
+        Nadd_data = 10
+        for ind in range(Nadd_data):
+            data_saver.add_data(det_group, data_to_export)
+
+        nav_axis_node = h5saver.get_node('/RawData/MyDet/NavAxes/Axis00')
+        assert nav_axis_node.attrs['shape'] == (8,)  # the last 2 rows are still buffered
+        h5saver.flush()
+        assert nav_axis_node.attrs['shape'] == (Nadd_data,)
+        assert nav_axis_node.attrs['size'] == Nadd_data
+        for node in h5saver.walk_nodes('/'):
+            if 'shape' in node.attrs and node.name != 'Logger' and 'data' in node.attrs['data_type']:
+                assert node.attrs['shape'][0] == Nadd_data
+
+        data_loaded = DataLoader(h5saver).load_data('/RawData/MyDet/Data1D/CH00/EnlData00')
+        assert data_loaded.axes_manager.get_nav_axes()[0].size == Nadd_data
+        for ind in range(len(data_loaded)):
+            assert np.all(data_loaded[ind] == pytest.approx(np.tile(DATA1D, (Nadd_data, 1))))
+
+
 class TestDataToExportExtendedSaver:
     def test_save(self, get_h5saver, init_data_to_export):
         h5saver = get_h5saver
@@ -595,6 +652,167 @@ class TestDataLoader:
             assert np.all(data_loaded[ind][0] == pytest.approx(DATA2D))
             assert np.all(data_loaded[ind][1] == pytest.approx(DATA2D))
 
+    @pytest.mark.parametrize('buffered', [False, True])
+    def test_load_time_range(self, get_h5saver, buffered):
+        h5saver = get_h5saver
+        h5saver.set_buffered_appends(buffered)
+        data_saver = DataToExportTimedSaver(h5saver)
+        det_group = h5saver.get_set_group(h5saver.raw_group, 'MyDet')
+        Nadd_data = 1500
+        for ind in range(Nadd_data):
+            dte = DataToExport('mydte', data=[DataRaw('mydata', data=[np.array([float(ind)])])])
+            dte.timestamp = 1000. + ind
+            data_saver.add_data(det_group, dte)
+
+        time_index = h5saver.get_node('/RawData/MyDet/NavAxes/TimeIndex')
+        block_size = time_index.attrs['block_size']
+        assert np.allclose(squeeze(time_index.read()),
+                           1000. + np.arange(0, Nadd_data, block_size))
+
+        data_loader = DataLoader(h5saver)
+        path = '/RawData/MyDet/Data0D/CH00/EnlData00'
+        assert data_loader.get_time_rows(path) == slice(0, Nadd_data)
+        assert data_loader.get_time_rows(path, 2000.5, 2100) == slice(1001, 1101)
+        assert data_loader.get_time_rows(path, stop=datetime.fromtimestamp(1010.)) == slice(0, 11)
+        assert data_loader.load_time_range(path, start=5000.) is None
+
+        data_loaded = data_loader.load_time_range(path, 2000.5, 2100)
+        assert np.allclose(data_loaded[0], np.arange(1001, 1101))
+        assert np.allclose(data_loaded.get_nav_axes()[0].get_data(), 1000. + np.arange(1001, 1101))
+
+        for decimation in ['mean', 'min', 'max']:
+            data_loaded = data_loader.load_time_range(path, max_rows=100, decimation=decimation)
+            assert data_loaded.size == 100
+            assert data_loaded.get_nav_axes()[0].get_data()[0] == pytest.approx(1007.)
+            assert data_loaded[0][0] == pytest.approx(dict(mean=7., min=0., max=14.)[decimation])
+
+
+    @pytest.mark.parametrize('buffered', [False, True])
+    def test_time_index_on_existing_rows(self, get_h5saver, buffered):
+        h5saver = get_h5saver
+        h5saver.set_buffered_appends(buffered)
+        det_group = h5saver.get_set_group(h5saver.raw_group, 'MyDet')
+
+        def add_rows(data_saver, rows):
+            for ind in rows:
+                dte = DataToExport('mydte', data=[DataRaw('mydata', data=[np.array([float(ind)])])])
+                dte.timestamp = 1000. + ind
+                data_saver.add_data(det_group, dte)
+
+        add_rows(DataToExportTimedSaver(h5saver), range(5))
+        h5saver.flush()
+        h5saver.remove_node('/RawData/MyDet/NavAxes/TimeIndex')  # as in files written without index
+        add_rows(DataToExportTimedSaver(h5saver), range(5, 3000))
+        h5saver.flush()
+
+        time_index = h5saver.get_node('/RawData/MyDet/NavAxes/TimeIndex')
+        block_size = time_index.attrs['block_size']
+        assert np.allclose(squeeze(time_index.read()), 1000. + np.arange(0, 3000, block_size))
+        data_loader = DataLoader(h5saver)
+        path = '/RawData/MyDet/Data0D/CH00/EnlData00'
+        assert data_loader.get_time_rows(path, 3000., 3005.) == slice(2000, 2006)
+        assert np.allclose(data_loader.load_time_range(path, 3000., 3005.)[0], np.arange(2000, 2006))
+    def test_load_rolled_data(self, qtbot, tmp_path, init_data_to_export):
+        h5saver = saving.H5SaverLowLevel()
+        h5saver.set_rollover('frames', max_frames=2)
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'))
+        data_saver = DataToExportTimedSaver(h5saver)
+
+        Nadd_data = 5
+        for ind in range(Nadd_data):
+            h5saver.check_rollover()
+            det_group = h5saver.get_set_group(h5saver.raw_group, 'MyDet')
+            data_saver.add_data(det_group, init_data_to_export)
+        h5saver.close_file()
+
+        file_paths = saving.get_rollover_files(tmp_path.joinpath('h5file.h5'))
+        assert len(file_paths) == 3
+        path = '/RawData/MyDet/Data2D/CH00/EnlData00'
+        for file_path in file_paths:  # the same dataset whatever the file of the series
+            with DataLoader(file_path) as data_loader:
+                data_loaded = data_loader.load_rolled_data(path)
+                assert data_loader.load_data(path).shape[0] < Nadd_data
+            assert data_loaded.shape == (Nadd_data,) + DATA2D.shape
+            assert data_loaded.nav_indexes == (0,)
+            nav_axis = data_loaded.get_nav_axes()[0]
+            assert nav_axis.size == Nadd_data
+            assert np.all(np.diff(nav_axis.get_data()) >= 0)
+            for ind in range(len(data_loaded)):
+                assert np.all(data_loaded[ind][-1] == pytest.approx(DATA2D))
+
+    @pytest.mark.parametrize('inav, isig', [((2, slice(None)), None), ((1, slice(2, 7)), None),
+                                            (None, (slice(1, 4), 3)),
+                                            ((-1, slice(None)), (2, slice(None, 3))),
+                                            ((slice(0, 2), 8), (slice(None), 4))])
+    def test_load_hyperslab(self, get_h5saver, inav, isig):
+        h5saver = get_h5saver
+        data_loader = DataLoader(h5saver)
+        det_group = h5saver.get_set_group(h5saver.raw_group, 'MyDet')
+
+        EXT_SHAPE = (5, 10)
+        nav_axes = [Axis('navaxis0', '', data=np.linspace(0, EXT_SHAPE[0] - 1, EXT_SHAPE[0]),
+                         index=0),
+                    Axis('navaxis1', '', data=np.linspace(0, EXT_SHAPE[1] - 1, EXT_SHAPE[1]) ** 2,
+                         index=1)]
+        data_saver = DataToExportExtendedSaver(h5saver, extended_shape=EXT_SHAPE)
+        data_saver.add_nav_axes(det_group, nav_axes)
+        for ind in range(EXT_SHAPE[0]):
+            for indbis in range(EXT_SHAPE[1]):
+                dwa = DataWithAxes(name='mydata2D', source='raw', dim='Data2D',
+                                   data=[np.random.rand(*DATA2D.shape) for _ in range(2)],
+                                   axes=[Axis(data=create_axis_array(DATA2D.shape[0]),
+                                              label='myaxis0', index=0),
+                                         Axis(data=create_axis_array(DATA2D.shape[1]) ** 2,
+                                              label='myaxis1', index=1)])
+                data_saver.add_data(det_group, DataToExport('mydte', data=[dwa]), (ind, indbis))
+
+        path = '/RawData/MyDet/Data2D/CH00/Data00'
+        data_full = data_loader.load_data(path)
+        data_sliced = data_loader.load_data(path, inav=inav, isig=isig)
+        if inav is not None:
+            data_full = data_full.inav[inav]
+        if isig is not None:
+            data_full = data_full.isig[isig]
+
+        assert data_sliced.shape == data_full.shape
+        assert data_sliced.nav_indexes == data_full.nav_indexes
+        for ind in range(len(data_full)):
+            assert np.allclose(data_sliced[ind], data_full[ind])
+        for axis in data_full.axes:
+            axis_sliced = data_sliced.get_axis_from_index(axis.index)[0]
+            assert axis_sliced.label == axis.label
+            assert np.allclose(axis_sliced.get_data(), axis.get_data())
+
+    @pytest.mark.parametrize('bkg_shape', [DATA2D.shape, (1, DATA2D.shape[1]), (3, 2)])
+    def test_load_hyperslab_with_bkg(self, get_h5saver, bkg_shape):
+        h5saver = get_h5saver
+        data_loader = DataLoader(h5saver)
+        det_group = h5saver.get_set_group(h5saver.raw_group, 'MyDet')
+
+        EXT_SHAPE = (3, 4)
+        data_saver = DataToExportExtendedSaver(h5saver, extended_shape=EXT_SHAPE)
+        data_saver.add_nav_axes(det_group, [Axis(f'navaxis{ind}', '', data=np.arange(size),
+                                                 index=ind) for ind, size in enumerate(EXT_SHAPE)])
+        for ind in range(EXT_SHAPE[0]):
+            for indbis in range(EXT_SHAPE[1]):
+                dwa = DataWithAxes(name='mydata2D', source='raw', dim='Data2D',
+                                   data=[np.random.rand(*DATA2D.shape)])
+                data_saver.add_data(det_group, DataToExport('mydte', data=[dwa]), (ind, indbis))
+        BkgSaver(h5saver).add_data('/RawData/MyDet/Data2D/CH00',
+                                   DataWithAxes(name='mydata2D', source='raw', dim='Data2D',
+                                                data=[np.random.rand(*bkg_shape)]))
+
+        path = '/RawData/MyDet/Data2D/CH00/Data00'
+        inav, isig = (1, slice(1, 3)), (slice(2, 5), 3)
+        if bkg_shape == (3, 2):
+            with pytest.raises(ValueError):
+                data_loader.load_data(path, with_bkg=True, inav=inav, isig=isig)
+            return
+        data_full = data_loader.load_data(path, with_bkg=True).inav[inav].isig[isig]
+        data_sliced = data_loader.load_data(path, with_bkg=True, inav=inav, isig=isig)
+        assert data_sliced.shape == data_full.shape
+        assert np.allclose(data_sliced[0], data_full[0])
+
     def test_load_all(self, get_h5saver, init_data_to_export):
         h5saver = get_h5saver
         data_to_export = init_data_to_export
@@ -641,3 +859,26 @@ class TestDataLoader:
         # axis node from this type of loading should be 'index'
         assert dwa.axes[0].units == UNITS  # should not be that as the retrieved axis units of an
         # axis node from this type of loading should be ''
+
+    @pytest.mark.skipif('h5py' not in saving.backends_available, reason='SWMR requires h5py')
+    def test_load_follow(self, qtbot, tmp_path):
+        h5saver = saving.H5SaverLowLevel(backend='h5py')
+        h5saver.set_swmr(True)
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'))
+        data_saver = DataToExportEnlargeableSaver(h5saver)
+        data_saver.add_data(h5saver.raw_group, DataToExport('dte', data=[init_data(DATA0D)]),
+                            axis_values=[0.])
+        assert h5saver.start_swmr()
+
+        data_loader = DataLoader(tmp_path.joinpath('h5file.h5'), follow=True)
+        node_path = '/RawData/Data0D/CH00/EnlData00'
+        assert data_loader.load_data(node_path).size == 1
+        for ind in range(1, 4):
+            data_saver.add_data(h5saver.raw_group, DataToExport('dte', data=[init_data(DATA0D)]),
+                                axis_values=[float(ind)])
+        h5saver.flush()
+        dwa = data_loader.load_data(node_path)
+        assert dwa.size == 4
+        assert np.allclose(dwa.axes[0].get_data(), np.arange(4))
+        data_loader.close_file()
+        h5saver.close_file()
@@ -96,6 +96,7 @@ def test_txt_exporter(get_h5saver, tmp_path):
     file_path = tmp_path.joinpath('exported_data.txt')
     exporter.export_data(h5saver.get_node('/RawData/Data00'), file_path)
     assert np.allclose(np.loadtxt(file_path), dwa[0])
+    assert file_path.read_text().split('\t')[0] == '%.6e' % dwa[0][0, 0]  # even for integer arrays
 
     # exporting 1D data as txt
     file_path = tmp_path.joinpath('exported_axis.txt')
@@ -121,3 +122,58 @@ def test_npy_exporter(get_h5saver, tmp_path):
     file_path = tmp_path.joinpath('exported_axis.npy')
     exporter.export_data(h5saver.get_node('/RawData/Axis00'), file_path)
     assert np.allclose(np.load(file_path), axis.get_data())
+
+
+def test_chunked_exporters(get_h5saver, tmp_path):
+    h5saver = get_h5saver
+    dwa = DataSaverLoader(h5saver).load_data('/RawData/Data00')
+    node = h5saver.get_node('/RawData/Data00')
+
+    progress = []
+    exporter = h5export.ExporterFactory.create_exporter('npy', 'Binary NumPy format')
+    exporter.chunk_size = 1e-6 * node.array.dtype.itemsize * node.shape[1]  # one row per chunk
+    assert exporter.get_chunk_rows(node) == 1
+    exporter.set_progress_callback(progress.append)
+    file_path = tmp_path.joinpath('exported_data.npy')
+    exporter.export_data(node, file_path)
+    assert np.allclose(np.load(file_path), dwa[0])
+    assert progress[0] == 0 and progress[-1] == 100
+    assert len(progress) == node.shape[0] + 1
+
+    exporter = h5export.ExporterFactory.create_exporter('txt', 'Text files')
+    exporter.chunk_size = 2e-6 * node.array.dtype.itemsize * node.shape[1]
+    file_path = tmp_path.joinpath('exported_data.txt')
+    exporter.export_data(node, file_path)
+    assert np.allclose(np.loadtxt(file_path), dwa[0])
+
+    exporter = h5export.ExporterFactory.create_exporter('ascii', 'Ascii flimj file')
+    exporter.chunk_size = 1e-6 * node.array.dtype.itemsize * node.shape[0]
+    file_path = tmp_path.joinpath('exported_data.ascii')
+    exporter.export_data(node, file_path)
+    assert np.allclose(np.loadtxt(file_path), dwa[0].T)
+
+
+def test_cancel_export(get_h5saver, tmp_path):
+    h5saver = get_h5saver
+    node = h5saver.get_node('/RawData/Data00')
+    exporter = h5export.ExporterFactory.create_exporter('txt', 'Text files')
+    exporter.chunk_size = 1e-6 * node.array.dtype.itemsize * node.shape[1]
+    exporter.set_progress_callback(lambda value: exporter.cancel() if value > 0 else None)
+    with pytest.raises(h5export.ExportCancelled):
+        exporter.export_data(node, tmp_path.joinpath('exported_data.txt'))
+
+
+def test_h5_exporter(get_h5saver, tmp_path):
+    h5saver = get_h5saver
+    dwa = DataSaverLoader(h5saver).load_data('/RawData/Data00')
+    exporter = h5export.ExporterFactory.create_exporter('h5', 'Single node h5 file')
+    file_path = tmp_path.joinpath('exported_data.h5')
+    exporter.export_data(h5saver.get_node('/RawData/Data00'), file_path)
+
+    h5saver_exported = H5SaverLowLevel()
+    h5saver_exported.init_file(file_path)
+    try:
+        assert 'Data00' in h5saver_exported.get_children('/RawData')
+        assert np.allclose(h5saver_exported.get_node('/RawData/Data00').read(), dwa[0])
+    finally:
+        h5saver_exported.close_file()
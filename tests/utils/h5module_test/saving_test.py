@@ -7,14 +7,18 @@ Created the 21/11/2022
 import numpy as np
 import pytest
 from datetime import datetime
+from time import sleep
 
 from pymodaq.utils.h5modules import saving, backends
+from pymodaq.utils.h5modules.writer import WriterError
 from pymodaq.utils import daq_utils as utils
 from pymodaq.utils.h5modules.data_saving import DataManagement, AxisSaverLoader
 from pymodaq.utils.daq_utils import capitalize
 from pymodaq.utils.data import DataDim
 
 tested_backend = ['tables', 'h5py']  # , 'h5pyd']
+if 'zarr' in backends.backends_available:
+    tested_backend.append('zarr')
 
 
 @pytest.fixture()
@@ -76,6 +80,163 @@ class TestH5SaverLowLevel:
             assert h5saver.raw_group.attrs[key] == value
         h5saver.close_file()
 
+    def test_data_type_count(self, tmp_path):
+        h5saver = saving.H5SaverLowLevel()
+        addhoc_file_path = tmp_path.joinpath('h5file.h5')
+        h5saver.init_file(file_name=addhoc_file_path, new_file=True)
+        group = h5saver.get_set_group(h5saver.raw_group, 'mygroup')
+        for ind in range(3):
+            h5saver.add_array(h5saver.raw_group, f'Axis{ind:02d}', 'axis', array_to_save=np.zeros((2,)),
+                              data_dimension='Data1D')
+        assert h5saver.get_data_type_count(h5saver.raw_group, 'axis') == 3
+        h5saver.add_array(group, 'Axis00', 'axis', array_to_save=np.zeros((2,)),
+                          data_dimension='Data1D')
+        h5saver.add_array(group, 'Data00', 'data', array_to_save=np.zeros((2,)),
+                          data_dimension='Data1D')
+        assert h5saver.get_data_type_count(group, 'axis') == 1
+        assert h5saver.get_data_type_count(group, 'data') == 1
+        assert h5saver.get_data_type_count(h5saver.raw_group, 'axis') == 4
+        assert h5saver.get_data_type_count('/RawData/mygroup/Data00', 'data') == 1
+        h5saver.close_file()
+
+        h5saver.init_file(file_name=addhoc_file_path, new_file=False)
+        assert h5saver.get_data_type_count(h5saver.raw_group, 'axis') == 4
+        assert h5saver.get_data_type_count('/RawData/mygroup', 'data') == 1
+        assert h5saver.get_data_type_count('/', 'strings') == 1
+        h5saver.close_file()
+
+    def test_add_array_chunks(self, tmp_path):
+        h5saver = saving.H5SaverLowLevel()
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'), new_file=True)
+        array = h5saver.add_array(h5saver.raw_group, 'Data00', 'data', data_shape=(20, 30),
+                                  array_type=np.float64, enlargeable=True,
+                                  data_dimension='Data2D')
+        assert array.chunk_shape == (1, 20, 30)
+        array = h5saver.add_array(h5saver.raw_group, 'Data01', 'data', data_shape=(10,),
+                                  array_type=np.float64, add_scan_dim=True, scan_shape=(5, 8),
+                                  data_dimension='Data1D',
+                                  chunk_size=1, compression=('blosc:lz4', 5))
+        assert array.chunk_shape == (1, 8, 10)
+        array[2, 3, :] = np.ones((10,))
+        assert np.all(array[2, 3, :] == pytest.approx(np.ones((10,))))
+        h5saver.close_file()
+
+    def test_add_array_scan_dim_not_allocated(self, tmp_path):
+        h5saver = saving.H5SaverLowLevel()
+        file_path = tmp_path.joinpath('h5file.h5')
+        h5saver.init_file(file_name=file_path, new_file=True)
+        # 100x100 scan of 2048x2048 uint16 frames: 80 GB if allocated
+        array = h5saver.add_array(h5saver.raw_group, 'Data00', 'data', data_shape=(2048, 2048),
+                                  array_type=np.uint16, add_scan_dim=True, scan_shape=(100, 100),
+                                  data_dimension='Data2D')
+        assert array.chunk_shape == (1, 1, 2048, 2048)
+        array[10, 20, ...] = np.ones((2048, 2048), dtype=np.uint16)
+        assert np.all(array[10, 20, ...] == 1)
+        assert np.all(array[10, 21, ...] == 0)
+        h5saver.close_file()
+        assert file_path.stat().st_size < 100e6
+
+    def test_async_writing(self, tmp_path):
+        h5saver = saving.H5SaverLowLevel()
+        h5saver.set_async_writing(True, queue_size=5)
+        assert not h5saver.is_async
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'), new_file=True)
+        assert h5saver.is_async
+
+        array = h5saver.add_array(h5saver.raw_group, 'Data00', 'data', enlargeable=True,
+                                  data_shape=(10,), array_type=float, data_dimension='Data1D')
+        for ind in range(20):
+            assert h5saver.submit(array.append, ind * np.ones((10,)))
+            h5saver.add_log(f'step {ind}')
+        h5saver.flush()
+        assert h5saver.writer_metrics.written == 40
+        assert h5saver.writer_metrics.max_queue_depth <= 5
+        assert array.attrs['shape'] == (20, 10)
+        assert h5saver._logger_array.attrs['shape'] == (20,)
+
+        h5saver.close_file()
+        assert not h5saver.is_async
+
+        h5saver.set_async_writing(False)
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'), new_file=False)
+        assert not h5saver.is_async
+        assert h5saver.get_node('/RawData/Data00').read()[-1, 0] == pytest.approx(19)
+        h5saver.close_file()
+
+    def test_async_writing_error(self, tmp_path):
+        h5saver = saving.H5SaverLowLevel()
+        h5saver.set_async_writing(True)
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'), new_file=True)
+        array = h5saver.add_array(h5saver.raw_group, 'Data00', 'data', enlargeable=True,
+                                  data_shape=(10,), array_type=float, data_dimension='Data1D')
+        h5saver.submit(array.append, np.ones((5,)))  # wrong shape
+        with pytest.raises(WriterError):
+            h5saver.flush()
+        h5saver.submit(array.append, np.ones((5,)))
+        with pytest.raises(WriterError):
+            h5saver.close_file()
+        assert not h5saver.isopen()
+
+    @pytest.mark.parametrize('backend', tested_backend)
+    @pytest.mark.parametrize('async_writing', [False, True])
+    def test_rollover(self, tmp_path, backend, async_writing):
+        h5saver = saving.H5SaverLowLevel(backend=backend)
+        h5saver.set_async_writing(async_writing)
+        h5saver.set_rollover('frames', max_frames=3)
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'), new_file=True,
+                          metadata=dict(attr1='attr1'))
+
+        def append(ind):
+            if not h5saver.is_node_in_group(h5saver.raw_group, 'Data00'):
+                h5saver.add_array(h5saver.raw_group, 'Data00', 'data', enlargeable=True,
+                                  data_shape=(10,), array_type=float, data_dimension='Data1D')
+            h5saver.get_node('/RawData/Data00').append(ind * np.ones((10,)))
+
+        rolled = []
+        for ind in range(8):
+            rolled.append(h5saver.check_rollover())
+            h5saver.submit(append, ind)
+        assert rolled == [False, False, False, True, False, False, True, False]
+        assert h5saver.rollover_index == 2
+        h5saver.close_file()
+
+        file_paths = saving.get_rollover_files(h5saver.file_path)
+        assert [path.name for path in file_paths] == \
+               [f'h5file{suffix}{h5saver.file_extension}' for suffix in ['', '_001', '_002']]
+        assert saving.get_rollover_files(file_paths[0]) == file_paths
+        data = []
+        for ind, file_path in enumerate(file_paths):
+            h5saver.open_file(file_path, 'r')
+            assert h5saver.get_node('/RawData').attrs['attr1'] == 'attr1'
+            if ind > 0:
+                assert h5saver.root().attrs['rollover_index'] == ind
+            data.append(h5saver.get_node('/RawData/Data00').read()[:, 0])
+            h5saver.close_file()
+        assert [len(dat) for dat in data] == [3, 3, 2]
+        assert np.allclose(np.concatenate(data), np.arange(8))
+
+    def test_rollover_sources(self, tmp_path):
+        h5saver = saving.H5SaverLowLevel()
+        h5saver.set_rollover('frames', max_frames=2)
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'), new_file=True)
+        rolled = [h5saver.check_rollover(source) for source in ['det0', 'det1', 'det0', 'det1',
+                                                                'det0', 'det1', 'det1']]
+        assert rolled == [False, False, False, False, True, False, False]
+        assert h5saver.rollover_index == 1
+        h5saver.close_file()
+
+    def test_rollover_duration(self, tmp_path):
+        h5saver = saving.H5SaverLowLevel()
+        h5saver.set_rollover('duration', max_duration=0.05)
+        h5saver.init_file(file_name=tmp_path.joinpath('h5file.h5'), new_file=True)
+        assert not h5saver.check_rollover()
+        assert not h5saver.check_rollover()
+        sleep(0.1)
+        assert h5saver.check_rollover()
+        assert not h5saver.check_rollover()
+        h5saver.close_file()
+        assert len(saving.get_rollover_files(tmp_path.joinpath('h5file.h5'))) == 2
+
     def test_logger(self, get_h5saver_lowlevel):
         h5saver = get_h5saver_lowlevel
 
@@ -144,7 +305,7 @@ class TestH5Saver:
         assert h5saver.get_scan_index() == 0
 
         h5saver.init_file(update_h5=update_h5)
-        assert h5saver.h5_file_path.joinpath(f'Dataset_{today}_000.h5').is_file()
+        assert h5saver.h5_file_path.joinpath(f'Dataset_{today}_000{h5saver.file_extension}').exists()
         scan_group = h5saver.add_scan_group()
         assert h5saver.get_node_name(h5saver.get_last_scan()) == 'Scan000'
         assert h5saver.get_scan_index() == 0
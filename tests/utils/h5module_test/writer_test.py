@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import threading
+from time import sleep
+
+import pytest
+
+from pymodaq.utils.h5modules.writer import (H5WriterThread, BackpressurePolicy, WriterQueueFull,
+                                            WriterError)
+
+
+@pytest.fixture()
+def get_writer():
+    writer = H5WriterThread(queue_size=2)
+    writer.start()
+    yield writer
+    writer.stop()
+
+
+class TestH5WriterThread:
+    def test_init(self, get_writer):
+        writer = get_writer
+        assert writer.queue_size == 2
+        assert writer.policy == BackpressurePolicy['block']
+        assert writer.is_alive()
+
+    def test_order_and_barrier(self, get_writer):
+        writer = get_writer
+        results = []
+        threads = []
+        for ind in range(10):
+            writer.submit(lambda x: (sleep(0.001), results.append(x), threads.append(
+                threading.current_thread())), ind)
+        writer.barrier()
+        assert results == list(range(10))
+        assert all([thread is writer for thread in threads])
+        assert writer.metrics.submitted == 10
+        assert writer.metrics.written == 10
+        assert writer.metrics.max_queue_depth <= 2
+        assert writer.metrics.max_latency >= writer.metrics.max_write_duration > 0.
+
+    def test_errors(self, get_writer):
+        writer = get_writer
+
+        def raise_error():
+            raise ValueError('an error')
+        writer.submit(raise_error)
+        with pytest.raises(WriterError):
+            writer.barrier()
+        assert writer.metrics.errors == 1
+        assert writer.metrics.written == 0
+        writer.barrier()  # the error has been cleared
+
+        writer.submit(raise_error)
+        sleep(0.05)
+        with pytest.raises(WriterError):
+            writer.submit(lambda: None)
+
+        writer.submit(raise_error)
+        with pytest.raises(WriterError):
+            writer.stop()
+        assert not writer.is_alive()
+
+    @pytest.mark.parametrize('policy', ['drop', 'error'])
+    def test_policy(self, policy):
+        event = threading.Event()
+        writer = H5WriterThread(queue_size=1, policy=policy)
+        writer.start()
+        writer.submit(event.wait)  # the writer thread is blocked until event is set
+        sleep(0.05)
+        writer.submit(lambda: None)  # fills the queue
+        if policy == 'drop':
+            assert not writer.submit(lambda: None)
+            assert writer.metrics.dropped == 1
+        else:
+            with pytest.raises(WriterQueueFull):
+                writer.submit(lambda: None)
+        event.set()
+        writer.stop()
+        assert not writer.is_alive()
+        assert writer.metrics.written == 2
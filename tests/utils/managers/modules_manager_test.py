@@ -0,0 +1,113 @@
+from time import perf_counter
+
+import pytest
+from qtpy.QtCore import QTimer
+
+from pymodaq.utils.data import DataActuator, DataToExport
+from pymodaq.utils.managers.modules_manager import ModulesManager
+
+
+@pytest.fixture
+def modules_manager(qtbot):
+    return ModulesManager()
+
+
+def set_flag(manager: ModulesManager):
+    manager.det_done_flag = True
+    manager._wake_up()
+
+
+class TestWait:
+    def test_wait_done(self, modules_manager):
+        modules_manager.det_done_flag = False
+        QTimer.singleShot(50, lambda: set_flag(modules_manager))
+        start = perf_counter()
+        assert modules_manager._wait_for(lambda: modules_manager.det_done_flag, start, 5000, 'det')
+        assert 0.04 < perf_counter() - start < 1.
+
+    def test_already_done(self, modules_manager):
+        modules_manager.det_done_flag = True
+        assert modules_manager._wait_for(lambda: modules_manager.det_done_flag, perf_counter(), 5000,
+                                         'det')
+
+    def test_timeout(self, modules_manager):
+        modules_manager.det_done_flag = False
+        start = perf_counter()
+        assert not modules_manager._wait_for(lambda: modules_manager.det_done_flag, start, 100, 'det')
+        assert 0.09 < perf_counter() - start < 1.
+
+    def test_wait_statistics(self, modules_manager):
+        modules_manager.det_done_flag = True
+        for ind in range(3):
+            modules_manager._wait_for(lambda: modules_manager.det_done_flag, perf_counter(), 5000, 'det')
+        stats = modules_manager.get_wait_statistics()
+        assert stats['det']['n'] == 3
+        assert stats['move']['n'] == 0
+        assert stats['det']['max'] >= stats['det']['mean'] >= 0.
+
+        modules_manager.reset_wait_statistics()
+        assert modules_manager.get_wait_statistics()['det']['n'] == 0
+
+
+def test_timings(modules_manager):
+    modules_manager.start_grab()
+    assert set(modules_manager.grab_timings.keys()) == {'grab_issued'}
+    assert modules_manager.move_timings == dict([])
+
+
+class ActuatorMock:
+    def __init__(self, title: str, manager: ModulesManager = None):
+        self.title = title
+        self.epsilon = 0.01
+        self.manager = manager
+        self.commands = []
+        self.command_hardware = self
+
+    def emit(self, command):
+        self.commands.append(command)
+        self.manager.move_done(DataActuator(self.title, data=float(command.attribute[0].value())))
+
+
+def get_positions(*values) -> DataToExport:
+    return DataToExport('positions', data=[DataActuator(f'act{ind}', data=value)
+                                           for ind, value in enumerate(values)])
+
+
+@pytest.mark.parametrize('skip', [True, False])
+def test_redundant_moves(modules_manager, skip):
+    actuators = [ActuatorMock(f'act{ind}', modules_manager) for ind in range(2)]
+    modules_manager.set_actuators(actuators, actuators)
+    modules_manager.skip_redundant_moves = skip
+    modules_manager.connect_actuators(False)
+
+    for values in [(0., 0.), (0., 1.), (0.005, 2.), (1., 2.)]:
+        positions = modules_manager.move_actuators(get_positions(*values))
+        assert modules_manager.move_done_flag
+        assert sorted(positions.get_names()) == ['act0', 'act1']
+    assert [len(act.commands) for act in actuators] == ([2, 3] if skip else [4, 4])
+    assert modules_manager.n_moves_saved == (3 if skip else 0)
+
+    modules_manager.move_actuators(get_positions(1., 1.), mode='rel')
+    modules_manager.move_actuators(get_positions(1., 1.))
+    assert [len(act.commands) for act in actuators] == ([4, 5] if skip else [6, 6])
+
+    modules_manager.forget_positions()
+    modules_manager.move_actuators(get_positions(1., 1.))
+    assert [len(act.commands) for act in actuators] == ([5, 6] if skip else [7, 7])
+    modules_manager.reset_wait_statistics()
+    assert modules_manager.n_moves_saved == 0
+
+
+@pytest.mark.parametrize('values, mode', [((1.,), 'abs'), ((1., 1.), 'other')])
+def test_move_failure(modules_manager, values, mode):
+    actuators = [ActuatorMock(f'act{ind}', modules_manager) for ind in range(2)]
+    modules_manager.set_actuators(actuators, actuators)
+    modules_manager.connect_actuators(False)
+    emitted = []
+    modules_manager.move_done_signal.connect(emitted.append)
+
+    positions = modules_manager.move_actuators(get_positions(*values), mode=mode)
+    assert len(positions) == 0
+    assert not modules_manager.move_done_flag
+    assert emitted == []
+    assert [len(act.commands) for act in actuators] == [0, 0]
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from pymodaq.utils.data import DataActuator, DataRaw, DataToExport
+from pymodaq.utils.scanner.fly_scan import interpolate_positions, bin_positions, FlyScanRecorder
+
+
+def test_interpolate_positions():
+    readback_times = np.array([0., 1., 2., 3.])
+    readback_positions = np.array([0., 10., 20., 20.])
+    positions = interpolate_positions([-1., 0.5, 1.5, 2.5, 4.], readback_times, readback_positions)
+    assert positions == pytest.approx([0., 5., 15., 20., 20.])
+
+    # readbacks received out of order
+    assert interpolate_positions([0.5], readback_times[::-1], readback_positions[::-1]) == \
+        pytest.approx([5.])
+
+
+@pytest.mark.parametrize('line', [np.linspace(0, 4, 5), np.linspace(4, 0, 5)])
+def test_bin_positions(line):
+    positions = np.array([-1., -0.4, 0.1, 0.9, 1.2, 3.8, 5.])
+    binned = bin_positions(positions, line)
+    assert len(binned) == len(line)
+    binned = dict(zip(line, binned))
+    assert list(binned[0.]) == [1, 2]
+    assert list(binned[1.]) == [3, 4]
+    assert list(binned[2.]) == [4]  # no frame within the bin, the closest one is used
+    assert list(binned[4.]) == [5]
+
+
+def test_recorder():
+    recorder = FlyScanRecorder('act')
+    for time, position in zip([0., 1., 2.], [0., 1., 2.]):
+        data_act = DataActuator('act', data=position)
+        data_act.timestamp = time
+        recorder.add_readback(data_act)
+    other_act = DataActuator('other', data=10.)
+    recorder.add_readback(other_act)
+    assert recorder.readback_positions == [0., 1., 2.]
+
+    for time, value in zip([0.1, 0.3, 1.05, 1.9], [1., 3., 5., 7.]):
+        dwa = DataRaw('data', data=[np.array([value])])
+        dwa.timestamp = time
+        recorder.add_frame({'det': DataToExport('det', data=[dwa])})
+    assert recorder.get_frame_positions() == pytest.approx([0.1, 0.3, 1.05, 1.9])
+
+    binned = recorder.get_binned_frames(np.array([0., 1., 2.]))
+    assert [frames['det'][0][0][0] for frames in binned] == pytest.approx([2., 5., 7.])
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from pymodaq.utils.data import DataDistribution
+from pymodaq.utils.scanner.learners import (Learner1D, Learner2D, AdaptiveScanner, uniform_loss_1d,
+                                            default_loss_1d, curvature_loss_1d, uniform_loss_2d,
+                                            default_loss_2d)
+from pymodaq.utils.scanner.utils import scanner_factory
+
+
+def run_learner(learner, function, n_points: int, batch_size: int = 1):
+    while learner.n_points < n_points:
+        points = learner.ask(batch_size)
+        learner.tell_many(points, [function(point) for point in points])
+    return learner
+
+
+def test_losses_1d():
+    xs = np.array([0., 0.5, 1.])
+    ys = np.array([0., 0., 1.])
+    assert uniform_loss_1d(xs, ys) == pytest.approx([0.5, 0.5])
+    assert default_loss_1d(xs, ys) == pytest.approx([0.5, np.hypot(0.5, 1.)])
+    assert np.all(curvature_loss_1d(xs, ys) > default_loss_1d(xs, ys))
+
+
+def test_losses_2d():
+    vertices = np.array([[[0., 0.], [1., 0.], [0., 1.]]])
+    assert uniform_loss_2d(vertices, np.zeros((1, 3))) == pytest.approx([np.sqrt(0.5)])
+    assert default_loss_2d(vertices, np.zeros((1, 3))) == pytest.approx([np.sqrt(0.5)])
+    assert default_loss_2d(vertices, np.array([[0., 1., 0.]])) > uniform_loss_2d(vertices, None)
+
+
+def test_learner_errors():
+    with pytest.raises(ValueError):
+        Learner1D([(1., 1.)])
+    with pytest.raises(ValueError):
+        Learner1D([(0., 1.)], loss='not_a_loss')
+    learner = Learner1D([(0., 1.)], loss=uniform_loss_1d)
+    assert learner.loss_function is uniform_loss_1d
+
+
+def test_learner1d():
+    learner = Learner1D([(-1., 2.)], loss='uniform')
+    assert learner.loss() == np.inf
+    assert learner.ask(2) == pytest.approx(np.array([[-1.], [2.]]))
+    assert len(learner.pending) == 2
+    learner.tell([-1.], 0.)
+    learner.tell([2.], 0.)
+    assert len(learner.pending) == 0
+    assert learner.loss() == pytest.approx(1.)
+    assert learner.ask(3) == pytest.approx(np.array([[0.5], [-0.25], [1.25]]))
+
+    learner = run_learner(Learner1D([(-1., 1.)]), lambda x: np.tanh(50 * x[0]), 50)
+    assert np.sum(np.abs(learner.points) < 0.1) > 10
+    assert learner.loss() < 0.1
+
+
+@pytest.mark.parametrize('batch_size', [1, 4])
+def test_learner2d(batch_size):
+    learner = Learner2D([(0., 1.), (-1., 1.)], loss='uniform')
+    assert len(learner.ask(4)) == 4
+    assert np.all(np.isin(learner.pending[:, 0], [0., 1.]))
+    assert np.all(np.isin(learner.pending[:, 1], [-1., 1.]))
+
+    learner = run_learner(Learner2D([(-1., 1.), (-1., 1.)]),
+                          lambda point: np.exp(-(np.hypot(*point) - 0.5) ** 2 / 0.005), 100,
+                          batch_size=batch_size)
+    radii = np.hypot(learner.points[:, 0], learner.points[:, 1])
+    assert np.all(np.abs(learner.points) <= 1.)
+    assert np.sum(np.abs(radii - 0.5) < 0.15) > 30
+
+
+@pytest.mark.parametrize('scan_type, n_axes', [('Scan1D', 1), ('Scan2D', 2)])
+def test_adaptive_scanners(qtbot, get_actuators, scan_type, n_axes):
+    scanner = scanner_factory.get(scan_type, 'Adaptive', actuators=get_actuators(n_axes))
+    scanner.save_settings = False
+    scanner.settings['max_steps'] = 20
+    scanner.set_scan()
+    assert scanner.distribution == DataDistribution['spread']
+    assert scanner.n_steps == 20
+    assert scanner.positions.shape == (0, n_axes)
+    assert scanner.get_nav_axes() == []
+    assert scanner.get_scan_shape() == ()
+    assert scanner.get_indexes_from_scan_index(5) == (5,)
+
+    learner = scanner.get_learner()
+    assert learner.n_axes == n_axes
+    assert np.all(learner.bounds == np.array(scanner.get_bounds()))
+    run_learner(learner, lambda point: np.sum(point), 10)
+    scanner.positions = learner.points
+    nav_axes = scanner.get_nav_axes()
+    assert [axis.spread_order for axis in nav_axes] == list(range(n_axes))
+    assert [axis.label for axis in nav_axes] == [f'act_{ind}' for ind in range(n_axes)]
+
+
+def test_adaptive_scanner_abstract():
+    class AdaptiveScannerNoBounds(AdaptiveScanner):
+        pass
+
+    with pytest.raises(TypeError):
+        AdaptiveScannerNoBounds()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from pymodaq.utils.scanner.path_optimization import (get_travel_times, get_path_duration,
+                                                     nearest_neighbour_order, two_opt,
+                                                     optimize_order)
+
+
+def test_travel_times():
+    assert get_travel_times([0., 0.], [3., 1.]) == pytest.approx(3.)
+    assert get_travel_times([0., 0.], [3., 1.], speeds=[3., 0.5]) == pytest.approx(2.)
+    assert get_travel_times(np.zeros((2, 2)), np.array([[1., 2.], [-4., 1.]])) == \
+        pytest.approx([2., 4.])
+    assert get_path_duration(np.array([[0., 0.], [1., 0.], [1., 2.]])) == pytest.approx(3.)
+    with pytest.raises(ValueError):
+        get_travel_times([0., 0.], [3., 1.], speeds=[1., 0.])
+
+
+def test_nearest_neighbour():
+    positions = np.array([[0.], [3.], [1.], [2.], [-1.]])
+    assert np.all(nearest_neighbour_order(positions) == [0, 2, 3, 1, 4])
+
+
+def test_two_opt():
+    positions = np.array([[0.], [3.], [1.], [2.], [4.]])
+    order = two_opt(positions, np.arange(5))
+    assert order[0] == 0
+    assert np.all(order == [0, 2, 3, 1, 4])
+
+
+@pytest.mark.parametrize('speeds', [None, [1., 10.]])
+def test_optimize_order(speeds):
+    rng = np.random.default_rng(0)
+    positions = rng.random((200, 2))
+    order = optimize_order(positions, speeds)
+    assert order[0] == 0
+    assert np.all(np.sort(order) == np.arange(200))
+    assert get_path_duration(positions[order], speeds) < \
+        get_path_duration(positions[nearest_neighbour_order(positions, speeds)], speeds) < \
+        get_path_duration(positions, speeds)
@@ -4,6 +4,7 @@ Created the 05/12/2022
 
 @author: Sebastien Weber
 """
+import numpy as np
 import pytest
 from qtpy import QtWidgets, QtCore
 from pymodaq.utils.managers.parameter_manager import ParameterManager, Parameter, ParameterTree
@@ -37,6 +38,23 @@ class TestSettings:
                     assert scanner.n_axes == len(config_scanner['actuators'])
 
                 if scan_type == 'Tabular':
-                    assert scanner.n_steps == 1
-
-
+                    if scan_sub_type == 'File':
+                        assert scanner.n_steps == 0  # no positions file selected
+                    else:
+                        assert scanner.n_steps == 1
+
+
+
+def test_get_info_from_positions(qtbot, get_actuators):
+    scanner = scanner_factory.get('Tabular', 'Linear', actuators=get_actuators(2))
+    positions = np.array([[1., 0.5], [0., 0.5], [1., -2.], [0.3, 0.5]])
+    scanner.get_info_from_positions(positions)
+    assert scanner.n_steps == 4
+    assert scanner.n_axes == 2
+    assert np.allclose(scanner.axes_unique[0], [0., 0.3, 1.])
+    assert np.allclose(scanner.axes_unique[1], [-2., 0.5])
+    assert np.all(scanner.axes_indexes == [[2, 1], [0, 1], [2, 0], [1, 1]])
+
+    scanner.get_info_from_positions(np.array([0.2, 0.1, 0.2]))
+    assert scanner.positions.shape == (3, 1)
+    assert np.all(scanner.axes_indexes == [[1], [0], [1]])
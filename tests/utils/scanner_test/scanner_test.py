@@ -22,3 +22,27 @@ class TestScanner:
         assert hasattr(scanner, 'positions')
         assert hasattr(scanner, 'axes_indexes')
         assert hasattr(scanner, 'axes_unique')
+
+    def test_optimize_path(self, qtbot, get_actuators):
+        scanner = Scanner(actuators=get_actuators(2))
+        scanner.set_scan_type_and_subtypes('Scan2D', 'Random')
+        scanner.scanner.save_settings = False
+        assert [child.name() for child in scanner.settings.child('speeds').children()] == \
+            ['act_0', 'act_1']
+        scanner.settings['speeds', 'act_1'] = 2.
+        scanner.settings['optimize_path'] = True
+        assert scanner.settings.child('time_saved').opts['visible']
+        scanner.set_scan()
+        assert scanner.settings['time_saved'] > 0.
+
+    def test_scan_info_lazy(self, qtbot, get_actuators):
+        scanner = Scanner(actuators=get_actuators(2))
+        scanner.set_scan_type_and_subtypes('Scan2D', 'Linear')
+        scanner.scanner.save_settings = False
+        scanner.set_scan()
+        assert scanner.scanner.is_lazy
+        scan_info = scanner.get_scan_info()
+        assert scan_info.Nsteps == scanner.n_steps
+        assert scan_info.positions is None
+        assert len(scan_info.axes_unique) == 2
+        assert scanner.scanner.is_lazy
@@ -4,7 +4,100 @@ Created the 04/11/2023
 
 @author: Sebastien Weber
 """
+import numpy as np
+import pytest
+
+from pymodaq.utils.scanner import scan_factory
+from pymodaq.utils.scanner.utils import scanner_factory
+from pymodaq.utils.scanner.scanners._2d_scanners import Scan2DSpiral
+
+
+def get_scanner(scan_subtype: str, actuators):
+    scanner = scanner_factory.get('Scan2D', scan_subtype, actuators=actuators)
+    scanner.save_settings = False
+    if scan_subtype == 'Spiral':
+        scanner.settings['npts_by_axis'] = 4
+    else:
+        for ax, (start, stop, step) in zip(scanner.axes, ((0., 1., 0.25), (-1., 1., 0.5))):
+            scanner.settings[ax, f'start_{ax}'] = start
+            scanner.settings[ax, f'stop_{ax}'] = stop
+            scanner.settings[ax, f'step_{ax}'] = step
+    scanner.set_scan()
+    return scanner
 
 
 class TestScanner2D:
-    pass
\ No newline at end of file
+    @pytest.mark.parametrize('scan_subtype', ['Linear', 'LinearBackForce', 'Random'])
+    def test_linear(self, qtbot, get_actuators, scan_subtype):
+        scanner = get_scanner(scan_subtype, get_actuators(2))
+        assert scanner.n_steps == 25
+        assert scanner.get_scan_shape() == (5, 5)
+        assert np.allclose(scanner.axes_unique[0], np.linspace(0, 1, 5))
+        assert np.allclose(scanner.axes_unique[1], np.linspace(-1, 1, 5))
+        for ind in range(scanner.n_steps):
+            indexes = scanner.get_indexes_from_scan_index(ind)
+            assert np.allclose(scanner.positions[ind],
+                               [scanner.axes_unique[0][indexes[0]],
+                                scanner.axes_unique[1][indexes[1]]])
+        if scan_subtype == 'Linear':
+            assert np.allclose(scanner.positions[:6, 1], [-1., -0.5, 0., 0.5, 1., -1.])
+        elif scan_subtype == 'LinearBackForce':
+            assert np.allclose(scanner.positions[:6, 1], [-1., -0.5, 0., 0.5, 1., 1.])
+            assert np.allclose(scanner.positions[5:10, 0], 0.25)
+
+    @pytest.mark.parametrize('scan_subtype', ['Linear', 'LinearBackForce', 'Spiral'])
+    def test_iter_positions(self, qtbot, get_actuators, scan_subtype):
+        scanner = get_scanner(scan_subtype, get_actuators(2))
+        assert scanner.is_lazy == (scan_subtype != 'Spiral')
+        chunks = list(scanner.iter_positions(chunk_size=7))
+        assert [len(chunk) for chunk in chunks[:-1]] == [7] * (len(chunks) - 1)
+        assert sum([len(chunk) for chunk in chunks]) == scanner.n_steps
+        assert np.all(np.concatenate(chunks) == scanner.positions)
+        assert np.all(scanner.get_axes_indexes_chunk(3, 12) == scanner.axes_indexes[3:12])
+        assert np.all(scanner.get_position_at(8) == scanner.positions[8])
+
+    def test_spiral_indexes(self):
+        indexes = Scan2DSpiral.get_spiral_indexes(2)
+        assert indexes.shape == (9, 2)
+        assert np.all(indexes[0] == 0)
+        assert np.all(np.sum(np.abs(np.diff(indexes, axis=0)), axis=1) == 1)
+        assert len(np.unique(indexes, axis=0)) == 9
+
+    @pytest.mark.parametrize('scan_subtype', ['Linear', 'LinearBackForce'])
+    def test_iter_lines(self, qtbot, get_actuators, scan_subtype):
+        scanner = get_scanner(scan_subtype, get_actuators(2))
+        lines = list(scanner.iter_lines(chunk_size=7))
+        assert [line_start for line_start, _ in lines] == [0, 5, 10, 15, 20]
+        for line_start, line in lines:
+            assert np.allclose(line, scanner.positions[line_start: line_start + 5])
+            assert np.all(line[:, 0] == line[0, 0])
+
+    def test_optimize_path_skipped(self, qtbot, get_actuators, monkeypatch):
+        scanner = get_scanner('Linear', get_actuators(2))
+        assert scanner.optimize_path(speeds=[1., 2.]) == (0., 0.)
+        assert scanner._positions is None and scanner.is_lazy
+
+        config = scan_factory.config
+        monkeypatch.setattr(scan_factory, 'config', lambda *args: 10 if
+                            args == ('scan', 'path_optimization_max_steps') else config(*args))
+        scanner = get_scanner('Random', get_actuators(2))
+        positions = scanner.positions.copy()
+        assert scanner.optimize_path(speeds=[1., 2.]) == (0., 0.)
+        assert np.all(scanner.positions == positions)
+
+    @pytest.mark.parametrize('scan_subtype', ['Linear', 'Random'])
+    def test_optimize_path(self, qtbot, get_actuators, scan_subtype):
+        scanner = get_scanner(scan_subtype, get_actuators(2))
+        positions = scanner.positions.copy()
+        duration, optimized_duration = scanner.optimize_path(speeds=[1., 2.])
+        assert optimized_duration <= duration
+        assert not scanner.is_lazy
+        assert np.all(scanner.positions[0] == positions[0])
+        assert len(np.unique(scanner.positions, axis=0)) == scanner.n_steps == 25
+        for ind in range(scanner.n_steps):
+            indexes = scanner.get_indexes_from_scan_index(ind)
+            assert np.allclose(scanner.positions[ind],
+                               [scanner.axes_unique[0][indexes[0]],
+                                scanner.axes_unique[1][indexes[1]]])
+        if scan_subtype == 'Random':
+            assert optimized_duration < duration
@@ -4,7 +4,17 @@ Created the 04/11/2023
 
 @author: Sebastien Weber
 """
+import numpy as np
+
+from pymodaq.utils.scanner.scanners.sequential import SequentialScanner
 
 
 class TestScannerSequential:
-    pass
\ No newline at end of file
+    def test_get_axis_positions(self):
+        assert np.allclose(SequentialScanner.get_axis_positions(0., 1., 0.25),
+                           [0., 0.25, 0.5, 0.75, 1.])
+        assert np.allclose(SequentialScanner.get_axis_positions(1., 0., -0.3),
+                           [1., 0.7, 0.4, 0.1])
+        # positions are accumulated: 0.1 + 0.1 + 0.1 is above 0.3
+        assert np.allclose(SequentialScanner.get_axis_positions(0., 0.3, 0.1), [0., 0.1, 0.2])
+        assert len(SequentialScanner.get_axis_positions(1., 0., 0.1)) == 0
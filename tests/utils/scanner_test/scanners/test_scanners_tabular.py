@@ -4,7 +4,68 @@ Created the 04/11/2023
 
 @author: Sebastien Weber
 """
+import numpy as np
 
+from pymodaq.utils.scanner.utils import scanner_factory
 
-class TestScannerSequential:
-    pass
\ No newline at end of file
+
+class TestScannerTabularFile:
+    def test_iter_positions(self, qtbot, tmp_path, get_actuators):
+        positions = np.random.rand(25, 2)
+        file_path = tmp_path.joinpath('positions.dat')
+        with open(file_path, 'w') as file:
+            file.write('# act_0\tact_1\n')
+            np.savetxt(file, positions, delimiter='\t')
+            file.write('\n')
+
+        scanner = scanner_factory.get('Tabular', 'File', actuators=get_actuators(2))
+        assert scanner.n_steps == 0
+        scanner.settings['positions_file'] = str(file_path)
+        scanner.set_scan()
+        assert scanner.n_steps == 25
+        assert scanner.get_scan_shape() == (25,)
+        assert scanner.is_lazy
+
+        chunks = list(scanner.iter_positions(chunk_size=10))
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        assert np.allclose(np.concatenate(chunks), positions)
+        assert np.allclose(scanner.get_position_at(12), positions[12])
+        assert scanner.is_lazy
+
+        nav_axes = scanner.get_nav_axes()
+        assert np.allclose(nav_axes[0].get_data(), positions[:, 0])
+        assert np.allclose(scanner.axes_unique[1], np.unique(positions[:, 1]))
+        assert np.allclose(scanner.get_axes_indexes_chunk(3, 8)[:, 0],
+                           np.searchsorted(np.unique(positions[:, 0]), positions[3:8, 0]))
+        assert scanner.is_lazy
+
+        assert np.allclose(scanner.positions, positions)
+        assert not scanner.is_lazy
+        assert len(scanner.axes_unique) == 2
+        assert np.allclose(scanner.get_nav_axes()[1].get_data(), positions[:, 1])
+
+    def test_random_access(self, qtbot, tmp_path, get_actuators, monkeypatch):
+        positions = np.random.rand(5000, 2)
+        file_path = tmp_path.joinpath('positions.dat')
+        np.savetxt(file_path, positions, delimiter='\t', header='act_0\tact_1')
+        scanner = scanner_factory.get('Tabular', 'File', actuators=get_actuators(2))
+        scanner.settings['positions_file'] = str(file_path)
+        scanner.set_scan()
+        assert scanner.n_steps == 5000
+
+        lines_read = []
+        iter_data_lines = scanner.iter_data_lines
+
+        def counting_iter_data_lines(file):
+            for line in iter_data_lines(file):
+                lines_read.append(line)
+                yield line
+
+        monkeypatch.setattr(scanner, 'iter_data_lines', counting_iter_data_lines)
+        for ind in range(4980, 5000):
+            lines_read.clear()
+            assert np.allclose(scanner.get_position_at(ind), positions[ind])
+            assert len(lines_read) <= scanner.offsets_step
+        assert np.allclose(np.concatenate(list(scanner.iter_positions(chunk_size=100, start=3000))),
+                           positions[3000:])
+        assert scanner.is_lazy